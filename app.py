@@ -8,7 +8,12 @@ import os
 import io
 import json
 from datetime import datetime, date, timedelta
-from src.core.database import init_db, get_db_connection
+from src.core.database import (
+    init_db, get_db_connection, register_statistics, unregister_statistics,
+    load_drawings, get_all_drawings, get_french_loto_drawings, FrenchLotoDrawing,
+    decode_french_loto_numbers
+)
+from src.core.bitmask import numbers_to_masks, match_counts
 import logging
 
 # Import strategy and analysis tools
@@ -94,6 +99,53 @@ def run_comprehensive_backtest(lottery_type: str, num_predictions: int = 20, _ca
         return None
 
 
+def get_session_statistics(game, data):
+    """
+    Statistics object of this session's loaded data.
+
+    Built once per data load and kept in st.session_state, so reruns reuse
+    it instead of rescanning the history. Each session registers its own
+    instance to receive newly inserted draws.
+
+    Args:
+        game: "euromillions" or "french_loto"
+        data: DataFrame loaded in the session
+
+    Returns:
+        EuromillionsStatistics or FrenchLotoStatistics
+    """
+    key = f"{game}_statistics"
+    cached = st.session_state.get(key)
+    if cached is None or cached[0] is not data:
+        if game == "euromillions":
+            from src.core.statistics import EuromillionsStatistics as statistics_class
+        else:
+            from src.core.french_loto_statistics import FrenchLotoStatistics as statistics_class
+        if cached is not None:
+            unregister_statistics(game, cached[1])
+        statistics = statistics_class(data)
+        register_statistics(game, statistics)
+        cached = st.session_state[key] = (data, statistics)
+    return cached[1]
+
+
+def set_session_data(game, data_key, statistics):
+    """
+    Show the data of this session's statistics after a draw was pushed to them.
+
+    Keeps the cached statistics paired with the new data, so the next rerun
+    reuses them instead of rebuilding from the table.
+
+    Args:
+        game: "euromillions" or "french_loto"
+        data_key: st.session_state key of the game's loaded data
+        statistics: Statistics object returned by get_session_statistics
+    """
+    data = statistics.data
+    st.session_state[data_key] = data
+    st.session_state[f"{game}_statistics"] = (data, statistics)
+
+
 def main():
     """Main application function"""
     
@@ -124,18 +176,12 @@ def main():
         
         if load_data_button:
             with st.spinner("Loading Euromillions data..."):
-                # Get database connection
-                conn = get_db_connection()
-                if conn:
-                    try:
-                        query = "SELECT * FROM euromillions_drawings ORDER BY date DESC"
-                        data = pd.read_sql(query, conn)
-                        st.session_state.processed_data = data
-                        st.session_state.data_loaded = True
-                    except Exception as e:
-                        st.error(f"Error loading data: {str(e)}")
+                data = get_all_drawings()
+                if not data.empty:
+                    st.session_state.processed_data = data
+                    st.session_state.data_loaded = True
                 else:
-                    st.error("Could not connect to database.")
+                    st.error("Could not load Euromillions data from the database.")
         
         if st.session_state.data_loaded:
             st.success(f"✅ {len(st.session_state.processed_data)} Euromillions drawings loaded")
@@ -152,12 +198,8 @@ def main():
                     if count > 0:
                         st.success(f"✅ {count} new Euromillions drawings imported!")
                         # Reload data
-                        conn = get_db_connection()
-                        if conn:
-                            query = "SELECT * FROM euromillions_drawings ORDER BY date DESC"
-                            data = pd.read_sql(query, conn)
-                            st.session_state.processed_data = data
-                            st.session_state.data_loaded = True
+                        st.session_state.processed_data = get_all_drawings()
+                        st.session_state.data_loaded = True
                     else:
                         st.info("No new Euromillions drawings found (all already imported)")
                 except Exception as e:
@@ -169,18 +211,12 @@ def main():
         
         if load_french_loto_button:
             with st.spinner("Loading French Loto data..."):
-                # Get database connection
-                conn = get_db_connection()
-                if conn:
-                    try:
-                        query = "SELECT * FROM french_loto_drawings ORDER BY date DESC"
-                        data = pd.read_sql(query, conn)
-                        st.session_state.french_loto_data = data
-                        st.session_state.french_loto_data_loaded = True
-                    except Exception as e:
-                        st.error(f"Error loading data: {str(e)}")
+                data = get_french_loto_drawings()
+                if not data.empty:
+                    st.session_state.french_loto_data = data
+                    st.session_state.french_loto_data_loaded = True
                 else:
-                    st.error("Could not connect to database.")
+                    st.error("Could not load French Loto data from the database.")
             
         # Update French Loto from FDJ API
             if st.session_state.french_loto_data_loaded:
@@ -196,12 +232,8 @@ def main():
                     if count > 0:
                         st.success(f"✅ {count} new French Loto drawings imported!")
                         # Reload data
-                        conn = get_db_connection()
-                        if conn:
-                            query = "SELECT * FROM french_loto_drawings ORDER BY date DESC"
-                            data = pd.read_sql(query, conn)
-                            st.session_state.french_loto_data = data
-                            st.session_state.french_loto_data_loaded = True
+                        st.session_state.french_loto_data = get_french_loto_drawings()
+                        st.session_state.french_loto_data_loaded = True
                     else:
                         st.info("No new French Loto drawings found (all already imported)")
                 except Exception as e:
@@ -408,9 +440,8 @@ def main():
                 try:
                     # Initialize the FrenchLotoStatistics module
                     try:
-                        # Import here to ensure it's available even if global import failed
-                        from src.core.french_loto_statistics import FrenchLotoStatistics
-                        stats = FrenchLotoStatistics(st.session_state.french_loto_data)
+                        # Built once per data load; the helper imports the class itself
+                        stats = get_session_statistics('french_loto', st.session_state.french_loto_data)
                     except Exception as e:
                         st.error(f"Error initializing statistics module: {str(e)}")
                         import traceback
@@ -516,9 +547,8 @@ def main():
                 
                 # Initialize strategies
                 try:
-                    # Create a simple statistics class for Euromillions data
-                    from src.core.statistics import EuromillionsStatistics
-                    euro_stats = EuromillionsStatistics(st.session_state.processed_data)
+                    # Statistics of the loaded Euromillions data, reused across reruns
+                    euro_stats = get_session_statistics('euromillions', st.session_state.processed_data)
                     strategies = PredictionStrategies(euro_stats)
 
                     # Initialize ensemble strategies
@@ -828,9 +858,8 @@ def main():
             else:
                 # Initialize strategies
                 try:
-                    # Create a statistics class for French Loto data
-                    from src.core.french_loto_statistics import FrenchLotoStatistics
-                    loto_stats = FrenchLotoStatistics(st.session_state.french_loto_data)
+                    # Statistics of the loaded French Loto data, reused across reruns
+                    loto_stats = get_session_statistics('french_loto', st.session_state.french_loto_data)
                     strategies = FrenchLotoStrategy(loto_stats)
                 except Exception as e:
                     st.error(f"Error initializing French Loto strategies: {str(e)}")
@@ -1310,7 +1339,7 @@ def main():
                                 with st.spinner("Mixing combinations to find optimal solution..."):
                                     try:
                                         selected_combos = [current_combos[i] for i in selected_indices if i < len(current_combos)]
-                                        mixed_combo = strategies.mix_combinations(selected_combos, max_iterations=200)
+                                        mixed_combo = strategies.mix_combinations(selected_combos, exact=True)
                                         
                                         if mixed_combo:
                                             # Store in session state for saving later
@@ -1653,13 +1682,14 @@ def main():
                     except Exception as e:
                         st.error(f"Erreur: {str(e)}")
             
-            # Get latest drawing date
+            # Get latest drawing
             conn = get_db_connection()
             if conn:
                 try:
-                    latest_drawing_query = "SELECT MAX(date) as latest_date FROM french_loto_drawings"
-                    latest_drawing = pd.read_sql(latest_drawing_query, conn)
-                    latest_date = latest_drawing['latest_date'].iloc[0] if not latest_drawing.empty and latest_drawing['latest_date'].iloc[0] else None
+                    latest_draw_df = load_drawings(
+                        FrenchLotoDrawing, columns=['date', 'n1', 'n2', 'n3', 'n4', 'n5', 'lucky'], limit=1
+                    )
+                    latest_date = latest_draw_df['date'].iloc[0] if not latest_draw_df.empty else None
                     
                     if latest_date:
                         st.info(f"📅 Latest draw in database: {latest_date}")
@@ -1720,17 +1750,7 @@ def main():
             st.subheader("2️⃣ Analyze Predictions Against Latest Draw")
             
             if latest_date:
-                # Get latest drawing
                 try:
-                    latest_draw_query = f"""
-                        SELECT date, n1, n2, n3, n4, n5, lucky 
-                        FROM french_loto_drawings 
-                        WHERE date = '{latest_date}'
-                        ORDER BY draw_num DESC
-                        LIMIT 1
-                    """
-                    latest_draw_df = pd.read_sql(latest_draw_query, conn)
-                    
                     if not latest_draw_df.empty:
                         draw = latest_draw_df.iloc[0]
                         actual_numbers = sorted([int(draw['n1']), int(draw['n2']), int(draw['n3']), int(draw['n4']), int(draw['n5'])])
@@ -1742,7 +1762,7 @@ def main():
                         
                         # Get predictions for this date or before
                         predictions_query = f"""
-                            SELECT id, date_generated, numbers, lucky, strategy, score
+                            SELECT id, date_generated, numbers, lucky, strategy, score, numbers_rank
                             FROM french_loto_predictions
                             WHERE date_generated <= '{latest_date}'
                             ORDER BY date_generated DESC, score DESC
@@ -1753,14 +1773,21 @@ def main():
                         if not predictions_df.empty:
                             st.markdown(f"**Found {len(predictions_df)} predictions to analyze**")
                             
+                            # Count matches of all predictions at once with bitmasks
+                            all_pred_numbers = decode_french_loto_numbers(
+                                predictions_df['numbers_rank'].tolist(), predictions_df['numbers'].tolist()
+                            )
+                            all_number_matches = match_counts(
+                                numbers_to_masks(all_pred_numbers), numbers_to_masks([actual_numbers])
+                            )[:, 0]
+                            
                             # Analyze each prediction
                             results = []
-                            for idx, pred in predictions_df.iterrows():
-                                pred_numbers = [int(n) for n in pred['numbers'].split('-')]
+                            for i, (idx, pred) in enumerate(predictions_df.iterrows()):
+                                pred_numbers = all_pred_numbers[i]
                                 pred_lucky = int(pred['lucky'])
                                 
-                                # Count matches
-                                number_matches = len(set(pred_numbers) & set(actual_numbers))
+                                number_matches = int(all_number_matches[i])
                                 lucky_match = 1 if pred_lucky == actual_lucky else 0
                                 
                                 # Calculate score (French Loto scoring)
@@ -1934,9 +1961,7 @@ def main():
                         st.subheader("Number Pairs Frequency Heatmap")
                         st.markdown("Interactive heatmap showing how often number pairs appear together")
                         with st.spinner("Generating heatmap..."):
-                            fig = plot_number_pairs_heatmap(
-                                historical_data=st.session_state.processed_data.to_dict('records')
-                            )
+                            fig = plot_number_pairs_heatmap(draws=euro_stats.draws)
                             st.plotly_chart(fig, use_container_width=True)
 
                     elif viz_type == "Number Frequency Chart":
@@ -2310,30 +2335,23 @@ def main():
                         st.error("❌ Star numbers must be unique!")
                     else:
                         try:
-                            # Import EuromillionsDrawing model
-                            from src.core.database import EuromillionsDrawing, get_session
+                            from src.core.database import EuromillionsDrawing, get_session, add_new_drawing, get_all_drawings
                             
-                            # Create new drawing
-                            new_draw = EuromillionsDrawing(
-                                date=draw_date,
-                                day_of_week=day_of_week,
-                                n1=n1,
-                                n2=n2,
-                                n3=n3,
-                                n4=n4,
-                                n5=n5,
-                                s1=s1,
-                                s2=s2
-                            )
+                            # Build this session's statistics first so the insert is pushed to them
+                            stats = None
+                            if st.session_state.data_loaded:
+                                stats = get_session_statistics('euromillions', st.session_state.processed_data)
                             
-                            # Save to database
-                            session = get_session()
-                            try:
-                                # Check if this date already exists
-                                existing_draw = session.query(EuromillionsDrawing).filter_by(date=draw_date).first()
-                                if existing_draw:
+                            if add_new_drawing(draw_date, all_numbers, all_stars, day_of_week=day_of_week):
+                                st.success(f"✅ Successfully added Euromillions draw for {draw_date}!")
+                                if stats is not None:
+                                    set_session_data('euromillions', 'processed_data', stats)
+                            else:
+                                # A draw for this date already exists: update it in place
+                                session = get_session()
+                                try:
+                                    existing_draw = session.query(EuromillionsDrawing).filter_by(date=draw_date).first()
                                     st.warning(f"⚠️ A draw for {draw_date} already exists. Updating with new numbers.")
-                                    # Update existing draw
                                     existing_draw.n1 = n1
                                     existing_draw.n2 = n2
                                     existing_draw.n3 = n3
@@ -2341,26 +2359,17 @@ def main():
                                     existing_draw.n5 = n5
                                     existing_draw.s1 = s1
                                     existing_draw.s2 = s2
-                                else:
-                                    # Add new draw
-                                    session.add(new_draw)
-                                
-                                session.commit()
-                                st.success(f"✅ Successfully added Euromillions draw for {draw_date}!")
-                                
-                                # Force reload of data if it was already loaded
-                                if st.session_state.data_loaded:
-                                    conn = get_db_connection()
-                                    if conn:
-                                        query = "SELECT * FROM euromillions_drawings ORDER BY date DESC"
-                                        data = pd.read_sql(query, conn)
-                                        st.session_state.processed_data = data
-                                
-                            except Exception as e:
-                                session.rollback()
-                                st.error(f"❌ Error adding draw: {str(e)}")
-                            finally:
-                                session.close()
+                                    session.commit()
+                                    st.success(f"✅ Successfully updated Euromillions draw for {draw_date}!")
+                                    
+                                    # Changed numbers cannot be applied incrementally; reload the history
+                                    if st.session_state.data_loaded:
+                                        st.session_state.processed_data = get_all_drawings()
+                                except Exception as e:
+                                    session.rollback()
+                                    st.error(f"❌ Error adding draw: {str(e)}")
+                                finally:
+                                    session.close()
                         except Exception as e:
                             st.error(f"❌ Database error: {str(e)}")
         
@@ -2426,32 +2435,16 @@ def main():
                         st.error("❌ Main numbers must be unique!")
                     else:
                         try:
-                            # Import FrenchLotoDrawing model
-                            from src.core.database import FrenchLotoDrawing, get_session
+                            from src.core.database import FrenchLotoDrawing, get_session, add_french_loto_drawing_with_details, get_french_loto_drawings
                             
-                            # Create new drawing
-                            new_draw = FrenchLotoDrawing(
-                                date=draw_date,
-                                day_of_week=day_of_week,
-                                n1=n1,
-                                n2=n2,
-                                n3=n3,
-                                n4=n4,
-                                n5=n5,
-                                lucky=lucky,
-                                winners_rank1=winners_rank1,
-                                winners_rank2=winners_rank2,
-                                winners_rank3=winners_rank3,
-                                prize_rank1=prize_rank1,
-                                prize_rank2=prize_rank2,
-                                prize_rank3=prize_rank3,
-                                currency="EUR"
-                            )
+                            # Build this session's statistics first so the insert is pushed to them
+                            stats = None
+                            if st.session_state.french_loto_data_loaded:
+                                stats = get_session_statistics('french_loto', st.session_state.french_loto_data)
                             
-                            # Save to database
+                            updated = False
                             session = get_session()
                             try:
-                                # Check if this date already exists
                                 existing_draw = session.query(FrenchLotoDrawing).filter_by(date=draw_date).first()
                                 if existing_draw:
                                     st.warning(f"⚠️ A draw for {draw_date} already exists. Updating with new numbers.")
@@ -2468,26 +2461,30 @@ def main():
                                     existing_draw.prize_rank1 = prize_rank1
                                     existing_draw.prize_rank2 = prize_rank2
                                     existing_draw.prize_rank3 = prize_rank3
-                                else:
-                                    # Add new draw
-                                    session.add(new_draw)
-                                
-                                session.commit()
-                                st.success(f"✅ Successfully added French Loto draw for {draw_date}!")
-                                
-                                # Force reload of data if it was already loaded
-                                if st.session_state.french_loto_data_loaded:
-                                    conn = get_db_connection()
-                                    if conn:
-                                        query = "SELECT * FROM french_loto_drawings ORDER BY date DESC"
-                                        data = pd.read_sql(query, conn)
-                                        st.session_state.french_loto_data = data
-                                
+                                    session.commit()
+                                    updated = True
                             except Exception as e:
                                 session.rollback()
-                                st.error(f"❌ Error adding draw: {str(e)}")
+                                raise
                             finally:
                                 session.close()
+                            
+                            if updated:
+                                st.success(f"✅ Successfully updated French Loto draw for {draw_date}!")
+                                # Changed numbers cannot be applied incrementally; reload the history
+                                if st.session_state.french_loto_data_loaded:
+                                    st.session_state.french_loto_data = get_french_loto_drawings()
+                            elif add_french_loto_drawing_with_details(
+                                draw_date, all_numbers, lucky, day_of_week=day_of_week,
+                                winners={'rank1': winners_rank1, 'rank2': winners_rank2, 'rank3': winners_rank3},
+                                prizes={'rank1': prize_rank1, 'rank2': prize_rank2, 'rank3': prize_rank3},
+                                skip_future_dates=False
+                            ):
+                                st.success(f"✅ Successfully added French Loto draw for {draw_date}!")
+                                if stats is not None:
+                                    set_session_data('french_loto', 'french_loto_data', stats)
+                            else:
+                                st.error(f"❌ Could not add the French Loto draw for {draw_date}")
                         except Exception as e:
                             st.error(f"❌ Database error: {str(e)}")
     
@@ -2637,41 +2634,40 @@ def main():
                     try:
                         from src.core.lucky_number_strategies import LuckyNumberStrategies, backtest_lucky_strategies
                         
-                        conn = get_db_connection()
-                        if conn:
-                            loto_data = pd.read_sql("SELECT * FROM french_loto_drawings ORDER BY date", conn)
+                        # Oldest draw first
+                        loto_data = get_french_loto_drawings().iloc[::-1].reset_index(drop=True)
+                        
+                        if not loto_data.empty:
+                            results = backtest_lucky_strategies(loto_data, test_size=0.3)
                             
-                            if not loto_data.empty:
-                                results = backtest_lucky_strategies(loto_data, test_size=0.3)
-                                
-                                st.markdown("### Lucky Number Strategy Performance")
-                                
-                                results_df = pd.DataFrame([
-                                    {
-                                        'Strategy': strategy,
-                                        'Predictions': data['predictions'],
-                                        'Matches': data['matches'],
-                                        'Win Rate (%)': data['win_rate'],
-                                        'Expected Random (%)': data['expected_random']
-                                    }
-                                    for strategy, data in results.items()
-                                ])
-                                results_df = results_df.sort_values('Win Rate (%)', ascending=False)
-                                
-                                best = results_df.iloc[0]
-                                st.success(f"🏆 **Best Lucky Strategy: {best['Strategy']}** with {best['Win Rate (%)']}% win rate")
-                                
-                                fig = px.bar(results_df, x='Strategy', y='Win Rate (%)',
-                                           color='Win Rate (%)', color_continuous_scale='Greens',
-                                           title='Lucky Number Strategy Win Rates')
-                                fig.add_hline(y=10, line_dash="dash", line_color="red",
-                                            annotation_text="Random (10%)")
-                                st.plotly_chart(fig, use_container_width=True)
-                                
-                                st.dataframe(results_df, use_container_width=True)
-                                st.info("**Note**: Random probability is 10% (1/10). Strategies above this line perform better than random.")
-                            else:
-                                st.error("No data available for backtesting.")
+                            st.markdown("### Lucky Number Strategy Performance")
+                            
+                            results_df = pd.DataFrame([
+                                {
+                                    'Strategy': strategy,
+                                    'Predictions': data['predictions'],
+                                    'Matches': data['matches'],
+                                    'Win Rate (%)': data['win_rate'],
+                                    'Expected Random (%)': data['expected_random']
+                                }
+                                for strategy, data in results.items()
+                            ])
+                            results_df = results_df.sort_values('Win Rate (%)', ascending=False)
+                            
+                            best = results_df.iloc[0]
+                            st.success(f"🏆 **Best Lucky Strategy: {best['Strategy']}** with {best['Win Rate (%)']}% win rate")
+                            
+                            fig = px.bar(results_df, x='Strategy', y='Win Rate (%)',
+                                       color='Win Rate (%)', color_continuous_scale='Greens',
+                                       title='Lucky Number Strategy Win Rates')
+                            fig.add_hline(y=10, line_dash="dash", line_color="red",
+                                        annotation_text="Random (10%)")
+                            st.plotly_chart(fig, use_container_width=True)
+                            
+                            st.dataframe(results_df, use_container_width=True)
+                            st.info("**Note**: Random probability is 10% (1/10). Strategies above this line perform better than random.")
+                        else:
+                            st.error("No data available for backtesting.")
                     except Exception as e:
                         st.error(f"Error running lucky backtest: {str(e)}")
             
@@ -2680,32 +2676,31 @@ def main():
                     try:
                         from src.core.lucky_number_strategies import LuckyNumberStrategies
                         
-                        conn = get_db_connection()
-                        if conn:
-                            loto_data = pd.read_sql("SELECT * FROM french_loto_drawings ORDER BY date", conn)
+                        # Oldest draw first
+                        loto_data = get_french_loto_drawings().iloc[::-1].reset_index(drop=True)
+                        
+                        if not loto_data.empty:
+                            strategies = LuckyNumberStrategies(loto_data)
                             
-                            if not loto_data.empty:
-                                strategies = LuckyNumberStrategies(loto_data)
-                                
-                                st.markdown("### Generated Lucky Numbers by Strategy")
-                                
-                                strategy_names = ['frequency', 'balanced', 'contrarian', 'time_series', 
-                                                'hot_cold', 'range_balanced', 'weighted_random']
-                                
-                                cols = st.columns(len(strategy_names))
-                                for i, strat in enumerate(strategy_names):
-                                    with cols[i]:
-                                        result = strategies.generate(strat)
-                                        st.metric(
-                                            label=strat.replace('_', ' ').title(),
-                                            value=result['lucky_number'],
-                                            delta=f"Score: {result['score']:.0f}"
-                                        )
-                                
-                                stats = strategies.get_statistics()
-                                with st.expander("📊 Lucky Number Statistics"):
-                                    st.write("**Most Frequent:**", [f"{n}: {f} times" for n, f in stats['most_frequent']])
-                                    st.write("**Least Frequent:**", [f"{n}: {f} times" for n, f in stats['least_frequent']])
+                            st.markdown("### Generated Lucky Numbers by Strategy")
+                            
+                            strategy_names = ['frequency', 'balanced', 'contrarian', 'time_series', 
+                                            'hot_cold', 'range_balanced', 'weighted_random']
+                            
+                            cols = st.columns(len(strategy_names))
+                            for i, strat in enumerate(strategy_names):
+                                with cols[i]:
+                                    result = strategies.generate(strat)
+                                    st.metric(
+                                        label=strat.replace('_', ' ').title(),
+                                        value=result['lucky_number'],
+                                        delta=f"Score: {result['score']:.0f}"
+                                    )
+                            
+                            stats = strategies.get_statistics()
+                            with st.expander("📊 Lucky Number Statistics"):
+                                st.write("**Most Frequent:**", [f"{n}: {f} times" for n, f in stats['most_frequent']])
+                                st.write("**Least Frequent:**", [f"{n}: {f} times" for n, f in stats['least_frequent']])
                     except Exception as e:
                         st.error(f"Error generating lucky numbers: {str(e)}")
         
@@ -2843,51 +2838,50 @@ def main():
                     try:
                         from src.core.lucky_number_strategies import StarStrategies, backtest_star_strategies
                         
-                        conn = get_db_connection()
-                        if conn:
-                            euro_data = pd.read_sql("SELECT * FROM euromillions_drawings ORDER BY date", conn)
+                        # Oldest draw first
+                        euro_data = get_all_drawings().iloc[::-1].reset_index(drop=True)
+                        
+                        if not euro_data.empty:
+                            results = backtest_star_strategies(euro_data, test_size=0.3)
                             
-                            if not euro_data.empty:
-                                results = backtest_star_strategies(euro_data, test_size=0.3)
-                                
-                                st.markdown("### Star Strategy Performance")
-                                
-                                results_df = pd.DataFrame([
-                                    {
-                                        'Strategy': strategy,
-                                        'Predictions': data['predictions'],
-                                        'Full Matches (2/2)': data['full_matches'],
-                                        'Partial (1/2)': data['partial_matches'],
-                                        'Full Match Rate (%)': data['full_match_rate'],
-                                        'Partial Rate (%)': data['partial_match_rate'],
-                                        'Expected Random (%)': data['expected_random_full']
-                                    }
-                                    for strategy, data in results.items()
-                                ])
-                                results_df = results_df.sort_values('Full Match Rate (%)', ascending=False)
-                                
-                                best = results_df.iloc[0]
-                                st.success(f"🏆 **Best Star Strategy: {best['Strategy']}** with {best['Full Match Rate (%)']}% full match rate")
-                                
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    fig = px.bar(results_df, x='Strategy', y='Full Match Rate (%)',
-                                               color='Full Match Rate (%)', color_continuous_scale='Blues',
-                                               title='Full Star Match Rates (2/2)')
-                                    fig.add_hline(y=1.52, line_dash="dash", line_color="red",
-                                                annotation_text="Random (1.52%)")
-                                    st.plotly_chart(fig, use_container_width=True)
-                                
-                                with col2:
-                                    fig = px.bar(results_df, x='Strategy', y='Partial Rate (%)',
-                                               color='Partial Rate (%)', color_continuous_scale='Oranges',
-                                               title='Partial Match Rates (1/2)')
-                                    st.plotly_chart(fig, use_container_width=True)
-                                
-                                st.dataframe(results_df, use_container_width=True)
-                                st.info("**Note**: Random probability for 2/2 stars is 1.52% (1/66). Strategies above this perform better than random.")
-                            else:
-                                st.error("No data available for backtesting.")
+                            st.markdown("### Star Strategy Performance")
+                            
+                            results_df = pd.DataFrame([
+                                {
+                                    'Strategy': strategy,
+                                    'Predictions': data['predictions'],
+                                    'Full Matches (2/2)': data['full_matches'],
+                                    'Partial (1/2)': data['partial_matches'],
+                                    'Full Match Rate (%)': data['full_match_rate'],
+                                    'Partial Rate (%)': data['partial_match_rate'],
+                                    'Expected Random (%)': data['expected_random_full']
+                                }
+                                for strategy, data in results.items()
+                            ])
+                            results_df = results_df.sort_values('Full Match Rate (%)', ascending=False)
+                            
+                            best = results_df.iloc[0]
+                            st.success(f"🏆 **Best Star Strategy: {best['Strategy']}** with {best['Full Match Rate (%)']}% full match rate")
+                            
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                fig = px.bar(results_df, x='Strategy', y='Full Match Rate (%)',
+                                           color='Full Match Rate (%)', color_continuous_scale='Blues',
+                                           title='Full Star Match Rates (2/2)')
+                                fig.add_hline(y=1.52, line_dash="dash", line_color="red",
+                                            annotation_text="Random (1.52%)")
+                                st.plotly_chart(fig, use_container_width=True)
+                            
+                            with col2:
+                                fig = px.bar(results_df, x='Strategy', y='Partial Rate (%)',
+                                           color='Partial Rate (%)', color_continuous_scale='Oranges',
+                                           title='Partial Match Rates (1/2)')
+                                st.plotly_chart(fig, use_container_width=True)
+                            
+                            st.dataframe(results_df, use_container_width=True)
+                            st.info("**Note**: Random probability for 2/2 stars is 1.52% (1/66). Strategies above this perform better than random.")
+                        else:
+                            st.error("No data available for backtesting.")
                     except Exception as e:
                         st.error(f"Error running star backtest: {str(e)}")
             
@@ -2896,33 +2890,32 @@ def main():
                     try:
                         from src.core.lucky_number_strategies import StarStrategies
                         
-                        conn = get_db_connection()
-                        if conn:
-                            euro_data = pd.read_sql("SELECT * FROM euromillions_drawings ORDER BY date", conn)
+                        # Oldest draw first
+                        euro_data = get_all_drawings().iloc[::-1].reset_index(drop=True)
+                        
+                        if not euro_data.empty:
+                            strategies = StarStrategies(euro_data)
                             
-                            if not euro_data.empty:
-                                strategies = StarStrategies(euro_data)
-                                
-                                st.markdown("### Generated Stars by Strategy")
-                                
-                                strategy_names = ['frequency', 'balanced', 'contrarian', 'range_balanced', 
-                                                'pair_frequency', 'markov', 'time_series', 'weighted_random']
-                                
-                                for row in range(2):
-                                    cols = st.columns(4)
-                                    for i, strat in enumerate(strategy_names[row*4:(row+1)*4]):
-                                        with cols[i]:
-                                            result = strategies.generate(strat)
-                                            st.metric(
-                                                label=strat.replace('_', ' ').title(),
-                                                value=f"{result['stars'][0]}, {result['stars'][1]}",
-                                                delta=f"Score: {result['score']:.0f}"
-                                            )
-                                
-                                stats = strategies.get_statistics()
-                                with st.expander("📊 Star Statistics"):
-                                    st.write("**Most Frequent Stars:**", [f"⭐{s}: {f} times" for s, f in stats['most_frequent']])
-                                    st.write("**Most Common Pairs:**", [f"({p[0]}, {p[1]}): {f} times" for p, f in stats['most_common_pairs'][:5]])
+                            st.markdown("### Generated Stars by Strategy")
+                            
+                            strategy_names = ['frequency', 'balanced', 'contrarian', 'range_balanced', 
+                                            'pair_frequency', 'markov', 'time_series', 'weighted_random']
+                            
+                            for row in range(2):
+                                cols = st.columns(4)
+                                for i, strat in enumerate(strategy_names[row*4:(row+1)*4]):
+                                    with cols[i]:
+                                        result = strategies.generate(strat)
+                                        st.metric(
+                                            label=strat.replace('_', ' ').title(),
+                                            value=f"{result['stars'][0]}, {result['stars'][1]}",
+                                            delta=f"Score: {result['score']:.0f}"
+                                        )
+                            
+                            stats = strategies.get_statistics()
+                            with st.expander("📊 Star Statistics"):
+                                st.write("**Most Frequent Stars:**", [f"⭐{s}: {f} times" for s, f in stats['most_frequent']])
+                                st.write("**Most Common Pairs:**", [f"({p[0]}, {p[1]}): {f} times" for p, f in stats['most_common_pairs'][:5]])
                     except Exception as e:
                         st.error(f"Error generating stars: {str(e)}")
 
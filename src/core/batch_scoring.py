@@ -0,0 +1,284 @@
+"""
+Batch scoring of tickets with the strategies' scoring functions.
+
+``score_batch(tickets, scorer_spec, bonus)`` computes, for a whole (N, 5)
+array of tickets and their bonus numbers, the score one of the per-ticket
+scoring functions of the platform would give each ticket:
+
+- ``'french_loto'``: ``FrenchLotoStrategy._calculate_combination_score``
+- ``'probability'``: ``utils.calculate_probability_score``
+- ``'markov'``: ``utils.calculate_markov_score``
+- ``'fibonacci'``: the hybrid score of ``EnsembleStrategies._apply_fibonacci_filtering``
+- ``'coverage'``: the score of ``PredictionStrategies.coverage_strategy``
+- ``'cognitive_bias'``: the score of ``PredictionStrategies.cognitive_bias_strategy``
+
+The spec is a dict with the scorer ``'name'`` and the data the scalar
+version reads (frequencies, hot numbers, transition matrix...). Sums run
+over the ticket columns in order and scores rounded to 2 decimals are
+rounded the way the scalar version rounds them: ``round`` on the NumPy
+floats of the utils scorers follows NumPy, on the strategies' Python
+floats it follows Python. The results are identical to the scalar
+versions, not merely close.
+"""
+
+import numpy as np
+
+from src.core.ticket_space import ticket_features
+
+# French Loto range-distribution bonus by covered thirds
+# (ticket_features 'zones': 4 low, 2 middle, 1 high)
+_ZONE_SCORES = np.array([0, 0, 0, 4, 0, 0, 4, 8])
+
+
+def _lookup_table(values, size):
+    """Array ``table[n] = values[n]`` for n in 0..size - 1 from a dict or Series (0 where missing)."""
+    table = np.zeros(size)
+    if values is not None:
+        for key, value in values.items():
+            if 0 <= int(key) < size:
+                table[int(key)] = value
+    return table
+
+
+def _column_sum(values):
+    """Row sums added column by column, in the order of Python's sum()."""
+    total = np.zeros(values.shape[:-1])
+    for column in range(values.shape[-1]):
+        total += values[..., column]
+    return total
+
+
+def _round2(values):
+    """Round to 2 decimals exactly like Python's round(value, 2)."""
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    # Near a half, the float product may round the other way than the exact decimal value
+    unsure = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if unsure.any():
+        rounded[unsure] = [round(v, 2) for v in values[unsure].tolist()]
+    return rounded
+
+
+def _round2_numpy(values):
+    """Round to 2 decimals like round() on a NumPy float, i.e. rint(value * 100) / 100."""
+    return np.rint(np.asarray(values, dtype=np.float64) * 100) / 100
+
+
+def _french_loto_scores(numbers, lucky, spec):
+    """Scores of FrenchLotoStrategy._calculate_combination_score; see score_batch."""
+    features = ticket_features(numbers, 49)
+    score = np.full(len(numbers), 50.0)  # Base score
+
+    # Hot numbers
+    score += np.isin(numbers, list(spec.get('hot_numbers', ()))).sum(axis=1) * 8
+
+    # Historical frequency
+    if spec.get('main_freq') is not None:
+        freq = _lookup_table(spec['main_freq'], 50)
+        avg_freq = _column_sum(freq[np.clip(numbers, 0, 49)]) / 5
+        score += np.minimum(avg_freq * 0.5, 15)
+
+    # Even/odd balance, range distribution and sum range
+    score += np.where((features['even'] >= 2) & (features['even'] <= 3), 5, 0)
+    score += _ZONE_SCORES[features['zones']]
+    total_sum = features['sum']
+    score += np.where((total_sum >= 100) & (total_sum <= 150), 5,
+                      np.where((total_sum >= 80) & (total_sum <= 170), 2, 0))
+
+    # Consecutive pairs, in the order the numbers are given (added last)
+    consecutive = features['consecutive']
+    consecutive_score = np.where(consecutive <= 1, 3, np.where(consecutive > 2, -5, 0))
+    if lucky.ndim == 2:
+        score = score[:, np.newaxis]
+        consecutive_score = consecutive_score[:, np.newaxis]
+
+    # Lucky number frequency and hot lucky numbers
+    if spec.get('lucky_freq') is not None:
+        lucky_freq = _lookup_table(spec['lucky_freq'], 11)
+        score = score + np.minimum(lucky_freq[np.clip(lucky, 0, 10)] * 0.3, 10)
+    score = score + np.where(np.isin(lucky, list(spec.get('hot_lucky', ()))), 5, 0)
+
+    score = score + consecutive_score
+    return np.clip(score, 0, 100)
+
+
+def _probability_scores(numbers, stars, spec):
+    """Scores of utils.calculate_probability_score; see score_batch."""
+    number_freq = _lookup_table(spec['number_freq'], 51)
+    star_freq = _lookup_table(spec['star_freq'], 13)
+    num_avg_freq = _column_sum(number_freq[numbers]) / numbers.shape[1]
+    star_avg_freq = _column_sum(star_freq[stars]) / stars.shape[1]
+    combined_score = (0.7 * num_avg_freq) + (0.3 * star_avg_freq)
+    return _round2_numpy(combined_score * 100)
+
+
+def _markov_scores(numbers, stars, spec):
+    """Scores of utils.calculate_markov_score; see score_batch."""
+    matrix = spec['transition_matrix']
+    size = int(max(max(matrix.index), max(matrix.columns))) + 1
+    table = np.zeros((size, size))
+    table[np.ix_(np.asarray(matrix.index, dtype=np.int64), np.asarray(matrix.columns, dtype=np.int64))] = matrix.values
+
+    ordered = np.sort(numbers, axis=1)
+    transition_probs = table[ordered[:, :-1], ordered[:, 1:]]
+    avg_prob = _column_sum(transition_probs) / transition_probs.shape[1]
+    return _round2_numpy(avg_prob * 100)
+
+
+def _contains(values, number):
+    """Rows of a 2-D array that contain the number."""
+    return (values == number).any(axis=1)
+
+
+def fibonacci_boosts(numbers, stars, fibonacci_numbers):
+    """
+    Fibonacci count and boosts of the ensemble's Fibonacci filtering.
+
+    Parameters:
+    -----------
+    numbers : numpy.ndarray
+        (N, 5) main numbers
+    stars : numpy.ndarray
+        (N, 2) stars
+    fibonacci_numbers : iterable of int
+        Fibonacci numbers in range
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        (fibonacci count, fibonacci boost, star boost), one entry per ticket
+    """
+    fib_count = np.isin(numbers, list(fibonacci_numbers)).sum(axis=1)
+    fib_percentage = fib_count / 5 * 100
+
+    # Fibonacci presence, then specific patterns
+    fibonacci_boost = np.select([fib_percentage >= 60, fib_percentage >= 40, fib_percentage >= 20], [25, 15, 8], 0)
+    fibonacci_boost += np.where(_contains(numbers, 1) & _contains(numbers, 8), 10, 0)
+    fibonacci_boost += np.where(_contains(numbers, 13), 8, 0)
+    fibonacci_boost += np.where(_contains(numbers, 21), 5, 0)
+
+    # Common winning stars
+    star_boost = (np.where(_contains(stars, 5), 5, 0) + np.where(_contains(stars, 6), 5, 0)
+                  + np.where(_contains(stars, 8), 3, 0))
+    return fib_count, fibonacci_boost, star_boost
+
+
+def fibonacci_hybrid_scores(base_scores, fibonacci_boost, star_boost):
+    """
+    Hybrid scores from base scores and the boosts of fibonacci_boosts.
+
+    Parameters:
+    -----------
+    base_scores : float or array-like
+        Score of each ticket before filtering
+    fibonacci_boost, star_boost : numpy.ndarray
+        Boosts returned by fibonacci_boosts
+
+    Returns:
+    --------
+    numpy.ndarray
+        Scores capped at 100
+    """
+    base_scores = np.broadcast_to(np.asarray(base_scores, dtype=np.float64), np.shape(fibonacci_boost))
+    return np.minimum(base_scores + fibonacci_boost + star_boost, 100.0)
+
+
+def _fibonacci_scores(numbers, stars, spec):
+    """Hybrid scores of EnsembleStrategies._apply_fibonacci_filtering; see score_batch."""
+    _, fibonacci_boost, star_boost = fibonacci_boosts(numbers, stars, spec['fibonacci_numbers'])
+    return fibonacci_hybrid_scores(spec.get('base_scores', 50), fibonacci_boost, star_boost)
+
+
+def _covered_counts(values):
+    """Distinct values seen in rows 0..i, for every row i."""
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    first_rows = np.full(values.max() + 1, len(values))
+    np.minimum.at(first_rows, values.ravel(), np.repeat(np.arange(len(values)), values.shape[1]))
+    return np.cumsum(np.bincount(first_rows[first_rows < len(values)], minlength=len(values)))
+
+
+def _coverage_scores(numbers, stars, spec):
+    """Scores of PredictionStrategies.coverage_strategy; see score_batch."""
+    number_freq = _lookup_table(spec['number_freq'], 51)
+    star_freq = _lookup_table(spec['star_freq'], 13)
+
+    # Coverage of the tickets generated so far
+    num_coverage = _covered_counts(numbers) / 50
+    star_coverage = _covered_counts(stars) / 12
+
+    freq_score = (_column_sum(number_freq[numbers]) / 5 + _column_sum(star_freq[stars]) / 2) / 2
+
+    # Coverage weighs more in later tickets
+    coverage_weight = np.minimum(0.2 + (np.arange(len(numbers)) * 0.15), 0.8)
+    freq_weight = 1 - coverage_weight
+    return _round2((coverage_weight * (num_coverage + star_coverage) / 2 + freq_weight * freq_score) * 100)
+
+
+def _cognitive_bias_scores(numbers, stars, spec):
+    """Scores of PredictionStrategies.cognitive_bias_strategy; see score_batch."""
+    features = ticket_features(np.sort(numbers, axis=1), 50)
+    num_sum = features['sum']
+
+    # Sums that are not "nice" round numbers
+    sum_score = np.full(len(numbers), 0.5)
+    sum_score += np.where(num_sum % 10 != 0, 0.15, 0)
+    sum_score += np.where(num_sum % 5 != 0, 0.1, 0)
+
+    # No consecutive numbers, and a 2/3 or 3/2 low/high split
+    pattern_score = np.where(features['consecutive'] == 0, 0.2 + 0.15, 0.2)
+    distribution_score = np.where((features['low'] == 2) | (features['low'] == 3), 0.0 + 0.2, 0.0)
+    return _round2((sum_score + pattern_score + distribution_score) / 1.3 * 100)
+
+
+SCORERS = {
+    'french_loto': _french_loto_scores,
+    'probability': _probability_scores,
+    'markov': _markov_scores,
+    'fibonacci': _fibonacci_scores,
+    'coverage': _coverage_scores,
+    'cognitive_bias': _cognitive_bias_scores,
+}
+
+
+def score_batch(tickets, scorer_spec, bonus=None):
+    """
+    Score many tickets at once with one of the strategies' scoring functions.
+
+    Parameters:
+    -----------
+    tickets : array-like
+        (N, 5) main numbers, one ticket per row
+    scorer_spec : dict
+        ``'name'`` of the scorer (a key of SCORERS) and its data:
+
+        - ``'french_loto'``: ``main_freq`` and ``lucky_freq`` dicts (None to
+          skip the frequency factors), ``hot_numbers``, ``hot_lucky``
+        - ``'probability'``: ``number_freq`` and ``star_freq``, indexed by number
+        - ``'markov'``: ``transition_matrix`` DataFrame indexed by number
+        - ``'fibonacci'``: ``fibonacci_numbers`` and ``base_scores`` (scalar
+          or (N,), default 50)
+        - ``'coverage'``: ``number_freq`` and ``star_freq``; the tickets are
+          taken in generation order, since coverage accumulates
+        - ``'cognitive_bias'``: nothing
+    bonus : array-like, optional
+        (N, 2) stars or (N,) lucky numbers. For 'french_loto' a (1, m) array
+        scores every ticket with each of m lucky numbers.
+
+    Returns:
+    --------
+    numpy.ndarray
+        (N,) scores ((N, m) for a (1, m) lucky array)
+    """
+    name = scorer_spec.get('name')
+    if name not in SCORERS:
+        raise ValueError(f"Unknown scorer '{name}', expected one of {list(SCORERS)}")
+
+    numbers = np.asarray(tickets, dtype=np.int64).reshape(-1, 5)
+    bonus = np.zeros((len(numbers), 0), dtype=np.int64) if bonus is None else np.asarray(bonus, dtype=np.int64)
+    if name != 'french_loto':
+        bonus = bonus.reshape(len(numbers), -1) if bonus.size else np.zeros((len(numbers), 0), dtype=np.int64)
+    elif bonus.ndim != 2:
+        bonus = bonus.reshape(-1)
+    return SCORERS[name](numbers, bonus, scorer_spec)
@@ -0,0 +1,132 @@
+"""
+Bitmask encoding of tickets and draws.
+
+Number k sets bit ``k - 1``: main numbers (up to 50) fit in a uint64 and
+bonus numbers (stars 1-12, lucky 1-10) in a uint16. The number of matches
+between a ticket and a draw is then ``popcount(ticket & draw)``.
+Values outside the mask width (0 for missing, or old lucky numbers above 16)
+set no bit, so they never match.
+"""
+
+import numpy as np
+
+# Upper bound on the (tickets x draws) block ANDed at once in match_counts
+_BLOCK_CELLS = 1 << 16
+
+
+def to_mask(numbers):
+    """
+    Bitmask of one ticket as a Python int.
+
+    Parameters:
+    -----------
+    numbers : int or iterable of int
+        Numbers of the ticket (a single lucky number is accepted)
+
+    Returns:
+    --------
+    int
+        Mask with bit ``n - 1`` set for each number n >= 1
+    """
+    if np.isscalar(numbers):
+        numbers = [numbers]
+    mask = 0
+    for n in numbers:
+        n = int(n)
+        if n >= 1:
+            mask |= 1 << (n - 1)
+    return mask
+
+
+def count_matches(mask_a, mask_b):
+    """Number of numbers shared by two masks built with to_mask."""
+    return (mask_a & mask_b).bit_count()
+
+
+def _to_masks(values, dtype):
+    """Row-wise bitmasks of a 2-D array of numbers."""
+    values = np.asarray(values, dtype=np.int64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    width = np.dtype(dtype).itemsize * 8
+    valid = (values >= 1) & (values <= width)
+    shifts = np.where(valid, values - 1, 0).astype(dtype)
+    bits = np.where(valid, np.left_shift(dtype(1), shifts), dtype(0)).astype(dtype)
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def numbers_to_masks(numbers):
+    """
+    uint64 masks of the main numbers of many tickets or draws.
+
+    Parameters:
+    -----------
+    numbers : array-like of shape (n, k)
+        One row of numbers per ticket
+
+    Returns:
+    --------
+    numpy.ndarray
+        uint64 array of shape (n,)
+    """
+    return _to_masks(numbers, np.uint64)
+
+
+def bonus_to_masks(bonus):
+    """
+    uint16 masks of the bonus numbers (stars or lucky number).
+
+    Parameters:
+    -----------
+    bonus : array-like of shape (n,) or (n, k)
+        Bonus numbers of each ticket or draw
+
+    Returns:
+    --------
+    numpy.ndarray
+        uint16 array of shape (n,)
+    """
+    return _to_masks(bonus, np.uint16)
+
+
+def draw_masks(draws):
+    """
+    Masks of every draw of a DrawMatrix.
+
+    Parameters:
+    -----------
+    draws : DrawMatrix
+        Draw history
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        (number masks, bonus masks), one entry per draw
+    """
+    return numbers_to_masks(draws.numbers), bonus_to_masks(draws.bonus)
+
+
+def match_counts(ticket_masks, draw_masks):
+    """
+    Number of matches of every ticket against every draw.
+
+    Parameters:
+    -----------
+    ticket_masks : numpy.ndarray
+        Masks of the tickets, shape (n_tickets,)
+    draw_masks : numpy.ndarray
+        Masks of the draws, same dtype, shape (n_draws,)
+
+    Returns:
+    --------
+    numpy.ndarray
+        uint8 array of shape (n_tickets, n_draws)
+    """
+    ticket_masks = np.asarray(ticket_masks)
+    draw_masks = np.asarray(draw_masks)
+    counts = np.empty((len(ticket_masks), len(draw_masks)), dtype=np.uint8)
+    step = max(1, _BLOCK_CELLS // max(1, len(draw_masks)))
+    for start in range(0, len(ticket_masks), step):
+        block = ticket_masks[start:start + step, np.newaxis] & draw_masks[np.newaxis, :]
+        counts[start:start + step] = np.bitwise_count(block)
+    return counts
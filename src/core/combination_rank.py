@@ -0,0 +1,188 @@
+"""
+Combinatorial ranks for lottery tickets.
+
+A sorted k-subset of {1..N} is encoded by its colexicographic rank
+``sum(C(c_i - 1, i))`` for i = 1..k. The rank of a set does not depend on N,
+so 5-of-50 (Euromillions) and 5-of-49 (French Loto) tickets share the same
+encoding and every rank fits in an int32 (C(50, 5) = 2,118,760).
+
+Bonus numbers are ranked the same way (a star pair in 0..65, a lucky number
+in 0..9), and ``ticket_codes`` packs both ranks of a ticket into one int32,
+``numbers_rank * BONUS_SLOTS + bonus_rank``. The array functions rank and
+unrank whole batches of tickets at once, so duplicates and repeats can be
+found with ``np.unique`` or ``np.isin`` over plain integers.
+"""
+
+import numpy as np
+
+# Largest pool size the rank tables cover (Euromillions main numbers)
+MAX_POOL = 50
+
+# Bonus ranks per main-number rank in a ticket code: C(12, 2) star pairs,
+# enough for the 10 French Loto lucky numbers too (C(50, 5) * 66 < 2**31)
+BONUS_SLOTS = 66
+
+# _BINOM[n, k] = C(n, k) for 0 <= n <= MAX_POOL, 0 <= k <= 5
+_BINOM = np.zeros((MAX_POOL + 1, 6), dtype=np.int64)
+_BINOM[:, 0] = 1
+for _n in range(1, MAX_POOL + 1):
+    _BINOM[_n, 1:] = _BINOM[_n - 1, 1:] + _BINOM[_n - 1, :-1]
+
+
+def rank_combination(numbers):
+    """
+    Colex rank of one set of numbers.
+
+    Parameters:
+    -----------
+    numbers : iterable of int
+        Distinct numbers in 1..MAX_POOL, in any order
+
+    Returns:
+    --------
+    int
+        Rank in ``0 .. C(max(numbers), len(numbers)) - 1``
+    """
+    values = sorted(int(n) for n in numbers)
+    if len(set(values)) != len(values) or not values or values[0] < 1 or values[-1] > MAX_POOL:
+        raise ValueError(f"Invalid combination: {list(numbers)}")
+    return int(sum(_BINOM[c - 1, i] for i, c in enumerate(values, start=1)))
+
+
+def unrank_combination(rank, k=5):
+    """
+    Numbers of the k-subset with the given colex rank.
+
+    Parameters:
+    -----------
+    rank : int
+        Colex rank as returned by rank_combination
+    k : int
+        Size of the subset
+
+    Returns:
+    --------
+    list of int
+        Sorted numbers
+    """
+    rank = int(rank)
+    numbers = []
+    for i in range(k, 0, -1):
+        # Largest c with C(c, i) <= rank; column i is increasing in c
+        c = int(np.searchsorted(_BINOM[:, i], rank, side='right')) - 1
+        numbers.append(c + 1)
+        rank -= int(_BINOM[c, i])
+    return numbers[::-1]
+
+
+def rank_ticket(numbers, bonus):
+    """
+    Storage key of a ticket: (numbers rank, bonus index).
+
+    The bonus index is the colex rank of the bonus numbers, so a single
+    French Loto lucky number maps to ``lucky - 1`` and a pair of Euromillions
+    stars to a value in 0..65.
+
+    Parameters:
+    -----------
+    numbers : iterable of int
+        Five main numbers
+    bonus : int or iterable of int
+        Lucky number or stars
+
+    Returns:
+    --------
+    tuple of (int, int)
+        Main-number rank and bonus index
+    """
+    if np.isscalar(bonus):
+        bonus = [bonus]
+    return rank_combination(numbers), rank_combination(bonus)
+
+
+def rank_combinations(numbers):
+    """
+    Colex ranks of many sets of numbers at once.
+
+    Parameters:
+    -----------
+    numbers : array-like
+        (n, k) distinct numbers in 1..MAX_POOL per row, in any order
+
+    Returns:
+    --------
+    numpy.ndarray
+        (n,) int32 ranks
+    """
+    values = np.sort(np.asarray(numbers, dtype=np.int64).reshape(len(numbers), -1), axis=1)
+    k = values.shape[1]
+    if values.size and (values[:, 0].min() < 1 or values[:, -1].max() > MAX_POOL
+                        or (k > 1 and (np.diff(values, axis=1) == 0).any())):
+        raise ValueError(f"Invalid combinations: numbers must be distinct and within 1..{MAX_POOL}")
+    return _BINOM[values - 1, np.arange(1, k + 1)].sum(axis=1).astype(np.int32)
+
+
+def unrank_combinations(ranks, k=5):
+    """
+    Numbers of the k-subsets with the given colex ranks.
+
+    Parameters:
+    -----------
+    ranks : array-like
+        Colex ranks as returned by rank_combinations
+    k : int
+        Size of the subsets
+
+    Returns:
+    --------
+    numpy.ndarray
+        (n, k) int64 sorted numbers
+    """
+    ranks = np.asarray(ranks, dtype=np.int64).ravel().copy()
+    numbers = np.empty((len(ranks), k), dtype=np.int64)
+    for i in range(k, 0, -1):
+        c = np.searchsorted(_BINOM[:, i], ranks, side='right') - 1
+        numbers[:, i - 1] = c + 1
+        ranks -= _BINOM[c, i]
+    return numbers
+
+
+def ticket_codes(numbers, bonus):
+    """
+    One int32 code per ticket from its main and bonus numbers.
+
+    Parameters:
+    -----------
+    numbers : array-like
+        (n, 5) main numbers
+    bonus : array-like
+        (n, 2) stars, or (n,) / (n, 1) lucky numbers
+
+    Returns:
+    --------
+    numpy.ndarray
+        (n,) int32 codes ``numbers_rank * BONUS_SLOTS + bonus_rank``
+    """
+    bonus = np.asarray(bonus)
+    bonus = bonus.reshape(len(bonus), -1)
+    return rank_combinations(numbers) * np.int32(BONUS_SLOTS) + rank_combinations(bonus)
+
+
+def split_ticket_codes(codes, bonus_count=2):
+    """
+    Main and bonus numbers of ticket codes built by ticket_codes.
+
+    Parameters:
+    -----------
+    codes : array-like
+        Ticket codes
+    bonus_count : int
+        Bonus numbers per ticket (2 stars or 1 lucky number)
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        (n, 5) main numbers and (n, bonus_count) bonus numbers
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    return unrank_combinations(codes // BONUS_SLOTS, 5), unrank_combinations(codes % BONUS_SLOTS, bonus_count)
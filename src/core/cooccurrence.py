@@ -0,0 +1,181 @@
+"""
+Co-occurrence counts of numbers drawn together, computed with matrix products.
+
+With X the one-hot occurrence matrix of a DrawMatrix, ``X.T @ X`` counts
+how often every pair of main numbers was drawn together; the same product
+on the bonus matrix gives the star pairs and ``X.T @ B`` the number x bonus
+joint table. Larger subsets (triplets and up) are counted sparsely with
+``np.unique`` over encoded keys. A CoOccurrence is built once per DrawMatrix
+(see ``DrawMatrix.cooccurrence``) and shared by the statistics, the
+recommendations and the heatmap.
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+
+def top_k_upper(matrix, count=20):
+    """
+    Largest entries above the diagonal of a symmetric count matrix.
+
+    Parameters:
+    -----------
+    matrix : numpy.ndarray
+        (n, n) counts, row/column k standing for number k + 1
+    count : int
+        Number of entries to return
+
+    Returns:
+    --------
+    dict
+        {(a, b): count} with a < b, most frequent first (ties by (a, b)),
+        zero counts omitted
+    """
+    rows, cols = np.triu_indices(matrix.shape[0], k=1)
+    values = matrix[rows, cols]
+    order = np.argsort(-values, kind='stable')[:count]
+    return {
+        (int(rows[i]) + 1, int(cols[i]) + 1): int(values[i])
+        for i in order if values[i] > 0
+    }
+
+
+class CoOccurrence:
+    """
+    Pair, bonus-pair, number x bonus and subset counts of one draw history.
+
+    All results are computed on first use and kept on the instance.
+    """
+
+    def __init__(self, draws):
+        """
+        Initialize from a DrawMatrix.
+
+        Parameters:
+        -----------
+        draws : DrawMatrix
+            Draw history to count
+        """
+        self.draws = draws
+        self.max_number = draws.max_number
+        self.max_bonus = draws.max_bonus
+        self._pair_matrix = None
+        self._bonus_pair_matrix = None
+        self._number_bonus_matrix = None
+        self._subsets = {}
+
+    @property
+    def pair_matrix(self):
+        """(max_number, max_number) int32 pair counts with a zero diagonal"""
+        if self._pair_matrix is None:
+            x = self.draws.occurrence.astype(np.int32)
+            self._pair_matrix = x.T @ x
+            np.fill_diagonal(self._pair_matrix, 0)
+        return self._pair_matrix
+
+    @property
+    def bonus_pair_matrix(self):
+        """(max_bonus, max_bonus) int32 counts of bonus balls drawn together (star pairs)"""
+        if self._bonus_pair_matrix is None:
+            b = self.draws.bonus_occurrence.astype(np.int32)
+            self._bonus_pair_matrix = b.T @ b
+            np.fill_diagonal(self._bonus_pair_matrix, 0)
+        return self._bonus_pair_matrix
+
+    @property
+    def number_bonus_matrix(self):
+        """(max_number, max_bonus) int32 counts of each main number drawn with each bonus ball"""
+        if self._number_bonus_matrix is None:
+            x = self.draws.occurrence.astype(np.int32)
+            self._number_bonus_matrix = x.T @ self.draws.bonus_occurrence.astype(np.int32)
+        return self._number_bonus_matrix
+
+    def top_pairs(self, count=20):
+        """Most frequent main-number pairs as {(a, b): count}"""
+        return top_k_upper(self.pair_matrix, count)
+
+    def top_bonus_pairs(self, count=10):
+        """Most frequent bonus pairs (Euromillions star pairs) as {(a, b): count}"""
+        return top_k_upper(self.bonus_pair_matrix, count)
+
+    def top_number_bonus(self, count=20):
+        """
+        Most frequent (number, bonus) combinations.
+
+        Parameters:
+        -----------
+        count : int
+            Number of entries to return
+
+        Returns:
+        --------
+        dict
+            {(number, bonus): count}, most frequent first
+        """
+        values = self.number_bonus_matrix.ravel()
+        order = np.argsort(-values, kind='stable')[:count]
+        width = self.max_bonus
+        return {
+            (int(i // width) + 1, int(i % width) + 1): int(values[i])
+            for i in order if values[i] > 0
+        }
+
+    def subset_counts(self, size=3):
+        """
+        Sparse counts of every subset of main numbers of a given size.
+
+        Parameters:
+        -----------
+        size : int
+            Subset size, 1 to 5
+
+        Returns:
+        --------
+        tuple of numpy.ndarray
+            (subsets, counts): subsets is an (m, size) array of sorted numbers,
+            counts the number of draws containing each one, most frequent
+            first (ties in increasing subset order)
+        """
+        if size not in self._subsets:
+            numbers = np.sort(self.draws.numbers.astype(np.int64), axis=1)
+            numbers = numbers[(numbers > 0).all(axis=1)]  # skip draws with missing numbers
+            columns = list(combinations(range(numbers.shape[1]), size))
+            subsets = numbers[:, columns].reshape(-1, size)
+
+            # Encode each sorted subset as one integer in base (max_number + 1)
+            base = self.max_number + 1
+            keys = subsets @ (base ** np.arange(size - 1, -1, -1, dtype=np.int64))
+            unique_keys, counts = np.unique(keys, return_counts=True)
+            order = np.argsort(-counts, kind='stable')
+            unique_keys, counts = unique_keys[order], counts[order]
+
+            digits = (unique_keys[:, np.newaxis] // base ** np.arange(size - 1, -1, -1)) % base
+            self._subsets[size] = (digits, counts)
+        return self._subsets[size]
+
+    def triplet_counts(self):
+        """Sparse counts of main-number triplets, see subset_counts"""
+        return self.subset_counts(3)
+
+    def top_subsets(self, size=3, count=20):
+        """
+        Most frequent subsets of main numbers.
+
+        Parameters:
+        -----------
+        size : int
+            Subset size, 1 to 5
+        count : int
+            Number of subsets to return
+
+        Returns:
+        --------
+        list of tuple
+            [((a, b, ...), count), ...] like Counter.most_common
+        """
+        subsets, counts = self.subset_counts(size)
+        return [
+            (tuple(int(n) for n in subset), int(c))
+            for subset, c in zip(subsets[:count], counts[:count])
+        ]
@@ -1,15 +1,19 @@
 import os
 import pandas as pd
+import numpy as np
 import time
 import json
 import logging
-import random
+import threading
+import weakref
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Date, Float, Boolean, ForeignKey, Table, MetaData, inspect, UniqueConstraint
+from sqlalchemy import create_engine, Column, Integer, String, Date, Float, Boolean, ForeignKey, Table, MetaData, inspect, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, scoped_session
 from sqlalchemy.pool import QueuePool
-from sqlalchemy import exc
+from sqlalchemy import exc, select, event, insert, update, text, func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.core.combination_rank import rank_combination, unrank_combinations
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -21,11 +25,16 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 # Flag to track if database is available
 DB_AVAILABLE = True
 
-# Constants for exponential backoff (production-grade retry logic)
-MIN_RETRY_DELAY = 0.5  # Starting delay of 0.5 seconds
-MAX_RETRY_DELAY = 10   # Maximum delay of 10 seconds
-BACKOFF_FACTOR = 2     # Multiply delay by this factor for each retry
-JITTER = 0.1           # Add ±10% random jitter to avoid thundering herd
+# Circuit breaker settings: after this many consecutive connection failures,
+# fail fast for the cool-down window instead of waiting on the database again
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_COOLDOWN_SECONDS = 30
+
+# Optional local SQLite replica of the draw tables. When DRAW_REPLICA_PATH is
+# set, drawing reads are served from that file, which is synced incrementally
+# from the primary at most every DRAW_REPLICA_SYNC_INTERVAL seconds.
+DRAW_REPLICA_PATH = os.getenv("DRAW_REPLICA_PATH")
+DRAW_REPLICA_SYNC_INTERVAL = int(os.getenv("DRAW_REPLICA_SYNC_INTERVAL", "300"))
 
 # If no DATABASE_URL is set, try to use local SQLite files
 if not DATABASE_URL:
@@ -85,75 +94,112 @@ except Exception as e:
     # But we can't do this here yet because Base class is defined later in this file
     logger.warning("Running in offline mode with SQLite memory database")
 
+class CircuitBreaker:
+    """
+    Tracks consecutive database connection failures.
+    
+    Once CIRCUIT_FAILURE_THRESHOLD failures happen in a row the circuit opens
+    and new connection attempts fail immediately until the cool-down window
+    has passed. The first attempt after the cool-down is let through; a
+    success closes the circuit, a failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+    
+    def is_open(self):
+        """Return True while the circuit is open and the cool-down has not elapsed"""
+        if self.opened_at is None:
+            return False
+        return time.monotonic() - self.opened_at < self.cooldown
+    
+    def record_failure(self):
+        """Count a connection failure, opening the circuit at the threshold"""
+        if self.is_open():
+            # Refused by the breaker itself; counting it would restart the cool-down
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if not self.is_open():
+                logger.warning(f"Database circuit opened after {self.failures} failures; "
+                               f"failing fast for {self.cooldown} seconds")
+            self.opened_at = time.monotonic()
+    
+    def record_success(self):
+        """Reset the failure count and close the circuit"""
+        if self.opened_at is not None:
+            logger.info("Database circuit closed")
+        self.failures = 0
+        self.opened_at = None
+
+circuit_breaker = CircuitBreaker()
+
+def _install_circuit_breaker(target_engine):
+    """
+    Hook the circuit breaker into an engine's connection events.
+    
+    Connection errors (as classified by the dialect) count as failures,
+    successful checkouts reset the breaker, and while the circuit is open
+    new DBAPI connections are refused immediately with the driver's own
+    OperationalError, so callers take their usual error path without
+    waiting for a connect timeout. Those refusals are not counted as
+    failures, so the cool-down runs from the last real failure.
+    """
+    dbapi = target_engine.dialect.dbapi
+    
+    @event.listens_for(target_engine, "do_connect")
+    def _fail_fast_when_open(dialect, conn_rec, cargs, cparams):
+        if circuit_breaker.is_open():
+            raise dbapi.OperationalError("database circuit open, skipping connection attempt")
+    
+    @event.listens_for(target_engine, "handle_error")
+    def _record_failure(context):
+        if circuit_breaker.is_open():
+            return
+        if context.is_disconnect or isinstance(context.original_exception, dbapi.OperationalError):
+            circuit_breaker.record_failure()
+    
+    @event.listens_for(target_engine, "engine_connect")
+    def _record_success(connection):
+        circuit_breaker.record_success()
+
+_install_circuit_breaker(engine)
+
 # Create a scoped session to manage connections properly
 Session = scoped_session(sessionmaker(bind=engine, autoflush=True, autocommit=False))
 
-# Function to get a fresh session with retry logic
 def get_session(max_retries=3):
     """
-    Get a database session with production-grade retry logic.
+    Get a database session.
 
-    Uses jittered exponential backoff to avoid thundering herd problem
-    and properly handles rate limits.
+    No validation query is issued: stale pooled connections are replaced
+    by the pool's pre-ping on checkout, and failures surface as errors on
+    first use, where the calling helpers retry. While the circuit breaker
+    is open the first query fails immediately instead of blocking.
 
     Args:
-        max_retries: Maximum number of retry attempts
+        max_retries: Kept for compatibility; retries happen in the callers
 
     Returns:
         SQLAlchemy session
     """
-    retries = 0
-    retry_delay = MIN_RETRY_DELAY
-    last_error = None
-    session = None
-
-    while retries < max_retries:
-        try:
-            # Create a new session
-            session = Session()
-            # Test connection with a simple query using text() to properly declare SQL
-            from sqlalchemy import text
-            session.execute(text("SELECT 1"))
-            return session
-        except exc.DBAPIError as e:
-            last_error = e
-            retries += 1
-
-            # Check if it's a rate limit error
-            error_str = str(e).lower()
-            if "rate limit" in error_str or "too many connections" in error_str:
-                logger.warning(f"Database rate limit hit (attempt {retries}/{max_retries})")
-            else:
-                logger.warning(f"Database connection error (attempt {retries}/{max_retries}): {str(e)}")
-
-            # Close the session if it was created
-            if session:
-                session.close()
-
-            # Only retry if we haven't hit max retries
-            if retries < max_retries:
-                # Calculate jittered exponential backoff (±10% jitter)
-                jitter_amount = random.uniform(-JITTER, JITTER) * retry_delay
-                actual_delay = retry_delay + jitter_amount
-                logger.info(f"Retrying in {actual_delay:.2f} seconds...")
-                time.sleep(actual_delay)
-
-                # Exponential backoff (double each time, up to MAX_RETRY_DELAY)
-                retry_delay = min(retry_delay * BACKOFF_FACTOR, MAX_RETRY_DELAY)
-
-    # If we got here, all retries failed
-    logger.error(f"Failed to establish database session after {max_retries} attempts: {str(last_error)}")
-    # Return a session anyway - let the caller handle any exceptions
+    if circuit_breaker.is_open():
+        logger.warning("Database circuit open; session will fail fast until the cool-down ends")
     return Session()
 
 def get_db_connection(max_retries=3):
     """
-    Get a direct database connection from engine with production-grade retry logic.
+    Get a direct database connection from the engine.
 
-    Uses jittered exponential backoff for robust connection handling.
+    Relies on the pool's pre-ping instead of a SELECT 1 round trip and
+    retries immediately on connection errors. Gives up at once while the
+    circuit breaker is open.
 
     Args:
-        max_retries: Maximum number of retry attempts
+        max_retries: Maximum number of connection attempts
 
     Returns:
         SQLAlchemy connection or None if unavailable
@@ -162,42 +208,21 @@ def get_db_connection(max_retries=3):
         logger.error("Database not available")
         return None
 
-    retries = 0
-    retry_delay = MIN_RETRY_DELAY
     last_error = None
-
-    while retries < max_retries:
+    for attempt in range(max_retries):
+        if circuit_breaker.is_open():
+            logger.warning("Database circuit open; not attempting a connection")
+            return None
         try:
-            conn = engine.connect()
-            # Test connection
-            from sqlalchemy import text
-            conn.execute(text("SELECT 1"))
-            return conn
+            return engine.connect()
         except Exception as e:
             last_error = e
-            retries += 1
-
-            # Check if this is a rate limit error
             error_str = str(e).lower()
             if "rate limit" in error_str or "too many connections" in error_str:
-                logger.warning(f"Rate limit hit (attempt {retries}/{max_retries})")
+                logger.warning(f"Rate limit hit (attempt {attempt+1}/{max_retries})")
             else:
-                logger.warning(f"Database connection error (attempt {retries}/{max_retries}): {str(e)}")
-
-            # Close the connection if it was created
-            if 'conn' in locals():
-                conn.close()
-
-            # Only retry if we haven't hit max retries
-            if retries < max_retries:
-                # Calculate jittered exponential backoff
-                jitter_amount = random.uniform(-JITTER, JITTER) * retry_delay
-                actual_delay = retry_delay + jitter_amount
-                logger.info(f"Retrying in {actual_delay:.2f} seconds...")
-                time.sleep(actual_delay)
-                retry_delay = min(retry_delay * BACKOFF_FACTOR, MAX_RETRY_DELAY)
-
-    # If we got here, all retries failed
+                logger.warning(f"Database connection error (attempt {attempt+1}/{max_retries}): {str(e)}")
+
     logger.error(f"Failed to establish database connection after {max_retries} attempts: {str(last_error)}")
     return None
 
@@ -248,6 +273,13 @@ class GeneratedCombination(Base):
     stars = Column(String(20), nullable=False)    # Stored as JSON string
     strategy = Column(String(100))
     score = Column(Float)
+    numbers_rank = Column(Integer)  # Colex rank of the 5 numbers (see combination_rank)
+    stars_rank = Column(Integer)    # Colex rank of the 2 stars, NULL for other star counts
+    
+    __table_args__ = (
+        Index('ix_generated_combinations_ticket', 'numbers_rank', 'stars_rank', 'target_draw_date'),
+        Index('ix_generated_combinations_strategy_created', 'strategy', 'created_at'),
+    )
     
     def __repr__(self):
         return f"<GeneratedCombination(strategy='{self.strategy}', numbers={self.numbers}, stars={self.stars}, score={self.score})>"
@@ -407,6 +439,12 @@ class FrenchLotoPrediction(Base):
     lucky = Column(Integer, nullable=False)
     strategy = Column(String(100))
     score = Column(Float)
+    numbers_rank = Column(Integer)  # Colex rank of the 5 numbers (see combination_rank)
+    
+    __table_args__ = (
+        Index('ix_french_loto_predictions_ticket', 'numbers_rank', 'lucky'),
+        Index('ix_french_loto_predictions_strategy_generated', 'strategy', 'date_generated'),
+    )
     
     def __repr__(self):
         return f"<FrenchLotoPrediction(id='{self.id}', numbers='{self.numbers}', lucky={self.lucky}, strategy='{self.strategy}')>"
@@ -451,12 +489,103 @@ class FrenchLotoPlayedCombination(Base):
             'result': self.result
         }
 
+class DrawReplica:
+    """
+    Local SQLite copy of the draw tables, synced incrementally from the primary
+    
+    Rows are copied when their id is above, or their date after, the newest
+    row already in the replica. Writes always go to the primary; a sync is
+    forced on the next read after mark_stale().
+    """
+    
+    def __init__(self, path, sync_interval=DRAW_REPLICA_SYNC_INTERVAL):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.engine = create_engine(f'sqlite:///{path}', connect_args={'check_same_thread': False})
+        self.last_sync = {}  # table name -> time.monotonic() of the last successful sync
+        self._lock = threading.Lock()
+    
+    def mark_stale(self, model):
+        """Force a sync of this table on its next read"""
+        self.last_sync.pop(model.__tablename__, None)
+    
+    def sync(self, model, force=False):
+        """
+        Copy new rows of one draw table from the primary
+        
+        Parameters:
+        -----------
+        model : EuromillionsDrawing or FrenchLotoDrawing
+            Mapped class whose table is synced
+        force : bool
+            Sync even if the last sync is more recent than sync_interval
+        
+        Returns:
+        --------
+        int
+            Number of rows copied
+        """
+        table = model.__table__
+        with self._lock:
+            last = self.last_sync.get(table.name)
+            if not force and last is not None and time.monotonic() - last < self.sync_interval:
+                return 0
+            
+            table.create(self.engine, checkfirst=True)
+            with self.engine.connect() as conn:
+                max_id, max_date = conn.execute(select(func.max(table.c.id), func.max(table.c.date))).one()
+            
+            stmt = select(table)
+            if max_id is not None:
+                stmt = stmt.where(or_(table.c.id > max_id, table.c.date > max_date))
+            with engine.connect() as conn:
+                rows = [dict(row._mapping) for row in conn.execute(stmt)]
+            
+            if rows:
+                with self.engine.begin() as conn:
+                    conn.execute(sqlite_insert(table).on_conflict_do_nothing(), rows)
+            self.last_sync[table.name] = time.monotonic()
+            logger.info(f"Replica sync copied {len(rows)} rows of {table.name}")
+            return len(rows)
+    
+    def engine_for(self, model):
+        """
+        Engine to read a draw table from, syncing first when due
+        
+        If the primary cannot be reached the replica is served as it is;
+        None is returned only when it has never been synced.
+        """
+        if not circuit_breaker.is_open():
+            try:
+                self.sync(model)
+            except Exception as e:
+                logger.warning(f"Replica sync of {model.__tablename__} failed, serving local copy: {str(e)}")
+        if inspect(self.engine).has_table(model.__tablename__):
+            return self.engine
+        return None
+
+draw_replica = DrawReplica(DRAW_REPLICA_PATH) if DRAW_REPLICA_PATH else None
+
+def _read_engine(model):
+    """Engine used to read a draw table: the local replica when enabled, else the primary"""
+    if draw_replica is not None:
+        replica_engine = draw_replica.engine_for(model)
+        if replica_engine is not None:
+            return replica_engine
+    return engine
+
+def _mark_replica_stale(model):
+    """Make the next read of a draw table pick up a write made to the primary"""
+    if draw_replica is not None:
+        draw_replica.mark_stale(model)
+
 def init_db():
     """Initialize the database by creating all tables if they don't exist"""
     global DB_AVAILABLE
     try:
         # Attempt to create tables whether in online or offline mode
         Base.metadata.create_all(engine)
+        migrate_combination_ranks()
         if DB_AVAILABLE:
             print("Database initialized and tables created.")
         else:
@@ -468,6 +597,94 @@ def init_db():
         # Mark database as unavailable
         DB_AVAILABLE = False
 
+# Rank columns added after the first release, with the tables they belong to
+RANK_COLUMNS = {
+    'generated_combinations': ['numbers_rank', 'stars_rank'],
+    'french_loto_predictions': ['numbers_rank'],
+}
+
+def migrate_combination_ranks(batch_size=1000):
+    """
+    Add the rank columns and indexes to existing combination tables and backfill them
+    
+    Safe to run repeatedly: missing columns and indexes are created, and only
+    rows whose rank is still NULL are converted.
+    
+    Parameters:
+    -----------
+    batch_size : int
+        Number of rows updated per statement
+        
+    Returns:
+    --------
+    dict
+        Number of rows converted per table
+    """
+    converted = {}
+    try:
+        inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table, columns in RANK_COLUMNS.items():
+                if not inspector.has_table(table):
+                    continue
+                existing = {col['name'] for col in inspector.get_columns(table)}
+                for column in columns:
+                    if column not in existing:
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER"))
+                        logger.info(f"Added column {table}.{column}")
+        
+        for model in (GeneratedCombination, FrenchLotoPrediction):
+            for index in model.__table__.indexes:
+                index.create(engine, checkfirst=True)
+        
+        converted['generated_combinations'] = _backfill_ranks(
+            GeneratedCombination,
+            [GeneratedCombination.numbers, GeneratedCombination.stars],
+            lambda numbers, stars: {
+                'numbers_rank': _numbers_rank(json.loads(numbers)),
+                'stars_rank': _stars_rank(json.loads(stars))
+            },
+            batch_size
+        )
+        converted['french_loto_predictions'] = _backfill_ranks(
+            FrenchLotoPrediction,
+            [FrenchLotoPrediction.numbers],
+            lambda numbers: {'numbers_rank': _numbers_rank(_parse_dash_numbers(numbers))},
+            batch_size
+        )
+        logger.info(f"Combination rank migration converted {converted}")
+    except Exception as e:
+        logger.error(f"Error migrating combination ranks: {str(e)}")
+    
+    return converted
+
+def _backfill_ranks(model, source_columns, to_ranks, batch_size):
+    """Compute ranks for rows where numbers_rank is NULL and write them back by primary key"""
+    session = get_session()
+    try:
+        rows = session.execute(
+            select(model.id, *source_columns).where(model.numbers_rank.is_(None))
+        ).all()
+        
+        updates = []
+        for row in rows:
+            try:
+                ranks = to_ranks(*row[1:])
+            except (ValueError, TypeError):
+                continue
+            if ranks['numbers_rank'] is not None:
+                updates.append({'id': row[0], **ranks})
+        
+        for start in range(0, len(updates), batch_size):
+            session.execute(update(model), updates[start:start + batch_size])
+        session.commit()
+        return len(updates)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 def load_drawings_from_dataframe(df):
     """
     Load Euromillions drawings from a DataFrame into the database
@@ -520,6 +737,7 @@ def load_drawings_from_dataframe(df):
             session.add_all(drawings)
             session.commit()
             count = len(drawings)
+            _mark_replica_stale(EuromillionsDrawing)
         
     except Exception as e:
         logger.error(f"Error loading drawings: {str(e)}")
@@ -530,13 +748,109 @@ def load_drawings_from_dataframe(df):
     
     return count
 
+def _column_array(values, column):
+    """Convert a list of values from one result column to a typed NumPy array"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = object
+    has_null = any(v is None for v in values)
+    if column.name == 'date':
+        return np.array(values, dtype='datetime64[D]')
+    if python_type is int and not has_null:
+        return np.array(values, dtype=np.int64)
+    if python_type in (int, float):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(values, dtype=object)
+
+def load_drawings(model, columns=None, since_date=None, as_arrays=False, max_retries=3, chunk_size=5000, limit=None):
+    """
+    Load drawings with a Core select, skipping ORM objects and to_dict()
+    
+    Parameters:
+    -----------
+    model : EuromillionsDrawing or FrenchLotoDrawing
+        Mapped class whose table is read
+    columns : list of str, optional
+        Columns to load (default: every column of the table)
+    since_date : datetime.date or str, optional
+        Only load drawings on or after this date
+    as_arrays : bool
+        If True, return a dict of typed NumPy arrays instead of a DataFrame
+    max_retries : int
+        Maximum number of retry attempts
+    chunk_size : int
+        Number of rows fetched per streamed partition
+    limit : int, optional
+        Only load this many of the most recent drawings
+    
+    Returns:
+    --------
+    pandas.DataFrame or dict
+        Drawings ordered by date descending. In the DataFrame the date column
+        holds 'YYYY-MM-DD' strings as in to_dict(); the arrays use datetime64[D].
+    """
+    table = model.__table__
+    if columns is None:
+        columns = [col.name for col in table.columns]
+    selected = [table.c[name] for name in columns]
+    
+    stmt = select(*selected).order_by(table.c.date.desc())
+    if 'draw_num' in table.c:
+        stmt = stmt.order_by(table.c.draw_num.desc())
+    if since_date is not None:
+        if isinstance(since_date, str):
+            since_date = datetime.strptime(since_date, '%Y-%m-%d').date()
+        elif hasattr(since_date, 'date') and callable(getattr(since_date, 'date')):
+            since_date = since_date.date()
+        stmt = stmt.where(table.c.date >= since_date)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    
+    for attempt in range(max_retries):
+        try:
+            rows = []
+            with _read_engine(model).connect() as conn:
+                result = conn.execution_options(stream_results=True).execute(stmt)
+                for partition in result.partitions(chunk_size):
+                    rows.extend(partition)
+            break
+        except exc.OperationalError as e:
+            logger.warning(f"Database operational error (attempt {attempt+1}/{max_retries}): {str(e)}")
+            if attempt < max_retries - 1 and not circuit_breaker.is_open():
+                retry_delay = 2 ** attempt
+                logger.info(f"Retrying in {retry_delay} seconds...")
+                time.sleep(retry_delay)
+            else:
+                logger.error(f"Failed to load {table.name} after {max_retries} attempts")
+                rows = []
+                break
+        except Exception as e:
+            logger.error(f"Error loading {table.name}: {str(e)}")
+            rows = []
+            break
+    
+    values_by_column = list(zip(*rows)) if rows else [() for _ in columns]
+    arrays = {
+        column.name: _column_array(list(values), column)
+        for column, values in zip(selected, values_by_column)
+    }
+    
+    if as_arrays:
+        return arrays
+    if not rows:
+        return pd.DataFrame()
+    if 'date' in arrays:
+        arrays['date'] = np.datetime_as_string(arrays['date'], unit='D').astype(object)
+    return pd.DataFrame(arrays, columns=columns)
+
 def get_all_draws(max_retries=3):
     """
     Alias for get_all_drawings() for compatibility with strategy testing module
     """
     return get_all_drawings(max_retries)
     
-def get_all_drawings(max_retries=3):
+def get_all_drawings(max_retries=3, since_date=None, columns=None):
     """
     Get all Euromillions drawings from the database with retry logic
     
@@ -544,43 +858,66 @@ def get_all_drawings(max_retries=3):
     -----------
     max_retries : int
         Maximum number of retry attempts
+    since_date : datetime.date or str, optional
+        Only return drawings on or after this date
+    columns : list of str, optional
+        Columns to load (default: every column)
     
     Returns:
     --------
     pandas.DataFrame
         DataFrame containing all drawing records
     """
-    for attempt in range(max_retries):
-        session = get_session()
+    return load_drawings(EuromillionsDrawing, columns=columns, since_date=since_date, max_retries=max_retries)
+
+# In-process statistics objects that receive newly inserted draws, keyed by game.
+# Held weakly: each Streamlit session registers its own instance, which drops
+# out of the registry when the session and its state are discarded.
+_registered_statistics = {}
+_registry_lock = threading.Lock()
+
+def register_statistics(game, statistics):
+    """
+    Register a statistics instance to be updated when a new draw is inserted
+    
+    Several instances can be registered for the same game (one per session).
+    
+    Parameters:
+    -----------
+    game : str
+        'euromillions' or 'french_loto'
+    statistics : EuromillionsStatistics or FrenchLotoStatistics
+        Object exposing ``apply_draw(draw)``
+    """
+    with _registry_lock:
+        _registered_statistics.setdefault(game, weakref.WeakSet()).add(statistics)
+
+def unregister_statistics(game, statistics=None):
+    """
+    Stop pushing new draws to statistics instances registered for a game
+    
+    Parameters:
+    -----------
+    game : str
+        'euromillions' or 'french_loto'
+    statistics : EuromillionsStatistics or FrenchLotoStatistics, optional
+        Instance to unregister (default: every instance of the game)
+    """
+    with _registry_lock:
+        if statistics is None:
+            _registered_statistics.pop(game, None)
+        elif game in _registered_statistics:
+            _registered_statistics[game].discard(statistics)
+
+def _push_draw_to_statistics(game, draw):
+    """Apply a newly inserted draw to every registered statistics instance of the game"""
+    with _registry_lock:
+        targets = list(_registered_statistics.get(game, ()))
+    for statistics in targets:
         try:
-            drawings = session.query(EuromillionsDrawing).order_by(EuromillionsDrawing.date.desc()).all()
-            if not drawings:
-                return pd.DataFrame()
-                
-            # Convert to list of dictionaries
-            records = [drawing.to_dict() for drawing in drawings]
-            return pd.DataFrame(records)
-        except exc.OperationalError as e:
-            # Handle specific database operational errors
-            logger.warning(f"Database operational error (attempt {attempt+1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
-                # Wait before retrying (exponential backoff)
-                retry_delay = 2 ** attempt
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                # Create a fresh engine and session factory if needed
-                if "SSL connection has been closed" in str(e):
-                    logger.info("Resetting database connection pool")
-                    Session.remove()  # Close all sessions
-            else:
-                logger.error(f"Failed to retrieve drawings after {max_retries} attempts")
-                # Return empty DataFrame as a fallback
-                return pd.DataFrame()
+            statistics.apply_draw(draw)
         except Exception as e:
-            logger.error(f"Error retrieving drawings: {str(e)}")
-            return pd.DataFrame()
-        finally:
-            session.close()
+            logger.error(f"Error updating registered {game} statistics: {str(e)}")
 
 def add_new_drawing(date, numbers, stars, day_of_week=None):
     """
@@ -644,9 +981,89 @@ def add_new_drawing(date, numbers, stars, day_of_week=None):
         raise
     finally:
         session.close()
+    
+    if success:
+        _mark_replica_stale(EuromillionsDrawing)
+        _push_draw_to_statistics('euromillions', {'date': date, 'numbers': list(numbers), 'stars': list(stars)})
         
     return success
 
+def _to_date(value):
+    """Convert a str, pandas Timestamp or datetime to datetime.date (None stays None)"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    if hasattr(value, 'date') and callable(getattr(value, 'date')):
+        return value.date()
+    return value
+
+def _numbers_rank(numbers):
+    """Colex rank of five main numbers, or None if they are not a valid ticket"""
+    try:
+        return rank_combination(numbers) if len(numbers) == 5 else None
+    except ValueError:
+        return None
+
+def _stars_rank(stars):
+    """Colex rank of a pair of stars, or None for any other star count"""
+    try:
+        return rank_combination(stars) if len(stars) == 2 else None
+    except ValueError:
+        return None
+
+@event.listens_for(GeneratedCombination, 'before_insert')
+def _fill_generated_combination_ranks(mapper, connection, target):
+    """Rank combinations added through the ORM without their ranks (e.g. by the app's save buttons)"""
+    try:
+        if target.numbers_rank is None:
+            target.numbers_rank = _numbers_rank(json.loads(target.numbers))
+        if target.stars_rank is None:
+            target.stars_rank = _stars_rank(json.loads(target.stars))
+    except (ValueError, TypeError):
+        pass
+
+@event.listens_for(FrenchLotoPrediction, 'before_insert')
+def _fill_french_loto_prediction_rank(mapper, connection, target):
+    """Rank predictions added through the ORM without their rank"""
+    if target.numbers_rank is None:
+        target.numbers_rank = _numbers_rank(_parse_dash_numbers(target.numbers))
+
+def _bulk_insert_returning_ids(model, mappings, description):
+    """
+    Insert many rows of one table in a single transaction
+    
+    Parameters:
+    -----------
+    model : declarative class
+        Table to insert into
+    mappings : list of dict
+        Column values for each row
+    description : str
+        Label used in log messages
+    
+    Returns:
+    --------
+    list of int
+        Assigned ids, in the same order as ``mappings``
+    """
+    if not mappings:
+        return []
+    
+    session = get_session()
+    try:
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        ids = list(session.scalars(stmt, mappings).all())
+        session.commit()
+        logger.info(f"Saved {len(ids)} {description} in one transaction")
+        return ids
+    except Exception as e:
+        logger.error(f"Error bulk saving {description}: {str(e)}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 def save_generated_combination(numbers, stars, strategy, score, target_draw_date=None):
     """
     Save a generated combination to the database
@@ -700,7 +1117,9 @@ def save_generated_combination(numbers, stars, strategy, score, target_draw_date
             strategy=strategy,
             score=score,
             created_at=datetime.now().date(),
-            target_draw_date=target_draw_date
+            target_draw_date=target_draw_date,
+            numbers_rank=_numbers_rank(numbers),
+            stars_rank=_stars_rank(stars)
         )
         
         # Add to the database
@@ -717,6 +1136,45 @@ def save_generated_combination(numbers, stars, strategy, score, target_draw_date
         
     return combo_id
 
+def save_generated_combinations_bulk(combinations, strategy=None, target_draw_date=None):
+    """
+    Save many generated combinations with one batched insert
+    
+    Parameters:
+    -----------
+    combinations : list of dict
+        Each with 'numbers', 'stars' and optionally 'strategy', 'score' and
+        'target_draw_date' (the arguments of save_generated_combination)
+    strategy : str, optional
+        Strategy used for combinations that do not name one
+    target_draw_date : datetime.date, str, or None
+        Draw date used for combinations that do not give one
+        
+    Returns:
+    --------
+    list of int
+        IDs of the saved combinations, in input order. Nothing is saved and
+        the database error is raised if the insert fails.
+    """
+    created_at = datetime.now().date()
+    mappings = []
+    for combo in combinations:
+        score = combo.get('score')
+        numbers = [int(n) for n in combo['numbers']]
+        stars = [int(s) for s in combo['stars']]
+        mappings.append({
+            'numbers': json.dumps(numbers),
+            'stars': json.dumps(stars),
+            'strategy': combo.get('strategy', strategy),
+            'score': float(score) if score is not None else None,
+            'created_at': created_at,
+            'target_draw_date': _to_date(combo.get('target_draw_date', target_draw_date)),
+            'numbers_rank': _numbers_rank(numbers),
+            'stars_rank': _stars_rank(stars)
+        })
+    
+    return _bulk_insert_returning_ids(GeneratedCombination, mappings, "generated combinations")
+
 def get_generated_combinations(strategy=None, limit=100, max_retries=3):
     """
     Get generated combinations from the database with retry logic
@@ -733,7 +1191,9 @@ def get_generated_combinations(strategy=None, limit=100, max_retries=3):
     Returns:
     --------
     list
-        List of dictionaries containing combination data
+        List of dictionaries containing combination data. Numbers and stars
+        are decoded from their ranks, so they are in ascending order rather
+        than the order they were saved in (rows without ranks keep it).
     """
     logger.info(f"Attempting to get generated combinations, strategy={strategy}, limit={limit}")
     
@@ -750,6 +1210,12 @@ def get_generated_combinations(strategy=None, limit=100, max_retries=3):
             combinations = query.order_by(GeneratedCombination.created_at.desc()).limit(limit).all()
             logger.info(f"Found {len(combinations)} combinations for strategy={strategy}")
             
+            # Decode all the indexed ranks in one vectorized pass, no JSON parsing needed
+            ranked = [c for c in combinations if c.numbers_rank is not None and c.stars_rank is not None]
+            decoded_numbers = unrank_combinations([c.numbers_rank for c in ranked], 5).tolist()
+            decoded_stars = unrank_combinations([c.stars_rank for c in ranked], 2).tolist()
+            decoded = {id(c): (n, s) for c, n, s in zip(ranked, decoded_numbers, decoded_stars)}
+            
             result = []
             for combination in combinations:
                 try:
@@ -762,6 +1228,11 @@ def get_generated_combinations(strategy=None, limit=100, max_retries=3):
                         'score': combination.score
                     }
                     
+                    if id(combination) in decoded:
+                        combo_dict['numbers'], combo_dict['stars'] = decoded[id(combination)]
+                        result.append(combo_dict)
+                        continue
+                    
                     # Parse numbers and stars with explicit error handling
                     try:
                         combo_dict['numbers'] = json.loads(combination.numbers)
@@ -785,7 +1256,7 @@ def get_generated_combinations(strategy=None, limit=100, max_retries=3):
         except exc.OperationalError as e:
             # Handle specific database operational errors
             logger.warning(f"Database operational error (attempt {attempt+1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
+            if attempt < max_retries - 1 and not circuit_breaker.is_open():
                 # Wait before retrying (exponential backoff)
                 retry_delay = 2 ** attempt
                 logger.info(f"Retrying in {retry_delay} seconds...")
@@ -801,7 +1272,7 @@ def get_generated_combinations(strategy=None, limit=100, max_retries=3):
                 
         except Exception as e:
             logger.error(f"Unexpected error retrieving combinations: {str(e)}")
-            if attempt < max_retries - 1:
+            if attempt < max_retries - 1 and not circuit_breaker.is_open():
                 # Wait before retrying (exponential backoff)
                 retry_delay = 2 ** attempt
                 logger.info(f"Retrying in {retry_delay} seconds...")
@@ -815,6 +1286,50 @@ def get_generated_combinations(strategy=None, limit=100, max_retries=3):
     # If all attempts failed, return an empty list
     return []
 
+def is_combination_generated(numbers, stars, target_draw_date=None, strategy=None):
+    """
+    Check whether this exact Euromillions ticket was already generated
+    
+    Uses the (numbers_rank, stars_rank, target_draw_date) index.
+    
+    Parameters:
+    -----------
+    numbers : list
+        List of 5 main numbers
+    stars : list
+        List of 2 star numbers
+    target_draw_date : datetime.date, str, or None
+        Only match combinations generated for this draw
+    strategy : str, optional
+        Only match combinations from this strategy
+        
+    Returns:
+    --------
+    bool
+        True if a matching combination is stored
+    """
+    numbers_rank = _numbers_rank([int(n) for n in numbers])
+    stars_rank = _stars_rank([int(s) for s in stars])
+    if numbers_rank is None or stars_rank is None:
+        return False
+    
+    session = get_session()
+    try:
+        query = select(GeneratedCombination.id).where(
+            GeneratedCombination.numbers_rank == numbers_rank,
+            GeneratedCombination.stars_rank == stars_rank
+        )
+        if target_draw_date:
+            query = query.where(GeneratedCombination.target_draw_date == _to_date(target_draw_date))
+        if strategy:
+            query = query.where(GeneratedCombination.strategy == strategy)
+        return session.execute(query.limit(1)).first() is not None
+    except Exception as e:
+        logger.error(f"Error looking up generated combination: {str(e)}")
+        return False
+    finally:
+        session.close()
+
 def save_user_combination(numbers, stars, strategy=None, notes=None, played_date=None):
     """
     Save a user-selected combination
@@ -881,6 +1396,36 @@ def save_user_combination(numbers, stars, strategy=None, notes=None, played_date
         
     return saved_id
 
+def save_user_combinations_bulk(combinations, played_date=None):
+    """
+    Save many user-selected combinations with one batched insert
+    
+    Parameters:
+    -----------
+    combinations : list of dict
+        Each with 'numbers', 'stars' and optionally 'strategy', 'notes' and
+        'played_date' (the arguments of save_user_combination)
+    played_date : datetime.date, str, or None
+        Play date used for combinations that do not give one
+        
+    Returns:
+    --------
+    list of int
+        IDs of the saved combinations, in input order. Nothing is saved and
+        the database error is raised if the insert fails.
+    """
+    saved_at = datetime.now().date()
+    mappings = [{
+        'numbers': json.dumps([int(n) for n in combo['numbers']]),
+        'stars': json.dumps([int(s) for s in combo['stars']]),
+        'strategy': combo.get('strategy'),
+        'notes': combo.get('notes'),
+        'saved_at': saved_at,
+        'played_date': _to_date(combo.get('played_date', played_date))
+    } for combo in combinations]
+    
+    return _bulk_insert_returning_ids(UserSavedCombination, mappings, "user combinations")
+
 def get_user_saved_combinations(limit=50, max_retries=3):
     """
     Get user-saved combinations from the database with retry logic
@@ -908,7 +1453,7 @@ def get_user_saved_combinations(limit=50, max_retries=3):
         except exc.OperationalError as e:
             # Handle specific database operational errors
             logger.warning(f"Database operational error (attempt {attempt+1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
+            if attempt < max_retries - 1 and not circuit_breaker.is_open():
                 # Wait before retrying (exponential backoff)
                 retry_delay = 2 ** attempt
                 logger.info(f"Retrying in {retry_delay} seconds...")
@@ -1057,7 +1602,7 @@ def get_strategy_test_results(limit=10, max_retries=3):
         except exc.OperationalError as e:
             # Handle specific database operational errors
             logger.warning(f"Database operational error (attempt {attempt+1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
+            if attempt < max_retries - 1 and not circuit_breaker.is_open():
                 # Wait before retrying (exponential backoff)
                 retry_delay = 2 ** attempt
                 logger.info(f"Retrying in {retry_delay} seconds...")
@@ -1081,7 +1626,7 @@ def get_strategy_test_results(limit=10, max_retries=3):
 
 # French Loto Database Functions
 
-def get_french_loto_drawings(max_retries=3):
+def get_french_loto_drawings(max_retries=3, since_date=None, columns=None):
     """
     Get all French Loto drawings from the database
     
@@ -1089,43 +1634,18 @@ def get_french_loto_drawings(max_retries=3):
     -----------
     max_retries : int
         Maximum number of retry attempts
+    since_date : datetime.date or str, optional
+        Only return drawings on or after this date
+    columns : list of str, optional
+        Columns to load, e.g. ['date', 'n1', 'n2', 'n3', 'n4', 'n5', 'lucky']
+        to skip the winner and prize columns (default: every column)
     
     Returns:
     --------
     pandas.DataFrame
         DataFrame containing all drawings
     """
-    for attempt in range(max_retries):
-        session = get_session()
-        try:
-            drawings = session.query(FrenchLotoDrawing).order_by(FrenchLotoDrawing.date.desc()).all()
-            if not drawings:
-                return pd.DataFrame()
-                
-            # Convert to list of dictionaries
-            records = [drawing.to_dict() for drawing in drawings]
-            return pd.DataFrame(records)
-        except exc.OperationalError as e:
-            # Handle specific database operational errors
-            logger.warning(f"Database operational error (attempt {attempt+1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
-                # Wait before retrying (exponential backoff)
-                retry_delay = 2 ** attempt
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                # Create a fresh engine and session factory if needed
-                if "SSL connection has been closed" in str(e):
-                    logger.info("Resetting database connection pool")
-                    Session.remove()  # Close all sessions
-            else:
-                logger.error(f"Failed to retrieve French Loto drawings after {max_retries} attempts")
-                # Return empty DataFrame as a fallback
-                return pd.DataFrame()
-        except Exception as e:
-            logger.error(f"Error retrieving French Loto drawings: {str(e)}")
-            return pd.DataFrame()
-        finally:
-            session.close()
+    return load_drawings(FrenchLotoDrawing, columns=columns, since_date=since_date, max_retries=max_retries)
 
 def add_french_loto_drawing(date, numbers, lucky, day_of_week=None, skip_future_dates=True):
     """
@@ -1197,6 +1717,10 @@ def add_french_loto_drawing(date, numbers, lucky, day_of_week=None, skip_future_
         session.rollback()
     finally:
         session.close()
+    
+    if success:
+        _mark_replica_stale(FrenchLotoDrawing)
+        _push_draw_to_statistics('french_loto', {'date': date, 'numbers': list(numbers), 'lucky': lucky})
         
     return success
     
@@ -1234,6 +1758,7 @@ def add_french_loto_drawing_with_details(date, numbers, lucky, day_of_week=None,
     """
     session = get_session()
     success = False
+    inserted = False
     
     try:
         # Convert date to a consistent datetime.date object format
@@ -1330,12 +1855,18 @@ def add_french_loto_drawing_with_details(date, numbers, lucky, day_of_week=None,
             session.add(drawing)
             session.commit()
             success = True
+            inserted = True
             logger.info(f"Added French Loto drawing with details for {date}, draw {draw_num}")
     except Exception as e:
         logger.error(f"Error adding French Loto drawing with details: {str(e)}")
         session.rollback()
     finally:
         session.close()
+    
+    # Only newly inserted draws are pushed; refreshing the details of an existing draw adds nothing
+    if inserted:
+        _mark_replica_stale(FrenchLotoDrawing)
+        _push_draw_to_statistics('french_loto', {'date': date, 'numbers': list(numbers), 'lucky': lucky})
         
     return success
 
@@ -1375,7 +1906,8 @@ def save_french_loto_prediction(numbers, lucky, strategy, score):
             numbers=numbers_str,
             lucky=int(lucky),
             strategy=strategy,
-            score=float(score)
+            score=float(score),
+            numbers_rank=_numbers_rank(_parse_dash_numbers(numbers_str))
         )
         
         # Add to database
@@ -1391,6 +1923,80 @@ def save_french_loto_prediction(numbers, lucky, strategy, score):
         
     return prediction_id
 
+def _parse_dash_numbers(numbers_str):
+    """Numbers of a dash-separated string such as "1-5-12-32-45" (empty list if malformed)"""
+    try:
+        return [int(n) for n in str(numbers_str).split('-')]
+    except ValueError:
+        return []
+
+def decode_french_loto_numbers(numbers_ranks, numbers_strs):
+    """
+    Main numbers of stored French Loto predictions, decoded from their ranks
+    
+    Parameters:
+    -----------
+    numbers_ranks : sequence
+        numbers_rank column values (None or NaN for rows saved before the ranks existed)
+    numbers_strs : sequence
+        numbers column values, only parsed for rows without a rank
+        
+    Returns:
+    --------
+    list of list of int
+        Ascending main numbers of each prediction
+    """
+    ranked = [i for i, rank in enumerate(numbers_ranks) if rank is not None and rank == rank]
+    decoded = unrank_combinations([int(numbers_ranks[i]) for i in ranked], 5).tolist()
+    result = [None] * len(numbers_ranks)
+    for i, numbers in zip(ranked, decoded):
+        result[i] = numbers
+    return [numbers if numbers is not None else _parse_dash_numbers(numbers_str)
+            for numbers, numbers_str in zip(result, numbers_strs)]
+
+def _french_loto_numbers_and_lucky(combo):
+    """Extract the dash-separated numbers string and lucky number from a combination dict"""
+    numbers = combo['main_numbers'] if 'main_numbers' in combo else combo['numbers']
+    lucky = combo['lucky_number'] if 'lucky_number' in combo else combo['lucky']
+    if isinstance(numbers, str):
+        numbers_str = numbers  # Assume it's already formatted
+    else:
+        numbers_str = "-".join(map(str, sorted(int(n) for n in numbers)))
+    return numbers_str, int(lucky)
+
+def save_french_loto_predictions_bulk(predictions, strategy=None):
+    """
+    Save many French Loto predictions with one batched insert
+    
+    Parameters:
+    -----------
+    predictions : list of dict
+        Each with 'numbers' (or 'main_numbers'), 'lucky' (or 'lucky_number'),
+        and optionally 'strategy' and 'score'
+    strategy : str, optional
+        Strategy used for predictions that do not name one
+        
+    Returns:
+    --------
+    list of int
+        IDs of the saved predictions, in input order. Nothing is saved and
+        the database error is raised if the insert fails.
+    """
+    date_generated = datetime.now().date()
+    mappings = []
+    for combo in predictions:
+        numbers_str, lucky = _french_loto_numbers_and_lucky(combo)
+        mappings.append({
+            'date_generated': date_generated,
+            'numbers': numbers_str,
+            'lucky': lucky,
+            'strategy': combo.get('strategy', strategy),
+            'score': float(combo.get('score', 0.0)),
+            'numbers_rank': _numbers_rank(_parse_dash_numbers(numbers_str))
+        })
+    
+    return _bulk_insert_returning_ids(FrenchLotoPrediction, mappings, "French Loto predictions")
+
 def get_french_loto_predictions(limit=50):
     """
     Get French Loto predictions from the database
@@ -1403,7 +2009,8 @@ def get_french_loto_predictions(limit=50):
     Returns:
     --------
     pandas.DataFrame
-        DataFrame containing predictions
+        DataFrame containing predictions; 'main_numbers' holds the ascending
+        numbers as a list, 'numbers' the stored dash-separated string
     """
     session = get_session()
     try:
@@ -1411,8 +2018,13 @@ def get_french_loto_predictions(limit=50):
         if not predictions:
             return pd.DataFrame()
             
-        # Convert to list of dictionaries
+        # Convert to list of dictionaries, decoding all the indexed ranks in one vectorized pass
         records = [pred.to_dict() for pred in predictions]
+        main_numbers = decode_french_loto_numbers(
+            [pred.numbers_rank for pred in predictions], [pred.numbers for pred in predictions]
+        )
+        for record, numbers in zip(records, main_numbers):
+            record['main_numbers'] = numbers
         return pd.DataFrame(records)
         
     except Exception as e:
@@ -1421,6 +2033,45 @@ def get_french_loto_predictions(limit=50):
     finally:
         session.close()
 
+def is_french_loto_prediction_generated(numbers, lucky, strategy=None):
+    """
+    Check whether this exact French Loto ticket was already predicted
+    
+    Uses the (numbers_rank, lucky) index.
+    
+    Parameters:
+    -----------
+    numbers : list
+        List of 5 main numbers
+    lucky : int
+        Lucky number
+    strategy : str, optional
+        Only match predictions from this strategy
+        
+    Returns:
+    --------
+    bool
+        True if a matching prediction is stored
+    """
+    numbers_rank = _numbers_rank([int(n) for n in numbers])
+    if numbers_rank is None:
+        return False
+    
+    session = get_session()
+    try:
+        query = select(FrenchLotoPrediction.id).where(
+            FrenchLotoPrediction.numbers_rank == numbers_rank,
+            FrenchLotoPrediction.lucky == int(lucky)
+        )
+        if strategy:
+            query = query.where(FrenchLotoPrediction.strategy == strategy)
+        return session.execute(query.limit(1)).first() is not None
+    except Exception as e:
+        logger.error(f"Error looking up French Loto prediction: {str(e)}")
+        return False
+    finally:
+        session.close()
+
 def save_french_loto_played_combination(numbers, lucky, strategy, draw_date, notes=""):
     """
     Save a played French Loto combination
@@ -1482,6 +2133,39 @@ def save_french_loto_played_combination(numbers, lucky, strategy, draw_date, not
         
     return combo_id
 
+def save_french_loto_played_combinations_bulk(combinations, draw_date=None):
+    """
+    Save many played French Loto combinations with one batched insert
+    
+    Parameters:
+    -----------
+    combinations : list of dict
+        Each with 'numbers' (or 'main_numbers'), 'lucky' (or 'lucky_number'),
+        and optionally 'strategy', 'notes' and 'draw_date'
+    draw_date : datetime.date, pandas.Timestamp, or str, optional
+        Draw date used for combinations that do not give one
+        
+    Returns:
+    --------
+    list of int
+        IDs of the saved combinations, in input order. Nothing is saved and
+        the database error is raised if the insert fails.
+    """
+    played_date = datetime.now().date()
+    mappings = []
+    for combo in combinations:
+        numbers_str, lucky = _french_loto_numbers_and_lucky(combo)
+        mappings.append({
+            'played_date': played_date,
+            'draw_date': _to_date(combo.get('draw_date', draw_date)),
+            'numbers': numbers_str,
+            'lucky': lucky,
+            'strategy': combo.get('strategy'),
+            'notes': combo.get('notes', "")
+        })
+    
+    return _bulk_insert_returning_ids(FrenchLotoPlayedCombination, mappings, "played French Loto combinations")
+
 def get_french_loto_played_combinations():
     """
     Get all played French Loto combinations
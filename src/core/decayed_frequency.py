@@ -0,0 +1,100 @@
+"""
+Exponentially decayed frequencies of main and bonus numbers.
+
+A draw ``age`` draws old counts ``0.5 ** (age / half_life)``, so recent draws
+weigh more without the hard cut-off of a fixed window. The state is built
+with one matrix-vector product over the DrawMatrix and folds in each new draw
+in O(numbers): instead of multiplying every weight by the decay factor, the
+decay is accumulated in a global scale and new draws are added divided by it.
+"""
+
+import numpy as np
+
+# Default half-life, in draws
+DEFAULT_HALF_LIFE = 52
+
+# The scaled weights are folded back once the global scale drops below this
+_MIN_SCALE = 1e-150
+
+
+class DecayedFrequency:
+    """
+    Decayed counts of every main and bonus number of a draw history.
+
+    Row 0 of the DrawMatrix is the most recent draw (weight 1), row i has a
+    weight of ``decay ** i``. Index k of the weight arrays is number k + 1.
+    """
+
+    def __init__(self, draws, half_life=DEFAULT_HALF_LIFE):
+        """
+        Initialize from a DrawMatrix.
+
+        Parameters:
+        -----------
+        draws : DrawMatrix
+            Draw history, most recent draw first
+        half_life : float
+            Number of draws after which a draw's weight is halved
+        """
+        if half_life <= 0:
+            raise ValueError(f"half_life must be positive, got {half_life}")
+        self.half_life = half_life
+        self.decay = 0.5 ** (1.0 / half_life)
+        self.n_draws = len(draws)
+
+        weights = self.decay ** np.arange(self.n_draws, dtype=np.float64)
+        self._numbers = weights @ draws.occurrence
+        self._bonus = weights @ draws.bonus_occurrence
+        self._total = float(weights.sum())
+        # Actual weights are the stored ones times this scale
+        self._scale = 1.0
+
+    def update(self, numbers, bonus=()):
+        """
+        Age the state by one draw and add a new most recent draw.
+
+        Parameters:
+        -----------
+        numbers : iterable of int
+            Main numbers of the new draw
+        bonus : iterable of int
+            Bonus numbers (stars or lucky number) of the new draw
+        """
+        self._scale *= self.decay
+        if self._scale < _MIN_SCALE:
+            self._rescale()
+        increment = 1.0 / self._scale
+        for number in numbers:
+            self._numbers[number - 1] += increment
+        for number in bonus:
+            self._bonus[number - 1] += increment
+        self._total += increment
+        self.n_draws += 1
+
+    def _rescale(self):
+        """Fold the global scale into the stored weights."""
+        self._numbers *= self._scale
+        self._bonus *= self._scale
+        self._total *= self._scale
+        self._scale = 1.0
+
+    @property
+    def total_weight(self):
+        """Sum of the draw weights (the effective number of draws)"""
+        return self._total * self._scale
+
+    def number_weights(self):
+        """Decayed counts of the main numbers, index k for number k + 1"""
+        return self._numbers * self._scale
+
+    def bonus_weights(self):
+        """Decayed counts of the bonus numbers, index k for number k + 1"""
+        return self._bonus * self._scale
+
+    def number_frequency(self):
+        """{number: decayed count} of the main numbers"""
+        return {i + 1: float(w) for i, w in enumerate(self.number_weights())}
+
+    def bonus_frequency(self):
+        """{bonus number: decayed count} of the stars or lucky numbers"""
+        return {i + 1: float(w) for i, w in enumerate(self.bonus_weights())}
@@ -0,0 +1,174 @@
+"""
+Running aggregates over a DrawMatrix that can be updated one draw at a time.
+
+The statistics classes keep a DrawAggregates instance so that a newly
+published draw can be folded in with ``apply_draw`` instead of rebuilding
+everything from the database.
+"""
+
+import numpy as np
+
+from src.core.cooccurrence import top_k_upper
+
+# Default size of the recent-draws window (matches get_recency_stats)
+DEFAULT_RECENT_WINDOW = 20
+
+
+class DrawAggregates:
+    """
+    Frequencies, recent window, gaps, pair counts and shape histograms.
+
+    All arrays are indexed by ``number - 1``. ``draws_since_last`` is 0 for a
+    number drawn in the most recent draw and ``n_draws`` for one never drawn.
+    ``gap_sums`` and ``gap_square_sums`` add up the gaps between consecutive
+    appearances of each number (as in GapIndex), so the gap mean and
+    variance follow a new draw without a rescan. ``date_sorted`` tells
+    whether the rows are in date order, most recent first, so that the
+    recent window is also the most recent draws by date.
+    """
+
+    def __init__(self, draws, recent_window=DEFAULT_RECENT_WINDOW):
+        """
+        Initialize from a DrawMatrix (most recent draw first).
+
+        Parameters:
+        -----------
+        draws : DrawMatrix
+            Draw history to aggregate
+        recent_window : int
+            Number of most recent draws tracked in the recent counts
+        """
+        self.recent_window = recent_window
+        self.n_draws = len(draws)
+
+        occurrence = draws.occurrence
+        bonus_occurrence = draws.bonus_occurrence
+
+        self.number_counts = occurrence.sum(axis=0, dtype=np.int64)
+        self.bonus_counts = bonus_occurrence.sum(axis=0, dtype=np.int64)
+
+        recent = slice(0, recent_window)
+        self.recent_number_counts = occurrence[recent].sum(axis=0, dtype=np.int64)
+        self.recent_bonus_counts = bonus_occurrence[recent].sum(axis=0, dtype=np.int64)
+
+        self.draws_since_last = self._first_rows(occurrence)
+        self.bonus_draws_since_last = self._first_rows(bonus_occurrence)
+        self.gap_sums, self.gap_square_sums = self._gap_sums(occurrence)
+
+        ordinals = draws.date_ordinals
+        self.date_sorted = bool(np.all(ordinals[:-1] >= ordinals[1:]))
+
+        # Copy of the shared pair matrix, since apply() updates it in place
+        self.pair_counts = draws.cooccurrence().pair_matrix.copy()
+
+        numbers = draws.numbers.astype(np.int64)
+        self.sum_histogram = np.bincount(numbers.sum(axis=1), minlength=5 * draws.max_number + 1)
+        self.even_histogram = np.bincount((numbers % 2 == 0).sum(axis=1), minlength=6)
+
+    def _first_rows(self, occurrence):
+        """Row of the most recent appearance of each column (n_draws if never)."""
+        if len(occurrence) == 0:
+            return np.zeros(occurrence.shape[1], dtype=np.int64)
+        seen = occurrence.any(axis=0)
+        first = occurrence.argmax(axis=0).astype(np.int64)
+        first[~seen] = len(occurrence)
+        return first
+
+    @staticmethod
+    def _gap_sums(occurrence):
+        """Sum and sum of squares of the gaps between consecutive appearances of each column."""
+        width = occurrence.shape[1]
+        columns, rows = np.nonzero(np.asarray(occurrence).T)
+        same_number = columns[1:] == columns[:-1]
+        gap_columns = columns[1:][same_number]
+        gaps = np.diff(rows)[same_number].astype(np.int64)
+        return (np.bincount(gap_columns, weights=gaps, minlength=width).astype(np.int64),
+                np.bincount(gap_columns, weights=gaps * gaps, minlength=width).astype(np.int64))
+
+    def gap_stats(self):
+        """
+        Mean and variance of the gaps of every number, as in GapIndex.
+
+        Returns:
+        --------
+        tuple of numpy.ndarray
+            (avg_gap, gap_variance), 0 for numbers drawn fewer than twice
+        """
+        gap_counts = np.maximum(self.number_counts - 1, 0)
+        has_gaps = gap_counts > 0
+        avg_gap = np.divide(self.gap_sums, gap_counts, out=np.zeros(len(gap_counts)), where=has_gaps)
+        # n * sum(g^2) - sum(g)^2 is exact in integers
+        spread = gap_counts * self.gap_square_sums - self.gap_sums ** 2
+        gap_variance = np.divide(spread, gap_counts ** 2, out=np.zeros(len(gap_counts)), where=has_gaps)
+        return avg_gap, gap_variance
+
+    def sum_values(self):
+        """
+        Draw sums as (values, counts) from the sum histogram.
+
+        Returns:
+        --------
+        tuple of numpy.ndarray
+            Distinct sums in increasing order and the number of draws of each
+        """
+        values = np.flatnonzero(self.sum_histogram)
+        return values, self.sum_histogram[values]
+
+    def apply(self, draws):
+        """
+        Fold in row 0 of ``draws``, which must be this history plus one new draw.
+
+        Parameters:
+        -----------
+        draws : DrawMatrix
+            Updated matrix whose first row is the new draw
+        """
+        numbers = draws.numbers[0].astype(np.int64)
+        bonus = draws.bonus[0].astype(np.int64)
+        idx = numbers - 1
+        bonus_idx = bonus - 1
+
+        self.n_draws += 1
+        self.number_counts[idx] += 1
+        self.bonus_counts[bonus_idx] += 1
+
+        # Slide the recent window: add the new draw, drop the one that fell out
+        self.recent_number_counts[idx] += 1
+        self.recent_bonus_counts[bonus_idx] += 1
+        if len(draws) > self.recent_window:
+            self.recent_number_counts -= draws.occurrence[self.recent_window]
+            self.recent_bonus_counts -= draws.bonus_occurrence[self.recent_window]
+
+        # The previous appearance of a drawn number is now draws_since_last rows away
+        self.draws_since_last += 1
+        seen = self.number_counts[idx] > 1
+        gaps = self.draws_since_last[idx][seen]
+        self.gap_sums[idx[seen]] += gaps
+        self.gap_square_sums[idx[seen]] += gaps * gaps
+        self.draws_since_last[idx] = 0
+        self.bonus_draws_since_last += 1
+        self.bonus_draws_since_last[bonus_idx] = 0
+
+        self.pair_counts[np.ix_(idx, idx)] += 1
+        self.pair_counts[idx, idx] -= 1
+
+        self.sum_histogram[numbers.sum()] += 1
+        self.even_histogram[int((numbers % 2 == 0).sum())] += 1
+        if len(draws) > 1:
+            self.date_sorted = self.date_sorted and draws.date_ordinals[0] >= draws.date_ordinals[1]
+
+    def top_pairs(self, count=20):
+        """
+        Most frequent pairs of main numbers.
+
+        Parameters:
+        -----------
+        count : int
+            Number of pairs to return
+
+        Returns:
+        --------
+        dict
+            {(a, b): count} with a < b, most frequent first
+        """
+        return top_k_upper(self.pair_counts, count)
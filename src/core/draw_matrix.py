@@ -0,0 +1,584 @@
+"""
+Columnar draw history shared by the statistics, models and backtester.
+
+A DrawMatrix is built once from ``euromillions_drawings`` or
+``french_loto_drawings`` (or from an equivalent DataFrame) and keeps the
+history as contiguous NumPy arrays so that frequency, gap and transition
+computations can be expressed as array operations instead of row loops.
+"""
+
+import logging
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Per-game layout: number range, bonus range and accepted column aliases
+GAME_CONFIG = {
+    'euromillions': {
+        'max_number': 50,
+        'max_bonus': 12,
+        'bonus_count': 2,
+        'table': 'euromillions_drawings',
+        'number_cols': ['n1', 'n2', 'n3', 'n4', 'n5'],
+        'bonus_cols': ['s1', 's2'],
+        'number_aliases': [['n1', 'n2', 'n3', 'n4', 'n5'],
+                           ['number1', 'number2', 'number3', 'number4', 'number5']],
+        'bonus_aliases': [['s1', 's2'], ['star1', 'star2']],
+    },
+    'french_loto': {
+        'max_number': 49,
+        'max_bonus': 10,
+        'bonus_count': 1,
+        'table': 'french_loto_drawings',
+        'number_cols': ['n1', 'n2', 'n3', 'n4', 'n5'],
+        'bonus_cols': ['lucky'],
+        'number_aliases': [['n1', 'n2', 'n3', 'n4', 'n5'],
+                           ['number1', 'number2', 'number3', 'number4', 'number5']],
+        'bonus_aliases': [['lucky'], ['lucky_number']],
+    },
+}
+
+
+# date.toordinal() of 1970-01-01, used to turn epoch days into ordinals
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Per-draw arrays of a DrawMatrix, all indexed by row
+_ROW_ARRAYS = ('numbers', 'bonus', 'date_ordinals', 'occurrence', 'bonus_occurrence')
+
+# Free rows reserved in front of a history when the first draw is prepended
+_MIN_FRONT_ROWS = 64
+
+
+class _RowBuffer:
+    """
+    Row storage with free rows in front, shared by successive prepends.
+
+    A DrawMatrix built by ``prepend`` is a view of the last rows of these
+    arrays; ``front`` is the first used row. Prepending to the matrix whose
+    first row is ``front`` writes one row in place, so a run of new draws
+    costs O(numbers) each plus an amortized copy when the space runs out.
+    """
+
+    def __init__(self, matrix, capacity):
+        self.front = capacity - len(matrix)
+        self.arrays = {}
+        for name in _ROW_ARRAYS:
+            values = getattr(matrix, name)
+            storage = np.zeros((capacity,) + values.shape[1:], dtype=values.dtype)
+            storage[self.front:] = values
+            self.arrays[name] = storage
+
+
+def _date_ordinals(values):
+    """Convert a Series of date-like values to int32 ordinals (0 where missing)."""
+    parsed = pd.to_datetime(values, errors='coerce')
+    days = parsed.to_numpy(dtype='datetime64[D]')
+    missing = np.isnat(days)
+    ordinals = days.astype(np.int64) + _EPOCH_ORDINAL
+    ordinals[missing] = 0
+    return ordinals.astype(np.int32)
+
+
+def _date_ordinal(value):
+    """Ordinal of a single date-like value (0 when missing or unparseable), without a Series."""
+    if value is None or value is pd.NaT:
+        return 0
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        parsed = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return 0
+    return 0 if pd.isna(parsed) else parsed.toordinal()
+
+
+def _numeric_columns(df, cols):
+    """Columns as a 2-D array of numbers, 0 where missing or not numeric."""
+    block = df[cols]
+    # Plain integer columns (no missing values possible) need no conversion
+    if all(isinstance(dtype, np.dtype) and dtype.kind in 'iu' for dtype in block.dtypes):
+        return block.to_numpy()
+    return block.apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy()
+
+
+def _one_hot(values, width):
+    """
+    Build a (n_draws, width) uint8 occurrence matrix from 1-based values.
+
+    Values outside 1..width (e.g. missing entries stored as 0) are ignored.
+    """
+    occurrence = np.zeros((values.shape[0], width), dtype=np.uint8)
+    if values.size == 0:
+        return occurrence
+    rows = np.repeat(np.arange(values.shape[0]), values.shape[1])
+    cols = values.astype(np.int64).ravel() - 1
+    valid = (cols >= 0) & (cols < width)
+    occurrence[rows[valid], cols[valid]] = 1
+    return occurrence
+
+
+def _bincount(values, width):
+    """Counts of the 1-based values in 1..width, other values ignored."""
+    values = values.astype(np.int64).ravel()
+    values = values[(values >= 1) & (values <= width)]
+    return np.bincount(values - 1, minlength=width)
+
+
+class DrawMatrix:
+    """
+    Columnar store of a lottery draw history.
+
+    Rows keep the order of the source (the database loaders return the most
+    recent draw first), so row ``i`` of every array describes the same draw.
+
+    Attributes:
+    -----------
+    game : str
+        'euromillions' or 'french_loto'
+    numbers : numpy.ndarray
+        int8 array of shape (n_draws, 5) with the main numbers
+    bonus : numpy.ndarray
+        int8 array of shape (n_draws, 2) for stars or (n_draws, 1) for the lucky number
+    occurrence : numpy.ndarray
+        uint8 one-hot matrix of shape (n_draws, 50|49); column ``k`` is number ``k + 1``
+    bonus_occurrence : numpy.ndarray
+        uint8 one-hot matrix of shape (n_draws, 12|10) for the bonus balls
+    date_ordinals : numpy.ndarray
+        int32 array of draw dates as ordinals (0 when the date is unknown)
+    """
+
+    def __init__(self, numbers, bonus, date_ordinals=None, game='euromillions'):
+        """
+        Initialize from raw arrays.
+
+        Parameters:
+        -----------
+        numbers : array-like
+            Main numbers with shape (n_draws, 5)
+        bonus : array-like
+            Bonus numbers with shape (n_draws, bonus_count)
+        date_ordinals : array-like, optional
+            Draw dates as ordinals, one per draw
+        game : str
+            'euromillions' or 'french_loto'
+        """
+        if game not in GAME_CONFIG:
+            raise ValueError(f"Unknown game '{game}', expected one of {list(GAME_CONFIG)}")
+
+        self.game = game
+        config = GAME_CONFIG[game]
+        self.max_number = config['max_number']
+        self.max_bonus = config['max_bonus']
+        self.number_cols = list(config['number_cols'])
+        self.bonus_cols = list(config['bonus_cols'])
+
+        self.numbers = np.ascontiguousarray(np.asarray(numbers, dtype=np.int8).reshape(-1, 5))
+        self.bonus = np.ascontiguousarray(
+            np.asarray(bonus, dtype=np.int8).reshape(-1, config['bonus_count'])
+        )
+        if len(self.bonus) != len(self.numbers):
+            raise ValueError("numbers and bonus must describe the same number of draws")
+
+        if date_ordinals is None:
+            date_ordinals = np.zeros(len(self.numbers), dtype=np.int32)
+        self.date_ordinals = np.ascontiguousarray(np.asarray(date_ordinals, dtype=np.int32))
+
+        self.occurrence = _one_hot(self.numbers, self.max_number)
+        self.bonus_occurrence = _one_hot(self.bonus, self.max_bonus)
+
+    @staticmethod
+    def detect_game(df):
+        """Guess the game of a DataFrame from its bonus columns."""
+        for game, config in GAME_CONFIG.items():
+            for cols in config['bonus_aliases']:
+                if all(col in df.columns for col in cols):
+                    return game
+        raise ValueError("Cannot detect game: no star or lucky number columns found")
+
+    @classmethod
+    def from_dataframe(cls, df, game=None, require_bonus=True):
+        """
+        Build a DrawMatrix from a DataFrame of draws.
+
+        Accepts the column names used across the code base (n1..n5 or
+        number1..number5, s1/s2 or star1/star2, lucky or lucky_number).
+        Missing values are stored as 0 and ignored by the occurrence matrices.
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            Drawing data, in the row order to preserve
+        game : str, optional
+            'euromillions' or 'french_loto'; detected from the columns if omitted
+        require_bonus : bool
+            If False, a DataFrame without bonus columns is accepted and its
+            bonus numbers are treated as missing (only useful with ``game``)
+
+        Returns:
+        --------
+        DrawMatrix
+        """
+        if isinstance(df, cls):
+            return df
+
+        if game is None:
+            game = cls.detect_game(df) if df is not None else 'euromillions'
+        config = GAME_CONFIG[game]
+
+        if df is None or len(df) == 0:
+            return cls(np.zeros((0, 5)), np.zeros((0, config['bonus_count'])), game=game)
+
+        def resolve(aliases, kind):
+            for cols in aliases:
+                if all(col in df.columns for col in cols):
+                    return cols
+            raise ValueError(f"DataFrame has no {kind} columns for {game}")
+
+        number_cols = resolve(config['number_aliases'], 'main number')
+        numbers = _numeric_columns(df, number_cols)
+        try:
+            bonus = _numeric_columns(df, resolve(config['bonus_aliases'], 'bonus number'))
+        except ValueError:
+            if require_bonus:
+                raise
+            bonus = np.zeros((len(df), config['bonus_count']))
+
+        date_ordinals = None
+        if 'date' in df.columns:
+            date_ordinals = _date_ordinals(df['date'])
+
+        return cls(numbers, bonus, date_ordinals, game=game)
+
+    @classmethod
+    def from_database(cls, game='euromillions', since_date=None):
+        """
+        Build a DrawMatrix straight from the drawings table, newest draw first.
+
+        Uses the Core loader so only the date and number columns are read and
+        no ORM objects or intermediate DataFrame are created.
+
+        Parameters:
+        -----------
+        game : str
+            'euromillions' or 'french_loto'
+        since_date : datetime.date or str, optional
+            Only load drawings on or after this date
+
+        Returns:
+        --------
+        DrawMatrix
+            Empty matrix if the table cannot be read
+        """
+        from src.core.database import load_drawings, EuromillionsDrawing, FrenchLotoDrawing
+
+        config = GAME_CONFIG[game]
+        model = EuromillionsDrawing if game == 'euromillions' else FrenchLotoDrawing
+        columns = ['date'] + config['number_cols'] + config['bonus_cols']
+
+        arrays = load_drawings(model, columns=columns, since_date=since_date, as_arrays=True)
+        if len(arrays['date']) == 0:
+            return cls(np.zeros((0, 5)), np.zeros((0, config['bonus_count'])), game=game)
+
+        numbers = np.column_stack([arrays[col] for col in config['number_cols']])
+        bonus = np.column_stack([np.nan_to_num(arrays[col]) for col in config['bonus_cols']])
+        days = arrays['date']
+        date_ordinals = np.where(np.isnat(days), 0, days.astype(np.int64) + _EPOCH_ORDINAL)
+
+        return cls(numbers, bonus, date_ordinals, game=game)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __repr__(self):
+        return f"<DrawMatrix(game='{self.game}', draws={len(self)})>"
+
+    @property
+    def n_draws(self):
+        """Number of draws in the matrix."""
+        return len(self.numbers)
+
+    def number_counts(self):
+        """
+        Count how many times each main number was drawn.
+
+        Returns:
+        --------
+        numpy.ndarray
+            int64 array of length max_number; index ``k`` is number ``k + 1``
+        """
+        return _bincount(self.numbers, self.max_number)
+
+    def bonus_counts(self):
+        """
+        Count how many times each bonus number was drawn.
+
+        Returns:
+        --------
+        numpy.ndarray
+            int64 array of length max_bonus; index ``k`` is bonus ``k + 1``
+        """
+        return _bincount(self.bonus, self.max_bonus)
+
+    def position_counts(self):
+        """
+        Count how many times each main number was drawn at each position.
+
+        Returns:
+        --------
+        numpy.ndarray
+            int64 array of shape (5, max_number); ``[p, k]`` counts number
+            ``k + 1`` drawn as the (p + 1)-th number
+        """
+        width = self.max_number
+        values = self.numbers.astype(np.int64)
+        valid = (values >= 1) & (values <= width)
+        # One bincount over flat (position, number) cells
+        cells = (np.arange(values.shape[1]) * width + values - 1)[valid]
+        return np.bincount(cells, minlength=values.shape[1] * width).reshape(values.shape[1], width)
+
+    def cooccurrence(self):
+        """
+        Shared co-occurrence counts of this history, built on first call.
+
+        Returns:
+        --------
+        CoOccurrence
+        """
+        cached = getattr(self, '_cooccurrence', None)
+        if cached is None:
+            from src.core.cooccurrence import CoOccurrence
+            cached = self._cooccurrence = CoOccurrence(self)
+        return cached
+
+    def draw_shape(self):
+        """
+        Shared per-draw shape features of this history, built on first call.
+
+        Returns:
+        --------
+        DrawShape
+        """
+        cached = getattr(self, '_draw_shape', None)
+        if cached is None:
+            from src.core.draw_shape import DrawShape
+            cached = self._draw_shape = DrawShape(self)
+        return cached
+
+    def take(self, rows):
+        """
+        Return a new DrawMatrix restricted to the given rows.
+
+        Parameters:
+        -----------
+        rows : slice or array-like
+            Row selector (slice, integer indices or boolean mask)
+
+        Returns:
+        --------
+        DrawMatrix
+        """
+        subset = DrawMatrix.__new__(DrawMatrix)
+        subset.game = self.game
+        subset.max_number = self.max_number
+        subset.max_bonus = self.max_bonus
+        subset.number_cols = list(self.number_cols)
+        subset.bonus_cols = list(self.bonus_cols)
+        subset.numbers = np.ascontiguousarray(self.numbers[rows])
+        subset.bonus = np.ascontiguousarray(self.bonus[rows])
+        subset.date_ordinals = np.ascontiguousarray(self.date_ordinals[rows])
+        subset.occurrence = np.ascontiguousarray(self.occurrence[rows])
+        subset.bonus_occurrence = np.ascontiguousarray(self.bonus_occurrence[rows])
+        return subset
+
+    def prepend(self, numbers, bonus, date_ordinal=0):
+        """
+        Return a new DrawMatrix with one draw added as the most recent row.
+
+        Parameters:
+        -----------
+        numbers : list
+            The 5 main numbers of the new draw
+        bonus : list
+            The bonus numbers of the new draw (2 stars or 1 lucky number)
+        date_ordinal : int
+            Draw date as an ordinal (0 if unknown)
+
+        Returns:
+        --------
+        DrawMatrix
+            Sharing this matrix's storage: the row is written into free
+            space in front of it, without copying the history
+        """
+        buffer = getattr(self, '_buffer', None)
+        if buffer is None or buffer.front == 0 or buffer.front != len(buffer.arrays['numbers']) - len(self):
+            # No free row in front, or another matrix already prepended to this one
+            buffer = _RowBuffer(self, 2 * len(self) + _MIN_FRONT_ROWS)
+        buffer.front -= 1
+        row, arrays = buffer.front, buffer.arrays
+        arrays['numbers'][row] = numbers
+        arrays['bonus'][row] = bonus
+        arrays['date_ordinals'][row] = date_ordinal
+        # Free rows are zeros, so only the drawn cells are set (out-of-range values are ignored)
+        for name, values, width in (('occurrence', numbers, self.max_number),
+                                    ('bonus_occurrence', bonus, self.max_bonus)):
+            for value in values:
+                if 1 <= value <= width:
+                    arrays[name][row, value - 1] = 1
+
+        combined = self._empty_like()
+        combined._buffer = buffer
+        for name in _ROW_ARRAYS:
+            setattr(combined, name, buffer.arrays[name][buffer.front:])
+        return combined
+
+    def _empty_like(self):
+        """DrawMatrix with this matrix's game layout and no row arrays yet"""
+        matrix = DrawMatrix.__new__(DrawMatrix)
+        matrix.game = self.game
+        matrix.max_number = self.max_number
+        matrix.max_bonus = self.max_bonus
+        matrix.number_cols = list(self.number_cols)
+        matrix.bonus_cols = list(self.bonus_cols)
+        return matrix
+
+    def insert(self, position, numbers, bonus, date_ordinal=0):
+        """
+        Return a new DrawMatrix with one draw inserted before a row.
+
+        Parameters:
+        -----------
+        position : int
+            Row index of the new draw (0 for the most recent row)
+        numbers : list
+            The 5 main numbers of the new draw
+        bonus : list
+            The bonus numbers of the new draw (2 stars or 1 lucky number)
+        date_ordinal : int
+            Draw date as an ordinal (0 if unknown)
+
+        Returns:
+        --------
+        DrawMatrix
+            New arrays (O(n_draws)); use prepend for the most recent row
+        """
+        row = DrawMatrix([numbers], [bonus], [date_ordinal], game=self.game)
+        combined = self._empty_like()
+        for name in _ROW_ARRAYS:
+            values = getattr(self, name)
+            setattr(combined, name, np.concatenate([values[:position], getattr(row, name), values[position:]]))
+        return combined
+
+    def date_position(self, date_ordinal):
+        """
+        Row at which a draw of the given date goes, most recent draws first.
+
+        Parameters:
+        -----------
+        date_ordinal : int
+            Draw date as an ordinal (0 if unknown)
+
+        Returns:
+        --------
+        int
+            0 when the draw is the latest (or either date is unknown),
+            otherwise the first row older than the draw (the end if none)
+        """
+        if date_ordinal <= 0 or len(self) == 0 or self.date_ordinals[0] <= date_ordinal:
+            return 0
+        older = np.flatnonzero((self.date_ordinals > 0) & (self.date_ordinals < date_ordinal))
+        return int(older[0]) if len(older) else len(self)
+
+    def dates(self):
+        """
+        Draw dates as a pandas DatetimeIndex (NaT where unknown).
+
+        Returns:
+        --------
+        pandas.DatetimeIndex
+        """
+        return pd.DatetimeIndex([
+            pd.Timestamp(date.fromordinal(int(o))) if o > 0 else pd.NaT
+            for o in self.date_ordinals
+        ])
+
+    def to_dataframe(self):
+        """
+        Convert back to the DataFrame layout used by the database loaders.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Columns date, n1..n5 and s1, s2 (Euromillions) or lucky (French Loto)
+        """
+        frame = {'date': self.dates()}
+        for i, col in enumerate(self.number_cols):
+            frame[col] = self.numbers[:, i].astype(np.int64)
+        for i, col in enumerate(self.bonus_cols):
+            frame[col] = self.bonus[:, i].astype(np.int64)
+        return pd.DataFrame(frame)
+
+
+def as_draw_matrix(data, game=None, require_bonus=True):
+    """
+    Return ``data`` as a DrawMatrix, converting DataFrames when needed.
+
+    Parameters:
+    -----------
+    data : DrawMatrix or pandas.DataFrame
+        Draw history
+    game : str, optional
+        Game name used when converting a DataFrame
+    require_bonus : bool
+        Passed to DrawMatrix.from_dataframe
+
+    Returns:
+    --------
+    DrawMatrix
+    """
+    if isinstance(data, DrawMatrix):
+        return data
+    return DrawMatrix.from_dataframe(data, game=game, require_bonus=require_bonus)
+
+
+def parse_draw(draw, game):
+    """
+    Normalize a single draw to (numbers, bonus, date_ordinal).
+
+    Accepts either the ``{'date', 'numbers', 'stars'|'lucky'}`` layout used by
+    the insert functions or a row with n1..n5 and s1/s2 or lucky columns.
+
+    Parameters:
+    -----------
+    draw : dict or pandas.Series
+        The draw to normalize
+    game : str
+        'euromillions' or 'french_loto'
+
+    Returns:
+    --------
+    tuple
+        (list of 5 ints, list of bonus ints, int date ordinal)
+    """
+    config = GAME_CONFIG[game]
+
+    if 'numbers' in draw:
+        numbers = [int(n) for n in draw['numbers']]
+        if game == 'euromillions':
+            bonus = [int(s) for s in draw['stars']]
+        else:
+            lucky = draw['lucky'] if 'lucky' in draw else draw['lucky_number']
+            bonus = [int(lucky)]
+    else:
+        numbers = [int(draw[col]) for col in config['number_cols']]
+        bonus_cols = next(cols for cols in config['bonus_aliases'] if all(col in draw for col in cols))
+        bonus = [int(draw[col]) for col in bonus_cols]
+
+    if len(numbers) != 5 or len(bonus) != config['bonus_count']:
+        raise ValueError(f"Invalid {game} draw: {numbers} / {bonus}")
+
+    date_ordinal = _date_ordinal(draw['date'] if 'date' in draw else None)
+
+    return numbers, bonus, date_ordinal
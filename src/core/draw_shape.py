@@ -0,0 +1,99 @@
+"""
+Per-draw shape features: sum, spread, even count, low count, consecutive pairs, decades.
+
+A DrawShape computes every feature of every draw of a DrawMatrix in one
+vectorized pass (see ``DrawMatrix.draw_shape``). The sum, even/odd,
+low/high, consecutive and decade statistics of both games are histograms
+of these columns instead of row-by-row loops.
+"""
+
+import numpy as np
+
+
+def most_common(values):
+    """
+    Most frequent value of an integer array.
+
+    Ties go to the value seen first, like ``Counter.most_common(1)``.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        1-D integer array
+
+    Returns:
+    --------
+    int or None
+        The most common value (None for an empty array)
+    """
+    if len(values) == 0:
+        return None
+    unique, first_seen, counts = np.unique(values, return_index=True, return_counts=True)
+    best = np.flatnonzero(counts == counts.max())
+    return int(unique[best[np.argmin(first_seen[best])]])
+
+
+class DrawShape:
+    """
+    Shape feature columns of a draw history, one entry per draw.
+
+    ``low_counts`` counts numbers up to ``low_limit`` (25 for Euromillions,
+    24 for French Loto). ``decades[i, d]`` counts the numbers of draw i in
+    ``10 * d .. 10 * d + 9``.
+    """
+
+    def __init__(self, draws):
+        """
+        Initialize from a DrawMatrix.
+
+        Parameters:
+        -----------
+        draws : DrawMatrix
+            Draw history
+        """
+        numbers = draws.numbers.astype(np.int64)
+        ordered = np.sort(numbers, axis=1)
+        self.n_draws, self.draw_size = numbers.shape
+        self.low_limit = draws.max_number // 2
+
+        self.sums = numbers.sum(axis=1)
+        self.spreads = ordered[:, -1] - ordered[:, 0]
+        self.even_counts = np.count_nonzero(numbers % 2 == 0, axis=1)
+        self.low_counts = np.count_nonzero(numbers <= self.low_limit, axis=1)
+        self.consecutive_counts = np.count_nonzero(np.diff(ordered, axis=1) == 1, axis=1)
+
+        n_decades = draws.max_number // 10 + 1
+        cells = np.arange(self.n_draws)[:, np.newaxis] * n_decades + np.clip(numbers // 10, 0, n_decades - 1)
+        self.decades = np.bincount(cells.ravel(), minlength=self.n_draws * n_decades).reshape(-1, n_decades)
+
+    def histogram(self, column, size=None):
+        """
+        Number of draws for each value of a count column.
+
+        Parameters:
+        -----------
+        column : numpy.ndarray
+            One of the per-draw count columns (e.g. ``even_counts``)
+        size : int, optional
+            Minimum length (default: draw size + 1)
+
+        Returns:
+        --------
+        numpy.ndarray
+            ``hist[k]`` is the number of draws whose value is k
+        """
+        return np.bincount(column, minlength=self.draw_size + 1 if size is None else size)
+
+    def even_odd_pattern(self):
+        """Most common even/odd pattern, e.g. ``'2e-3o'`` ('Unknown' without draws)"""
+        even = most_common(self.even_counts)
+        if even is None:
+            return "Unknown"
+        return f"{even}e-{self.draw_size - even}o"
+
+    def low_high_pattern(self):
+        """Most common low/high pattern, e.g. ``'3l-2h'`` ('Unknown' without draws)"""
+        low = most_common(self.low_counts)
+        if low is None:
+            return "Unknown"
+        return f"{low}l-{self.draw_size - low}h"
@@ -13,6 +13,10 @@ import random
 from collections import Counter
 import logging
 
+import numpy as np
+
+from src.core.batch_scoring import fibonacci_boosts, fibonacci_hybrid_scores
+
 logger = logging.getLogger(__name__)
 
 
@@ -115,55 +119,32 @@ class EnsembleStrategies:
         filtered_combinations = []
 
         for strategy_name, strategy_candidates in candidates.items():
-            for candidate in strategy_candidates:
-                # Calculate Fibonacci metrics
-                fib_count = len([n for n in candidate['numbers'] if n in self.fibonacci_numbers])
-                fib_percentage = fib_count / 5 * 100
-
-                # Calculate Fibonacci score boost
-                fibonacci_boost = 0
-
-                # Boost for Fibonacci presence
-                if fib_percentage >= 60:  # 3+ Fibonacci numbers
-                    fibonacci_boost += 25
-                elif fib_percentage >= 40:  # 2 Fibonacci numbers
-                    fibonacci_boost += 15
-                elif fib_percentage >= 20:  # 1 Fibonacci number
-                    fibonacci_boost += 8
-
-                # Bonus for specific Fibonacci patterns
-                if 1 in candidate['numbers'] and 8 in candidate['numbers']:
-                    fibonacci_boost += 10
-                if 13 in candidate['numbers']:
-                    fibonacci_boost += 8
-                if 21 in candidate['numbers']:
-                    fibonacci_boost += 5
-
-                # Star bonuses (common winning stars)
-                star_boost = 0
-                if 5 in candidate['stars']:
-                    star_boost += 5
-                if 6 in candidate['stars']:
-                    star_boost += 5
-                if 8 in candidate['stars']:
-                    star_boost += 3
-
-                # Calculate final hybrid score
-                base_score = candidate.get('score', 50)
-                final_score = min(base_score + fibonacci_boost + star_boost, 100.0)
+            if not strategy_candidates:
+                continue
+
+            # Fibonacci presence and pattern boosts, star boosts (common winning stars)
+            # and the hybrid score, for all candidates of the strategy at once
+            numbers = [candidate['numbers'] for candidate in strategy_candidates]
+            stars = [candidate['stars'] for candidate in strategy_candidates]
+            base_scores = [candidate.get('score', 50) for candidate in strategy_candidates]
+            fib_counts, fib_boosts, star_boosts = fibonacci_boosts(
+                np.asarray(numbers).reshape(-1, 5), np.asarray(stars).reshape(len(stars), -1), self.fibonacci_numbers
+            )
+            final_scores = fibonacci_hybrid_scores(base_scores, fib_boosts, star_boosts)
 
+            for i, candidate in enumerate(strategy_candidates):
                 # Create enhanced combination
                 enhanced_combo = {
                     'numbers': candidate['numbers'],
                     'stars': candidate['stars'],
                     'strategy': f"Fibonacci-Filtered {strategy_name.replace('_', ' ').title()}",
                     'base_strategy': strategy_name,
-                    'fibonacci_count': fib_count,
-                    'fibonacci_percentage': fib_percentage,
-                    'base_score': base_score,
-                    'fibonacci_boost': fibonacci_boost,
-                    'star_boost': star_boost,
-                    'score': final_score
+                    'fibonacci_count': int(fib_counts[i]),
+                    'fibonacci_percentage': int(fib_counts[i]) / 5 * 100,
+                    'base_score': base_scores[i],
+                    'fibonacci_boost': int(fib_boosts[i]),
+                    'star_boost': int(star_boosts[i]),
+                    'score': float(final_scores[i])
                 }
 
                 filtered_combinations.append(enhanced_combo)
@@ -151,9 +151,13 @@ def get_fibonacci_strategy_info():
         "Fibonacci Enhanced": "Advanced mix optimizing Fibonacci patterns with winning insights. Recommended approach."
     }
 
-def save_fibonacci_to_database(combinations, engine):
-    """Save Fibonacci combinations to database"""
-    import pandas as pd
+def save_fibonacci_to_database(combinations, engine=None):
+    """Save Fibonacci combinations to database in one batched insert
+
+    The engine argument is kept for backward compatibility; rows go through
+    save_generated_combinations_bulk on the shared database engine.
+    """
+    from src.core.database import save_generated_combinations_bulk
     
     try:
         # Calculate target draw date
@@ -163,22 +167,9 @@ def save_fibonacci_to_database(combinations, engine):
             days_until_friday = 7
         next_draw_date = today + timedelta(days=days_until_friday)
         
-        records = []
-        for combo in combinations:
-            record = {
-                'numbers': str(combo['numbers']),
-                'stars': str(combo['stars']),
-                'strategy': combo['strategy'],
-                'score': combo['score'],
-                'target_draw_date': next_draw_date.date(),
-                'created_at': datetime.now().date()
-            }
-            records.append(record)
-        
-        df = pd.DataFrame(records)
-        df.to_sql('generated_combinations', engine, if_exists='append', index=False)
+        ids = save_generated_combinations_bulk(combinations, target_draw_date=next_draw_date.date())
         
-        return True, len(combinations)
+        return True, len(ids)
         
     except Exception as e:
-        return False, str(e)
\ No newline at end of file
+        return False, str(e)
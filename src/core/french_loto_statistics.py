@@ -9,35 +9,212 @@ from sqlalchemy import text
 import logging
 import os
 from datetime import date, timedelta, datetime
+from functools import cached_property
+
+from src.core.draw_matrix import DrawMatrix, as_draw_matrix, parse_draw
+from src.core.draw_aggregates import DrawAggregates
+from src.core.frequency_index import FrequencyIndex
+from src.core.decayed_frequency import DecayedFrequency, DEFAULT_HALF_LIFE
+from src.core.statistics_view import StatisticsView
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _ordinal_to_date(ordinal):
+    """Date of a DrawMatrix date ordinal (None when the date is missing)"""
+    return date.fromordinal(ordinal) if ordinal > 0 else None
+
+def _sorted_frequencies(counts):
+    """{number: count} of a counts array, most frequent first (ties by number)"""
+    order = np.argsort(-counts, kind='stable')
+    return {int(i) + 1: int(counts[i]) for i in order}
+
 class FrenchLotoStatistics:
     """
     Class for analyzing French Loto data and generating statistics
+    
+    Derived statistics (frequencies, hot/cold numbers, pairs, indexes) are
+    memoized properties computed on first use and dropped by ``apply_draw``
+    when the draws change. The caller's DataFrame is never modified.
     """
     
+    # Memoized properties that depend on the draws
+    _DERIVED = ('main_number_freq', 'lucky_number_freq', 'aggregates', 'frequency_index',
+                'hot_cold_numbers', 'pair_analysis', 'decayed_frequencies')
+    
     def __init__(self, data):
         """
         Initialize with French Loto data
         
         Args:
-            data: pandas DataFrame containing French Loto data
+            data: pandas DataFrame or DrawMatrix containing French Loto data
+        """
+        if isinstance(data, DrawMatrix):
+            self.draws = data
+            self._source = None
+        else:
+            self.draws = DrawMatrix.from_dataframe(data, game='french_loto')
+            self._source = data
+        self._data = None
+        # Rows of draws applied since data was last read, oldest first
+        self._pending_rows = []
+    
+    @property
+    def data(self):
+        """Draws as a DataFrame with n1..n5, lucky and datetime dates, built on first use"""
+        if self._data is None:
+            self.process_data()
+            self._pending_rows = []
+        elif self._pending_rows:
+            # Draws applied since the last read, added in one concat
+            combined = pd.concat([pd.DataFrame(self._pending_rows[::-1]), self._data], ignore_index=True)
+            columns = list(self._data.columns)
+            self._data = combined[columns + [c for c in combined.columns if c not in columns]]
+            self._pending_rows = []
+        return self._data
+    
+    @cached_property
+    def main_number_freq(self):
+        """{number: count} of the main numbers, most frequent first"""
+        return _sorted_frequencies(self.draws.number_counts())
+    
+    @cached_property
+    def lucky_number_freq(self):
+        """{lucky number: count}, most frequent first"""
+        return _sorted_frequencies(self.draws.bonus_counts())
+    
+    @cached_property
+    def aggregates(self):
+        """DrawAggregates of the draws, kept up to date by apply_draw once built"""
+        return DrawAggregates(self.draws)
+    
+    @cached_property
+    def frequency_index(self):
+        """FrequencyIndex (cumulative counts) of the draws, built on first use"""
+        return FrequencyIndex(self.draws)
+    
+    @cached_property
+    def hot_cold_numbers(self):
+        """Hot and cold numbers of the last year, see get_hot_cold_numbers"""
+        return self.get_hot_cold_numbers()
+    
+    @cached_property
+    def pair_analysis(self):
+        """Most frequent pairs, see analyze_number_pairs"""
+        return self.analyze_number_pairs()
+    
+    @cached_property
+    def decayed_frequencies(self):
+        """{half_life: DecayedFrequency} built so far, kept up to date by apply_draw"""
+        return {}
+    
+    def get_decayed_frequency(self, half_life=DEFAULT_HALF_LIFE):
         """
-        self.data = data
-        self.process_data()
-        self.analyze_frequencies()
-        self.hot_cold_numbers = self.get_hot_cold_numbers()
-        self.pair_analysis = self.analyze_number_pairs()
+        Exponentially decayed frequencies of the main and lucky numbers
         
-    def process_data(self):
-        """Process the data to ensure it's in the right format"""
-        # Ensure date is in datetime format
-        if 'date' in self.data.columns:
-            self.data['date'] = pd.to_datetime(self.data['date'])
+        Args:
+            half_life: Number of draws after which a draw's weight is halved
             
+        Returns:
+            DecayedFrequency: Decayed state, built on first use for each half-life
+        """
+        states = self.decayed_frequencies
+        if half_life not in states:
+            states[half_life] = DecayedFrequency(self.draws, half_life)
+        return states[half_life]
+    
+    def _invalidate(self, keep=()):
+        """Drop the memoized statistics, except those listed in ``keep``"""
+        for name in self._DERIVED:
+            if name not in keep:
+                self.__dict__.pop(name, None)
+    
+    def view(self, as_of_index):
+        """
+        Statistics restricted to the draws strictly before a cut-off
+        
+        Args:
+            as_of_index: Number of draws, oldest first, visible from the view
+            
+        Returns:
+            StatisticsView: O(1) view sharing this object's cumulative index
+        """
+        return StatisticsView(self, as_of_index)
+    
+    def apply_draw(self, draw):
+        """
+        Fold a newly published draw into the statistics without a rescan
+        
+        The aggregates (recent window, gap counters, pair counts and the
+        sum/even-odd histograms, built on the first call) and the frequencies
+        already built are updated in O(numbers), and the draw is written into
+        free rows in front of the DrawMatrix; the recency, pair, sum and
+        even/odd statistics are then served from the aggregates. The draw
+        becomes the most recent row of ``data`` the next time it is read.
+        A draw dated before the latest one is inserted in date order
+        instead and the derived statistics are rebuilt on next use.
+        
+        Args:
+            draw: {'date': ..., 'numbers': [5 ints], 'lucky': int} or a row
+                with n1..n5 and lucky columns
+        """
+        numbers, bonus, date_ordinal = parse_draw(draw, 'french_loto')
+        lucky = bonus[0]
+        
+        position = self.draws.date_position(date_ordinal)
+        if position > 0:
+            # Older than the latest draw: insert it in date order and rebuild on use
+            self.draws = self.draws.insert(position, numbers, bonus, date_ordinal)
+            self._invalidate()
+            if self._data is not None:
+                data = self.data
+                row = self._data_row(numbers, lucky, draw)
+                self._data = pd.concat([data.iloc[:position], pd.DataFrame([row]), data.iloc[position:]],
+                                       ignore_index=True)
+            elif self._source is not None:
+                # Not processed yet: rebuild from the updated matrix instead
+                self._source = None
+            return
+        
+        # Aggregates are built on the current draws the first time, then kept up to date
+        self.aggregates
+        self.draws = self.draws.prepend(numbers, bonus, date_ordinal)
+        
+        # Statistics already built are updated in place, the others are dropped
+        memo = self.__dict__
+        self._invalidate(keep=('main_number_freq', 'lucky_number_freq', 'aggregates',
+                               'decayed_frequencies'))
+        self.aggregates.apply(self.draws)
+        for state in memo.get('decayed_frequencies', {}).values():
+            state.update(numbers, bonus)
+        if 'main_number_freq' in memo:
+            for num in numbers:
+                self.main_number_freq[num] = self.main_number_freq.get(num, 0) + 1
+            self.main_number_freq = dict(sorted(self.main_number_freq.items(), key=lambda x: x[1], reverse=True))
+        if 'lucky_number_freq' in memo:
+            self.lucky_number_freq[lucky] = self.lucky_number_freq.get(lucky, 0) + 1
+            self.lucky_number_freq = dict(sorted(self.lucky_number_freq.items(), key=lambda x: x[1], reverse=True))
+        if self._data is not None:
+            self._pending_rows.append(self._data_row(numbers, lucky, draw))
+        elif self._source is not None:
+            # Not processed yet: rebuild from the updated matrix instead
+            self._source = None
+    
+    def _data_row(self, numbers, lucky, draw):
+        """Row of ``data`` for an applied draw"""
+        row = {'n1': numbers[0], 'n2': numbers[1], 'n3': numbers[2], 'n4': numbers[3], 'n5': numbers[4]}
+        row['lucky' if 'lucky' in self._data.columns else 'lucky_number'] = lucky
+        if 'date' in self._data.columns:
+            row['date'] = pd.Timestamp(draw['date']) if 'date' in draw else pd.NaT
+        return row
+    
+    def process_data(self):
+        """Build ``data`` in the standard format without modifying the source DataFrame"""
+        if self._source is None:
+            self._data = self.draws.to_dataframe()
+            return
+        
         # Rename columns if needed to standard format
         column_mapping = {
             'number1': 'n1',
@@ -48,51 +225,27 @@ class FrenchLotoStatistics:
             'lucky_number': 'lucky'
         }
         
-        # Rename only if the columns exist
-        for old_col, new_col in column_mapping.items():
-            if old_col in self.data.columns and new_col not in self.data.columns:
-                self.data.rename(columns={old_col: new_col}, inplace=True)
+        # Rename only if the columns exist (rename returns a new frame)
+        renames = {old_col: new_col for old_col, new_col in column_mapping.items()
+                   if old_col in self._source.columns and new_col not in self._source.columns}
+        data = self._source.rename(columns=renames)
+        
+        # Ensure date is in datetime format
+        if 'date' in data.columns:
+            data = data.assign(date=pd.to_datetime(data['date']))
+        self._data = data
     
     def analyze_frequencies(self):
         """
         Analyze frequency of numbers in French Loto
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             logger.error("No data available for frequency analysis")
             return
         
-        # Create dictionaries to store frequencies
-        self.main_number_freq = {}
-        self.lucky_number_freq = {}
-        
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-        
-        # Get column name for lucky number
-        lucky_col = 'lucky' if 'lucky' in self.data.columns else 'lucky_number'
-        
-        # Count frequency of main numbers (1-49)
-        main_numbers = []
-        for col in main_cols:
-            main_numbers.extend(self.data[col].tolist())
-        
-        for i in range(1, 50):
-            self.main_number_freq[i] = main_numbers.count(i)
-        
-        # Count frequency of lucky numbers (1-10)
-        lucky_numbers = self.data[lucky_col].tolist()
-        for i in range(1, 11):
-            self.lucky_number_freq[i] = lucky_numbers.count(i)
-        
-        # Sort dictionaries by frequency (descending)
-        self.main_number_freq = dict(sorted(self.main_number_freq.items(), 
-                                            key=lambda x: x[1], 
-                                            reverse=True))
-        self.lucky_number_freq = dict(sorted(self.lucky_number_freq.items(), 
-                                             key=lambda x: x[1], 
-                                             reverse=True))
+        # np.bincount over the draw arrays (index k is number k + 1), sorted by frequency
+        self.main_number_freq = _sorted_frequencies(self.draws.number_counts())
+        self.lucky_number_freq = _sorted_frequencies(self.draws.bonus_counts())
     
     def get_hot_cold_numbers(self, period_days=365):
         """
@@ -104,7 +257,7 @@ class FrenchLotoStatistics:
         Returns:
             dict: Hot and cold numbers
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             logger.error("No data available for hot/cold analysis")
             return {
                 'hot_numbers': [],
@@ -113,97 +266,43 @@ class FrenchLotoStatistics:
                 'cold_lucky': []
             }
         
-        # Ensure date is datetime
-        self.data['date'] = pd.to_datetime(self.data['date'])
+        index = self.frequency_index
         
-        # Get latest date in dataset
-        latest_date = self.data['date'].max()
-        
-        # Define recent period
-        cutoff_date = latest_date - pd.Timedelta(days=period_days)
-        
-        # Split into recent and older data
-        recent_data = self.data[self.data['date'] >= cutoff_date]
+        # Draws of the last period_days days, counted from the cumulative index
+        latest_ordinal = index.latest_ordinal()
+        cutoff_ordinal = latest_ordinal - period_days
+        main_counts, lucky_counts, recent_size = index.counts_between(cutoff_ordinal, latest_ordinal)
         
         # If recent data is very small, use more data
-        if len(recent_data) < 10:
+        if recent_size < 10:
             # Use at least 20% of total data as recent
-            min_recent_size = max(10, int(len(self.data) * 0.2))
-            recent_data = self.data.sort_values('date', ascending=False).head(min_recent_size)
-            cutoff_date = recent_data['date'].min()
-        
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-        
-        # Get column name for lucky number
-        lucky_col = 'lucky' if 'lucky' in self.data.columns else 'lucky_number'
-        
-        # Analyze recent frequency
-        recent_main_numbers = []
-        for col in main_cols:
-            recent_main_numbers.extend(recent_data[col].tolist())
-        
-        recent_main_freq = {}
-        for i in range(1, 50):
-            recent_main_freq[i] = recent_main_numbers.count(i)
-        
-        recent_lucky_numbers = recent_data[lucky_col].tolist()
-        recent_lucky_freq = {}
-        for i in range(1, 11):
-            recent_lucky_freq[i] = recent_lucky_numbers.count(i)
+            recent_size = min(len(self.draws), max(10, int(len(self.draws) * 0.2)))
+            main_counts, lucky_counts = index.counts_by_date_rank(0, recent_size)
+            cutoff_ordinal = int(index.sorted_ordinals[recent_size - 1])
         
         # Identify hot numbers (above average frequency in recent period)
-        avg_main_freq = sum(recent_main_freq.values()) / len(recent_main_freq) if recent_main_freq else 0
-        hot_numbers = [n for n, freq in recent_main_freq.items() 
-                       if freq > avg_main_freq * 1.2]
-        
-        # For cold numbers, use global frequency to ensure we have results
-        # Cold numbers are those with low frequency in recent period AND low overall frequency
-        if not hasattr(self, 'main_number_freq'):
-            self.analyze_frequencies()
-        
-        # Get overall frequencies for comparison
-        overall_avg = sum(self.main_number_freq.values()) / len(self.main_number_freq) if self.main_number_freq else 0
+        hot_numbers = (np.flatnonzero(main_counts > main_counts.mean() * 1.2) + 1).tolist()
         
         # Cold numbers: low in recent period OR low overall (take bottom 20% of recent + bottom 20% overall)
-        recent_sorted = sorted(recent_main_freq.items(), key=lambda x: x[1])
-        cold_threshold_recent = len(recent_sorted) // 5  # Bottom 20%
-        cold_numbers_recent = [n for n, _ in recent_sorted[:max(1, cold_threshold_recent)]]
-        
-        # Also include numbers that are cold overall
-        overall_sorted = sorted(self.main_number_freq.items(), key=lambda x: x[1])
-        cold_threshold_overall = len(overall_sorted) // 5  # Bottom 20%
-        cold_numbers_overall = [n for n, _ in overall_sorted[:max(1, cold_threshold_overall)]]
+        cold_numbers_recent = np.argsort(main_counts, kind='stable')[:max(1, 49 // 5)] + 1
+        overall_counts = index.counts()[0]
+        cold_numbers_overall = np.argsort(overall_counts, kind='stable')[:max(1, 49 // 5)] + 1
         
         # Combine and deduplicate
-        cold_numbers = sorted(list(set(cold_numbers_recent + cold_numbers_overall)))[:15]  # Limit to 15
+        cold_numbers = sorted(set(cold_numbers_recent.tolist() + cold_numbers_overall.tolist()))[:15]  # Limit to 15
         
         # Identify hot lucky numbers
-        avg_lucky_freq = sum(recent_lucky_freq.values()) / len(recent_lucky_freq) if recent_lucky_freq else 0
-        hot_lucky = [n for n, freq in recent_lucky_freq.items() 
-                     if freq > avg_lucky_freq * 1.2]
-        
-        # For cold lucky numbers, use similar approach
-        if not hasattr(self, 'lucky_number_freq'):
-            self.analyze_frequencies()
-        
-        lucky_sorted = sorted(recent_lucky_freq.items(), key=lambda x: x[1])
-        cold_threshold_lucky = max(1, len(lucky_sorted) // 3)  # Bottom 33%
-        cold_lucky = [n for n, _ in lucky_sorted[:cold_threshold_lucky]]
+        hot_lucky = (np.flatnonzero(lucky_counts > lucky_counts.mean() * 1.2) + 1).tolist()
         
-        # If still empty, use overall least frequent
-        if not cold_lucky and hasattr(self, 'lucky_number_freq'):
-            overall_lucky_sorted = sorted(self.lucky_number_freq.items(), key=lambda x: x[1])
-            cold_lucky = [n for n, _ in overall_lucky_sorted[:3]]  # Bottom 3
+        # Bottom 33% of the recent lucky numbers
+        cold_lucky = (np.argsort(lucky_counts, kind='stable')[:max(1, 10 // 3)] + 1).tolist()
         
         return {
             'hot_numbers': sorted(hot_numbers),
             'cold_numbers': sorted(cold_numbers),
             'hot_lucky': sorted(hot_lucky),
             'cold_lucky': sorted(cold_lucky),
-            'recent_period': f"{cutoff_date.date()} to {latest_date.date()}"
+            'recent_period': f"{_ordinal_to_date(cutoff_ordinal)} to {_ordinal_to_date(latest_ordinal)}"
         }
     
     def analyze_number_pairs(self):
@@ -213,35 +312,15 @@ class FrenchLotoStatistics:
         Returns:
             dict: Top 20 number pairs by frequency
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             logger.error("No data available for pair analysis")
             return {}
         
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-        
-        # Get all possible pairs from each drawing
-        pairs = []
-        
-        for _, row in self.data.iterrows():
-            numbers = [row[col] for col in main_cols]
-            for i in range(len(numbers)):
-                for j in range(i+1, len(numbers)):
-                    # Ensure pairs are ordered (smaller number first)
-                    pair = tuple(sorted([numbers[i], numbers[j]]))
-                    pairs.append(pair)
-        
-        # Count frequency of each pair
-        pair_counts = {}
-        for pair in pairs:
-            pair_counts[pair] = pair_counts.get(pair, 0) + 1
-        
-        # Sort by frequency and get top 20
-        top_pairs = dict(sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)[:20])
-        
-        return top_pairs
+        # Pair counts kept up to date by apply_draw, else the shared X.T @ X pair matrix
+        aggregates = self.__dict__.get('aggregates')
+        if aggregates is not None:
+            return aggregates.top_pairs(20)
+        return self.draws.cooccurrence().top_pairs(20)
     
     def get_hot_numbers(self, count=10):
         """
@@ -396,39 +475,20 @@ class FrenchLotoStatistics:
         Returns:
             pandas.DataFrame: Distribution of even/odd combinations
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             return pd.DataFrame()
-            
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-            
-        # Create a dictionary to store counts of different even/odd combinations
-        even_odd_dist = {
-            '0 Even - 5 Odd': 0,
-            '1 Even - 4 Odd': 0,
-            '2 Even - 3 Odd': 0,
-            '3 Even - 2 Odd': 0,
-            '4 Even - 1 Odd': 0,
-            '5 Even - 0 Odd': 0
-        }
         
-        # Count combinations
-        for _, row in self.data.iterrows():
-            even_count = sum(1 for col in main_cols if int(row[col]) % 2 == 0)
-            odd_count = 5 - even_count
-            key = f"{even_count} Even - {odd_count} Odd"
-            even_odd_dist[key] += 1
-            
+        # Running histogram of the even count of each draw
+        counts = self.aggregates.even_histogram[:6]
+        
         # Convert to DataFrame
         dist_df = pd.DataFrame({
-            'Combination': list(even_odd_dist.keys()),
-            'Count': list(even_odd_dist.values())
+            'Combination': [f"{even} Even - {5 - even} Odd" for even in range(6)],
+            'Count': counts
         })
         
         # Calculate percentage
-        dist_df['Percentage'] = (dist_df['Count'] / len(self.data) * 100).round(2)
+        dist_df['Percentage'] = (dist_df['Count'] / len(self.draws) * 100).round(2)
         
         return dist_df
         
@@ -439,16 +499,11 @@ class FrenchLotoStatistics:
         Returns:
             pandas.DataFrame: Sum distribution grouped into ranges
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             return pd.DataFrame()
-            
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-            
-        # Calculate sum for each drawing
-        self.data['sum'] = self.data[main_cols].sum(axis=1)
+        
+        # Distinct draw sums and their counts, from the running sum histogram
+        sums, sum_counts = self.aggregates.sum_values()
         
         # Create ranges for grouping
         ranges = [
@@ -461,18 +516,20 @@ class FrenchLotoStatistics:
         bins = [r[0] for r in ranges] + [ranges[-1][1] + 1]
         labels = [f"{r[0]}-{r[1]}" for r in ranges]
         
-        # Group by range
-        self.data['sum_range'] = pd.cut(self.data['sum'], bins=bins, labels=labels, right=False)
-        sum_dist = self.data['sum_range'].value_counts().sort_index()
+        # Group by range (sums outside the bins are not counted)
+        range_index = np.searchsorted(bins, sums, side='right') - 1
+        in_range = (range_index >= 0) & (range_index < len(labels))
+        counts = np.bincount(range_index[in_range], weights=sum_counts[in_range],
+                             minlength=len(labels)).astype(np.int64)
         
         # Convert to DataFrame
         dist_df = pd.DataFrame({
-            'Range': sum_dist.index,
-            'Count': sum_dist.values
+            'Range': pd.Categorical(labels, categories=labels, ordered=True),
+            'Count': counts
         })
         
         # Calculate percentage
-        dist_df['Percentage'] = (dist_df['Count'] / len(self.data) * 100).round(2)
+        dist_df['Percentage'] = (dist_df['Count'] / len(self.draws) * 100).round(2)
         
         return dist_df
         
@@ -483,39 +540,28 @@ class FrenchLotoStatistics:
         Returns:
             pandas.DataFrame: Distribution of numbers across ranges
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             return pd.DataFrame()
-            
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-            
-        # Define ranges
+        
+        # Define ranges (the decades of the shape features)
         ranges = [
             (1, 9), (10, 19), (20, 29), (30, 39), (40, 49)
         ]
         
-        # Initialize counters for each range
-        range_counts = {f"{r[0]}-{r[1]}": 0 for r in ranges}
-        
-        # Count numbers in each range
-        for _, row in self.data.iterrows():
-            for col in main_cols:
-                num = int(row[col])
-                for r in ranges:
-                    if r[0] <= num <= r[1]:
-                        range_counts[f"{r[0]}-{r[1]}"] += 1
-                        break
+        # Count numbers in each range; missing numbers (0) fall outside 1-9
+        decades = self.draws.draw_shape().decades.sum(axis=0)
+        missing = int(np.count_nonzero(self.draws.numbers == 0))
+        counts = decades[:len(ranges)].copy()
+        counts[0] -= missing
         
         # Convert to DataFrame
         dist_df = pd.DataFrame({
-            'Range': list(range_counts.keys()),
-            'Count': list(range_counts.values())
+            'Range': [f"{r[0]}-{r[1]}" for r in ranges],
+            'Count': counts
         })
         
         # Calculate percentage
-        total_numbers = len(self.data) * 5  # Total numbers drawn
+        total_numbers = len(self.draws) * 5  # Total numbers drawn
         dist_df['Percentage'] = (dist_df['Count'] / total_numbers * 100).round(2)
         
         return dist_df
@@ -572,40 +618,17 @@ class FrenchLotoStatistics:
         Returns:
             dict: Dictionary with distribution statistics
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             return {
                 'even_odd_pattern': 'N/A',
                 'low_high_pattern': 'N/A'
             }
         
-        # Get column names for main numbers
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-        
-        # Calculate even/odd patterns
-        even_odd_patterns = []
-        low_high_patterns = []
-        
-        for _, row in self.data.iterrows():
-            numbers = [int(row[col]) for col in main_cols]
-            even_count = sum(1 for n in numbers if n % 2 == 0)
-            odd_count = 5 - even_count
-            even_odd_patterns.append(f"{even_count}e-{odd_count}o")
-            
-            # Low/high: numbers 1-24 are low, 25-49 are high
-            low_count = sum(1 for n in numbers if n <= 24)
-            high_count = 5 - low_count
-            low_high_patterns.append(f"{low_count}l-{high_count}h")
-        
-        # Get most common pattern
-        from collections import Counter
-        most_common_even_odd = Counter(even_odd_patterns).most_common(1)[0][0]
-        most_common_low_high = Counter(low_high_patterns).most_common(1)[0][0]
-        
+        # Most common patterns of the shared shape features (1-24 are low, 25-49 high)
+        shape = self.draws.draw_shape()
         return {
-            'even_odd_pattern': most_common_even_odd,
-            'low_high_pattern': most_common_low_high
+            'even_odd_pattern': shape.even_odd_pattern(),
+            'low_high_pattern': shape.low_high_pattern()
         }
     
     def get_recency_stats(self, draws=20):
@@ -618,48 +641,26 @@ class FrenchLotoStatistics:
         Returns:
             dict: Dictionary with recent statistics including hot numbers and hot lucky numbers
         """
-        if self.data is None or len(self.data) == 0:
+        if len(self.draws) == 0:
             return {
                 'hot_numbers': [],
                 'hot_lucky': []
             }
         
-        # Get recent draws
-        recent_data = self.data.sort_values('date', ascending=False).head(draws)
-        
-        # Get column names
-        main_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        if 'n1' not in self.data.columns and 'number1' in self.data.columns:
-            main_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-        lucky_col = 'lucky' if 'lucky' in self.data.columns else 'lucky_number'
-        
-        # Count frequencies in recent draws
-        recent_main_numbers = []
-        for col in main_cols:
-            recent_main_numbers.extend(recent_data[col].tolist())
-        
-        recent_main_freq = {}
-        for i in range(1, 50):
-            recent_main_freq[i] = recent_main_numbers.count(i)
-        
-        recent_lucky_numbers = recent_data[lucky_col].tolist()
-        recent_lucky_freq = {}
-        for i in range(1, 11):
-            recent_lucky_freq[i] = recent_lucky_numbers.count(i)
-        
-        # Get hot numbers (above average)
-        avg_main_freq = sum(recent_main_freq.values()) / len(recent_main_freq) if recent_main_freq else 0
-        hot_numbers = [n for n, freq in recent_main_freq.items() 
-                      if freq > avg_main_freq * 1.2]
-        
-        # Get hot lucky numbers
-        avg_lucky_freq = sum(recent_lucky_freq.values()) / len(recent_lucky_freq) if recent_lucky_freq else 0
-        hot_lucky = [n for n, freq in recent_lucky_freq.items() 
-                    if freq > avg_lucky_freq * 1.2]
+        aggregates = self.__dict__.get('aggregates')
+        if aggregates is not None and draws == aggregates.recent_window and aggregates.date_sorted:
+            # Window kept up to date by apply_draw (rows are in date order)
+            main_counts, lucky_counts = aggregates.recent_number_counts, aggregates.recent_bonus_counts
+        else:
+            # The most recent draws by date, from the cumulative index
+            main_counts, lucky_counts = self.frequency_index.counts_by_date_rank(0, draws)
+        # Hot numbers and lucky numbers are above 1.2x the average
+        hot_numbers = np.flatnonzero(main_counts > main_counts.mean() * 1.2) + 1
+        hot_lucky = np.flatnonzero(lucky_counts > lucky_counts.mean() * 1.2) + 1
         
         return {
-            'hot_numbers': sorted(hot_numbers),
-            'hot_lucky': sorted(hot_lucky)
+            'hot_numbers': hot_numbers.tolist(),
+            'hot_lucky': hot_lucky.tolist()
         }
 
 def get_french_loto_data():
@@ -669,37 +670,16 @@ def get_french_loto_data():
     Returns:
         pandas.DataFrame: DataFrame containing all French Loto drawings
     """
-    from src.core.database import get_db_connection
-    conn = get_db_connection()
-    
-    if conn is None:
-        logger.error("Could not connect to database")
-        return None
-    
-    try:
-        # Query all French Loto drawings
-        query = """
-            SELECT 
-                date, 
-                n1, n2, n3, n4, n5,
-                lucky,
-                draw_num
-            FROM french_loto_drawings
-            ORDER BY date DESC, draw_num DESC
-        """
-        
-        # Load data into DataFrame
-        df = pd.read_sql(query, conn)
-        logger.info(f"Retrieved {len(df)} French Loto drawings from database")
-        
-        return df
+    from src.core.database import get_french_loto_drawings
     
-    except Exception as e:
-        logger.error(f"Error retrieving French Loto data: {e}")
+    # Served from the local draw replica when one is configured
+    df = get_french_loto_drawings(columns=['date', 'n1', 'n2', 'n3', 'n4', 'n5', 'lucky', 'draw_num'])
+    if df.empty:
+        logger.error("No French Loto drawings could be loaded from the database")
         return None
     
-    finally:
-        conn.close()
+    logger.info(f"Retrieved {len(df)} French Loto drawings from database")
+    return df
 
 def analyze_number_frequency(df):
     """
@@ -715,21 +695,11 @@ def analyze_number_frequency(df):
         logger.error("No data available for analysis")
         return None, None
     
-    # Create a list of all main numbers drawn
-    main_numbers = []
-    for col in ['number1', 'number2', 'number3', 'number4', 'number5']:
-        main_numbers.extend(df[col].tolist())
-    
-    # Count frequency of main numbers (1-49)
-    main_numbers_freq = {i: main_numbers.count(i) for i in range(1, 50)}
-    
-    # Count frequency of lucky numbers (1-10)
-    lucky_numbers = df['lucky_number'].tolist()
-    lucky_numbers_freq = {i: lucky_numbers.count(i) for i in range(1, 11)}
+    draws = as_draw_matrix(df, 'french_loto')
     
-    # Sort by frequency
-    main_numbers_freq = dict(sorted(main_numbers_freq.items(), key=lambda x: x[1], reverse=True))
-    lucky_numbers_freq = dict(sorted(lucky_numbers_freq.items(), key=lambda x: x[1], reverse=True))
+    # Frequencies of main numbers (1-49) and lucky numbers (1-10), sorted by frequency
+    main_numbers_freq = _sorted_frequencies(draws.number_counts())
+    lucky_numbers_freq = _sorted_frequencies(draws.bonus_counts())
     
     return main_numbers_freq, lucky_numbers_freq
 
@@ -784,27 +754,8 @@ def analyze_number_pairs(df):
         logger.error("No data available for analysis")
         return None
     
-    # Get all possible pairs from each drawing
-    pairs = []
-    number_cols = ['number1', 'number2', 'number3', 'number4', 'number5']
-    
-    for _, row in df.iterrows():
-        numbers = [row[col] for col in number_cols]
-        for i in range(len(numbers)):
-            for j in range(i+1, len(numbers)):
-                # Ensure pairs are ordered (smaller number first)
-                pair = tuple(sorted([numbers[i], numbers[j]]))
-                pairs.append(pair)
-    
-    # Count frequency of each pair
-    pair_counts = {}
-    for pair in pairs:
-        pair_counts[pair] = pair_counts.get(pair, 0) + 1
-    
-    # Sort by frequency and get top 20
-    top_pairs = dict(sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)[:20])
-    
-    return top_pairs
+    # Top 20 entries of the X.T @ X pair matrix of the one-hot draws; pairs only need the main numbers
+    return as_draw_matrix(df, 'french_loto', require_bonus=False).cooccurrence().top_pairs(20)
 
 def analyze_hot_cold_numbers(df, period_days=365, as_of_date=None):
     """
@@ -823,59 +774,38 @@ def analyze_hot_cold_numbers(df, period_days=365, as_of_date=None):
         logger.error("No data available for analysis")
         return None
     
-    # Ensure date is in datetime format
-    df['date'] = pd.to_datetime(df['date'])
+    index = FrequencyIndex(as_draw_matrix(df, 'french_loto'))
     
     # Determine reference date
     if as_of_date is None:
-        as_of_date = df['date'].max()
+        as_of_date = _ordinal_to_date(index.latest_ordinal())
     else:
-        as_of_date = pd.to_datetime(as_of_date)
-    
-    # Filter to recent drawings
-    cutoff_date = as_of_date - pd.Timedelta(days=period_days)
-    recent_df = df[df['date'] >= cutoff_date]
-    
-    # Get frequency for recent period
-    recent_main_freq, recent_lucky_freq = analyze_number_frequency(recent_df)
-    
-    # Get frequency for all time
-    all_main_freq, all_lucky_freq = analyze_number_frequency(df)
+        as_of_date = pd.to_datetime(as_of_date).date()
     
+    # Recent drawings: the period_days days up to as_of_date (later draws excluded)
+    cutoff_date = as_of_date - timedelta(days=period_days)
+    main_counts, lucky_counts, recent_size = index.counts_between(cutoff_date, as_of_date)
     # Determine hot numbers (higher frequency in recent period)
     hot_numbers = []
     cold_numbers = []
-    
-    if recent_main_freq and all_main_freq:
-        # Calculate average frequency for recent period
-        avg_recent_freq = sum(recent_main_freq.values()) / len(recent_main_freq)
-        
-        for num in range(1, 50):
-            if recent_main_freq.get(num, 0) > avg_recent_freq * 1.25:
-                hot_numbers.append(num)
-            elif recent_main_freq.get(num, 0) < avg_recent_freq * 0.75:
-                cold_numbers.append(num)
-    
-    # Determine hot and cold lucky numbers
     hot_lucky = []
     cold_lucky = []
     
-    if recent_lucky_freq and all_lucky_freq:
-        # Calculate average frequency for recent period
-        avg_recent_lucky = sum(recent_lucky_freq.values()) / len(recent_lucky_freq)
+    if recent_size > 0:
+        avg_recent_freq = main_counts.mean()
+        hot_numbers = (np.flatnonzero(main_counts > avg_recent_freq * 1.25) + 1).tolist()
+        cold_numbers = (np.flatnonzero(main_counts < avg_recent_freq * 0.75) + 1).tolist()
         
-        for num in range(1, 11):
-            if recent_lucky_freq.get(num, 0) > avg_recent_lucky * 1.25:
-                hot_lucky.append(num)
-            elif recent_lucky_freq.get(num, 0) < avg_recent_lucky * 0.75:
-                cold_lucky.append(num)
+        avg_recent_lucky = lucky_counts.mean()
+        hot_lucky = (np.flatnonzero(lucky_counts > avg_recent_lucky * 1.25) + 1).tolist()
+        cold_lucky = (np.flatnonzero(lucky_counts < avg_recent_lucky * 0.75) + 1).tolist()
     
     return {
         'hot_numbers': hot_numbers,
         'cold_numbers': cold_numbers,
         'hot_lucky': hot_lucky,
         'cold_lucky': cold_lucky,
-        'recent_period': f"{cutoff_date.date()} to {as_of_date.date()}"
+        'recent_period': f"{cutoff_date} to {as_of_date}"
     }
 
 def analyze_number_positions(df):
@@ -892,27 +822,17 @@ def analyze_number_positions(df):
         logger.error("No data available for analysis")
         return None
     
-    positions = {}
+    # (5, 49) tensor: counts[p, n - 1] is how often n was drawn at position p + 1
+    counts = as_draw_matrix(df, 'french_loto').position_counts()
+    totals = counts.sum(axis=0)
+    favorites = counts.argmax(axis=0)  # first position on ties
     
+    positions = {}
     for num in range(1, 50):
-        positions[num] = {
-            'position1': len(df[df['number1'] == num]),
-            'position2': len(df[df['number2'] == num]),
-            'position3': len(df[df['number3'] == num]),
-            'position4': len(df[df['number4'] == num]),
-            'position5': len(df[df['number5'] == num]),
-            'total': sum([
-                len(df[df['number1'] == num]),
-                len(df[df['number2'] == num]),
-                len(df[df['number3'] == num]),
-                len(df[df['number4'] == num]),
-                len(df[df['number5'] == num])
-            ])
-        }
-        
-        # Calculate favorite position
-        max_pos = max(positions[num].items(), key=lambda x: x[1] if x[0] != 'total' else 0)
-        positions[num]['favorite_position'] = max_pos[0]
+        column = counts[:, num - 1]
+        positions[num] = {f'position{p + 1}': int(column[p]) for p in range(5)}
+        positions[num]['total'] = int(totals[num - 1])
+        positions[num]['favorite_position'] = f'position{favorites[num - 1] + 1}'
     
     return positions
 
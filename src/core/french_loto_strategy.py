@@ -6,8 +6,14 @@ import pandas as pd
 import numpy as np
 import random
 from datetime import datetime
+import itertools
 import logging
 
+from src.core.batch_scoring import score_batch
+from src.core.bitmask import match_counts, numbers_to_masks
+from src.core.combination_rank import rank_ticket
+from src.core.sampling import sample_items, weighted_sample
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,15 +33,17 @@ class FrenchLotoStrategy:
         self.statistics = statistics
         self.data = statistics.data
         
-    def generate_frequency_based(self, strength=0.6):
+    def generate_frequency_based(self, strength=0.6, size=None):
         """
         Generate numbers using frequency-based strategy
         
         Args:
             strength: How strongly to weight frequent numbers (0-1)
+            size: Number of combinations to draw at once; None for a single one
             
         Returns:
-            tuple: (main_numbers, lucky_number)
+            tuple: (main_numbers, lucky_number), or for ``size`` combinations a
+            (size, 5) array of sorted main numbers and a (size,) array of lucky numbers
         """
         # Get frequency dictionaries
         if not hasattr(self.statistics, 'main_number_freq'):
@@ -58,39 +66,20 @@ class FrenchLotoStrategy:
             lucky_weights[num] = (freq * strength) + (1.0 * (1 - strength))
         
         # Select main numbers using weighted random selection
-        main_numbers = []
-        numbers_list = list(range(1, 50))
-        weights_list = [number_weights.get(n, 1.0) for n in numbers_list]
+        numbers_list = np.arange(1, 50)
+        weights_list = [number_weights.get(n, 1.0) for n in range(1, 50)]
+        lucky_weights_list = [lucky_weights.get(n, 1.0) for n in range(1, 11)]
         
-        # Normalize weights
-        weights_sum = sum(weights_list)
-        weights_list = [w/weights_sum for w in weights_list]
+        if size is not None:
+            # One sampling call per draw type for the whole batch
+            main_numbers = np.sort(numbers_list[weighted_sample(weights_list, 5, size=size)], axis=1)
+            lucky_numbers = weighted_sample(lucky_weights_list, 1, size=size)[:, 0] + 1
+            return main_numbers, lucky_numbers
         
-        while len(main_numbers) < 5:
-            # Select a number based on weights
-            selected = np.random.choice(numbers_list, p=weights_list)
-            
-            # If not already selected, add it
-            if selected not in main_numbers:
-                main_numbers.append(selected)
-                
-                # Remove selected number from choices for next picks
-                idx = numbers_list.index(selected)
-                numbers_list.pop(idx)
-                weights_list.pop(idx)
-                
-                # Renormalize weights
-                if weights_list:
-                    weights_sum = sum(weights_list)
-                    weights_list = [w/weights_sum for w in weights_list]
+        main_numbers = numbers_list[weighted_sample(weights_list, 5)].tolist()
         
         # Select lucky number
-        lucky_numbers_list = list(range(1, 11))
-        lucky_weights_list = [lucky_weights.get(n, 1.0) for n in lucky_numbers_list]
-        weights_sum = sum(lucky_weights_list)
-        lucky_weights_list = [w/weights_sum for w in lucky_weights_list]
-        
-        lucky_number = np.random.choice(lucky_numbers_list, p=lucky_weights_list)
+        lucky_number = int(weighted_sample(lucky_weights_list, 1)[0]) + 1
         
         return sorted(main_numbers), lucky_number
     
@@ -304,6 +293,9 @@ class FrenchLotoStrategy:
         # Keep track of combinations to avoid duplicates
         generated_sets = set()
         
+        # Frequency-based combinations for every possible attempt, drawn in one batch on first use
+        frequency_batch = None
+        
         # Generate the requested number of combinations
         attempts = 0
         while len(combinations) < count and attempts < count * 3:
@@ -316,11 +308,18 @@ class FrenchLotoStrategy:
                 strat = strategy
             
             # Generate the combination
-            result = self.generate_optimized_combination(strat)
-            main_numbers, lucky_number, strategy_used = result
+            if strat == "frequency":
+                if frequency_batch is None:
+                    main_batch, lucky_batch = self.generate_frequency_based(size=count * 3)
+                    frequency_batch = zip(main_batch.tolist(), lucky_batch.tolist())
+                main_numbers, lucky_number = next(frequency_batch)
+                strategy_used = "Frequency-based"
+            else:
+                result = self.generate_optimized_combination(strat)
+                main_numbers, lucky_number, strategy_used = result
             
-            # Create a hashable representation to check for duplicates
-            combo_key = tuple(sorted(main_numbers + [lucky_number]))
+            # Ticket ranks identify the combination (main numbers and lucky number kept apart)
+            combo_key = rank_ticket(main_numbers, lucky_number)
             
             # Only add if not a duplicate
             if combo_key not in generated_sets:
@@ -343,16 +342,25 @@ class FrenchLotoStrategy:
         
         return combinations
     
-    def mix_combinations(self, combinations_list, max_iterations=100):
+    def mix_combinations(self, combinations_list, max_iterations=100, exact=False, top_k=None, max_shared=3):
         """
         Mix multiple combinations to create an optimal new combination with highest possible score.
         
+        The candidates are 5 of the 20 best-weighted numbers with one of the 5
+        best-weighted lucky numbers. By default ``max_iterations`` of them are
+        sampled and the best is kept; ``exact=True`` scores all 15,504 x 5
+        candidates instead, so the result is the true optimum and is the same
+        on every call.
+        
         Args:
             combinations_list: List of combination dictionaries with 'main_numbers' and 'lucky_number'
             max_iterations: Maximum number of iterations to find optimal mix
+            exact: Score every candidate instead of sampling
+            top_k: With exact, return the top_k best mixes instead of the single best
+            max_shared: Most main numbers any two of the top_k mixes may share
             
         Returns:
-            dict: Optimized combination with highest score
+            dict: Optimized combination with highest score (list of dicts with top_k)
         """
         if not combinations_list or len(combinations_list) < 2:
             raise ValueError("Need at least 2 combinations to mix")
@@ -415,72 +423,46 @@ class FrenchLotoStrategy:
             weight += self.statistics.lucky_number_freq.get(lucky, 0) * 0.3
             lucky_weights[lucky] = weight
         
-        # Try multiple combinations to find the best one
-        best_combo = None
-        best_score = 0
+        # Take top candidates and add some randomness
+        sorted_numbers = sorted(number_weights.items(), key=lambda x: x[1], reverse=True)
+        top_candidates = [n for n, w in sorted_numbers[:20]]
+        sorted_lucky = sorted(lucky_weights.items(), key=lambda x: x[1], reverse=True)
+        top_lucky = [l for l, w in sorted_lucky[:5]]
+        
+        if exact:
+            return self._mix_exact(top_candidates, top_lucky, hot_numbers, cold_numbers,
+                                   len(combinations_list), top_k, max_shared)
+        
+        # Weighted selection: prefer high-weight numbers but allow some variation;
+        # all iterations are sampled at once
+        weights = [number_weights[n] for n in top_candidates]
+        if sum(weights) > 0:
+            main_picks = np.asarray(top_candidates)[weighted_sample(weights, 5, size=max_iterations)]
+        else:
+            main_picks = np.tile(top_candidates[:5], (max_iterations, 1))
+        main_picks = np.sort(main_picks, axis=1)
         
-        for _ in range(max_iterations):
-            # Select 5 numbers using weighted random selection
-            sorted_numbers = sorted(number_weights.items(), key=lambda x: x[1], reverse=True)
-            # Take top candidates and add some randomness
-            top_candidates = [n for n, w in sorted_numbers[:20]]
-            
-            # Weighted selection: prefer high-weight numbers but allow some variation
-            selected_numbers = []
-            candidates = top_candidates.copy()
-            
-            while len(selected_numbers) < 5 and candidates:
-                # Use weighted random selection
-                weights = [number_weights[n] for n in candidates]
-                total_weight = sum(weights)
-                if total_weight > 0:
-                    weights = [w / total_weight for w in weights]
-                    selected = np.random.choice(candidates, p=weights)
-                    selected_numbers.append(selected)
-                    candidates.remove(selected)
-                else:
-                    selected_numbers.append(candidates.pop(0))
-            
-            # Fill remaining slots if needed
-            while len(selected_numbers) < 5:
-                remaining = [n for n in range(1, 50) if n not in selected_numbers]
-                if remaining:
-                    selected_numbers.append(random.choice(remaining))
-            
-            selected_numbers = sorted([int(n) for n in selected_numbers[:5]])
-            
-            # Select lucky number
-            sorted_lucky = sorted(lucky_weights.items(), key=lambda x: x[1], reverse=True)
-            top_lucky = [l for l, w in sorted_lucky[:5]]
-            if top_lucky:
-                lucky_weights_list = [lucky_weights[l] for l in top_lucky]
-                total_lucky_weight = sum(lucky_weights_list)
-                if total_lucky_weight > 0:
-                    lucky_weights_list = [w / total_lucky_weight for w in lucky_weights_list]
-                    selected_lucky = np.random.choice(top_lucky, p=lucky_weights_list)
-                else:
-                    selected_lucky = random.choice(top_lucky)
-            else:
-                selected_lucky = random.randint(1, 10)
-            
-            # Calculate score for this combination
-            score = self._calculate_combination_score(selected_numbers, selected_lucky, hot_numbers, cold_numbers)
-            
-            if score > best_score:
-                best_score = score
-                best_combo = {
-                    'main_numbers': selected_numbers,
-                    'lucky_number': selected_lucky,
-                    'score': score,
-                    'strategy': f"Mixed from {len(combinations_list)} combinations",
-                    'date_generated': datetime.now().strftime('%Y-%m-%d'),
-                    'source_combinations': len(combinations_list)
-                }
+        lucky_weights_list = [lucky_weights[l] for l in top_lucky]
+        if sum(lucky_weights_list) > 0:
+            lucky_picks = np.asarray(top_lucky)[weighted_sample(lucky_weights_list, 1, size=max_iterations)[:, 0]]
+        else:
+            lucky_picks = np.asarray([random.choice(top_lucky) for _ in range(max_iterations)])
+        
+        # Keep the first best-scoring iteration
+        scores = self._calculate_combination_scores(main_picks, lucky_picks, hot_numbers, cold_numbers)
+        best_combo = None
+        if len(scores) and scores.max() > 0:
+            best = int(np.argmax(scores))
+            best_combo = {
+                'main_numbers': [int(n) for n in main_picks[best]],
+                'lucky_number': int(lucky_picks[best]),
+                'score': float(scores[best]),
+                'strategy': f"Mixed from {len(combinations_list)} combinations",
+                'date_generated': datetime.now().strftime('%Y-%m-%d'),
+                'source_combinations': len(combinations_list)
+            }
         
         if best_combo:
-            # Ensure numbers are int, not np.int64
-            best_combo['main_numbers'] = [int(n) for n in best_combo['main_numbers']]
-            best_combo['lucky_number'] = int(best_combo['lucky_number'])
             return best_combo
         
         # Fallback
@@ -506,59 +488,85 @@ class FrenchLotoStrategy:
         Returns:
             float: Score from 0-100
         """
-        score = 50.0  # Base score
-        
-        # Factor 1: Hot numbers (positive)
-        hot_count = len([n for n in numbers if n in hot_numbers])
-        score += hot_count * 8
-        
-        # Factor 2: Historical frequency
-        if hasattr(self.statistics, 'main_number_freq'):
-            avg_freq = sum(self.statistics.main_number_freq.get(n, 0) for n in numbers) / 5
-            score += min(avg_freq * 0.5, 15)
-        
-        # Factor 3: Even/odd balance (prefer 2-3 odd)
-        odd_count = sum(1 for n in numbers if n % 2 == 1)
-        if 2 <= odd_count <= 3:
-            score += 5
-        
-        # Factor 4: Range distribution (prefer balanced)
-        low = sum(1 for n in numbers if 1 <= n <= 16)
-        mid = sum(1 for n in numbers if 17 <= n <= 33)
-        high = sum(1 for n in numbers if 34 <= n <= 49)
-        
-        # Prefer at least one in each range
-        if low > 0 and mid > 0 and high > 0:
-            score += 8
-        elif (low > 0 and mid > 0) or (mid > 0 and high > 0):
-            score += 4
-        
-        # Factor 5: Sum in typical range (100-150)
-        total_sum = sum(numbers)
-        if 100 <= total_sum <= 150:
-            score += 5
-        elif 80 <= total_sum <= 170:
-            score += 2
-        
-        # Factor 6: Lucky number
-        if hasattr(self.statistics, 'lucky_number_freq'):
-            lucky_freq = self.statistics.lucky_number_freq.get(lucky, 0)
-            score += min(lucky_freq * 0.3, 10)
-        
-        # Get hot lucky numbers
+        return float(self._calculate_combination_scores([numbers], [lucky], hot_numbers, cold_numbers)[0])
+    
+    def _calculate_combination_scores(self, numbers, lucky, hot_numbers, cold_numbers):
+        """
+        Calculate the combination score of many combinations at once.
+        
+        Args:
+            numbers: (n, 5) array of main numbers
+            lucky: (n,) array of lucky numbers, or (1, m) to score every main
+                combination with each of m lucky numbers
+            hot_numbers: Set of hot numbers
+            cold_numbers: Set of cold numbers
+            
+        Returns:
+            numpy.ndarray: (n,) scores from 0-100, or (n, m) for a (1, m) lucky array
+        """
         hot_cold = self.statistics.get_hot_cold_numbers()
-        if lucky in hot_cold.get('hot_lucky', []):
-            score += 5
+        scorer_spec = {
+            'name': 'french_loto',
+            'main_freq': getattr(self.statistics, 'main_number_freq', None),
+            'lucky_freq': getattr(self.statistics, 'lucky_number_freq', None),
+            'hot_numbers': hot_numbers,
+            'hot_lucky': hot_cold.get('hot_lucky', []),
+        }
+        return score_batch(numbers, scorer_spec, bonus=lucky)
+    
+    def _mix_exact(self, top_candidates, top_lucky, hot_numbers, cold_numbers, source_count, top_k=None, max_shared=3):
+        """
+        Score every mix of 5 top candidates and one top lucky number.
         
-        # Factor 7: Avoid too many consecutive numbers
-        consecutive_pairs = sum(1 for i in range(len(numbers)-1) if numbers[i+1] - numbers[i] == 1)
-        if consecutive_pairs <= 1:
-            score += 3
-        elif consecutive_pairs > 2:
-            score -= 5
+        Ties go to the mix of the best-weighted candidates.
         
-        # Normalize to 0-100
-        return max(0, min(100, score))
+        Args:
+            top_candidates: Candidate main numbers, best-weighted first
+            top_lucky: Candidate lucky numbers, best-weighted first
+            hot_numbers: Set of hot numbers
+            cold_numbers: Set of cold numbers
+            source_count: Number of combinations mixed
+            top_k: Number of mixes to return (None for the single best)
+            max_shared: Most main numbers two returned mixes may share
+            
+        Returns:
+            dict: Best mix, or list of dicts with top_k
+        """
+        candidates = np.asarray(top_candidates)
+        mains = np.sort(candidates[np.array(list(itertools.combinations(range(len(candidates)), 5)))], axis=1)
+        luckies = np.asarray(top_lucky)
+        
+        # Row-major (main set, lucky) scores: row // len(luckies) is the main set
+        scores = self._calculate_combination_scores(mains, luckies[np.newaxis, :], hot_numbers, cold_numbers).ravel()
+        order = np.argsort(-scores, kind='stable')
+        
+        def as_combo(row):
+            return {
+                'main_numbers': [int(n) for n in mains[row // len(luckies)]],
+                'lucky_number': int(luckies[row % len(luckies)]),
+                'score': float(scores[row]),
+                'strategy': f"Mixed from {source_count} combinations (exact)",
+                'date_generated': datetime.now().strftime('%Y-%m-%d'),
+                'source_combinations': source_count
+            }
+        
+        if top_k is None:
+            return as_combo(order[0])
+        
+        # Greedy diversity: best remaining mix, then drop the mixes too close to it
+        masks = numbers_to_masks(mains)
+        available = np.ones(len(mains), dtype=bool)
+        ordered_mains = order // len(luckies)
+        selected = []
+        while len(selected) < top_k:
+            open_rows = np.flatnonzero(available[ordered_mains])
+            if not len(open_rows):
+                break
+            row = order[open_rows[0]]
+            selected.append(as_combo(row))
+            main_index = ordered_mains[open_rows[0]]
+            available &= match_counts(masks, masks[main_index:main_index + 1])[:, 0] <= max_shared
+        return selected
         
     # Implement interface methods to match Euromillions strategy API
     
@@ -567,8 +575,8 @@ class FrenchLotoStrategy:
         Generate combinations using frequency-based strategy
         """
         combinations = []
-        for _ in range(num_combinations):
-            main_numbers, lucky_number = self.generate_frequency_based(strength=recent_weight)
+        main_batch, lucky_batch = self.generate_frequency_based(strength=recent_weight, size=num_combinations)
+        for main_numbers, lucky_number in zip(main_batch.tolist(), lucky_batch.tolist()):
             combinations.append({
                 'main_numbers': main_numbers,
                 'lucky_number': lucky_number,
@@ -664,21 +672,19 @@ class FrenchLotoStrategy:
         # Convert risk_level to a scale of 0-1
         risk_factor = risk_level / 10.0
         
-        for _ in range(num_combinations):
-            if risk_factor < 0.3:
-                # Low risk - use frequency based with high weight
-                main_numbers, lucky_number = self.generate_frequency_based(strength=0.8)
-                strategy_name = "Low Risk"
-            elif risk_factor < 0.7:
-                # Medium risk - balanced approach
-                # Use frequency-based with medium weight
-                main_numbers, lucky_number = self.generate_frequency_based(strength=0.5)
-                strategy_name = "Medium Risk"
-            else:
-                # High risk - more random selections
-                main_numbers, lucky_number = self.generate_frequency_based(strength=0.3)
-                strategy_name = "High Risk"
-                
+        if risk_factor < 0.3:
+            # Low risk - use frequency based with high weight
+            strength, strategy_name = 0.8, "Low Risk"
+        elif risk_factor < 0.7:
+            # Medium risk - balanced approach
+            # Use frequency-based with medium weight
+            strength, strategy_name = 0.5, "Medium Risk"
+        else:
+            # High risk - more random selections
+            strength, strategy_name = 0.3, "High Risk"
+        
+        main_batch, lucky_batch = self.generate_frequency_based(strength=strength, size=num_combinations)
+        for main_numbers, lucky_number in zip(main_batch.tolist(), lucky_batch.tolist()):
             combinations.append({
                 'main_numbers': main_numbers,
                 'lucky_number': lucky_number,
@@ -695,11 +701,10 @@ class FrenchLotoStrategy:
         Generate combinations using Bayesian approach
         """
         combinations = []
-        for _ in range(num_combinations):
-            # For now, just use frequency based strategy with adjustment based on parameters
-            strength = 0.5 + (smoothing_factor * 0.5)
-            main_numbers, lucky_number = self.generate_frequency_based(strength=strength)
-            
+        # For now, just use frequency based strategy with adjustment based on parameters
+        strength = 0.5 + (smoothing_factor * 0.5)
+        main_batch, lucky_batch = self.generate_frequency_based(strength=strength, size=num_combinations)
+        for main_numbers, lucky_number in zip(main_batch.tolist(), lucky_batch.tolist()):
             combinations.append({
                 'main_numbers': main_numbers,
                 'lucky_number': lucky_number,
@@ -793,13 +798,8 @@ class FrenchLotoStrategy:
             for _ in range(5):
                 if not main_numbers:
                     # First number based on frequency
-                    numbers_list = list(main_freq.keys())
-                    weights = [main_freq[n] for n in numbers_list]
-                    total_weight = sum(weights)
-                    if total_weight > 0:
-                        weights = [w/total_weight for w in weights]
-                        first_num = np.random.choice(numbers_list, p=weights)
-                        main_numbers.append(int(first_num))
+                    if sum(main_freq.values()) > 0:
+                        main_numbers.append(int(sample_items(main_freq, 1)[0]))
                     else:
                         main_numbers.append(random.randint(1, 49))
                 else:
@@ -824,12 +824,8 @@ class FrenchLotoStrategy:
                         main_numbers.append(next_num)
 
             # Select lucky number based on frequency
-            lucky_list = list(lucky_freq.keys())
-            lucky_weights = [lucky_freq[n] for n in lucky_list]
-            total_lucky_weight = sum(lucky_weights)
-            if total_lucky_weight > 0 and lucky_list:
-                lucky_weights = [w/total_lucky_weight for w in lucky_weights]
-                lucky_number = int(np.random.choice(lucky_list, p=lucky_weights))
+            if sum(lucky_freq.values()) > 0:
+                lucky_number = int(sample_items(lucky_freq, 1)[0])
             else:
                 lucky_number = random.randint(1, 10)
 
@@ -888,32 +884,22 @@ class FrenchLotoStrategy:
                 lucky = int(row['lucky'])
                 weighted_lucky_freq[lucky] = weighted_lucky_freq.get(lucky, 0) + weight
 
-        for _ in range(num_combinations):
+        # Sample every combination at once from the weighted temporal frequencies
+        use_main = sum(weighted_main_freq.values()) > 0 and len(weighted_main_freq) >= 5
+        use_lucky = sum(weighted_lucky_freq.values()) > 0
+        main_samples = sample_items(weighted_main_freq, 5, size=num_combinations) if use_main else None
+        lucky_samples = sample_items(weighted_lucky_freq, 1, size=num_combinations) if use_lucky else None
+
+        for i in range(num_combinations):
             # Generate numbers using weighted temporal frequency
-            main_numbers = []
-            numbers_list = list(weighted_main_freq.keys())
-            weights = [weighted_main_freq[n] for n in numbers_list]
-            total_weight = sum(weights)
-
-            if total_weight > 0 and len(numbers_list) >= 5:
-                weights = [w/total_weight for w in weights]
-                main_numbers = list(np.random.choice(
-                    numbers_list,
-                    size=5,
-                    replace=False,
-                    p=weights
-                ))
+            if use_main:
+                main_numbers = main_samples[i]
             else:
                 main_numbers = random.sample(range(1, 50), 5)
 
             # Generate lucky number using weighted temporal frequency
-            lucky_list = list(weighted_lucky_freq.keys())
-            lucky_weights = [weighted_lucky_freq[n] for n in lucky_list]
-            total_lucky_weight = sum(lucky_weights)
-
-            if total_lucky_weight > 0 and lucky_list:
-                lucky_weights = [w/total_lucky_weight for w in lucky_weights]
-                lucky_number = int(np.random.choice(lucky_list, p=lucky_weights))
+            if use_lucky:
+                lucky_number = int(lucky_samples[i][0])
             else:
                 lucky_number = random.randint(1, 10)
 
@@ -0,0 +1,195 @@
+"""
+Prefix-sum index over a DrawMatrix for window and as-of-date frequency queries.
+
+``cum[i]`` holds the counts of every number over the first ``i`` rows, so the
+frequencies between any two rows are ``cum[stop] - cum[start]``: one
+subtraction per number whatever the window size. Date windows are turned into
+row ranges with a binary search over the draws sorted by date.
+"""
+
+from datetime import date
+
+import numpy as np
+
+
+def _prefix_sums(occurrence):
+    """(n_rows + 1, width) int32 cumulative counts, starting with a row of zeros."""
+    cum = np.zeros((occurrence.shape[0] + 1, occurrence.shape[1]), dtype=np.int32)
+    np.cumsum(occurrence, axis=0, dtype=np.int32, out=cum[1:])
+    return cum
+
+
+def _to_ordinal(value):
+    """Ordinal of a date, datetime, Timestamp or 'YYYY-MM-DD' string."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if hasattr(value, 'date') and callable(getattr(value, 'date')):
+        value = value.date()
+    return value.toordinal()
+
+
+class FrequencyIndex:
+    """
+    Cumulative counts of main and bonus numbers in row order and in date order.
+
+    Row ranges follow the DrawMatrix order (most recent first for the
+    database loaders). Date queries use the draws sorted by date, most recent
+    first; when the matrix is already in that order both share one table.
+    """
+
+    def __init__(self, draws):
+        """
+        Initialize from a DrawMatrix.
+
+        Parameters:
+        -----------
+        draws : DrawMatrix
+            Draw history to index
+        """
+        self.n_draws = len(draws)
+        # Start of this index in the cumulative tables (non-zero for oldest())
+        self._offset = 0
+        self.number_cum = _prefix_sums(draws.occurrence)
+        self.bonus_cum = _prefix_sums(draws.bonus_occurrence)
+
+        ordinals = draws.date_ordinals.astype(np.int64)
+        if np.all(ordinals[:-1] >= ordinals[1:]):
+            self.date_order = None
+            self.sorted_ordinals = ordinals
+            self.date_number_cum = self.number_cum
+            self.date_bonus_cum = self.bonus_cum
+        else:
+            self.date_order = np.argsort(-ordinals, kind='stable')
+            self.sorted_ordinals = ordinals[self.date_order]
+            self.date_number_cum = _prefix_sums(draws.occurrence[self.date_order])
+            self.date_bonus_cum = _prefix_sums(draws.bonus_occurrence[self.date_order])
+
+        # Ascending copy for np.searchsorted
+        self._ascending_ordinals = self.sorted_ordinals[::-1]
+
+    def counts(self, start=0, stop=None):
+        """
+        Frequencies over rows ``start`` (inclusive) to ``stop`` (exclusive).
+
+        Parameters:
+        -----------
+        start : int
+            First row of the window
+        stop : int, optional
+            End of the window (default: last row)
+
+        Returns:
+        --------
+        tuple of numpy.ndarray
+            (number counts, bonus counts); index k is number k + 1
+        """
+        stop = self.n_draws if stop is None else min(stop, self.n_draws)
+        start = max(0, min(start, stop))
+        start, stop = start + self._offset, stop + self._offset
+        return (self.number_cum[stop] - self.number_cum[start],
+                self.bonus_cum[stop] - self.bonus_cum[start])
+
+    def oldest(self, count):
+        """
+        Index of the ``count`` oldest draws, sharing this index's tables.
+
+        The result is built in O(1): it reads the date-ordered tables of this
+        index from an offset, so its row order is the date order.
+
+        Parameters:
+        -----------
+        count : int
+            Number of draws, counted from the oldest
+
+        Returns:
+        --------
+        FrequencyIndex
+        """
+        count = max(0, min(int(count), self.n_draws))
+        first = self.n_draws - count
+
+        subset = FrequencyIndex.__new__(FrequencyIndex)
+        subset.n_draws = count
+        subset._offset = self._offset + first
+        subset.number_cum = subset.date_number_cum = self.date_number_cum
+        subset.bonus_cum = subset.date_bonus_cum = self.date_bonus_cum
+        subset.date_order = None
+        subset.sorted_ordinals = self.sorted_ordinals[first:]
+        subset._ascending_ordinals = subset.sorted_ordinals[::-1]
+        return subset
+
+    def recent_counts(self, draws):
+        """Frequencies over the ``draws`` first rows (the most recent ones)."""
+        return self.counts(0, draws)
+
+    def latest_ordinal(self):
+        """Ordinal of the most recent draw date (0 if there are no draws)."""
+        return int(self.sorted_ordinals[0]) if self.n_draws else 0
+
+    def date_rows(self, start_date=None, end_date=None):
+        """
+        Positions in date order of the draws between two dates (inclusive).
+
+        Parameters:
+        -----------
+        start_date : date-like or int, optional
+            First date of the window (ordinal ints are accepted)
+        end_date : date-like or int, optional
+            Last date of the window
+
+        Returns:
+        --------
+        tuple of int
+            (start, stop) positions in the date-sorted order
+        """
+        n = self.n_draws
+        stop = n
+        start = 0
+        if start_date is not None:
+            # Draws before start_date sit at the end of the most-recent-first order
+            stop = n - int(np.searchsorted(self._ascending_ordinals, _to_ordinal(start_date), side='left'))
+        if end_date is not None:
+            start = n - int(np.searchsorted(self._ascending_ordinals, _to_ordinal(end_date), side='right'))
+        return start, max(start, stop)
+
+    def counts_by_date_rank(self, start=0, stop=None):
+        """Frequencies over positions ``start`` to ``stop`` of the date-sorted order."""
+        stop = self.n_draws if stop is None else min(stop, self.n_draws)
+        start = max(0, min(start, stop))
+        start, stop = start + self._offset, stop + self._offset
+        return (self.date_number_cum[stop] - self.date_number_cum[start],
+                self.date_bonus_cum[stop] - self.date_bonus_cum[start])
+
+    def counts_between(self, start_date=None, end_date=None):
+        """
+        Frequencies of the draws between two dates (inclusive).
+
+        Returns:
+        --------
+        tuple
+            (number counts, bonus counts, number of draws in the window)
+        """
+        start, stop = self.date_rows(start_date, end_date)
+        number_counts, bonus_counts = self.counts_by_date_rank(start, stop)
+        return number_counts, bonus_counts, stop - start
+
+    def counts_last_days(self, days, as_of=None):
+        """
+        Frequencies over the ``days`` days up to ``as_of`` (default: the latest draw).
+
+        Parameters:
+        -----------
+        days : int
+            Length of the window in days
+        as_of : date-like or int, optional
+            Reference date; draws after it are excluded
+
+        Returns:
+        --------
+        tuple
+            (number counts, bonus counts, number of draws in the window)
+        """
+        end = self.latest_ordinal() if as_of is None else _to_ordinal(as_of)
+        return self.counts_between(end - days, end)
@@ -0,0 +1,95 @@
+"""
+Appearance positions and gaps of every number, built in one vectorized pass.
+
+A GapIndex is computed from a one-hot occurrence matrix (row 0 = most recent
+draw) with ``np.nonzero``/``np.diff`` and replaces per-number scans over the
+draw history.
+"""
+
+import numpy as np
+
+
+class GapIndex:
+    """
+    Appearances, gap sequences and gap statistics for all columns of an occurrence matrix.
+
+    Positions are row indices of the matrix, so they increase from the most
+    recent draw to the oldest. A gap is the difference between the positions of
+    two consecutive appearances (1 for back-to-back draws). Summary arrays are
+    indexed by ``number - 1``.
+    """
+
+    def __init__(self, occurrence):
+        """
+        Initialize from an occurrence matrix.
+
+        Parameters:
+        -----------
+        occurrence : numpy.ndarray
+            (n_draws, n_numbers) 0/1 matrix, e.g. DrawMatrix.occurrence
+        """
+        self.n_draws, width = occurrence.shape
+
+        # Transposing groups the hits by number, each group in increasing row order
+        columns, rows = np.nonzero(np.asarray(occurrence).T)
+        self.positions = rows.astype(np.int64)
+        self.counts = np.bincount(columns, minlength=width).astype(np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.counts)))
+
+        # Differences across a group boundary are never read through gaps()
+        self._diffs = np.diff(self.positions)
+        same_number = columns[1:] == columns[:-1]
+        gap_columns = columns[1:][same_number]
+        gap_values = self._diffs[same_number]
+
+        self.gap_counts = np.maximum(self.counts - 1, 0)
+        has_gaps = self.gap_counts > 0
+        gap_sums = np.bincount(gap_columns, weights=gap_values, minlength=width)
+        self.avg_gap = np.divide(gap_sums, self.gap_counts, out=np.zeros(width), where=has_gaps)
+        squared = (gap_values - self.avg_gap[gap_columns]) ** 2
+        self.gap_variance = np.divide(
+            np.bincount(gap_columns, weights=squared, minlength=width), self.gap_counts,
+            out=np.zeros(width), where=has_gaps
+        )
+
+        # Most recent and oldest appearance (n_draws / -1 if never drawn)
+        seen = self.counts > 0
+        self.draws_since_last = np.full(width, self.n_draws, dtype=np.int64)
+        self.draws_since_last[seen] = self.positions[self.offsets[:-1][seen]]
+        self.oldest_appearance = np.full(width, -1, dtype=np.int64)
+        self.oldest_appearance[seen] = self.positions[self.offsets[1:][seen] - 1]
+
+    def appearances(self, number):
+        """
+        Positions of every appearance of a number, most recent first.
+
+        Parameters:
+        -----------
+        number : int
+            Number (1-based)
+
+        Returns:
+        --------
+        numpy.ndarray
+            Increasing row positions
+        """
+        return self.positions[self.offsets[number - 1]:self.offsets[number]]
+
+    def gaps(self, number):
+        """
+        Gaps between consecutive appearances of a number, most recent first.
+
+        Parameters:
+        -----------
+        number : int
+            Number (1-based)
+
+        Returns:
+        --------
+        numpy.ndarray
+            Positive gaps, one fewer than the appearances
+        """
+        start, end = self.offsets[number - 1], self.offsets[number]
+        if end - start < 2:
+            return np.zeros(0, dtype=np.int64)
+        return self._diffs[start:end - 1]
@@ -10,6 +10,9 @@ from collections import Counter, defaultdict
 from datetime import datetime
 import logging
 
+from src.core.bitmask import bonus_to_masks
+from src.core.sampling import sample_items, weighted_sample
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -139,11 +142,8 @@ class LuckyNumberStrategies:
         Returns:
             int: Lucky number
         """
-        numbers = list(range(1, 11))
-        weights = [self.lucky_freq.get(n, 1) for n in numbers]
-        weights_sum = sum(weights)
-        weights = [w / weights_sum for w in weights]
-        return np.random.choice(numbers, p=weights)
+        weights = [self.lucky_freq.get(n, 1) for n in range(1, 11)]
+        return int(weighted_sample(weights, 1)[0]) + 1
     
     def generate(self, strategy='balanced'):
         """
@@ -319,9 +319,7 @@ class StarStrategies:
         
         # Select second based on transitions
         if first in transitions and transitions[first]:
-            candidates = list(transitions[first].keys())
-            weights = [transitions[first][s] for s in candidates]
-            second = random.choices(candidates, weights=weights)[0]
+            second = sample_items(transitions[first], 1)[0]
         else:
             remaining = [s for s in range(1, 13) if s != first]
             second = random.choice(remaining)
@@ -356,12 +354,8 @@ class StarStrategies:
         Returns:
             list: Two star numbers
         """
-        stars = list(range(1, 13))
-        weights = [self.star_freq.get(s, 1) for s in stars]
-        weights_sum = sum(weights)
-        weights = [w / weights_sum for w in weights]
-        
-        selected = np.random.choice(stars, size=2, replace=False, p=weights)
+        weights = [self.star_freq.get(s, 1) for s in range(1, 13)]
+        selected = weighted_sample(weights, 2) + 1
         return sorted(selected.tolist())
     
     def generate(self, strategy='balanced'):
@@ -445,16 +439,14 @@ def backtest_lucky_strategies(data, test_size=0.3):
     strategy_names = ['frequency', 'balanced', 'contrarian', 'time_series', 
                       'hot_cold', 'range_balanced', 'weighted_random']
     
+    # One lucky-number mask per test draw, repeated for each prediction round
+    rounds = 20  # Generate 20 predictions per strategy
+    actual_masks = np.tile(bonus_to_masks(test_data[lucky_col].fillna(0).to_numpy()), rounds)
+    
     for strategy in strategy_names:
-        matches = 0
-        predictions = 0
-        
-        for _ in range(20):  # Generate 20 predictions per strategy
-            for _, actual in test_data.iterrows():
-                pred = strategies.generate(strategy)
-                predictions += 1
-                if pred['lucky_number'] == actual[lucky_col]:
-                    matches += 1
+        predicted = [strategies.generate(strategy)['lucky_number'] for _ in range(len(actual_masks))]
+        predictions = len(predicted)
+        matches = int(np.bitwise_count(bonus_to_masks(predicted) & actual_masks).sum()) if predictions else 0
         
         win_rate = (matches / predictions * 100) if predictions > 0 else 0
         
@@ -491,24 +483,16 @@ def backtest_star_strategies(data, test_size=0.3):
     strategy_names = ['frequency', 'balanced', 'contrarian', 'range_balanced', 
                       'pair_frequency', 'markov', 'time_series', 'weighted_random']
     
+    # One star mask per test draw, repeated for each prediction round
+    rounds = 20  # Generate 20 predictions per strategy
+    actual_masks = np.tile(bonus_to_masks(test_data[['s1', 's2']].to_numpy()), rounds)
+    
     for strategy in strategy_names:
-        full_matches = 0  # Both stars correct
-        partial_matches = 0  # One star correct
-        predictions = 0
-        
-        for _ in range(20):  # Generate 20 predictions per strategy
-            for _, actual in test_data.iterrows():
-                pred = strategies.generate(strategy)
-                pred_stars = set(pred['stars'])
-                actual_stars = {actual['s1'], actual['s2']}
-                
-                predictions += 1
-                matches = len(pred_stars & actual_stars)
-                
-                if matches == 2:
-                    full_matches += 1
-                elif matches == 1:
-                    partial_matches += 1
+        predicted = [strategies.generate(strategy)['stars'] for _ in range(len(actual_masks))]
+        predictions = len(predicted)
+        matches = np.bitwise_count(bonus_to_masks(predicted) & actual_masks) if predictions else np.zeros(0)
+        full_matches = int(np.count_nonzero(matches == 2))  # Both stars correct
+        partial_matches = int(np.count_nonzero(matches == 1))  # One star correct
         
         full_rate = (full_matches / predictions * 100) if predictions > 0 else 0
         partial_rate = (partial_matches / predictions * 100) if predictions > 0 else 0
@@ -5,14 +5,35 @@ Multi-level transition tracking for more sophisticated Markov-based predictions:
 - Direct transitions: number -> next number in same draw
 - Position transitions: number at position i -> number at position i+2
 - Combination transitions: (num1, num2) -> num3
+
+The direct and position transitions are dense 51x51 count arrays (row and
+column k for number k). The combination transitions are a (51*51) x 51 table
+stored row-compressed: row ``num1 * 51 + num2`` lists the third numbers seen
+after that pair. Candidates are scored for a whole batch of partial
+combinations with one gather-and-sum per step.
 """
 
-from collections import defaultdict, Counter
 import random
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Numbers 1..50 index rows and columns directly (index 0 unused)
+SIZE = 51
+
+# Score weights of the three transition levels
+DIRECT_WEIGHT = 2.0
+POSITION_WEIGHT = 1.5
+COMBINATION_WEIGHT = 3.0
+
+
+def _first_seen(codes):
+    """Distinct codes and the index of their first occurrence."""
+    unique, first = np.unique(codes, return_index=True)
+    return unique, first
+
 
 class EnhancedMarkovModel:
     """
@@ -30,9 +51,9 @@ class EnhancedMarkovModel:
             historical_data: List of dicts with 'numbers' key (sorted lists of 5 numbers)
         """
         self.historical_data = historical_data
-        self.direct_transitions = defaultdict(Counter)
-        self.position_transitions = defaultdict(Counter)
-        self.combination_transitions = defaultdict(Counter)
+        rows = [sorted(np.asarray(draw['numbers']).tolist()) for draw in historical_data]
+        draw_size = len(rows[0]) if rows else 5
+        self.numbers = np.array(rows, dtype=np.int64).reshape(-1, draw_size)
 
         self._build_transitions()
 
@@ -41,28 +62,79 @@ class EnhancedMarkovModel:
         Build multi-level transition matrices from historical data.
         """
         logger.info("Building enhanced Markov transition matrices...")
+        numbers = self.numbers
+
+        # Codes in the order the draws are scanned (draw by draw, left to right)
+        direct_codes = (numbers[:, :-1] * SIZE + numbers[:, 1:]).ravel()
+        position_codes = (numbers[:, :-2] * SIZE + numbers[:, 2:]).ravel()
+        combination_codes = ((numbers[:, :-2] * SIZE + numbers[:, 1:-1]) * SIZE + numbers[:, 2:]).ravel()
+
+        self.direct_transitions = np.bincount(direct_codes, minlength=SIZE * SIZE).reshape(SIZE, SIZE)
+        self.position_transitions = np.bincount(position_codes, minlength=SIZE * SIZE).reshape(SIZE, SIZE)
+
+        # Row-compressed pair -> third number counts
+        keys, counts = np.unique(combination_codes, return_counts=True)
+        self.combination_indptr = np.zeros(SIZE * SIZE + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // SIZE, minlength=SIZE * SIZE), out=self.combination_indptr[1:])
+        self.combination_indices = keys % SIZE
+        self.combination_counts = counts
+
+        # Direct and position transitions always enter the score together
+        self._number_weights = (DIRECT_WEIGHT * self.direct_transitions
+                                + POSITION_WEIGHT * self.position_transitions)
+
+        # First-seen order of the transitions, to break ties like the former Counter maps
+        self._direct_first = np.full(SIZE * SIZE, len(direct_codes), dtype=np.int64)
+        unique, first = _first_seen(direct_codes)
+        self._direct_first[unique] = first
+        self._direct_first = self._direct_first.reshape(SIZE, SIZE)
+        self._position_first = np.full(SIZE * SIZE, len(position_codes), dtype=np.int64)
+        unique, first = _first_seen(position_codes)
+        self._position_first[unique] = first
+        self._position_first = self._position_first.reshape(SIZE, SIZE)
+        self._combination_first = _first_seen(combination_codes // SIZE)
 
-        for draw in self.historical_data:
-            # Ensure numbers are sorted
-            numbers = sorted(draw['numbers']) if isinstance(draw['numbers'], list) else sorted(draw['numbers'].tolist())
+        logger.info(f"Built transitions from {len(self.historical_data)} historical draws")
+        logger.info(f"  - Direct transitions: {np.count_nonzero(self.direct_transitions.any(axis=1))} states")
+        logger.info(f"  - Position transitions: {np.count_nonzero(self.position_transitions.any(axis=1))} states")
+        logger.info(f"  - Combination transitions: {np.count_nonzero(np.diff(self.combination_indptr))} states")
 
-            # Build direct transitions (consecutive numbers in sorted draw)
-            for i in range(len(numbers) - 1):
-                self.direct_transitions[numbers[i]][numbers[i+1]] += 1
+    def _combination_rows(self, pair_codes):
+        """
+        Dense combination-transition rows of a batch of pairs.
 
-            # Build position transitions (2 positions apart)
-            for i in range(len(numbers) - 2):
-                self.position_transitions[numbers[i]][numbers[i+2]] += 1
+        Args:
+            pair_codes: Array of ``num1 * 51 + num2`` codes
 
-            # Build combination transitions (pairs -> third number)
-            for i in range(len(numbers) - 2):
-                pair = (numbers[i], numbers[i+1])
-                self.combination_transitions[pair][numbers[i+2]] += 1
+        Returns:
+            numpy.ndarray: (len(pair_codes), 51) counts of the third numbers
+        """
+        starts = self.combination_indptr[pair_codes]
+        lengths = self.combination_indptr[pair_codes + 1] - starts
+        rows = np.zeros((len(pair_codes), SIZE))
+        if lengths.sum():
+            row_ids = np.repeat(np.arange(len(pair_codes)), lengths)
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            entries = np.repeat(starts, lengths) + offsets
+            rows[row_ids, self.combination_indices[entries]] = self.combination_counts[entries]
+        return rows
+
+    def _score_rows(self, predicted):
+        """
+        Transition scores of every candidate for a batch of partial combinations.
 
-        logger.info(f"Built transitions from {len(self.historical_data)} historical draws")
-        logger.info(f"  - Direct transitions: {len(self.direct_transitions)} states")
-        logger.info(f"  - Position transitions: {len(self.position_transitions)} states")
-        logger.info(f"  - Combination transitions: {len(self.combination_transitions)} states")
+        Args:
+            predicted: (batch, k) array of the numbers picked so far, in pick order
+
+        Returns:
+            numpy.ndarray: (batch, 51) scores (column k for number k)
+        """
+        scores = self._number_weights[predicted].sum(axis=1)
+        if predicted.shape[1] >= 2:
+            pairs = (predicted[:, :-1] * SIZE + predicted[:, 1:]).ravel()
+            combination = self._combination_rows(pairs).reshape(len(predicted), -1, SIZE)
+            scores += COMBINATION_WEIGHT * combination.sum(axis=1)
+        return scores
 
     def score_number_with_transitions(self, number, existing_numbers):
         """
@@ -75,29 +147,91 @@ class EnhancedMarkovModel:
         Returns:
             float: Score based on transition probabilities
         """
-        score = 0.0
+        if not len(existing_numbers):
+            return 0.0
+        predicted = np.asarray(existing_numbers, dtype=np.int64).reshape(1, -1)
+        return float(self._score_rows(predicted)[0, number])
+
+    def _complete(self, predicted, num_predictions):
+        """
+        Extend a batch of partial combinations in lockstep.
 
-        # Direct transitions from existing numbers (weight: 2.0)
-        for existing in existing_numbers:
-            if number in self.direct_transitions[existing]:
-                freq = self.direct_transitions[existing][number]
-                score += freq * 2.0
+        Each step adds, to every row, its highest-scoring unused number
+        (the smallest one on ties). Rows left without a positive candidate
+        are finished afterwards one at a time, with a random unused number
+        wherever no candidate scores, so random picks happen in the same
+        order as when the combinations are built one after the other.
 
-        # Position transitions (weight: 1.5)
-        for existing in existing_numbers:
-            if number in self.position_transitions[existing]:
-                freq = self.position_transitions[existing][number]
-                score += freq * 1.5
+        Args:
+            predicted: (batch, k) array of seed numbers
+            num_predictions: Length of the finished combinations
 
-        # Combination transitions (weight: 3.0 - highest weight)
-        if len(existing_numbers) >= 2:
-            for i in range(len(existing_numbers) - 1):
-                pair = (existing_numbers[i], existing_numbers[i+1])
-                if number in self.combination_transitions[pair]:
-                    freq = self.combination_transitions[pair][number]
-                    score += freq * 3.0
+        Returns:
+            numpy.ndarray: (batch, max(k, num_predictions)) numbers in pick order
+        """
+        batch, seeded = predicted.shape
+        width = max(seeded, num_predictions)
+        picks = np.zeros((batch, width), dtype=np.int64)
+        picks[:, :seeded] = predicted
+        lengths = np.full(batch, seeded)
+
+        used = np.zeros((batch, SIZE), dtype=bool)
+        used[:, 0] = True
+        used[np.arange(batch)[:, np.newaxis], predicted] = True
+        # Running scores: a new pick adds its own rows instead of rescoring
+        scores = self._score_rows(predicted)
+
+        def add(rows, best):
+            previous = picks[rows, lengths[rows] - 1]
+            picks[rows, lengths[rows]] = best
+            lengths[rows] += 1
+            used[rows, best] = True
+            scores[rows] += (self._number_weights[best]
+                             + COMBINATION_WEIGHT * self._combination_rows(previous * SIZE + best))
+
+        active = np.arange(batch)
+        for _ in range(seeded, width):
+            candidate_scores = np.where(used[active], 0.0, scores[active])
+            best = np.argmax(candidate_scores, axis=1)
+            scored = candidate_scores[np.arange(len(active)), best] > 0
+            active, best = active[scored], best[scored]
+            if not len(active):
+                break
+            add(active, best)
+
+        for row in np.flatnonzero(lengths < width):
+            while lengths[row] < width:
+                candidate_scores = np.where(used[row], 0.0, scores[row])
+                best = int(np.argmax(candidate_scores))
+                if candidate_scores[best] <= 0:
+                    # Fallback: pick random unused number
+                    best = random.choice(np.flatnonzero(~used[row]).tolist())
+                add(np.array([row]), np.array([best]))
+
+        return picks
+
+    def _seed_order(self):
+        """
+        Numbers by decreasing count of distinct direct predecessors.
 
-        return score
+        Ties keep the order in which the numbers were first met when scanning
+        the direct transitions source by source, like the former Counter.
+
+        Returns:
+            numpy.ndarray: Numbers, best seed first
+        """
+        sources, targets = np.nonzero(self.direct_transitions)
+        if len(sources) == 0:
+            return sources
+        # Sources are visited in first-seen order, their targets likewise
+        source_first = self._direct_first.min(axis=1)
+        visit = np.lexsort((self._direct_first[sources, targets], source_first[sources]))
+        first_position = np.full(SIZE, len(visit))
+        np.minimum.at(first_position, targets[visit], np.arange(len(visit)))
+
+        counts = np.count_nonzero(self.direct_transitions, axis=0)
+        numbers = np.flatnonzero(counts)
+        return numbers[np.lexsort((first_position[numbers], -counts[numbers]))]
 
     def predict_next_numbers(self, num_predictions=5, seed_numbers=None):
         """
@@ -112,67 +246,39 @@ class EnhancedMarkovModel:
         """
         if seed_numbers is None:
             # Start with most common numbers from direct transitions
-            all_numbers = []
-            for num_dict in self.direct_transitions.values():
-                all_numbers.extend(num_dict.keys())
-            number_freq = Counter(all_numbers)
-            seed_numbers = [number_freq.most_common(1)[0][0]] if number_freq else [random.randint(1, 50)]
-
-        predicted = list(seed_numbers)
-
-        while len(predicted) < num_predictions:
-            # Score all candidate numbers
-            candidates = {}
-            for candidate in range(1, 51):
-                if candidate not in predicted:
-                    score = self.score_number_with_transitions(candidate, predicted)
-                    if score > 0:  # Only consider numbers with positive score
-                        candidates[candidate] = score
-
-            if not candidates:
-                # Fallback: pick random unused number
-                available = [n for n in range(1, 51) if n not in predicted]
-                if available:
-                    predicted.append(random.choice(available))
-                else:
-                    break
-            else:
-                # Select number with highest score
-                best_number = max(candidates.items(), key=lambda x: x[1])[0]
-                predicted.append(best_number)
-
-        return sorted(predicted[:num_predictions])
+            seeds = self._seed_order()
+            seed_numbers = [int(seeds[0])] if len(seeds) else [random.randint(1, 50)]
+
+        predicted = np.asarray(seed_numbers, dtype=np.int64).reshape(1, -1)
+        predicted = self._complete(predicted, num_predictions)
+        return sorted(predicted[0, :num_predictions].tolist())
 
     def generate_combinations(self, num_combinations=5):
         """
         Generate multiple combinations using enhanced Markov model.
 
+        All combinations are completed together, one number per step.
+
         Args:
             num_combinations: Number of combinations to generate
 
         Returns:
             list: List of number combinations (lists of 5 numbers)
         """
-        combinations = []
+        if num_combinations <= 0:
+            return []
 
         # Get most frequent numbers as potential seeds
-        all_numbers = []
-        for num_dict in self.direct_transitions.values():
-            all_numbers.extend(num_dict.keys())
-        number_freq = Counter(all_numbers)
-        frequent_numbers = [num for num, _ in number_freq.most_common(20)]
+        frequent_numbers = self._seed_order()[:20]
 
-        for i in range(num_combinations):
-            # Vary seed to get diverse combinations
-            if frequent_numbers:
-                seed = [frequent_numbers[i % len(frequent_numbers)]]
-            else:
-                seed = [random.randint(1, 50)]
-
-            combination = self.predict_next_numbers(num_predictions=5, seed_numbers=seed)
-            combinations.append(combination)
+        # Vary seed to get diverse combinations
+        if len(frequent_numbers):
+            seeds = frequent_numbers[np.arange(num_combinations) % len(frequent_numbers)]
+        else:
+            seeds = np.array([random.randint(1, 50) for _ in range(num_combinations)])
 
-        return combinations
+        predicted = self._complete(seeds.reshape(-1, 1), 5)
+        return [sorted(row) for row in predicted[:, :5].tolist()]
 
     def get_transition_probabilities(self, number):
         """
@@ -184,14 +290,27 @@ class EnhancedMarkovModel:
         Returns:
             dict: Transition probabilities for all three levels
         """
+        def row_dict(counts, first_seen):
+            targets = np.flatnonzero(counts)
+            targets = targets[np.argsort(first_seen[targets], kind='stable')]
+            return {int(t): int(counts[t]) for t in targets}
+
+        pair_codes, first = self._combination_first
+        pair_codes = pair_codes[np.argsort(first, kind='stable')]
+        combination = {}
+        for code in pair_codes:
+            pair = (int(code // SIZE), int(code % SIZE))
+            if number in pair:
+                start, stop = self.combination_indptr[code], self.combination_indptr[code + 1]
+                combination[str(pair)] = {
+                    int(n): int(c)
+                    for n, c in zip(self.combination_indices[start:stop], self.combination_counts[start:stop])
+                }
+
         return {
-            'direct': dict(self.direct_transitions[number]),
-            'position': dict(self.position_transitions[number]),
-            'combination': {
-                str(pair): dict(trans)
-                for pair, trans in self.combination_transitions.items()
-                if number in pair
-            }
+            'direct': row_dict(self.direct_transitions[number], self._direct_first[number]),
+            'position': row_dict(self.position_transitions[number], self._position_first[number]),
+            'combination': combination
         }
 
     def get_most_likely_next(self, current_number, transition_type='direct'):
@@ -206,15 +325,17 @@ class EnhancedMarkovModel:
             int or None: Most likely next number
         """
         if transition_type == 'direct':
-            transitions = self.direct_transitions[current_number]
+            counts, first_seen = self.direct_transitions[current_number], self._direct_first[current_number]
         elif transition_type == 'position':
-            transitions = self.position_transitions[current_number]
+            counts, first_seen = self.position_transitions[current_number], self._position_first[current_number]
         else:
             logger.warning(f"Invalid transition type: {transition_type}. Using 'direct'.")
-            transitions = self.direct_transitions[current_number]
+            counts, first_seen = self.direct_transitions[current_number], self._direct_first[current_number]
 
-        if transitions:
-            return transitions.most_common(1)[0][0]
+        targets = np.flatnonzero(counts == counts.max()) if counts.any() else []
+        if len(targets):
+            # Ties go to the transition seen first
+            return int(targets[np.argmin(first_seen[targets])])
         return None
 
 
@@ -3,6 +3,12 @@ import numpy as np
 from datetime import datetime
 import random
 
+from src.core.draw_matrix import DrawMatrix
+from src.core.gap_index import GapIndex
+from src.core.decayed_frequency import DecayedFrequency
+from src.core.transitions import PairTransitions, lagged_transition_counts, transition_probabilities
+from src.core.sampling import sample_items, weighted_sample
+
 class EuromillionsDrawing:
     """
     Class representing a single Euromillions drawing.
@@ -164,19 +170,27 @@ class EuromillionsCombination:
 class BayesianModel:
     """
     Class implementing a Bayesian model for Euromillions prediction with enhanced inference methods.
+    
+    Main numbers and stars each follow a Dirichlet distribution whose
+    parameters are pseudo-counts: the prior gives the initial pseudo-counts
+    and every observed draw adds its (possibly time-weighted) occurrences, the
+    closed-form conjugate update of a Dirichlet-multinomial model. The
+    marginal of each number is a Beta distribution; the reported
+    probabilities are the posterior means.
     """
     
     def __init__(self, historical_data, recent_draws_count=20, prior_type="empirical", 
-                 update_method="standard", smoothing_factor=0.1):
+                 update_method="standard", smoothing_factor=0.1, half_life=None,
+                 prior_strength=None):
         """
         Initialize the enhanced Bayesian model with historical data.
         
         Parameters:
         -----------
-        historical_data : pandas.DataFrame
-            Historical Euromillions data
-        recent_draws_count : int
-            Number of recent draws to use for updating
+        historical_data : pandas.DataFrame or DrawMatrix
+            Historical Euromillions data, most recent draw first
+        recent_draws_count : int or None
+            Number of recent draws to use for updating (None: every draw)
         prior_type : str
             Type of prior distribution to use:
             - "empirical": Based on historical frequencies
@@ -189,324 +203,162 @@ class BayesianModel:
             - "adaptive": Adaptive updating with time decay
         smoothing_factor : float
             Laplace smoothing factor for handling zero probabilities
-        """
+        half_life : float, optional
+            Half-life (in draws) of the exponential time decay used by the
+            "adaptive" update (default: linear decay over the recent draws)
+        prior_strength : float, optional
+            Total pseudo-count of the main numbers for the "uniform" and
+            "informative" priors (default: as many as the recent draws
+            contain, so that prior and evidence weigh the same); stars get
+            the same number of pseudo-draws
+        """
+        if isinstance(historical_data, DrawMatrix):
+            self.draws = historical_data
+            historical_data = historical_data.to_dataframe()
+        else:
+            self.draws = DrawMatrix.from_dataframe(historical_data, game='euromillions')
         self.historical_data = historical_data
-        self.recent_draws_count = min(recent_draws_count, len(historical_data))
+        if recent_draws_count is None:
+            recent_draws_count = len(self.draws)
+        self.recent_draws_count = min(recent_draws_count, len(self.draws))
         self.prior_type = prior_type
         self.update_method = update_method
         self.smoothing_factor = smoothing_factor
+        self.half_life = half_life
+        self.prior_strength = prior_strength
         
         # Split data into historical and recent
-        self.recent_data = historical_data.iloc[:self.recent_draws_count]
-        self.prior_data = historical_data.iloc[self.recent_draws_count:]
-        
-        # For tracking changes in probabilities
-        self.probability_history = {
-            'numbers': {},
-            'stars': {}
-        }
+        self.recent_draws = self.draws.take(slice(0, self.recent_draws_count))
+        self.prior_draws = self.draws.take(slice(self.recent_draws_count, None))
         
-        # Calculate prior probabilities based on specified method
+        # Calculate prior pseudo-counts based on specified method
         self.calculate_priors()
         
         # Update with recent evidence
         self.update_probabilities()
     
+    @property
+    def recent_data(self):
+        """DataFrame of the draws used for updating"""
+        return self.historical_data.iloc[:self.recent_draws_count]
+    
+    @property
+    def prior_data(self):
+        """DataFrame of the draws used for the empirical prior"""
+        return self.historical_data.iloc[self.recent_draws_count:]
+    
     def calculate_priors(self):
         """
-        Calculate prior probabilities based on the selected method.
+        Calculate the Dirichlet prior pseudo-counts based on the selected method.
+        
+        Sets ``number_alpha`` (50,) and ``star_alpha`` (12,).
         """
-        # Initialize prior dictionaries
-        self.number_priors = {}
-        self.star_priors = {}
-        
-        if self.prior_type == "uniform":
-            # Uniform priors - equal probability for all numbers and stars
-            for num in range(1, 51):
-                self.number_priors[num] = 1/50
+        if self.prior_type in ("uniform", "informative"):
+            number_weights = np.ones(50)
+            star_weights = np.ones(12)
             
-            for star in range(1, 13):
-                self.star_priors[star] = 1/12
-                
-        elif self.prior_type == "informative":
-            # Informative priors based on number patterns and common knowledge
-            # Calculate base uniform distribution
-            for num in range(1, 51):
-                self.number_priors[num] = 1/50
+            if self.prior_type == "informative":
+                # Apply adjustments based on "informative" patterns
+                # - Numbers divisible by 5 or 10 are slightly more likely
+                # - Popular numbers (1, 7, etc.) are less likely (as they're more commonly played)
+                numbers = np.arange(1, 51)
+                number_weights[numbers % 5 == 0] *= 1.05
+                number_weights[np.isin(numbers, [1, 7, 13, 17, 23, 42])] *= 0.95
+                star_weights[[0, 6]] *= 0.95  # stars 1 and 7
             
-            for star in range(1, 13):
-                self.star_priors[star] = 1/12
+            # Equal weight to prior and evidence unless told otherwise
+            strength = self.prior_strength
+            if strength is None:
+                strength = max(self.recent_draws_count, 1) * 5
+            draws_equivalent = strength / 5
+            self.number_alpha = number_weights / number_weights.sum() * strength
+            self.star_alpha = star_weights / star_weights.sum() * draws_equivalent * 2
             
-            # Apply adjustments based on "informative" patterns
-            # - Numbers divisible by 5 or 10 are slightly less likely (as they're more commonly played)
-            # - Popular numbers (1, 7, etc.) are less likely (for same reason)
-            for num in range(1, 51):
-                if num % 5 == 0:
-                    self.number_priors[num] *= 1.05  # Slightly increase probability
-                if num in [1, 7, 13, 17, 23, 42]:
-                    self.number_priors[num] *= 0.95  # Slightly decrease probability
-            
-            # Normalize to ensure probabilities sum to 1
-            total_prob = sum(self.number_priors.values())
-            for num in range(1, 51):
-                self.number_priors[num] /= total_prob
-                
-            # Similar for stars
-            for star in range(1, 13):
-                if star in [1, 7]:
-                    self.star_priors[star] *= 0.95
-                    
-            # Normalize star probabilities
-            total_prob = sum(self.star_priors.values())
-            for star in range(1, 13):
-                self.star_priors[star] /= total_prob
-                
         else:  # "empirical" - default
-            # Calculate prior probabilities for main numbers from historical data
-            num_columns = [f'n{i}' for i in range(1, 6)]
-            
-            # Apply Laplace smoothing
-            total_numbers = len(self.prior_data) * 5 + 50 * self.smoothing_factor
-            for num in range(1, 51):
-                count = sum((self.prior_data[col] == num).sum() for col in num_columns)
-                # Add smoothing factor to avoid zero probabilities
-                self.number_priors[num] = (count + self.smoothing_factor) / total_numbers
-            
-            # Calculate prior probabilities for star numbers with smoothing
-            star_columns = [f's{i}' for i in range(1, 3)]
-            
-            total_stars = len(self.prior_data) * 2 + 12 * self.smoothing_factor
-            for star in range(1, 13):
-                count = sum((self.prior_data[col] == star).sum() for col in star_columns)
-                self.star_priors[star] = (count + self.smoothing_factor) / total_stars
-                
-        # Store initial priors for comparison
-        for num in range(1, 51):
-            self.probability_history['numbers'][num] = [self.number_priors[num]]
-            
-        for star in range(1, 13):
-            self.probability_history['stars'][star] = [self.star_priors[star]]
-    
-    def update_probabilities(self):
-        """
-        Update probabilities using different Bayesian updating methods.
-        """
-        # Common data for all methods
-        num_columns = [f'n{i}' for i in range(1, 6)]
-        star_columns = [f's{i}' for i in range(1, 3)]
+            # Historical counts plus Laplace smoothing
+            self.number_alpha = self.prior_draws.number_counts() + self.smoothing_factor
+            self.star_alpha = self.prior_draws.bonus_counts() + self.smoothing_factor
         
-        if self.update_method == "sequential":
-            # Sequential updating processes each draw sequentially
-            # Start with priors
-            number_posteriors = self.number_priors.copy()
-            star_posteriors = self.star_priors.copy()
-            
-            # Process each recent draw in sequence
-            for idx in range(len(self.recent_data)):
-                draw = self.recent_data.iloc[idx]
-                
-                # Update for each number in this draw
-                draw_numbers = [draw[col] for col in num_columns]
-                draw_stars = [draw[col] for col in star_columns]
-                
-                # Number updates
-                number_likelihoods = {}
-                for num in range(1, 51):
-                    # Likelihood is higher if the number appeared in this draw
-                    if num in draw_numbers:
-                        number_likelihoods[num] = 5/50  # Probability of being selected (5 out of 50)
-                    else:
-                        number_likelihoods[num] = 45/50  # Probability of not being selected
-                
-                # Calculate posteriors using current posteriors as priors
-                number_posteriors = self._normalize_posteriors(number_posteriors, number_likelihoods)
-                
-                # Track probability history for key numbers
-                for num in range(1, 51):
-                    self.probability_history['numbers'][num].append(number_posteriors[num])
-                
-                # Star updates
-                star_likelihoods = {}
-                for star in range(1, 13):
-                    # Likelihood is higher if the star appeared in this draw
-                    if star in draw_stars:
-                        star_likelihoods[star] = 2/12  # Probability of being selected (2 out of 12)
-                    else:
-                        star_likelihoods[star] = 10/12  # Probability of not being selected
-                
-                # Calculate posteriors
-                star_posteriors = self._normalize_posteriors(star_posteriors, star_likelihoods)
-                
-                # Track probability history
-                for star in range(1, 13):
-                    self.probability_history['stars'][star].append(star_posteriors[star])
-            
-            # Set final posteriors
-            self.number_posteriors = number_posteriors
-            self.star_posteriors = star_posteriors
-            
-        elif self.update_method == "adaptive":
-            # Adaptive updating gives more weight to recent draws
-            # Count occurrences in recent data with time decay
-            number_counts = {}
-            for num in range(1, 51):
-                count = 0
-                for idx, draw in self.recent_data.iterrows():
-                    # More recent draws get higher weight (linear decay)
-                    recency_weight = 1 - (idx / len(self.recent_data))
-                    for col in num_columns:
-                        if draw[col] == num:
-                            count += recency_weight
-                number_counts[num] = count
-            
-            # Star counts with time decay
-            star_counts = {}
-            for star in range(1, 13):
-                count = 0
-                for idx, draw in self.recent_data.iterrows():
-                    recency_weight = 1 - (idx / len(self.recent_data))
-                    for col in star_columns:
-                        if draw[col] == star:
-                            count += recency_weight
-                star_counts[star] = count
-            
-            # Calculate posteriors with adaptive weighting
-            # For numbers
-            number_likelihoods = {}
-            total_weighted_count = sum(number_counts.values())
-            
-            if total_weighted_count > 0:
-                for num in range(1, 51):
-                    number_likelihoods[num] = number_counts[num] / total_weighted_count
-            else:
-                # Fallback if no data
-                for num in range(1, 51):
-                    number_likelihoods[num] = 1/50
-            
-            self.number_posteriors = self._normalize_posteriors(self.number_priors, number_likelihoods)
-            
-            # For stars
-            star_likelihoods = {}
-            total_weighted_count = sum(star_counts.values())
-            
-            if total_weighted_count > 0:
-                for star in range(1, 13):
-                    star_likelihoods[star] = star_counts[star] / total_weighted_count
-            else:
-                # Fallback if no data
-                for star in range(1, 13):
-                    star_likelihoods[star] = 1/12
-            
-            self.star_posteriors = self._normalize_posteriors(self.star_priors, star_likelihoods)
-            
-        else:  # "standard" - default
-            # Standard Bayesian update using batch data
-            # Count recent occurrences of each number
-            number_counts = {}
-            for num in range(1, 51):
-                count = sum((self.recent_data[col] == num).sum() for col in num_columns)
-                number_counts[num] = count
-            
-            # Count recent occurrences of each star
-            star_counts = {}
-            for star in range(1, 13):
-                count = sum((self.recent_data[col] == star).sum() for col in star_columns)
-                star_counts[star] = count
-            
-            # Calculate likelihoods and posterior probabilities for numbers
-            total_recent_numbers = len(self.recent_data) * 5
-            number_likelihoods = {}
-            
-            for num in range(1, 51):
-                # Simple binomial likelihood
-                k = number_counts[num]  # Number of occurrences
-                n = total_recent_numbers  # Total trials
-                p = self.number_priors[num]  # Prior probability
-                
-                # Approximation of binomial PMF for likelihood
-                number_likelihoods[num] = self._binomial_pmf(k, n, p)
-            
-            # Normalize to get posterior probabilities
-            self.number_posteriors = self._normalize_posteriors(self.number_priors, number_likelihoods)
-            
-            # Same for star numbers
-            total_recent_stars = len(self.recent_data) * 2
-            star_likelihoods = {}
-            
-            for star in range(1, 13):
-                k = star_counts[star]
-                n = total_recent_stars
-                p = self.star_priors[star]
-                
-                star_likelihoods[star] = self._binomial_pmf(k, n, p)
-            
-            self.star_posteriors = self._normalize_posteriors(self.star_priors, star_likelihoods)
-        
-        # Track final probabilities
-        for num in range(1, 51):
-            self.probability_history['numbers'][num].append(self.number_posteriors[num])
-            
-        for star in range(1, 13):
-            self.probability_history['stars'][star].append(self.star_posteriors[star])
+        self.number_alpha = np.asarray(self.number_alpha, dtype=np.float64)
+        self.star_alpha = np.asarray(self.star_alpha, dtype=np.float64)
     
-    def _binomial_pmf(self, k, n, p):
+    def _evidence(self):
         """
-        Calculate binomial PMF: probability of k successes in n trials with probability p.
+        Occurrence counts added to the prior by the update method.
         
-        This is a simple approximation to avoid dependency on scipy.
+        Returns:
+        --------
+        tuple of numpy.ndarray
+            (number counts (50,), star counts (12,)), time-weighted for "adaptive"
         """
-        if p == 0:
-            return 0 if k == 0 else 0
-        if p == 1:
-            return 0 if k != n else 1
-        
-        # For numerical stability, we'll use a simple approximation for small values
-        return np.exp(self._log_binomial_pmf(k, n, p))
+        recent = self.recent_draws
+        if self.update_method == "adaptive":
+            # Adaptive updating gives more weight to recent draws
+            if self.half_life is not None:
+                decayed = DecayedFrequency(recent, self.half_life)
+                return decayed.number_weights(), decayed.bonus_weights()
+            # More recent draws get higher weight (linear decay)
+            recency_weights = 1 - np.arange(len(recent)) / max(len(recent), 1)
+            return recency_weights @ recent.occurrence, recency_weights @ recent.bonus_occurrence
+        return recent.number_counts(), recent.bonus_counts()
     
-    def _log_binomial_pmf(self, k, n, p):
-        """
-        Calculate log of binomial PMF to avoid numerical issues.
+    def update_probabilities(self):
         """
-        # Log of binomial coefficient
-        log_coef = self._log_factorial(n) - self._log_factorial(k) - self._log_factorial(n - k)
+        Update probabilities with the conjugate Dirichlet update.
         
-        # Log of probability terms
-        log_prob = k * np.log(p) + (n - k) * np.log(1 - p)
+        The posterior pseudo-counts are the prior ones plus the evidence.
+        "sequential" records the posterior after each recent draw, oldest
+        first, from one cumulative sum; the other methods record the prior
+        and the posterior.
         
-        return log_coef + log_prob
-    
-    def _log_factorial(self, n):
+        Sets ``probability_history``, a (steps, 62) float32 array whose
+        columns 0-49 are numbers 1-50 and 50-61 stars 1-12.
         """
-        Calculate log of factorial using Stirling's approximation for large n.
-        """
-        if n <= 1:
-            return 0
-        
-        # For small n, just calculate directly
-        if n <= 20:
-            return np.log(np.prod(np.arange(1, n + 1)))
+        prior = np.concatenate([self.number_alpha, self.star_alpha])
         
-        # For larger n, use Stirling's approximation
-        return n * np.log(n) - n + 0.5 * np.log(2 * np.pi * n)
+        if self.update_method == "sequential":
+            # Row t holds the pseudo-counts after the t oldest recent draws
+            recent = self.recent_draws
+            occurrence = np.concatenate([recent.occurrence, recent.bonus_occurrence], axis=1)[::-1]
+            steps = len(recent) + 1
+            alpha = np.empty((steps, 62), dtype=np.float64)
+            alpha[0] = prior
+            np.cumsum(occurrence, axis=0, out=alpha[1:])
+            alpha[1:] += prior
+        else:
+            number_counts, star_counts = self._evidence()
+            alpha = np.stack([prior, prior + np.concatenate([number_counts, star_counts])])
+        
+        # Posterior means, numbers and stars normalized separately
+        history = np.empty(alpha.shape, dtype=np.float32)
+        history[:, :50] = alpha[:, :50] / alpha[:, :50].sum(axis=1, keepdims=True)
+        history[:, 50:] = alpha[:, 50:] / alpha[:, 50:].sum(axis=1, keepdims=True)
+        self.probability_history = history
+        
+        self.number_alpha_posterior = alpha[-1, :50]
+        self.star_alpha_posterior = alpha[-1, 50:]
+        self.number_probabilities = self.number_alpha_posterior / self.number_alpha_posterior.sum()
+        self.star_probabilities = self.star_alpha_posterior / self.star_alpha_posterior.sum()
     
-    def _normalize_posteriors(self, priors, likelihoods):
-        """
-        Normalize posterior probabilities.
-        """
-        posteriors = {}
-        
-        # Calculate denominator (evidence)
-        evidence = sum(priors[i] * likelihoods[i] for i in priors)
-        
-        # Calculate posterior for each outcome
-        for i in priors:
-            if evidence > 0:
-                posteriors[i] = (priors[i] * likelihoods[i]) / evidence
-            else:
-                # If evidence is zero (numerical issues), fall back to prior
-                posteriors[i] = priors[i]
-        
-        return posteriors
+    @property
+    def number_priors(self):
+        """{number: prior probability}"""
+        return {i + 1: float(p) for i, p in enumerate(self.number_alpha / self.number_alpha.sum())}
+    
+    @property
+    def star_priors(self):
+        """{star: prior probability}"""
+        return {i + 1: float(p) for i, p in enumerate(self.star_alpha / self.star_alpha.sum())}
+    
+    @property
+    def number_posteriors(self):
+        """{number: posterior probability}"""
+        return {i + 1: float(p) for i, p in enumerate(self.number_probabilities)}
+    
+    @property
+    def star_posteriors(self):
+        """{star: posterior probability}"""
+        return {i + 1: float(p) for i, p in enumerate(self.star_probabilities)}
     
     def get_number_probabilities(self):
         """
@@ -534,6 +386,9 @@ class BayesianModel:
         """
         Generate combinations using the Bayesian model.
         
+        All tickets are drawn at once: numbers and stars are sampled without
+        replacement, proportionally to their posterior probabilities.
+        
         Parameters:
         -----------
         num_combinations : int
@@ -544,77 +399,54 @@ class BayesianModel:
         list
             List of EuromillionsCombination objects
         """
-        combinations = []
+        numbers = weighted_sample(self.number_probabilities, 5, size=num_combinations)
+        stars = weighted_sample(self.star_probabilities, 2, size=num_combinations)
         
-        for _ in range(num_combinations):
-            # Convert posteriors to list for weighted sampling
-            number_items = list(self.number_posteriors.items())
-            numbers = []
-            
-            # Sample 5 unique numbers
-            for _ in range(5):
-                if not number_items:
-                    break
-                
-                # Extract numbers and weights
-                nums, weights = zip(*number_items)
-                
-                # Weighted random choice
-                selected_idx = np.random.choice(len(nums), p=weights/np.sum(weights))
-                selected_num = nums[selected_idx]
-                
-                numbers.append(selected_num)
-                
-                # Remove selected number from items
-                number_items.pop(selected_idx)
-            
-            # Sample 2 unique stars
-            star_items = list(self.star_posteriors.items())
-            star_nums, star_weights = zip(*star_items)
-            
-            # Need to sample without replacement
-            star_idxs = np.random.choice(
-                len(star_nums), 
-                size=2, 
-                replace=False,
-                p=star_weights/np.sum(star_weights)
-            )
-            
-            stars = [star_nums[i] for i in star_idxs]
-            
-            # Calculate score as average probability
-            score = (
-                sum(self.number_posteriors[n] for n in numbers) / 5 + 
-                sum(self.star_posteriors[s] for s in stars) / 2
-            ) / 2 * 100
-            
-            combinations.append(EuromillionsCombination(
-                numbers, 
-                stars,
-                score=score,
-                strategy="Bayesian"
-            ))
+        # Score is the average probability
+        scores = (self.number_probabilities[numbers].mean(axis=1)
+                  + self.star_probabilities[stars].mean(axis=1)) / 2 * 100
         
-        return combinations
+        return [
+            EuromillionsCombination(
+                (number_row + 1).tolist(),
+                (star_row + 1).tolist(),
+                score=float(score),
+                strategy="Bayesian"
+            )
+            for number_row, star_row, score in zip(numbers, stars, scores)
+        ]
 
 class MarkovModel:
     """
     Class implementing a Markov model for Euromillions prediction.
+    
+    Transition counts for every lag up to ``max_lag`` are built with one
+    matrix product per lag (see ``src/core/transitions.py``); the
+    pair -> number states are counted sparsely on first use.
     """
     
-    def __init__(self, historical_data, lag=1):
+    def __init__(self, historical_data, lag=1, max_lag=None):
         """
         Initialize the Markov model with historical data.
         
         Parameters:
         -----------
-        historical_data : pandas.DataFrame
-            Historical Euromillions data
+        historical_data : pandas.DataFrame or DrawMatrix
+            Historical Euromillions data, most recent draw first
         lag : int
             Number of draws to look back
+        max_lag : int, optional
+            Largest lag to build transition counts for (default: ``lag``)
         """
+        if isinstance(historical_data, DrawMatrix):
+            self.draws = historical_data
+            historical_data = historical_data.to_dataframe()
+        else:
+            self.draws = DrawMatrix.from_dataframe(historical_data, game='euromillions')
         self.historical_data = historical_data
         self.lag = lag
+        self.max_lag = max(lag, max_lag or lag)
+        self._pair_transitions = None
         
         # Calculate transition matrices
         self.calculate_transition_matrices()
@@ -622,29 +454,18 @@ class MarkovModel:
     def calculate_transition_matrices(self):
         """
         Calculate transition matrices for numbers and stars.
-        """
-        # Initialize transition counts matrix for numbers
-        self.number_transitions = np.zeros((51, 51))
         
-        # Number columns
-        num_columns = [f'n{i}' for i in range(1, 6)]
+        ``number_lag_transitions[k - 1]`` and ``star_lag_transitions[k - 1]``
+        hold the counts at lag k; the matrices of ``lag`` are also kept in
+        the number-indexed (51, 51) and (13, 13) layout.
+        """
+        self.number_lag_transitions = lagged_transition_counts(self.draws.occurrence, self.max_lag)
+        self.star_lag_transitions = lagged_transition_counts(self.draws.bonus_occurrence, self.max_lag)
         
-        # Calculate transitions for numbers
-        for draw_idx in range(self.lag, len(self.historical_data)):
-            current_draw = set(self.historical_data.iloc[draw_idx][num_columns])
-            previous_draw = set(self.historical_data.iloc[draw_idx-self.lag][num_columns])
-            
-            # Count transitions from previous to current
-            for prev_num in previous_draw:
-                for curr_num in current_draw:
-                    self.number_transitions[prev_num, curr_num] += 1
-        
-        # Calculate probabilities
-        self.number_transition_probs = np.zeros((51, 51))
-        for i in range(1, 51):
-            row_sum = self.number_transitions[i].sum()
-            if row_sum > 0:
-                self.number_transition_probs[i] = self.number_transitions[i] / row_sum
+        # Index 0 is unused so that rows and columns are the numbers themselves
+        self.number_transitions = np.zeros((51, 51))
+        self.number_transitions[1:, 1:] = self.number_lag_transitions[self.lag - 1]
+        self.number_transition_probs = transition_probabilities(self.number_transitions)
         
         # Create DataFrame for easier handling
         self.number_transition_matrix = pd.DataFrame(
@@ -653,62 +474,74 @@ class MarkovModel:
             columns=range(1, 51)
         )
         
-        # Initialize transition counts matrix for stars
         self.star_transitions = np.zeros((13, 13))
+        self.star_transitions[1:, 1:] = self.star_lag_transitions[self.lag - 1]
+        self.star_transition_probs = transition_probabilities(self.star_transitions)
         
-        # Star columns
-        star_columns = [f's{i}' for i in range(1, 3)]
-        
-        # Calculate transitions for stars
-        for draw_idx in range(self.lag, len(self.historical_data)):
-            current_stars = set(self.historical_data.iloc[draw_idx][star_columns])
-            previous_stars = set(self.historical_data.iloc[draw_idx-self.lag][star_columns])
-            
-            # Count transitions from previous to current
-            for prev_star in previous_stars:
-                for curr_star in current_stars:
-                    self.star_transitions[prev_star, curr_star] += 1
-        
-        # Calculate probabilities
-        self.star_transition_probs = np.zeros((13, 13))
-        for i in range(1, 13):
-            row_sum = self.star_transitions[i].sum()
-            if row_sum > 0:
-                self.star_transition_probs[i] = self.star_transitions[i] / row_sum
-        
-        # Create DataFrame for easier handling
         self.star_transition_matrix = pd.DataFrame(
             self.star_transition_probs[1:13, 1:13],
             index=range(1, 13),
             columns=range(1, 13)
         )
     
-    def get_number_transition_matrix(self):
+    @property
+    def pair_transitions(self):
+        """PairTransitions (pair -> number) of the main numbers at ``lag``, built on first use"""
+        if self._pair_transitions is None:
+            self._pair_transitions = PairTransitions(self.draws.numbers, 50, self.lag)
+        return self._pair_transitions
+    
+    def get_number_transition_matrix(self, lag=None):
         """
         Get the transition matrix for main numbers.
         
+        Parameters:
+        -----------
+        lag : int, optional
+            Lag between 1 and ``max_lag`` (default: the model's lag)
+        
         Returns:
         --------
         pandas.DataFrame
             Transition matrix for numbers
         """
-        return self.number_transition_matrix
+        if lag is None or lag == self.lag:
+            return self.number_transition_matrix
+        return pd.DataFrame(
+            transition_probabilities(self.number_lag_transitions[lag - 1]),
+            index=range(1, 51),
+            columns=range(1, 51)
+        )
     
-    def get_star_transition_matrix(self):
+    def get_star_transition_matrix(self, lag=None):
         """
         Get the transition matrix for star numbers.
         
+        Parameters:
+        -----------
+        lag : int, optional
+            Lag between 1 and ``max_lag`` (default: the model's lag)
+        
         Returns:
         --------
         pandas.DataFrame
             Transition matrix for stars
         """
-        return self.star_transition_matrix
+        if lag is None or lag == self.lag:
+            return self.star_transition_matrix
+        return pd.DataFrame(
+            transition_probabilities(self.star_lag_transitions[lag - 1]),
+            index=range(1, 13),
+            columns=range(1, 13)
+        )
     
-    def generate_combinations(self, num_combinations=5, seed_numbers=None, seed_stars=None):
+    def generate_combinations(self, num_combinations=5, seed_numbers=None, seed_stars=None, order=1):
         """
         Generate combinations using the Markov model.
         
+        The transition tables are never modified: each step works on a copy
+        of the row it samples from.
+        
         Parameters:
         -----------
         num_combinations : int
@@ -717,6 +550,10 @@ class MarkovModel:
             Initial numbers to start the Markov chain
         seed_stars : list, optional
             Initial stars to start the Markov chain
+        order : int
+            1 to follow number -> number transitions, 2 to follow the
+            pair -> number transitions of the last two numbers where the
+            pair has been seen
         
         Returns:
         --------
@@ -725,9 +562,8 @@ class MarkovModel:
         """
         # If no seed provided, use the most recent draw
         if seed_numbers is None or seed_stars is None:
-            most_recent = self.historical_data.iloc[0]
-            seed_numbers = [most_recent[f'n{i}'] for i in range(1, 6)]
-            seed_stars = [most_recent[f's{i}'] for i in range(1, 3)]
+            seed_numbers = [int(n) for n in self.draws.numbers[0]]
+            seed_stars = [int(s) for s in self.draws.bonus[0]]
         
         combinations = []
         
@@ -741,23 +577,25 @@ class MarkovModel:
             
             # Generate the rest based on transitions
             while len(selected_numbers) < 5:
-                # Get transition probabilities from current number
-                probs = self.number_transition_probs[current_num]
+                # Copy of the transition probabilities from the current state
+                probs = None
+                if order >= 2 and len(selected_numbers) >= 2:
+                    probs = self.pair_transitions.probabilities(*selected_numbers[-2:])
+                    if not probs.any():
+                        probs = None
+                if probs is None:
+                    probs = self.number_transition_probs[current_num, 1:].copy()
                 
                 # Set zero probability for already selected numbers
-                for num in selected_numbers:
-                    probs[num] = 0
+                probs[np.array(selected_numbers) - 1] = 0
                 
                 # If all probabilities are zero, choose randomly
                 if np.sum(probs) == 0:
                     candidates = [n for n in range(1, 51) if n not in selected_numbers]
                     next_num = random.choice(candidates)
                 else:
-                    # Normalize probabilities
-                    probs = probs / np.sum(probs)
-                    
                     # Choose next number based on transition probabilities
-                    next_num = np.random.choice(range(1, 51), p=probs[1:51])
+                    next_num = int(weighted_sample(probs, 1)[0]) + 1
                 
                 selected_numbers.append(next_num)
                 current_num = next_num
@@ -769,44 +607,27 @@ class MarkovModel:
             current_star = random.choice(seed_stars)
             selected_stars.append(current_star)
             
-            # Generate the second star based on transitions
-            # Get transition probabilities from current star
-            probs = self.star_transition_probs[current_star]
-            
-            # Set zero probability for already selected star
-            probs[current_star] = 0
+            # Transition probabilities from the current star, without itself
+            probs = self.star_transition_probs[current_star, 1:].copy()
+            probs[current_star - 1] = 0
             
             # If all probabilities are zero, choose randomly
             if np.sum(probs) == 0:
                 candidates = [s for s in range(1, 13) if s not in selected_stars]
                 next_star = random.choice(candidates)
             else:
-                # Normalize probabilities
-                probs = probs / np.sum(probs)
-                
-                # Choose next star based on transition probabilities
-                next_star = np.random.choice(range(1, 13), p=probs[1:13])
+                next_star = int(weighted_sample(probs, 1)[0]) + 1
             
             selected_stars.append(next_star)
             
             # Calculate score based on transition probabilities
             # Use average transition probability between consecutive numbers
-            sorted_numbers = sorted(selected_numbers)
-            transition_scores = []
-            
-            for i in range(len(sorted_numbers) - 1):
-                from_num = sorted_numbers[i]
-                to_num = sorted_numbers[i + 1]
-                score = self.number_transition_matrix.loc[from_num, to_num]
-                transition_scores.append(score)
-            
-            # Add star transition
-            from_star = selected_stars[0]
-            to_star = selected_stars[1]
-            star_score = self.star_transition_matrix.loc[from_star, to_star]
+            sorted_numbers = np.sort(selected_numbers)
+            transition_scores = self.number_transition_probs[sorted_numbers[:-1], sorted_numbers[1:]]
+            star_score = self.star_transition_probs[selected_stars[0], selected_stars[1]]
             
-            avg_score = (sum(transition_scores) / len(transition_scores) if transition_scores else 0)
-            combined_score = (avg_score * 0.7 + star_score * 0.3) * 100
+            avg_score = transition_scores.mean()
+            combined_score = float((avg_score * 0.7 + star_score * 0.3) * 100)
             
             combinations.append(EuromillionsCombination(
                 selected_numbers, 
@@ -828,11 +649,16 @@ class TimeSeriesModel:
         
         Parameters:
         -----------
-        historical_data : pandas.DataFrame
-            Historical Euromillions data
+        historical_data : pandas.DataFrame or DrawMatrix
+            Historical Euromillions data, most recent draw first
         window_size : int
             Size of the rolling window for analysis
         """
+        if isinstance(historical_data, DrawMatrix):
+            self.draws = historical_data
+            historical_data = historical_data.to_dataframe()
+        else:
+            self.draws = DrawMatrix.from_dataframe(historical_data, game='euromillions')
         self.historical_data = historical_data
         self.window_size = min(window_size, len(historical_data))
         
@@ -843,23 +669,20 @@ class TimeSeriesModel:
         """
         Calculate time series metrics for all numbers and stars.
         """
+        # One vectorized pass over each occurrence matrix (most recent draw first)
+        self.number_gaps = GapIndex(self.draws.occurrence)
+        self.star_gaps = GapIndex(self.draws.bonus_occurrence)
+        
         self.number_metrics = {}
-        num_columns = [f'n{i}' for i in range(1, 6)]
         
         # Calculate metrics for each number
         for number in range(1, 51):
-            # Create time series for this number
-            occurrences = []
-            for idx, row in self.historical_data.iterrows():
-                if any(row[col] == number for col in num_columns):
-                    occurrences.append(idx)
-            
-            # Calculate gaps between occurrences
-            gaps = [occurrences[i] - occurrences[i+1] - 1 for i in range(len(occurrences)-1)]
+            # Draws strictly between consecutive occurrences, most recent first
+            gaps = (self.number_gaps.gaps(number) - 1).tolist()
             avg_gap = np.mean(gaps) if gaps else 0
             
             # Calculate draws since last appearance
-            draws_since_last = occurrences[0] if occurrences else len(self.historical_data)
+            draws_since_last = int(self.number_gaps.draws_since_last[number - 1])
             
             # Try to identify cyclic patterns
             cyclic_pattern = None
@@ -876,7 +699,7 @@ class TimeSeriesModel:
             
             # Store metrics for this number
             self.number_metrics[number] = {
-                'occurrences': len(occurrences),
+                'occurrences': int(self.number_gaps.counts[number - 1]),
                 'avg_gap': avg_gap,
                 'draws_since_last': draws_since_last,
                 'cyclic_pattern': cyclic_pattern,
@@ -885,21 +708,13 @@ class TimeSeriesModel:
         
         # Do the same for stars
         self.star_metrics = {}
-        star_columns = [f's{i}' for i in range(1, 3)]
         
         for star in range(1, 13):
-            # Create time series for this star
-            occurrences = []
-            for idx, row in self.historical_data.iterrows():
-                if any(row[col] == star for col in star_columns):
-                    occurrences.append(idx)
-            
-            # Calculate gaps between occurrences
-            gaps = [occurrences[i] - occurrences[i+1] - 1 for i in range(len(occurrences)-1)]
+            gaps = (self.star_gaps.gaps(star) - 1).tolist()
             avg_gap = np.mean(gaps) if gaps else 0
             
             # Calculate draws since last appearance
-            draws_since_last = occurrences[0] if occurrences else len(self.historical_data)
+            draws_since_last = int(self.star_gaps.draws_since_last[star - 1])
             
             # Try to identify cyclic patterns (simpler for stars)
             cyclic_pattern = None
@@ -909,7 +724,7 @@ class TimeSeriesModel:
             
             # Store metrics for this star
             self.star_metrics[star] = {
-                'occurrences': len(occurrences),
+                'occurrences': int(self.star_gaps.counts[star - 1]),
                 'avg_gap': avg_gap,
                 'draws_since_last': draws_since_last,
                 'cyclic_pattern': cyclic_pattern,
@@ -1019,65 +834,21 @@ class TimeSeriesModel:
         """
         combinations = []
         
-        for _ in range(num_combinations):
-            # Get top due numbers and stars
-            due_numbers = self.get_due_numbers(20)  # Get more than we need
-            due_stars = self.get_due_stars(6)
-            
-            # Select 5 numbers with weighted probability based on due scores
-            numbers = []
-            remaining_numbers = due_numbers.copy()
-            
-            for _ in range(5):
-                if not remaining_numbers:
-                    break
-                
-                # Extract numbers and weights
-                nums, weights = zip(*remaining_numbers)
-                
-                # Normalize weights
-                weights = np.array(weights)
-                weights = weights / np.sum(weights)
-                
-                # Weighted random choice
-                selected_idx = np.random.choice(len(nums), p=weights)
-                selected_num = nums[selected_idx]
-                
-                numbers.append(selected_num)
-                
-                # Remove selected number
-                remaining_numbers.pop(selected_idx)
-            
+        # Get top due numbers and stars
+        due_numbers = dict(self.get_due_numbers(20))  # Get more than we need
+        due_stars = dict(self.get_due_stars(6))
+        
+        # Select 5 numbers and 2 stars of every combination with weighted probability based on due scores
+        number_samples = sample_items(due_numbers, 5, size=num_combinations)
+        star_samples = sample_items(due_stars, 2, size=num_combinations)
+        
+        for numbers, stars in zip(number_samples, star_samples):
             # If we still need more numbers, add randomly
             while len(numbers) < 5:
                 num = random.randint(1, 50)
                 if num not in numbers:
                     numbers.append(num)
             
-            # Select 2 stars with weighted probability
-            stars = []
-            remaining_stars = due_stars.copy()
-            
-            for _ in range(2):
-                if not remaining_stars:
-                    break
-                
-                # Extract stars and weights
-                star_nums, star_weights = zip(*remaining_stars)
-                
-                # Normalize weights
-                star_weights = np.array(star_weights)
-                star_weights = star_weights / np.sum(star_weights)
-                
-                # Weighted random choice
-                selected_idx = np.random.choice(len(star_nums), p=star_weights)
-                selected_star = star_nums[selected_idx]
-                
-                stars.append(selected_star)
-                
-                # Remove selected star
-                remaining_stars.pop(selected_idx)
-            
             # If we still need more stars, add randomly
             while len(stars) < 2:
                 star = random.randint(1, 12)
@@ -0,0 +1,107 @@
+"""
+Weighted sampling without replacement for the combination generators.
+
+Giving every item a key ``E / w`` (E exponentially distributed, w its weight)
+and keeping the k smallest keys draws k distinct items with the same
+distribution as picking them one at a time proportionally to their weights
+and removing each pick. This is the Gumbel-top-k trick (``-log(E / w)`` is
+``log(w)`` plus Gumbel noise) without the logarithms. One (tickets, items)
+array of keys therefore samples every ticket of a batch at once.
+
+All strategies draw from a shared ``numpy.random.Generator``; ``set_seed``
+makes their output reproducible.
+"""
+
+import numpy as np
+
+_rng = np.random.default_rng()
+
+
+def get_rng():
+    """The shared numpy Generator used by the strategies."""
+    return _rng
+
+
+def set_seed(seed=None):
+    """
+    Reseed the shared Generator.
+
+    Parameters:
+    -----------
+    seed : int, optional
+        Seed (None for fresh entropy)
+    """
+    global _rng
+    _rng = np.random.default_rng(seed)
+
+
+def weighted_sample(weights, k, size=None, rng=None):
+    """
+    Sample k distinct indices proportionally to their weights.
+
+    Parameters:
+    -----------
+    weights : array-like
+        (n,) weights shared by all samples, or (size, n) weights per sample.
+        Zero, negative and NaN weights are only picked when the weighted
+        items run out.
+    k : int
+        Number of distinct indices per sample (at most n)
+    size : int, optional
+        Number of samples; None for a single one
+    rng : numpy.random.Generator, optional
+        Generator to use (default: the shared one)
+
+    Returns:
+    --------
+    numpy.ndarray
+        (k,) indices, or (size, k) for ``size`` samples, in pick order
+    """
+    rng = _rng if rng is None else rng
+    weights = np.asarray(weights, dtype=np.float64)
+    rows = weights.shape[0] if weights.ndim == 2 else (1 if size is None else size)
+    n = weights.shape[-1]
+    k = max(0, min(int(k), n))
+
+    noise = rng.standard_exponential(size=(rows, n))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        keys = noise / weights
+        if not (weights > 0).all():
+            # Items without a positive weight sort after every weighted one, in random order
+            keys = np.where(weights > 0, keys / (1 + keys), 1 + noise)
+
+    if k == 0:
+        picks = np.zeros((rows, 0), dtype=np.int64)
+    else:
+        top = np.argpartition(keys, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (rows, 1))
+        order = np.argsort(np.take_along_axis(keys, top, axis=1), axis=1)
+        picks = np.take_along_axis(top, order, axis=1)
+
+    return picks[0] if size is None and weights.ndim == 1 else picks
+
+
+def sample_items(weights, k, size=None, rng=None):
+    """
+    Sample k distinct keys of a weight mapping.
+
+    Parameters:
+    -----------
+    weights : dict or pandas.Series
+        Items as keys, weights as values
+    k : int
+        Number of distinct items per sample
+    size : int, optional
+        Number of samples; None for a single one
+    rng : numpy.random.Generator, optional
+        Generator to use (default: the shared one)
+
+    Returns:
+    --------
+    list
+        k items in pick order, or ``size`` such lists
+    """
+    items = list(weights.keys())
+    if not items:
+        return [] if size is None else [[] for _ in range(size)]
+    picks = weighted_sample([weights[item] for item in items], k, size=size, rng=rng)
+    return np.asarray(items)[picks].tolist()
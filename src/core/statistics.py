@@ -1,46 +1,202 @@
 import pandas as pd
 import numpy as np
-from collections import Counter
+from functools import cached_property
+
+from src.core.draw_matrix import DrawMatrix, parse_draw
+from src.core.draw_aggregates import DrawAggregates
+from src.core.gap_index import GapIndex
+from src.core.frequency_index import FrequencyIndex
+from src.core.decayed_frequency import DecayedFrequency, DEFAULT_HALF_LIFE
+from src.core.statistics_view import StatisticsView
 
 class EuromillionsStatistics:
     """
     Class for analyzing Euromillions data and calculating various statistics.
+    
+    Derived statistics are memoized properties computed on first use and
+    dropped by ``apply_draw`` when the draws change; constructing an
+    instance only builds the DrawMatrix.
     """
     
+    # Memoized properties that depend on the draws
+    _DERIVED = ('number_frequency', 'star_frequency', 'aggregates', 'frequency_index',
+                'number_gaps', 'star_gaps', 'sum_distribution', 'consecutive_analysis',
+                'distribution_stats', 'even_odd_distribution', 'decayed_frequencies')
+    
     def __init__(self, data):
         """
         Initialize with Euromillions drawing data.
         
         Parameters:
         -----------
-        data : pandas.DataFrame
-            DataFrame containing Euromillions drawing data
+        data : pandas.DataFrame or DrawMatrix
+            Euromillions drawing data, most recent draw first
         """
-        self.data = data
+        if isinstance(data, DrawMatrix):
+            self.draws = data
+            data = None  # rebuilt from the matrix on first use
+        else:
+            self.draws = DrawMatrix.from_dataframe(data, game='euromillions')
+        self._data = data
+        # Rows of draws applied since data was last read, oldest first
+        self._pending_rows = []
         self.number_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
         self.star_cols = ['s1', 's2']
+    
+    @property
+    def data(self):
+        """DataFrame of the draws (built from the DrawMatrix on first use if none was given)"""
+        if self._data is None:
+            self._data = self.draws.to_dataframe()
+            self._pending_rows = []
+        elif self._pending_rows:
+            # Draws applied since the last read, added in one concat
+            rows = pd.DataFrame(self._pending_rows[::-1])
+            if 'date' in rows.columns and pd.api.types.is_datetime64_any_dtype(self._data['date']):
+                rows['date'] = pd.to_datetime(rows['date'])
+            combined = pd.concat([rows, self._data], ignore_index=True)
+            columns = list(self._data.columns)
+            self._data = combined[columns + [c for c in combined.columns if c not in columns]]
+            self._pending_rows = []
+        return self._data
+    
+    @cached_property
+    def number_frequency(self):
+        """{number: count} of the main numbers"""
+        return {i + 1: int(c) for i, c in enumerate(self.draws.number_counts())}
+    
+    @cached_property
+    def star_frequency(self):
+        """{star: count} of the stars"""
+        return {i + 1: int(c) for i, c in enumerate(self.draws.bonus_counts())}
+    
+    @cached_property
+    def aggregates(self):
+        """DrawAggregates of the draws, kept up to date by apply_draw once built"""
+        return DrawAggregates(self.draws)
+    
+    @cached_property
+    def frequency_index(self):
+        """FrequencyIndex (cumulative counts) of the draws, built on first use"""
+        return FrequencyIndex(self.draws)
+    
+    @cached_property
+    def decayed_frequencies(self):
+        """{half_life: DecayedFrequency} built so far, kept up to date by apply_draw"""
+        return {}
+    
+    def get_decayed_frequency(self, half_life=DEFAULT_HALF_LIFE):
+        """
+        Exponentially decayed frequencies of the numbers and stars.
         
-        # Calculate basic frequency statistics
-        self._calculate_frequencies()
+        Parameters:
+        -----------
+        half_life : float
+            Number of draws after which a draw's weight is halved
+            
+        Returns:
+        --------
+        DecayedFrequency
+            Decayed state, built on first use for each half-life
+        """
+        states = self.decayed_frequencies
+        if half_life not in states:
+            states[half_life] = DecayedFrequency(self.draws, half_life)
+        return states[half_life]
     
-    def _calculate_frequencies(self):
-        """Calculate frequency statistics for numbers and stars"""
-        # Get all drawn numbers
-        all_numbers = pd.Series(self.data[self.number_cols].values.flatten())
-        all_stars = pd.Series(self.data[self.star_cols].values.flatten())
+    def view(self, as_of_index):
+        """
+        Statistics restricted to the draws strictly before a cut-off.
         
-        # Calculate frequencies
-        self.number_frequency = all_numbers.value_counts().to_dict()
-        self.star_frequency = all_stars.value_counts().to_dict()
+        Parameters:
+        -----------
+        as_of_index : int
+            Number of draws, oldest first, visible from the view
+            
+        Returns:
+        --------
+        StatisticsView
+            O(1) view sharing this object's cumulative index
+        """
+        return StatisticsView(self, as_of_index)
+    
+    @cached_property
+    def number_gaps(self):
+        """GapIndex of the main numbers, built on first use"""
+        return GapIndex(self.draws.occurrence)
+    
+    @cached_property
+    def star_gaps(self):
+        """GapIndex of the stars, built on first use"""
+        return GapIndex(self.draws.bonus_occurrence)
+    
+    def _invalidate(self, keep=()):
+        """Drop the memoized statistics, except those listed in ``keep``"""
+        for name in self._DERIVED:
+            if name not in keep:
+                self.__dict__.pop(name, None)
+    
+    def apply_draw(self, draw):
+        """
+        Fold a newly published draw into the statistics without a rescan.
         
-        # Fill in missing values
-        for i in range(1, 51):
-            if i not in self.number_frequency:
-                self.number_frequency[i] = 0
+        The aggregates (recent window, gap counters, pair counts and the
+        sum/even-odd histograms, built on the first call) and the frequencies
+        already built are updated in O(numbers), and the draw is written into
+        free rows in front of the DrawMatrix; the recency, number, sum and
+        even/odd statistics are then served from the aggregates. The draw
+        becomes the most recent row of ``data`` the next time it is read.
+        A draw dated before the latest one is inserted in date order
+        instead and the derived statistics are rebuilt on next use.
         
-        for i in range(1, 13):
-            if i not in self.star_frequency:
-                self.star_frequency[i] = 0
+        Parameters:
+        -----------
+        draw : dict
+            {'date': ..., 'numbers': [5 ints], 'stars': [2 ints]} or a row
+            with n1..n5, s1, s2 columns
+        """
+        numbers, stars, date_ordinal = parse_draw(draw, 'euromillions')
+        
+        position = self.draws.date_position(date_ordinal)
+        if position > 0:
+            # Older than the latest draw: insert it in date order and rebuild on use
+            self.draws = self.draws.insert(position, numbers, stars, date_ordinal)
+            self._invalidate()
+            if self._data is not None:
+                data = self.data
+                row = self._data_row(numbers, stars, draw)
+                if 'date' in row and pd.api.types.is_datetime64_any_dtype(data['date']):
+                    row['date'] = pd.Timestamp(row['date'])
+                self._data = pd.concat([data.iloc[:position], pd.DataFrame([row]), data.iloc[position:]],
+                                       ignore_index=True)
+            return
+        
+        # Aggregates are built on the current draws the first time, then kept up to date
+        self.aggregates
+        self.draws = self.draws.prepend(numbers, stars, date_ordinal)
+        
+        # Statistics already built are updated in place, the others are dropped
+        memo = self.__dict__
+        self._invalidate(keep=('number_frequency', 'star_frequency', 'aggregates',
+                               'decayed_frequencies'))
+        self.aggregates.apply(self.draws)
+        for state in memo.get('decayed_frequencies', {}).values():
+            state.update(numbers, stars)
+        if 'number_frequency' in memo:
+            for num in numbers:
+                self.number_frequency[num] = self.number_frequency.get(num, 0) + 1
+        if 'star_frequency' in memo:
+            for star in stars:
+                self.star_frequency[star] = self.star_frequency.get(star, 0) + 1
+        if self._data is not None:
+            self._pending_rows.append(self._data_row(numbers, stars, draw))
+    
+    def _data_row(self, numbers, stars, draw):
+        """Row of ``data`` for an applied draw"""
+        row = dict(zip(self.number_cols + self.star_cols, numbers + stars))
+        if 'date' in self._data.columns and 'date' in draw:
+            row['date'] = draw['date']
+        return row
     
     def get_frequency(self, number=None):
         """
@@ -80,27 +236,21 @@ class EuromillionsStatistics:
             'draws_since_last': 0
         }
         
-        # Check for the number in each draw to find patterns
-        appearances = []
-        for i, row in self.data.iterrows():
-            if number in [row[col] for col in self.number_cols]:
-                appearances.append(i)
+        # Running gap counters, kept up to date by apply_draw
+        aggregates = self.aggregates
+        column = number - 1
         
-        # Calculate draws since last appearance
-        if appearances:
-            stats['draws_since_last'] = len(self.data) - appearances[0] - 1
+        # Rows since the most recent appearance (data is most recent first)
+        if aggregates.number_counts[column]:
+            stats['draws_since_last'] = int(aggregates.draws_since_last[column])
         
         # Analyze for cyclical patterns
-        if len(appearances) >= 3:
-            # Calculate gaps between appearances
-            gaps = [appearances[i] - appearances[i+1] for i in range(len(appearances)-1)]
-            
-            # Calculate average gap (cycle)
-            avg_gap = sum(gaps) / len(gaps)
+        if aggregates.number_counts[column] >= 3:
+            avg_gaps, gap_variances = aggregates.gap_stats()
+            avg_gap = float(avg_gaps[column])
             
             # Only consider it a cycle if variance is low
-            gap_variance = sum((g - avg_gap)**2 for g in gaps) / len(gaps)
-            if gap_variance < (avg_gap * 0.5):  # Low variance relative to average
+            if gap_variances[column] < (avg_gap * 0.5):  # Low variance relative to average
                 stats['cyclic_pattern'] = avg_gap
         
         return stats
@@ -125,7 +275,7 @@ class EuromillionsStatistics:
         sorted_freq = sorted(self.star_frequency.items(), key=lambda x: x[1])
         return [star for star, _ in sorted_freq[:count]]
     
-    def get_weighted_frequency(self, recent_weight=0.5):
+    def get_weighted_frequency(self, recent_weight=0.5, half_life=None):
         """
         Get frequency with optional weighting for recent draws.
         
@@ -133,41 +283,28 @@ class EuromillionsStatistics:
         -----------
         recent_weight : float
             Weight to give recent draws (0.0 - 1.0)
+        half_life : float, optional
+            Weigh recent draws with an exponential decay of this half-life
+            (in draws) instead of counting the last 20% of the draws
             
         Returns:
         --------
         dict
             Dictionary mapping numbers to weighted frequencies
         """
-        # Base frequency
-        weighted_freq = self.number_frequency.copy()
+        if recent_weight <= 0:
+            return self.number_frequency.copy()
         
-        # If recent weighting is requested
-        if recent_weight > 0:
-            # Get recent draws (last 20%)
-            recent_count = max(1, int(len(self.data) * 0.2))
-            recent_data = self.data.head(recent_count)
-            
-            # Calculate recent frequencies
-            recent_numbers = pd.Series(recent_data[self.number_cols].values.flatten())
-            recent_freq = recent_numbers.value_counts().to_dict()
-            
-            # Apply weighted combination
-            for num in weighted_freq:
-                recent_val = recent_freq.get(num, 0) 
-                base_val = self.number_frequency[num]
-                
-                # Scale recent to match base scale
-                if sum(recent_freq.values()) > 0:
-                    scale_factor = sum(self.number_frequency.values()) / sum(recent_freq.values())
-                    recent_val = recent_val * scale_factor
-                
-                # Combine with weighting
-                weighted_freq[num] = (1 - recent_weight) * base_val + recent_weight * recent_val
-        
-        return weighted_freq
-    
-    def get_weighted_star_frequency(self, recent_weight=0.5):
+        index = self.frequency_index
+        if half_life is not None:
+            recent_counts = self.get_decayed_frequency(half_life).number_weights()
+        else:
+            # Recent draws (last 20%) come straight from the cumulative counts
+            recent_count = max(1, int(index.n_draws * 0.2))
+            recent_counts, _ = index.recent_counts(recent_count)
+        return self._blend_recent(index.counts()[0], recent_counts, recent_weight)
+    
+    def get_weighted_star_frequency(self, recent_weight=0.5, half_life=None):
         """
         Get star frequency with optional weighting for recent draws.
         
@@ -175,41 +312,55 @@ class EuromillionsStatistics:
         -----------
         recent_weight : float
             Weight to give recent draws (0.0 - 1.0)
+        half_life : float, optional
+            Weigh recent draws with an exponential decay of this half-life
+            (in draws) instead of counting the last 20% of the draws
             
         Returns:
         --------
         dict
             Dictionary mapping stars to weighted frequencies
         """
-        # Base frequency
-        weighted_freq = self.star_frequency.copy()
+        if recent_weight <= 0:
+            return self.star_frequency.copy()
         
-        # If recent weighting is requested
-        if recent_weight > 0:
-            # Get recent draws (last 20%)
-            recent_count = max(1, int(len(self.data) * 0.2))
-            recent_data = self.data.head(recent_count)
-            
-            # Calculate recent frequencies
-            recent_stars = pd.Series(recent_data[self.star_cols].values.flatten())
-            recent_freq = recent_stars.value_counts().to_dict()
+        index = self.frequency_index
+        if half_life is not None:
+            recent_counts = self.get_decayed_frequency(half_life).bonus_weights()
+        else:
+            recent_count = max(1, int(index.n_draws * 0.2))
+            _, recent_counts = index.recent_counts(recent_count)
+        return self._blend_recent(index.counts()[1], recent_counts, recent_weight)
+    
+    @staticmethod
+    def _blend_recent(base_counts, recent_counts, recent_weight):
+        """
+        Mix overall and recent counts, the recent ones rescaled to the overall total.
+        
+        Parameters:
+        -----------
+        base_counts : numpy.ndarray
+            Counts over all draws, index k for number k + 1
+        recent_counts : numpy.ndarray
+            Counts over the recent window
+        recent_weight : float
+            Weight of the recent counts (0.0 - 1.0)
             
-            # Apply weighted combination
-            for star in weighted_freq:
-                recent_val = recent_freq.get(star, 0) 
-                base_val = self.star_frequency[star]
-                
-                # Scale recent to match base scale
-                if sum(recent_freq.values()) > 0:
-                    scale_factor = sum(self.star_frequency.values()) / sum(recent_freq.values())
-                    recent_val = recent_val * scale_factor
-                
-                # Combine with weighting
-                weighted_freq[star] = (1 - recent_weight) * base_val + recent_weight * recent_val
-        
-        return weighted_freq
+        Returns:
+        --------
+        dict
+            Dictionary mapping numbers to weighted frequencies
+        """
+        base = base_counts.astype(float)
+        recent = recent_counts.astype(float)
+        recent_total = recent.sum()
+        if recent_total > 0:
+            recent *= base.sum() / recent_total
+        weighted = (1 - recent_weight) * base + recent_weight * recent
+        return {i + 1: float(value) for i, value in enumerate(weighted)}
     
-    def get_distribution_stats(self):
+    @cached_property
+    def distribution_stats(self):
         """
         Get statistics about number distributions.
         
@@ -218,45 +369,30 @@ class EuromillionsStatistics:
         dict
             Dictionary with distribution statistics
         """
-        # Collect all numbers from all draws
-        all_numbers = []
-        for _, row in self.data.iterrows():
-            all_numbers.extend([row[col] for col in self.number_cols])
-        
-        # Calculate statistics on all numbers
-        number_series = pd.Series(all_numbers)
+        # Statistics on all numbers from all draws
+        all_numbers = self.draws.numbers.astype(np.int64).ravel()
         
         return {
-            "mean": float(number_series.mean()),
-            "median": float(number_series.median()),
-            "std": float(number_series.std()),
-            "min": int(number_series.min()),
-            "max": int(number_series.max()),
+            "mean": float(all_numbers.mean()),
+            "median": float(np.median(all_numbers)),
+            "std": float(all_numbers.std(ddof=1)),
+            "min": int(all_numbers.min()),
+            "max": int(all_numbers.max()),
             "even_odd_pattern": self._get_most_common_even_odd_pattern(),
             "low_high_pattern": self._get_most_common_low_high_pattern()
         }
     
+    def get_distribution_stats(self):
+        """Distribution statistics of the draws (memoized), see ``distribution_stats``"""
+        return self.distribution_stats
+    
     def _get_most_common_even_odd_pattern(self):
         """Helper to get most common even/odd pattern."""
-        even_odd_patterns = []
-        for _, row in self.data.iterrows():
-            numbers = [row[col] for col in self.number_cols]
-            odd_count = sum(1 for n in numbers if n % 2 == 1)
-            even_count = 5 - odd_count
-            even_odd_patterns.append(f"{even_count}e-{odd_count}o")
-        even_odd_counts = Counter(even_odd_patterns)
-        return even_odd_counts.most_common(1)[0][0] if even_odd_counts else "Unknown"
+        return self.draws.draw_shape().even_odd_pattern()
     
     def _get_most_common_low_high_pattern(self):
-        """Helper to get most common low/high pattern."""
-        low_high_patterns = []
-        for _, row in self.data.iterrows():
-            numbers = [row[col] for col in self.number_cols]
-            low_count = sum(1 for n in numbers if n <= 25)
-            high_count = 5 - low_count
-            low_high_patterns.append(f"{low_count}l-{high_count}h")
-        low_high_counts = Counter(low_high_patterns)
-        return low_high_counts.most_common(1)[0][0] if low_high_counts else "Unknown"
+        """Helper to get most common low/high pattern (1-25 are low)."""
+        return self.draws.draw_shape().low_high_pattern()
     
     def get_recency_stats(self, draws=20):
         """
@@ -272,26 +408,24 @@ class EuromillionsStatistics:
         dict
             Dictionary with recency statistics
         """
-        # Get recent data
-        recent_data = self.data.head(min(draws, len(self.data)))
-        
-        # Calculate frequencies
-        recent_numbers = pd.Series(recent_data[self.number_cols].values.flatten())
-        recent_stars = pd.Series(recent_data[self.star_cols].values.flatten())
-        
-        recent_number_freq = recent_numbers.value_counts()
-        recent_star_freq = recent_stars.value_counts()
+        aggregates = self.__dict__.get('aggregates')
+        if aggregates is not None and draws == aggregates.recent_window:
+            # Window kept up to date by apply_draw
+            number_counts, star_counts = aggregates.recent_number_counts, aggregates.recent_bonus_counts
+        else:
+            number_counts, star_counts = self.frequency_index.recent_counts(draws)
         
-        # Get hot numbers and stars
-        hot_numbers = list(recent_number_freq.head(5).index)
-        hot_stars = list(recent_star_freq.head(3).index)
+        # Most frequent first, ties by number
+        hot_numbers = [int(i) + 1 for i in np.argsort(-number_counts, kind='stable')[:5] if number_counts[i] > 0]
+        hot_stars = [int(i) + 1 for i in np.argsort(-star_counts, kind='stable')[:3] if star_counts[i] > 0]
         
         return {
             "hot_numbers": hot_numbers,
             "hot_lucky": hot_stars
         }
         
-    def get_sum_distribution(self):
+    @cached_property
+    def sum_distribution(self):
         """
         Analyze the sum distribution of drawn numbers.
         
@@ -300,24 +434,27 @@ class EuromillionsStatistics:
         dict
             Dictionary with sum distribution statistics
         """
-        # Calculate sums of each draw
-        sums = []
-        for _, row in self.data.iterrows():
-            numbers = [row[col] for col in self.number_cols]
-            sums.append(sum(numbers))
-            
-        # Analyze the distribution of sums
-        sum_series = pd.Series(sums)
-        
-        # Convert numeric values to integers or floats as appropriate
-        min_sum = int(sum_series.min()) if not pd.isna(sum_series.min()) else 0
-        max_sum = int(sum_series.max()) if not pd.isna(sum_series.max()) else 0
-        mean_sum = float(sum_series.mean()) if not pd.isna(sum_series.mean()) else 0.0
-        median_sum = float(sum_series.median()) if not pd.isna(sum_series.median()) else 0.0
-        
-        # Create range distribution as a separate object
+        # Distinct sums and their draw counts, from the running sum histogram
+        values, counts = self.aggregates.sum_values()
+        total = int(counts.sum())
+        
+        min_sum = int(values[0]) if total else 0
+        max_sum = int(values[-1]) if total else 0
+        mean_sum = float((values * counts).sum() / total) if total else 0.0
+        median_sum = 0.0
+        if total:
+            cumulative = np.cumsum(counts)
+            lower = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+            upper = values[np.searchsorted(cumulative, total // 2, side='right')]
+            median_sum = float((lower + upper) / 2)
+        
+        # Create range distribution as a separate object (the bins only depend on min and max)
         try:
-            range_counts = pd.cut(sum_series, bins=5).value_counts()
+            ranges = pd.cut(pd.Series(values), bins=5)
+            range_counts = pd.Series(
+                np.bincount(ranges.cat.codes, weights=counts, minlength=5).astype(np.int64),
+                index=ranges.cat.categories
+            ).sort_values(ascending=False)
             range_dict = {str(k): int(v) for k, v in range_counts.items()}
         except:
             range_dict = {}
@@ -335,8 +472,13 @@ class EuromillionsStatistics:
             "sum_frequency": sum_frequency,
             "most_common_ranges": range_dict
         }
-        
-    def get_consecutive_analysis(self):
+    
+    def get_sum_distribution(self):
+        """Sum distribution of the draws (memoized), see ``sum_distribution``"""
+        return self.sum_distribution
+    
+    @cached_property
+    def consecutive_analysis(self):
         """
         Analyze the presence of consecutive numbers in drawings.
         
@@ -345,29 +487,22 @@ class EuromillionsStatistics:
         dict
             Dictionary with consecutive number statistics
         """
-        consecutive_counts = []
-        
-        # Check each draw for consecutive numbers
-        for _, row in self.data.iterrows():
-            numbers = sorted([row[col] for col in self.number_cols])
-            consecutive_count = 0
-            
-            # Count consecutive pairs
-            for i in range(len(numbers)-1):
-                if numbers[i+1] - numbers[i] == 1:
-                    consecutive_count += 1
-            
-            consecutive_counts.append(consecutive_count)
-        
-        consecutive_series = pd.Series(consecutive_counts)
+        # Consecutive pairs per draw and their histogram
+        shape = self.draws.draw_shape()
+        consecutive_counts = shape.consecutive_counts
+        histogram = shape.histogram(consecutive_counts)
         
         return {
-            "max_consecutive": consecutive_series.max(),
-            "mean_consecutive": consecutive_series.mean(),
-            "pct_with_consecutive": (consecutive_series > 0).mean() * 100,
-            "distribution": consecutive_series.value_counts().sort_index().to_dict()
+            "max_consecutive": int(consecutive_counts.max()),
+            "mean_consecutive": float(consecutive_counts.mean()),
+            "pct_with_consecutive": float(np.mean(consecutive_counts > 0) * 100),
+            "distribution": {k: int(c) for k, c in enumerate(histogram) if c > 0}
         }
     
+    def get_consecutive_analysis(self):
+        """Consecutive-number analysis of the draws (memoized), see ``consecutive_analysis``"""
+        return self.consecutive_analysis
+    
     def get_gap_analysis(self, number=None):
         """
         Analyze the gaps between appearances of a specific number.
@@ -382,43 +517,31 @@ class EuromillionsStatistics:
         dict
             Dictionary with gap statistics
         """
+        gaps = self.number_gaps
+        
         if number is None:  # Return a summary for all numbers if none specified
-            avg_gaps = {}
-            for num in range(1, 51):
-                appearances = []
-                for i, row in self.data.iterrows():
-                    if num in [row[col] for col in self.number_cols]:
-                        appearances.append(i)
-                
-                if len(appearances) > 1:
-                    # Calculate gaps: difference between consecutive appearances
-                    # appearances are in chronological order (0, 1, 2, ...)
-                    gaps = [appearances[i+1] - appearances[i] for i in range(len(appearances)-1)]
-                    avg_gaps[num] = sum(gaps) / len(gaps) if gaps else 0
+            avg_gaps = {
+                num: float(gaps.avg_gap[num - 1])
+                for num in range(1, 51) if gaps.counts[num - 1] > 1
+            }
             
             return {
                 "average_gaps": avg_gaps,
                 "most_regular": sorted(avg_gaps.items(), key=lambda x: x[1], reverse=True)[:5]
             }
         else:
-            # Find appearances of the specific number
-            appearances = []
-            for i, row in self.data.iterrows():
-                if number in [row[col] for col in self.number_cols]:
-                    appearances.append(i)
+            appearances = gaps.appearances(number)
             
             if len(appearances) <= 1:
-                return {"gaps": [], "avg_gap": 0, "last_appearance": appearances[0] if appearances else -1}
-            
-            # Calculate gaps between appearances
-            # appearances are in chronological order (0, 1, 2, ...)
-            gaps = [appearances[i+1] - appearances[i] for i in range(len(appearances)-1)]
+                return {"gaps": [], "avg_gap": 0, "last_appearance": int(appearances[0]) if len(appearances) else -1}
             
+            # Gaps between consecutive appearances, in row order
+            last_appearance = int(gaps.oldest_appearance[number - 1])
             return {
-                "gaps": gaps,
-                "avg_gap": sum(gaps) / len(gaps) if gaps else 0,
-                "last_appearance": appearances[-1] if appearances else -1,
-                "draws_since_last": len(self.data) - 1 - appearances[-1] if appearances else -1
+                "gaps": gaps.gaps(number).tolist(),
+                "avg_gap": float(gaps.avg_gap[number - 1]),
+                "last_appearance": last_appearance,
+                "draws_since_last": len(self.draws) - 1 - last_appearance
             }
 
     def get_number_range_distribution(self, ranges=None):
@@ -451,7 +574,8 @@ class EuromillionsStatistics:
 
         return distribution
 
-    def get_even_odd_distribution(self):
+    @cached_property
+    def even_odd_distribution(self):
         """
         Get distribution of even vs odd numbers in historical draws.
 
@@ -483,12 +607,8 @@ class EuromillionsStatistics:
         )
         total = even_count + odd_count
 
-        # Calculate how many draws have 0, 1, 2, 3, 4, or 5 even numbers
-        even_per_draw = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for _, row in self.data.iterrows():
-            numbers = [row[col] for col in self.number_cols]
-            even_in_draw = sum(1 for n in numbers if n % 2 == 0)
-            even_per_draw[even_in_draw] = even_per_draw.get(even_in_draw, 0) + 1
+        # How many draws have 0, 1, 2, 3, 4, or 5 even numbers (running histogram)
+        even_per_draw = {k: int(v) for k, v in enumerate(self.aggregates.even_histogram[:6])}
 
         return {
             'even_count': even_count,
@@ -496,4 +616,8 @@ class EuromillionsStatistics:
             'even_ratio': even_count / total if total > 0 else 0,
             'odd_ratio': odd_count / total if total > 0 else 0,
             **even_per_draw  # Unpack the distribution of even numbers per draw
-        }
\ No newline at end of file
+        }
+
+    def get_even_odd_distribution(self):
+        """Even/odd distribution of the draws (memoized), see ``even_odd_distribution``"""
+        return self.even_odd_distribution
@@ -0,0 +1,169 @@
+"""
+Point-in-time views of a statistics object for walk-forward backtesting.
+
+A StatisticsView presents the API of an EuromillionsStatistics or
+FrenchLotoStatistics restricted to the draws strictly before a cut-off. It
+shares the cumulative FrequencyIndex of the full-history statistics, so
+creating a view is O(1) and the frequency, recency and hot/cold methods run
+in O(numbers) without copying the draws. Anything that needs the draws
+themselves (gaps, pairs, distributions) is computed on first use from a
+statistics object built over the view's draws.
+"""
+
+import inspect
+import types
+
+# Instance attributes computed from the statistics methods rather than the snapshot
+_DERIVED_ATTRIBUTES = {
+    'hot_cold_numbers': 'get_hot_cold_numbers',
+}
+
+
+class StatisticsView:
+    """
+    The statistics of the ``as_of_index`` oldest draws of a history.
+
+    Methods of the underlying statistics class run against the view; their
+    ``self.draws``, ``self.data``, ``self.frequency_index`` and frequency
+    dictionaries are those of the view. Draws are ordered by date, most
+    recent first, as in the database loaders.
+    """
+
+    def __init__(self, statistics, as_of_index):
+        """
+        Initialize a view.
+
+        Parameters:
+        -----------
+        statistics : EuromillionsStatistics or FrenchLotoStatistics
+            Statistics over the full history
+        as_of_index : int
+            Number of draws (oldest first) visible from the view: draws with
+            a date rank of ``as_of_index`` or more are hidden
+        """
+        self.statistics = statistics
+        self.as_of_index = max(0, min(int(as_of_index), len(statistics.draws)))
+        self._frequency_index = None
+        self._draws = None
+        self._data = None
+        self._snapshot = None
+        self._frequencies = None
+        self._decayed_frequencies = None
+
+    def __len__(self):
+        return self.as_of_index
+
+    @property
+    def frequency_index(self):
+        """FrequencyIndex of the visible draws, sharing the parent's tables"""
+        if self._frequency_index is None:
+            self._frequency_index = self.statistics.frequency_index.oldest(self.as_of_index)
+        return self._frequency_index
+
+    @property
+    def draws(self):
+        """DrawMatrix of the visible draws (a zero-copy slice when the history is date-sorted)"""
+        if self._draws is None:
+            parent = self.statistics.frequency_index
+            first = len(self.statistics.draws) - self.as_of_index
+            if parent.date_order is None:
+                self._draws = self.statistics.draws.take(slice(first, None))
+            else:
+                self._draws = self.statistics.draws.take(parent.date_order[first:])
+        return self._draws
+
+    @property
+    def data(self):
+        """DataFrame of the visible draws, built on first use"""
+        if self._data is None:
+            self._data = self.draws.to_dataframe()
+        return self._data
+
+    @property
+    def number_cols(self):
+        return list(self.draws.number_cols)
+
+    @property
+    def star_cols(self):
+        return list(self.draws.bonus_cols)
+
+    def _counts(self):
+        """Frequency dictionaries of the visible draws, from the cumulative index"""
+        if self._frequencies is None:
+            number_counts, bonus_counts = self.frequency_index.counts()
+            self._frequencies = (
+                {i + 1: int(c) for i, c in enumerate(number_counts)},
+                {i + 1: int(c) for i, c in enumerate(bonus_counts)},
+            )
+        return self._frequencies
+
+    @property
+    def number_frequency(self):
+        """Euromillions main-number frequencies"""
+        return dict(self._counts()[0])
+
+    @property
+    def star_frequency(self):
+        """Euromillions star frequencies"""
+        return dict(self._counts()[1])
+
+    @property
+    def main_number_freq(self):
+        """French Loto main-number frequencies, most frequent first"""
+        freq = {n: c for n, c in self._counts()[0].items() if n <= 49}
+        return dict(sorted(freq.items(), key=lambda x: x[1], reverse=True))
+
+    @property
+    def lucky_number_freq(self):
+        """French Loto lucky-number frequencies, most frequent first"""
+        freq = {n: c for n, c in self._counts()[1].items() if n <= 10}
+        return dict(sorted(freq.items(), key=lambda x: x[1], reverse=True))
+
+    def analyze_frequencies(self):
+        """French Loto frequencies are read from the cumulative index; nothing to compute"""
+
+    @property
+    def decayed_frequencies(self):
+        """{half_life: DecayedFrequency} of the visible draws"""
+        if self._decayed_frequencies is None:
+            self._decayed_frequencies = {}
+        return self._decayed_frequencies
+
+    def snapshot(self):
+        """
+        Statistics object built over the visible draws.
+
+        Only used for attributes that cannot be answered from the cumulative
+        index; built once per view.
+
+        Returns:
+        --------
+        EuromillionsStatistics or FrenchLotoStatistics
+        """
+        if self._snapshot is None:
+            self._snapshot = type(self.statistics)(self.draws)
+        return self._snapshot
+
+    def view(self, as_of_index):
+        """View of the ``as_of_index`` oldest draws of the full history."""
+        return StatisticsView(self.statistics, as_of_index)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the view does not define itself
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name in _DERIVED_ATTRIBUTES:
+            value = getattr(self, _DERIVED_ATTRIBUTES[name])()
+            setattr(self, name, value)
+            return value
+
+        try:
+            attribute = inspect.getattr_static(type(self.statistics), name)
+        except AttributeError:
+            attribute = None
+        if isinstance(attribute, types.FunctionType):
+            # Run the class's method against the view
+            return types.MethodType(attribute, self)
+        if isinstance(attribute, staticmethod):
+            return attribute.__func__
+        return getattr(self.snapshot(), name)
@@ -5,7 +5,9 @@ import re
 from collections import Counter, defaultdict
 import itertools
 import math
+from src.core.batch_scoring import score_batch
 from src.core.models import BayesianModel, MarkovModel, TimeSeriesModel
+from src.core.sampling import sample_items, weighted_sample
 
 class PredictionStrategies:
     """
@@ -23,33 +25,25 @@ class PredictionStrategies:
         """
         self.stats = statistics
         
-    def _weighted_sample(self, weights_dict, k):
+    def _weighted_sample(self, weights, k):
         """
-        Sample k elements from a dictionary with weights.
+        Sample k distinct elements based on weights.
         
         Parameters:
         -----------
-        weights_dict : dict
-            Dictionary mapping elements to their weights
+        weights : dict or pandas.Series
+            Dictionary or Series with elements as keys and weights as values
         k : int
             Number of elements to sample
             
         Returns:
         --------
         list
-            List of sampled elements
+            List of k sampled elements (guaranteed to be unique), in pick order
         """
-        population = list(weights_dict.keys())
-        weights = [weights_dict[key] for key in population]
-        
-        # Ensure weights are all positive (add small constant if needed)
-        if min(weights) <= 0:
-            weights = [w + 0.1 for w in weights]
-            
-        # Sample without replacement
-        return random.choices(population, weights=weights, k=k)
+        return sample_items(weights, k)
     
-    def frequency_strategy(self, num_combinations=5, recent_weight=0.6):
+    def frequency_strategy(self, num_combinations=5, recent_weight=0.6, half_life=None):
         """
         Generate combinations based on frequency analysis.
         
@@ -59,6 +53,9 @@ class PredictionStrategies:
             Number of combinations to generate
         recent_weight : float
             Weight to give to recent draws (0.0 - 1.0)
+        half_life : float, optional
+            Weigh recent draws with an exponential decay of this half-life
+            (in draws) instead of the last 20% of the draws
         
         Returns:
         --------
@@ -66,31 +63,29 @@ class PredictionStrategies:
             List of combinations, each with 'numbers', 'stars', and 'score'
         """
         # Get weighted frequencies
-        number_freq = self.stats.get_weighted_frequency(recent_weight)
-        star_freq = self.stats.get_weighted_star_frequency(recent_weight)
-        
-        # Generate combinations
-        combinations = []
-        
-        for _ in range(num_combinations):
-            # Sample numbers weighted by frequency
-            numbers = self._weighted_sample(number_freq, 5)
-            stars = self._weighted_sample(star_freq, 2)
-            
-            # Calculate score based on average frequency
-            number_scores = [number_freq[n] for n in numbers]
-            star_scores = [star_freq[s] for s in stars]
-            
-            avg_score = (sum(number_scores) / 5 + sum(star_scores) / 2) / 2
-            normalized_score = round(avg_score * 100, 2)  # Scale to 0-100
-            
-            combinations.append({
-                'numbers': sorted(numbers),
-                'stars': sorted(stars),
-                'score': normalized_score
-            })
-        
-        return combinations
+        number_freq = self.stats.get_weighted_frequency(recent_weight, half_life=half_life)
+        star_freq = self.stats.get_weighted_star_frequency(recent_weight, half_life=half_life)
+        number_keys = np.array(list(number_freq.keys()))
+        number_values = np.array(list(number_freq.values()), dtype=np.float64)
+        star_keys = np.array(list(star_freq.keys()))
+        star_values = np.array(list(star_freq.values()), dtype=np.float64)
+        
+        # Sample the numbers and stars of every combination at once, weighted by frequency
+        number_picks = weighted_sample(number_values, 5, size=num_combinations)
+        star_picks = weighted_sample(star_values, 2, size=num_combinations)
+        
+        # Calculate score based on average frequency
+        avg_scores = (number_values[number_picks].sum(axis=1) / 5 + star_values[star_picks].sum(axis=1) / 2) / 2
+        normalized_scores = np.round(avg_scores * 100, 2)  # Scale to 0-100
+        
+        return [
+            {'numbers': numbers, 'stars': stars, 'score': score}
+            for numbers, stars, score in zip(
+                np.sort(number_keys[number_picks], axis=1).tolist(),
+                np.sort(star_keys[star_picks], axis=1).tolist(),
+                normalized_scores.tolist()
+            )
+        ]
         
     def temporal_pattern_strategy(self, num_combinations=5, pattern_depth=3):
         """Generate combinations based on temporal patterns in the draw history."""
@@ -160,7 +155,7 @@ class PredictionStrategies:
         
         
     
-    def mixed_strategy(self, num_combinations=5, hot_ratio=0.7):
+    def mixed_strategy(self, num_combinations=5, hot_ratio=0.7, half_life=None):
         """
         Generate combinations mixing high-frequency numbers with strategic outsiders.
         
@@ -170,6 +165,10 @@ class PredictionStrategies:
             Number of combinations to generate
         hot_ratio : float
             Ratio of hot numbers to include (0.0 - 1.0)
+        half_life : float, optional
+            Rank hot and cold numbers by their exponentially decayed
+            frequencies with this half-life (in draws), rescaled to the
+            overall counts, instead of the plain counts
         
         Returns:
         --------
@@ -177,8 +176,12 @@ class PredictionStrategies:
             List of combinations, each with 'numbers', 'stars', and 'score'
         """
         # Get number frequencies
-        number_freq = self.stats.get_frequency()
-        star_freq = self.stats.get_star_frequency()
+        if half_life is not None:
+            number_freq = self.stats.get_weighted_frequency(1.0, half_life=half_life)
+            star_freq = self.stats.get_weighted_star_frequency(1.0, half_life=half_life)
+        else:
+            number_freq = self.stats.get_frequency()
+            star_freq = self.stats.get_star_frequency()
         
         # Convert dict to Series for quantile calculation
         number_freq_series = pd.Series(list(number_freq.values()))
@@ -981,27 +984,17 @@ class PredictionStrategies:
             # Update covered sets
             covered_numbers.update(numbers)
             covered_stars.update(stars)
-            
-            # Calculate coverage score
-            num_coverage = len(covered_numbers) / 50  # Percentage of numbers covered
-            star_coverage = len(covered_stars) / 12  # Percentage of stars covered
-            
-            # Frequency score
-            freq_score = (sum(number_freq[n] for n in numbers) / 5 + sum(star_freq[s] for s in stars) / 2) / 2
-            
-            # Combined score - weight coverage more in later combinations
-            coverage_weight = min(0.2 + (i * 0.15), 0.8)  # Increases with each combination
-            freq_weight = 1 - coverage_weight
-            
-            normalized_score = round((coverage_weight * (num_coverage + star_coverage) / 2 + freq_weight * freq_score) * 100, 2)
-            
-            combinations.append({
-                'numbers': sorted(numbers),
-                'stars': sorted(stars),
-                'score': normalized_score
-            })
+            combinations.append((numbers, stars))
         
-        return combinations
+        # Score: coverage so far (weighted more in later combinations) and frequency
+        scores = score_batch([numbers for numbers, _ in combinations],
+                             {'name': 'coverage', 'number_freq': number_freq, 'star_freq': star_freq},
+                             bonus=[stars for _, stars in combinations])
+        
+        return [
+            {'numbers': sorted(numbers), 'stars': sorted(stars), 'score': float(score)}
+            for (numbers, stars), score in zip(combinations, scores)
+        ]
     
     def risk_reward_strategy(self, num_combinations=5, risk_level=5):
         """
@@ -1190,7 +1183,8 @@ class PredictionStrategies:
         return combinations
     
     def bayesian_strategy(self, num_combinations=5, recent_draws_count=20, 
-                       prior_type="empirical", update_method="standard", smoothing_factor=0.1):
+                       prior_type="empirical", update_method="standard", smoothing_factor=0.1,
+                       half_life=None):
         """
         Generate combinations using an enhanced Bayesian probability model with multiple inference methods.
         
@@ -1212,6 +1206,9 @@ class PredictionStrategies:
             - "adaptive": Adaptive updating with time decay
         smoothing_factor : float
             Laplace smoothing factor for handling zero probabilities
+        half_life : float, optional
+            Half-life (in draws) of the exponential time decay of the
+            "adaptive" update (default: linear decay)
             
         Returns:
         --------
@@ -1224,7 +1221,8 @@ class PredictionStrategies:
             recent_draws_count=recent_draws_count,
             prior_type=prior_type,
             update_method=update_method,
-            smoothing_factor=smoothing_factor
+            smoothing_factor=smoothing_factor,
+            half_life=half_life
         )
         
         # Generate combinations
@@ -1254,9 +1252,10 @@ class PredictionStrategies:
         
         Returns:
         --------
-        dict or None
-            Dictionary of probability histories for numbers and stars,
-            or None if no Bayesian model has been used
+        numpy.ndarray or None
+            (steps, 62) array of probabilities after each update, columns
+            0-49 for numbers 1-50 and 50-61 for stars 1-12, or None if no
+            Bayesian model has been used
         """
         if hasattr(self, 'current_bayesian_model'):
             return self.current_bayesian_model.probability_history
@@ -1391,96 +1390,23 @@ class PredictionStrategies:
                 
             star_weights[star] = weight
         
+        # Choose numbers and stars with weighted sampling, all combinations at once
+        numbers = sample_items(number_weights, 5, size=num_combinations)
+        stars = sample_items(star_weights, 2, size=num_combinations)
+        
+        # Score higher when the combination is likely avoided by humans:
+        # - sums that are not "nice" multiples of 10 or 5
+        # - no consecutive numbers
+        # - a 2/3 or 3/2 split of low (1-25) and high numbers
+        scores = score_batch(numbers, {'name': 'cognitive_bias'}, bonus=stars)
+        
         combinations = []
-        for _ in range(num_combinations):
-            # Choose numbers with weighted sampling
-            numbers = self._weighted_sample(number_weights, 5)
-            stars = self._weighted_sample(star_weights, 2)
-            
-            # Calculate sum (combinations with unusual sums may be less played)
-            num_sum = sum(numbers)
-            
-            # Calculate several anti-cognitive bias factors:
-            
-            # 1. Human tendency is to pick combinations with "nice" sums (100, 150, etc.)
-            # So we'll score higher when the sum isn't a multiple of 10 or 50
-            sum_score = 0.5
-            if num_sum % 10 != 0:
-                sum_score += 0.15
-            if num_sum % 5 != 0:
-                sum_score += 0.1
-                
-            # 2. Check for patterns people tend to pick:
-            sorted_nums = sorted(numbers)
-            
-            # Look for consecutive sequences (people like these)
-            has_consecutive = False
-            for i in range(len(sorted_nums) - 1):
-                if sorted_nums[i+1] - sorted_nums[i] == 1:
-                    has_consecutive = True
-                    break
-                    
-            pattern_score = 0.2
-            if not has_consecutive:
-                pattern_score += 0.15  # Bonus for no consecutive numbers
-                
-            # 3. Check distribution across the board (people like clustering)
-            num_in_first_half = sum(1 for n in numbers if n <= 25)
-            distribution_score = 0.0
-            # Score higher when mix of high and low numbers (2/3 or 3/2 split)
-            if num_in_first_half in [2, 3]:
-                distribution_score += 0.2
-                
-            # Calculate final score (higher when the combo is likely avoided by humans)
-            # Maximum theoretical score: 0.5 + 0.15 + 0.1 + 0.2 + 0.15 + 0.2 = 1.3
-            # Normalize to 100-point scale
-            final_score = round((sum_score + pattern_score + distribution_score) / 1.3 * 100, 2)
-            
+        for combo_numbers, combo_stars, score in zip(numbers, stars, scores):
             combinations.append({
-                'numbers': sorted(numbers),
-                'stars': sorted(stars),
-                'score': final_score,
+                'numbers': sorted(combo_numbers),
+                'stars': sorted(combo_stars),
+                'score': float(score),
                 'strategy': 'Anti-Bias'
             })
             
         return combinations
-        
-    def _weighted_sample(self, weights, k):
-        """
-        Helper method to sample k elements based on weights.
-        
-        Parameters:
-        -----------
-        weights : dict or pandas.Series
-            Dictionary or Series with elements as keys and weights as values
-        k : int
-            Number of elements to sample
-        
-        Returns:
-        --------
-        list
-            List of k sampled elements (guaranteed to be unique)
-        """
-        population = list(weights.keys())
-        weights_list = [weights[i] for i in population]
-        
-        # Ensure unique samples
-        result = []
-        remaining_population = population.copy()
-        remaining_weights = weights_list.copy()
-        
-        while len(result) < k and remaining_population:
-            if len(remaining_population) == 1:
-                # Only one choice left
-                result.append(remaining_population[0])
-            else:
-                # Sample based on weights
-                chosen = random.choices(remaining_population, weights=remaining_weights, k=1)[0]
-                result.append(chosen)
-                
-                # Remove the chosen element for next selection
-                idx = remaining_population.index(chosen)
-                remaining_population.pop(idx)
-                remaining_weights.pop(idx)
-        
-        return result
@@ -0,0 +1,242 @@
+"""
+Exhaustive scoring of the main-number ticket space.
+
+Every 5-number ticket of a pool of 50 (Euromillions, 2,118,760 tickets) or 49
+(French Loto, 1,906,884 tickets) is identified by its colex rank (see
+``combination_rank``), and the ranks ``0 .. C(pool, 5) - 1`` are exactly the
+tickets of the pool. ``top_tickets`` walks that range in chunks: each chunk
+is unranked into a (chunk, 5) array, scored in one vectorized call and
+reduced to its best K, so peak memory depends on the chunk size only. The
+chunks are spread over a process pool and their winners merged into the
+exact top K.
+
+``AdditiveScorer`` is the scoring model: a weight per number plus score
+tables indexed by shape features of the ticket (sum, spread, even count, low
+count, consecutive pairs, covered zones), with optional hard bounds on those
+features.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from src.core.combination_rank import unrank_combinations
+
+logger = logging.getLogger(__name__)
+
+# Tickets unranked and scored per block
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def _zone_edges(pool):
+    """Upper numbers of the low and middle thirds (16 and 33 for a pool of 49)."""
+    return round(pool / 3), round(2 * pool / 3)
+
+
+def ticket_features(numbers, pool):
+    """
+    Shape features of sorted tickets, named like the DrawShape columns.
+
+    Parameters:
+    -----------
+    numbers : numpy.ndarray
+        (n, k) tickets, each row sorted ascending
+    pool : int
+        Largest number of the game
+
+    Returns:
+    --------
+    dict
+        Feature name -> (n,) int64 array:
+
+        - ``sum``: sum of the numbers
+        - ``spread``: largest minus smallest number
+        - ``even``: count of even numbers
+        - ``low``: count of numbers up to ``pool // 2``
+        - ``consecutive``: count of pairs of consecutive numbers
+        - ``zones``: thirds of the pool covered, as bits (4 low, 2 middle, 1 high)
+    """
+    low_edge, mid_edge = _zone_edges(pool)
+    low = numbers <= low_edge
+    high = numbers > mid_edge
+    return {
+        'sum': numbers.sum(axis=1),
+        'spread': numbers[:, -1] - numbers[:, 0],
+        'even': np.count_nonzero(numbers % 2 == 0, axis=1),
+        'low': np.count_nonzero(numbers <= pool // 2, axis=1),
+        'consecutive': np.count_nonzero(np.diff(numbers, axis=1) == 1, axis=1),
+        'zones': (4 * low.any(axis=1) + 2 * (~low & ~high).any(axis=1) + high.any(axis=1)).astype(np.int64),
+    }
+
+
+FEATURES = ('sum', 'spread', 'even', 'low', 'consecutive', 'zones')
+
+
+class AdditiveScorer:
+    """
+    Ticket score: per-number weights plus feature lookup tables, under bounds.
+
+    The score of a ticket is::
+
+        base + min(sum of number_weights[n - 1], number_cap)
+             + sum of feature_scores[name][feature value]
+
+    Tickets whose features fall outside ``constraints`` score ``-inf``. The
+    scorer is a plain picklable object so it can be shipped to worker
+    processes.
+    """
+
+    def __init__(self, number_weights, base=0.0, number_cap=None, feature_scores=None, constraints=None):
+        """
+        Initialize the scoring model.
+
+        Parameters:
+        -----------
+        number_weights : array-like
+            (pool,) weight of each number, index ``n - 1`` for number n
+        base : float
+            Constant added to every score
+        number_cap : float, optional
+            Upper bound of the summed number weights
+        feature_scores : dict, optional
+            Feature name -> array of scores indexed by the feature value;
+            values past the end of an array score 0
+        constraints : dict, optional
+            Feature name -> (min, max) inclusive bounds a ticket must satisfy
+        """
+        self.number_weights = np.asarray(number_weights, dtype=np.float64)
+        self.pool = len(self.number_weights)
+        self.base = float(base)
+        self.number_cap = number_cap
+        self.feature_scores = {}
+        self.constraints = dict(constraints or {})
+
+        for name, table in (feature_scores or {}).items():
+            if name not in FEATURES:
+                raise ValueError(f"Unknown feature '{name}', expected one of {list(FEATURES)}")
+            # Pad to the largest possible value (the sum) so lookups never go out of range
+            table = np.asarray(table, dtype=np.float64)
+            padded = np.zeros(max(len(table), 5 * self.pool + 1))
+            padded[:len(table)] = table
+            self.feature_scores[name] = padded
+        for name in self.constraints:
+            if name not in FEATURES:
+                raise ValueError(f"Unknown feature '{name}', expected one of {list(FEATURES)}")
+
+    def __call__(self, numbers):
+        """
+        Score a block of tickets.
+
+        Parameters:
+        -----------
+        numbers : numpy.ndarray
+            (n, 5) tickets, each row sorted ascending
+
+        Returns:
+        --------
+        numpy.ndarray
+            (n,) float64 scores
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        scores = self.number_weights[numbers - 1].sum(axis=1)
+        if self.number_cap is not None:
+            np.minimum(scores, self.number_cap, out=scores)
+        scores += self.base
+
+        if self.feature_scores or self.constraints:
+            features = ticket_features(numbers, self.pool)
+            for name, table in self.feature_scores.items():
+                scores += table[features[name]]
+            for name, (low, high) in self.constraints.items():
+                scores[(features[name] < low) | (features[name] > high)] = -np.inf
+        return scores
+
+
+def _chunk_top(scores, k):
+    """
+    Indices of the k best scores, ties going to the lowest index.
+
+    Parameters:
+    -----------
+    scores : numpy.ndarray
+        1-D scores
+    k : int
+        Number of indices to keep
+
+    Returns:
+    --------
+    numpy.ndarray
+        Up to k indices, unordered
+    """
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= len(scores):
+        return np.arange(len(scores))
+    threshold = scores[np.argpartition(scores, len(scores) - k)[len(scores) - k]]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+    return np.concatenate([above, tied])
+
+
+def _score_chunk(scorer, start, stop, k, draw_size):
+    """Ranks and scores of the best k tickets with ranks in [start, stop)."""
+    ranks = np.arange(start, stop, dtype=np.int64)
+    scores = scorer(unrank_combinations(ranks, draw_size))
+    best = _chunk_top(scores, k)
+    return ranks[best], scores[best]
+
+
+def top_tickets(scorer, k=10, pool=50, draw_size=5, chunk_size=DEFAULT_CHUNK_SIZE, processes=None):
+    """
+    Exact best-scoring tickets of the whole ticket space.
+
+    Parameters:
+    -----------
+    scorer : callable
+        Picklable function mapping a (n, draw_size) array of sorted tickets
+        to (n,) scores, e.g. an AdditiveScorer
+    k : int
+        Number of tickets to return
+    pool : int
+        Largest number (50 for Euromillions, 49 for French Loto)
+    draw_size : int
+        Numbers per ticket
+    chunk_size : int
+        Tickets scored per block; bounds the memory of each worker
+    processes : int, optional
+        Worker processes (default: all cores); 1 scores in this process
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        (k, draw_size) tickets, best first (ties by lowest rank), and their
+        (k,) scores
+    """
+    total = comb(pool, draw_size)
+    k = max(0, min(int(k), total))
+    starts = range(0, total, chunk_size)
+    stops = [min(start + chunk_size, total) for start in starts]
+    processes = (os.cpu_count() or 1) if processes is None else processes
+    chunk_args = (
+        [scorer] * len(starts), list(starts), stops, [k] * len(starts), [draw_size] * len(starts)
+    )
+
+    results = None
+    if processes > 1 and len(starts) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(processes, len(starts))) as executor:
+                results = list(executor.map(_score_chunk, *chunk_args))
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"Process pool unavailable, scoring the tickets in-process: {e}")
+    if results is None:
+        results = list(map(_score_chunk, *chunk_args))
+
+    ranks = np.concatenate([chunk_ranks for chunk_ranks, _ in results])
+    scores = np.concatenate([chunk_scores for _, chunk_scores in results])
+    # Chunk winners come in rank order, so the tie-break on the lowest index carries over
+    best = _chunk_top(scores, k)
+    best = best[np.lexsort((ranks[best], -scores[best]))]
+    return unrank_combinations(ranks[best], draw_size), scores[best]
@@ -0,0 +1,148 @@
+"""
+Transition counts between draws, computed with matrix products.
+
+With X the one-hot occurrence matrix of a DrawMatrix, ``X[:-k].T @ X[k:]``
+counts, for every pair of numbers (a, b), how often a in row i was followed
+by b in row i + k: the first-order transition table at lag k, for all draw
+pairs at once. Higher-order states (a pair of numbers of one draw leading to
+a number of the other) are too many for a dense table, so they are counted
+sparsely with ``np.unique`` over encoded keys and stored row-compressed.
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+
+def lagged_transition_counts(occurrence, max_lag=1):
+    """
+    First-order transition counts for lags 1..max_lag.
+
+    Parameters:
+    -----------
+    occurrence : numpy.ndarray
+        (n_draws, width) one-hot occurrence matrix
+    max_lag : int
+        Largest lag
+
+    Returns:
+    --------
+    numpy.ndarray
+        (max_lag, width, width) int64 counts; ``counts[k - 1, a, b]`` is the
+        number of rows i with a in row i and b in row i + k (index a for
+        number a + 1)
+    """
+    # float32 products run on BLAS and are exact for counts below 2**24
+    x = np.asarray(occurrence, dtype=np.float32)
+    width = x.shape[1]
+    counts = np.zeros((max_lag, width, width), dtype=np.int64)
+    for lag in range(1, min(max_lag, len(x) - 1) + 1):
+        counts[lag - 1] = x[:-lag].T @ x[lag:]
+    return counts
+
+
+def transition_probabilities(counts):
+    """
+    Row-normalized transition probabilities (rows without transitions stay zero).
+
+    Parameters:
+    -----------
+    counts : numpy.ndarray
+        (..., width, width) transition counts
+
+    Returns:
+    --------
+    numpy.ndarray
+        Float array of the same shape
+    """
+    totals = counts.sum(axis=-1, keepdims=True)
+    return np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+
+class PairTransitions:
+    """
+    Sparse pair -> number transition counts at a given lag.
+
+    For every draw pair (i, i + lag), each of the pairs {a, b} of row i is
+    followed by each number c of row i + lag. Only the observed
+    (pair, number) combinations are stored: ``states`` holds the sorted pair
+    codes ``(a - 1) * width + (b - 1)`` with a < b, and the transitions of
+    ``states[s]`` are ``next_numbers[indptr[s]:indptr[s + 1]]`` with their
+    ``counts``.
+    """
+
+    def __init__(self, numbers, width, lag=1):
+        """
+        Initialize from the drawn numbers.
+
+        Parameters:
+        -----------
+        numbers : numpy.ndarray
+            (n_draws, draw_size) numbers of each draw
+        width : int
+            Largest number
+        lag : int
+            Distance, in rows, between a state and its next numbers
+        """
+        self.width = width
+        self.lag = lag
+        numbers = np.sort(np.asarray(numbers, dtype=np.int64), axis=1) - 1
+        if len(numbers) <= lag:
+            self.states = np.zeros(0, dtype=np.int64)
+            self.indptr = np.zeros(1, dtype=np.int64)
+            self.next_numbers = np.zeros(0, dtype=np.int64)
+            self.counts = np.zeros(0, dtype=np.int64)
+            return
+
+        first, second = np.array(list(combinations(range(numbers.shape[1]), 2))).T
+        # (n_pairs_rows, pairs per draw) state codes and their next draws
+        pair_codes = numbers[:-lag, first] * width + numbers[:-lag, second]
+        following = numbers[lag:]
+        keys = (pair_codes[:, :, np.newaxis] * width + following[:, np.newaxis, :]).ravel()
+
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        state_codes = unique_keys // width
+        self.states, starts = np.unique(state_codes, return_index=True)
+        self.indptr = np.append(starts, len(unique_keys))
+        self.next_numbers = unique_keys % width + 1
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.states)
+
+    def transitions(self, a, b):
+        """
+        Numbers that followed the pair {a, b}, with their counts.
+
+        Parameters:
+        -----------
+        a, b : int
+            Two distinct numbers
+
+        Returns:
+        --------
+        tuple of numpy.ndarray
+            (next numbers, counts); empty when the pair was never seen
+        """
+        a, b = min(a, b), max(a, b)
+        code = (a - 1) * self.width + (b - 1)
+        s = np.searchsorted(self.states, code)
+        if s == len(self.states) or self.states[s] != code:
+            return self.next_numbers[:0], self.counts[:0]
+        start, stop = self.indptr[s], self.indptr[s + 1]
+        return self.next_numbers[start:stop], self.counts[start:stop]
+
+    def probabilities(self, a, b):
+        """
+        Transition probabilities from the pair {a, b} over numbers 1..width.
+
+        Returns:
+        --------
+        numpy.ndarray
+            (width,) probabilities, all zero when the pair was never seen
+        """
+        probs = np.zeros(self.width)
+        next_numbers, counts = self.transitions(a, b)
+        if len(counts):
+            probs[next_numbers - 1] = counts / counts.sum()
+        return probs
@@ -13,7 +13,10 @@ import pandas as pd
 import numpy as np
 from collections import Counter
 import logging
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Union
+
+from src.core.draw_matrix import DrawMatrix
+from src.core.bitmask import to_mask, count_matches, numbers_to_masks, bonus_to_masks, draw_masks, match_counts
 
 logger = logging.getLogger(__name__)
 
@@ -25,17 +28,80 @@ class StrategyBacktester:
     Evaluates strategy performance against historical data.
     """
 
-    def __init__(self, historical_data: pd.DataFrame, lottery_type: str = "euromillions"):
+    def __init__(self, historical_data: Union[pd.DataFrame, DrawMatrix], lottery_type: str = "euromillions"):
         """
         Initialize backtester with historical data.
 
         Args:
-            historical_data: DataFrame with historical draws
-            lottery_type: "euromillions" or "french_loto"
+            historical_data: DataFrame or DrawMatrix with historical draws
+            lottery_type: "euromillions" or "french_loto" (taken from the DrawMatrix if one is given)
         """
+        if isinstance(historical_data, DrawMatrix):
+            self.draws = historical_data
+            lottery_type = historical_data.game
+            historical_data = historical_data.to_dataframe()
+        else:
+            self.draws = DrawMatrix.from_dataframe(historical_data, game=lottery_type)
         self.historical_data = historical_data
         self.lottery_type = lottery_type
         self.results = {}
+        self._statistics = None
+        self._views = {}
+
+    @property
+    def statistics(self):
+        """Statistics over the full history, built on first use and shared by every view."""
+        if self._statistics is None:
+            if self.lottery_type == "euromillions":
+                from src.core.statistics import EuromillionsStatistics
+                self._statistics = EuromillionsStatistics(self.draws)
+            else:  # french_loto
+                from src.core.french_loto_statistics import FrenchLotoStatistics
+                self._statistics = FrenchLotoStatistics(self.draws)
+        return self._statistics
+
+    def statistics_view(self, as_of_index: int):
+        """
+        Statistics restricted to the draws strictly before a cut-off.
+
+        Views are O(1) to create and cached per cut-off, so every strategy
+        evaluated at the same point shares one view.
+
+        Args:
+            as_of_index: Number of draws, oldest first, visible to the strategies
+
+        Returns:
+            StatisticsView over the full-history statistics
+        """
+        if as_of_index not in self._views:
+            self._views[as_of_index] = self.statistics.view(as_of_index)
+        return self._views[as_of_index]
+
+    def _split_order(self, test_ratio: float) -> Tuple[np.ndarray, int]:
+        """
+        Row order (most recent first) and test size used by the train/test split.
+
+        Args:
+            test_ratio: Ratio of data to use for testing
+
+        Returns:
+            Tuple of (row positions sorted by date descending, number of test draws)
+        """
+        order = np.argsort(-self.draws.date_ordinals.astype(np.int64), kind='stable')
+        return order, int(len(order) * test_ratio)
+
+    def split_draws(self, test_ratio: float = 0.3) -> Tuple[DrawMatrix, DrawMatrix]:
+        """
+        Split the DrawMatrix into training and testing sets.
+
+        Args:
+            test_ratio: Ratio of data to use for testing (default 30%)
+
+        Returns:
+            Tuple of (training_draws, test_draws), both most recent first
+        """
+        order, test_size = self._split_order(test_ratio)
+        return self.draws.take(order[test_size:]), self.draws.take(order[:test_size])
 
     def split_data(self, test_ratio: float = 0.3) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -48,10 +114,8 @@ class StrategyBacktester:
             Tuple of (training_data, test_data)
         """
         # Sort by date descending (most recent first)
-        sorted_data = self.historical_data.sort_values('date', ascending=False).reset_index(drop=True)
-
-        total_draws = len(sorted_data)
-        test_size = int(total_draws * test_ratio)
+        order, test_size = self._split_order(test_ratio)
+        sorted_data = self.historical_data.iloc[order].reset_index(drop=True)
 
         # Most recent draws for testing, older draws for training
         test_data = sorted_data.iloc[:test_size]
@@ -72,8 +136,8 @@ class StrategyBacktester:
         Returns:
             Score (0-12): number matches + star matches
         """
-        number_matches = len(set(predicted['numbers']) & set(actual['numbers']))
-        star_matches = len(set(predicted['stars']) & set(actual['stars']))
+        number_matches = count_matches(to_mask(predicted['numbers']), to_mask(actual['numbers']))
+        star_matches = count_matches(to_mask(predicted['stars']), to_mask(actual['stars']))
 
         return number_matches + star_matches
 
@@ -94,7 +158,7 @@ class StrategyBacktester:
         pred_lucky = predicted.get('lucky_number') or predicted.get('lucky')
         actual_lucky = actual.get('lucky_number') or actual.get('lucky')
 
-        number_matches = len(set(pred_numbers) & set(actual_numbers))
+        number_matches = count_matches(to_mask(pred_numbers), to_mask(actual_numbers))
         lucky_match = 1 if pred_lucky == actual_lucky else 0
 
         return number_matches + lucky_match
@@ -115,7 +179,7 @@ class StrategyBacktester:
         pred_lucky = predicted.get('lucky_number') or predicted.get('lucky')
         actual_lucky = actual.get('lucky_number') or actual.get('lucky')
 
-        number_matches = len(set(pred_numbers) & set(actual_numbers))
+        number_matches = count_matches(to_mask(pred_numbers), to_mask(actual_numbers))
         lucky_match = 1 if pred_lucky == actual_lucky else 0
 
         return {
@@ -135,8 +199,8 @@ class StrategyBacktester:
         Returns:
             Dict with separate scores for numbers and stars
         """
-        number_matches = len(set(predicted['numbers']) & set(actual['numbers']))
-        star_matches = len(set(predicted['stars']) & set(actual['stars']))
+        number_matches = count_matches(to_mask(predicted['numbers']), to_mask(actual['numbers']))
+        star_matches = count_matches(to_mask(predicted['stars']), to_mask(actual['stars']))
 
         return {
             'number_matches': number_matches,
@@ -144,6 +208,28 @@ class StrategyBacktester:
             'total_score': number_matches + star_matches
         }
 
+    def _prediction_masks(self, predictions: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bitmasks of the main and bonus numbers of generated predictions.
+
+        Args:
+            predictions: Euromillions {'numbers', 'stars'} or French Loto
+                {'main_numbers'/'numbers', 'lucky_number'/'lucky'} dicts
+
+        Returns:
+            Tuple of (uint64 number masks, uint16 bonus masks)
+        """
+        if self.lottery_type == "euromillions":
+            numbers = [pred['numbers'] for pred in predictions]
+            bonus = [pred['stars'] for pred in predictions]
+        else:
+            numbers = [pred.get('main_numbers') or pred.get('numbers', []) for pred in predictions]
+            bonus = [[pred.get('lucky_number') or pred.get('lucky') or 0] for pred in predictions]
+
+        if not predictions:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint16)
+        return numbers_to_masks(numbers), bonus_to_masks(bonus)
+
     def is_winning_prediction(self, score: float) -> bool:
         """
         Determine if a prediction is a winning prediction.
@@ -180,21 +266,19 @@ class StrategyBacktester:
         """
         logger.info(f"Backtesting {strategy_name}...")
 
-        # Split data
-        training_data, test_data = self.split_data()
+        # Split data; the training draws are the oldest ones, seen through a statistics view
+        order, test_size = self._split_order(0.3)
+        test_draws = self.draws.take(order[:test_size])
+        stats = self.statistics_view(len(order) - test_size)
 
         # Initialize strategy with training data
         if self.lottery_type == "euromillions":
-            from src.core.statistics import EuromillionsStatistics
             from src.core.strategies import PredictionStrategies
 
-            stats = EuromillionsStatistics(training_data)
             strategies = PredictionStrategies(stats)
         else:  # french_loto
-            from src.core.french_loto_statistics import FrenchLotoStatistics
             from src.core.french_loto_strategy import FrenchLotoStrategy
 
-            stats = FrenchLotoStatistics(training_data)
             strategies = FrenchLotoStrategy(stats)
 
         # Generate predictions using the strategy
@@ -218,53 +302,23 @@ class StrategyBacktester:
                 'total_scores': 0
             }
 
-        # Score predictions against test data
-        scores = []
-        number_scores = []  # Track number matches separately
-        bonus_scores = []   # Track lucky/star matches separately
-        wins = 0
-
-        for test_idx, test_row in test_data.iterrows():
-            # Extract actual result
-            if self.lottery_type == "euromillions":
-                actual = {
-                    'numbers': [test_row['n1'], test_row['n2'], test_row['n3'],
-                               test_row['n4'], test_row['n5']],
-                    'stars': [test_row['s1'], test_row['s2']]
-                }
-            else:  # french_loto
-                actual = {
-                    'main_numbers': [test_row['n1'], test_row['n2'], test_row['n3'],
-                                    test_row['n4'], test_row['n5']],
-                    'lucky_number': test_row.get('lucky', test_row.get('lucky_number'))
-                }
-
-            # Score each prediction against this actual result
-            for pred in predictions:
-                if self.lottery_type == "euromillions":
-                    detailed = self.score_prediction_euromillions_detailed(pred, actual)
-                    number_scores.append(detailed['number_matches'])
-                    bonus_scores.append(detailed['star_matches'])
-                    score = detailed['total_score']
-                else:
-                    detailed = self.score_prediction_french_loto_detailed(pred, actual)
-                    number_scores.append(detailed['number_matches'])
-                    bonus_scores.append(detailed['lucky_match'])
-                    score = detailed['total_score']
-
-                scores.append(score)
-
-                if self.is_winning_prediction(score):
-                    wins += 1
+        # Score every prediction against every test draw with bitmask matching
+        pred_number_masks, pred_bonus_masks = self._prediction_masks(predictions)
+        test_number_masks, test_bonus_masks = draw_masks(test_draws)
+        number_scores = match_counts(pred_number_masks, test_number_masks).ravel()
+        bonus_scores = match_counts(pred_bonus_masks, test_bonus_masks).ravel()  # Lucky/star matches
+        scores = number_scores.astype(np.int64) + bonus_scores
+        wins = int(np.count_nonzero(self.is_winning_prediction(scores)))
 
         # Calculate metrics
-        avg_score = np.mean(scores) if scores else 0
-        avg_number_score = np.mean(number_scores) if number_scores else 0
-        avg_bonus_score = np.mean(bonus_scores) if bonus_scores else 0
-        bonus_match_rate = (sum(1 for b in bonus_scores if b > 0) / len(bonus_scores) * 100) if bonus_scores else 0
-        win_rate = (wins / len(scores) * 100) if scores else 0
-        max_score = max(scores) if scores else 0
-        std_score = np.std(scores) if scores else 0
+        has_scores = len(scores) > 0
+        avg_score = np.mean(scores) if has_scores else 0
+        avg_number_score = np.mean(number_scores) if has_scores else 0
+        avg_bonus_score = np.mean(bonus_scores) if has_scores else 0
+        bonus_match_rate = (np.count_nonzero(bonus_scores) / len(bonus_scores) * 100) if has_scores else 0
+        win_rate = (wins / len(scores) * 100) if has_scores else 0
+        max_score = int(scores.max()) if has_scores else 0
+        std_score = np.std(scores) if has_scores else 0
 
         results = {
             'strategy': strategy_name,
@@ -276,7 +330,7 @@ class StrategyBacktester:
             'max_score': max_score,
             'std_score': round(std_score, 2),
             'total_predictions': len(predictions),
-            'total_tests': len(test_data),
+            'total_tests': len(test_draws),
             'total_scores': len(scores)
         }
 
@@ -371,19 +425,11 @@ def quick_backtest(lottery_type: str = "euromillions",
     Returns:
         DataFrame with performance metrics
     """
-    from src.core.database import get_db_connection
-
-    # Load data from database
-    conn = get_db_connection()
-    if not conn:
-        raise Exception("Could not connect to database")
-
-    if lottery_type == "euromillions":
-        query = "SELECT * FROM euromillions_drawings ORDER BY date DESC LIMIT 500"
-    else:
-        query = "SELECT * FROM french_loto_drawings ORDER BY date DESC LIMIT 500"
+    from src.core.database import load_drawings, EuromillionsDrawing, FrenchLotoDrawing
 
-    data = pd.read_sql(query, conn)
+    # Load the 500 most recent draws (from the local replica when configured)
+    model = EuromillionsDrawing if lottery_type == "euromillions" else FrenchLotoDrawing
+    data = load_drawings(model, limit=500)
 
     if len(data) < 100:
         raise Exception(f"Insufficient data for backtesting. Found {len(data)} draws, need at least 100.")
@@ -1,6 +1,9 @@
 import pandas as pd
+import numpy as np
 import json
-from collections import Counter
+
+from src.core.combination_rank import ticket_codes, split_ticket_codes
+from src.core.draw_matrix import as_draw_matrix
 
 def analyze_full_combinations(data=None):
     """
@@ -16,46 +19,35 @@ def analyze_full_combinations(data=None):
     # Get all drawings from database if data not provided
     if data is None:
         try:
-            from src.core.database import get_db_connection
-            conn = get_db_connection()
-            if conn:
-                data = pd.read_sql("SELECT * FROM euromillions_drawings ORDER BY date DESC", conn)
-            else:
-                return {"error": "Could not connect to database"}
+            from src.core.database import get_all_drawings
+            data = get_all_drawings()
         except Exception as e:
             return {"error": f"Error getting data: {str(e)}"}
     
     if not isinstance(data, pd.DataFrame) or data.empty:
         return {"error": "No data available for analysis"}
     
-    # Create combination strings for full combinations (5 numbers + 2 stars)
-    full_combinations = []
-    for _, row in data.iterrows():
-        numbers = sorted([row['n1'], row['n2'], row['n3'], row['n4'], row['n5']])
-        stars = sorted([row['s1'], row['s2']])
-        combo_str = f"Numbers: {numbers}, Stars: {stars}"
-        full_combinations.append({
-            'date': row['date'],
-            'combination': combo_str,
-            'numbers': numbers,
-            'stars': stars
-        })
-    
-    # Check for repeated full combinations
-    combo_counter = Counter([c['combination'] for c in full_combinations])
-    repeated_combos = {combo: count for combo, count in combo_counter.items() if count > 1}
-    
-    # Find occurrences of repeated combinations with dates
+    # One integer code per ticket; repeats are the codes np.unique counts more than once
+    draws = as_draw_matrix(data, 'euromillions')
+    try:
+        codes = ticket_codes(draws.numbers, draws.bonus)
+    except ValueError as e:
+        return {"error": f"Invalid drawing in data: {str(e)}"}
+    unique_codes, first, inverse, counts = np.unique(codes, return_index=True, return_inverse=True, return_counts=True)
+
+    repeated_combos = {}
     repeated_details = {}
-    if repeated_combos:
-        for combo_str, count in repeated_combos.items():
-            repeated_details[combo_str] = [
-                c['date'] for c in full_combinations if c['combination'] == combo_str
-            ]
+    dates = data['date'].tolist()
+    repeated = np.flatnonzero(counts > 1)
+    for index in repeated[np.argsort(first[repeated])]:
+        numbers, stars = split_ticket_codes(unique_codes[index:index + 1], 2)
+        combo_str = f"Numbers: {numbers[0].tolist()}, Stars: {stars[0].tolist()}"
+        repeated_combos[combo_str] = int(counts[index])
+        repeated_details[combo_str] = [dates[row] for row in np.flatnonzero(inverse == index)]
     
     return {
-        'total_draws': len(full_combinations),
-        'unique_combinations': len(combo_counter),
+        'total_draws': len(codes),
+        'unique_combinations': len(unique_codes),
         'repeated_combinations': repeated_combos,
         'repeated_details': repeated_details
     }
@@ -74,32 +66,17 @@ def analyze_number_combinations(data=None, size=3):
     # Get all drawings from database if data not provided
     if data is None:
         try:
-            from src.core.database import get_db_connection
-            conn = get_db_connection()
-            if conn:
-                data = pd.read_sql("SELECT * FROM euromillions_drawings ORDER BY date DESC", conn)
-            else:
-                return {"error": "Could not connect to database"}
+            from src.core.database import get_all_drawings
+            data = get_all_drawings()
         except Exception as e:
             return {"error": f"Error getting data: {str(e)}"}
     
     if not isinstance(data, pd.DataFrame) or data.empty:
         return {"error": "No data available for analysis"}
     
-    # Generate all subsets of the specified size
-    number_combinations = []
-    for _, row in data.iterrows():
-        numbers = sorted([row['n1'], row['n2'], row['n3'], row['n4'], row['n5']])
-        # Generate all possible combinations of size 'size'
-        from itertools import combinations as itercombo
-        for combo in itercombo(numbers, size):
-            number_combinations.append(tuple(sorted(combo)))
-    
-    # Count occurrences of each combination
-    combo_counter = Counter(number_combinations)
-    
-    # Get top combinations
-    top_combos = combo_counter.most_common(20)  # Get top 20
+    # Sparse subset counts from the shared co-occurrence engine
+    draws = as_draw_matrix(data, 'euromillions')
+    top_combos = draws.cooccurrence().top_subsets(size, 20)  # Get top 20
     
     return {
         'size': size,
@@ -120,29 +97,17 @@ def analyze_star_combinations(data=None):
     # Get all drawings from database if data not provided
     if data is None:
         try:
-            from src.core.database import get_db_connection
-            conn = get_db_connection()
-            if conn:
-                data = pd.read_sql("SELECT * FROM euromillions_drawings ORDER BY date DESC", conn)
-            else:
-                return {"error": "Could not connect to database"}
+            from src.core.database import get_all_drawings
+            data = get_all_drawings()
         except Exception as e:
             return {"error": f"Error getting data: {str(e)}"}
     
     if not isinstance(data, pd.DataFrame) or data.empty:
         return {"error": "No data available for analysis"}
     
-    # Extract star combinations
-    star_combinations = []
-    for _, row in data.iterrows():
-        stars = tuple(sorted([row['s1'], row['s2']]))
-        star_combinations.append(stars)
-    
-    # Count occurrences of each combination
-    combo_counter = Counter(star_combinations)
-    
-    # Get top combinations
-    top_combos = combo_counter.most_common(12)  # Get all possible combinations (12 choose 2 = 66)
+    # Star pairs from the 12x12 star co-occurrence matrix
+    draws = as_draw_matrix(data, 'euromillions')
+    top_combos = list(draws.cooccurrence().top_bonus_pairs(12).items())  # Top 12 of the 66 possible pairs
     
     return {
         'total_draws': len(data),
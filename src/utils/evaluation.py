@@ -12,9 +12,12 @@ Analyzes predictions across multiple dimensions:
 """
 
 from collections import Counter
+import numpy as np
 import pandas as pd
 import logging
 
+from src.core.bitmask import numbers_to_masks, bonus_to_masks, match_counts
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +60,7 @@ class FailureAnalyzer:
         star_analysis = self._analyze_stars(star_freq, winning_stars)
         range_analysis = self._analyze_range_distribution(all_our_numbers, winning_numbers)
         pattern_analysis = self._analyze_patterns(our_combinations, winning_numbers, winning_stars)
+        match_analysis = self._analyze_matches(our_combinations, winning_numbers, winning_stars)
 
         # Compile results
         results = {
@@ -65,6 +69,7 @@ class FailureAnalyzer:
             'star_analysis': star_analysis,
             'range_analysis': range_analysis,
             'pattern_analysis': pattern_analysis,
+            'match_analysis': match_analysis,
             'recommendations': self._generate_recommendations(
                 overused, missing, star_analysis, range_analysis
             )
@@ -203,6 +208,44 @@ class FailureAnalyzer:
             'underrepresented_ranges': gaps
         }
 
+    def _analyze_matches(self, our_combinations, winning_numbers, winning_stars):
+        """
+        Count how many numbers and stars each combination matched.
+
+        Args:
+            our_combinations: List of our combinations
+            winning_numbers: List of winning numbers
+            winning_stars: List of winning stars
+
+        Returns:
+            dict: Per-combination matches and their distribution
+        """
+        if not our_combinations:
+            return {'number_matches': [], 'star_matches': [], 'best_number_matches': 0, 'distribution': {}}
+
+        number_matches = match_counts(
+            numbers_to_masks([combo['numbers'] for combo in our_combinations]),
+            numbers_to_masks([winning_numbers])
+        )[:, 0]
+        star_matches = match_counts(
+            bonus_to_masks([combo['stars'] for combo in our_combinations]),
+            bonus_to_masks([winning_stars])
+        )[:, 0]
+
+        values, counts = np.unique(number_matches, return_counts=True)
+        distribution = {int(v): int(c) for v, c in zip(values, counts)}
+
+        logger.info(f"\n5. MATCHES PER COMBINATION:")
+        for matches, count in sorted(distribution.items(), reverse=True):
+            logger.info(f"   {matches} numbers matched: {count} combinations")
+
+        return {
+            'number_matches': number_matches.tolist(),
+            'star_matches': star_matches.tolist(),
+            'best_number_matches': int(number_matches.max()),
+            'distribution': distribution
+        }
+
     def _analyze_patterns(self, our_combinations, winning_numbers, winning_stars):
         """
         Analyze number patterns (even/odd, consecutive, etc.).
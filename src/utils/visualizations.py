@@ -14,48 +14,47 @@ import pandas as pd
 from collections import Counter
 import logging
 
+from src.core.draw_matrix import DrawMatrix, GAME_CONFIG
+
 logger = logging.getLogger(__name__)
 
 
-def plot_number_pairs_heatmap(pairs_data=None, historical_data=None, max_number=50):
+def plot_number_pairs_heatmap(pairs_data=None, historical_data=None, max_number=50, draws=None):
     """
     Create interactive heatmap showing frequency of number pairs.
 
     Args:
         pairs_data: dict of {(num1, num2): frequency} (optional)
-        historical_data: List of draws with 'numbers' key (used if pairs_data not provided)
+        historical_data: List of draws with 'numbers' (or n1..n5) keys (used if pairs_data not provided)
         max_number: Maximum number in range (default 50 for Euromillions)
+        draws: DrawMatrix whose shared co-occurrence counts are used (optional)
 
     Returns:
         Plotly figure object
     """
-    if pairs_data is None and historical_data is None:
-        raise ValueError("Either pairs_data or historical_data must be provided")
-
-    # Build pairs data from historical data if not provided
-    if pairs_data is None:
-        pairs_counter = Counter()
-        for draw in historical_data:
-            numbers = sorted(draw['numbers'])
-            # Count all pairs in this draw
-            for i in range(len(numbers)):
-                for j in range(i+1, len(numbers)):
-                    pair = (numbers[i], numbers[j])
-                    pairs_counter[pair] += 1
-        pairs_data = dict(pairs_counter)
-
-    # Create matrix
-    matrix = np.zeros((max_number, max_number))
-
-    # Total draws for percentage calculation
-    total_pairs = sum(pairs_data.values())
-
-    for (i, j), freq in pairs_data.items():
-        if 1 <= i <= max_number and 1 <= j <= max_number:
-            # Convert frequency to percentage
-            percentage = (freq / total_pairs * 100) if total_pairs > 0 else 0
-            matrix[i-1, j-1] = percentage
-            matrix[j-1, i-1] = percentage  # Mirror for symmetry
+    if pairs_data is None and historical_data is None and draws is None:
+        raise ValueError("Either pairs_data, historical_data or draws must be provided")
+
+    if pairs_data is not None:
+        counts = np.zeros((max_number, max_number))
+        for (i, j), freq in pairs_data.items():
+            if 1 <= i <= max_number and 1 <= j <= max_number:
+                counts[i-1, j-1] = freq
+                counts[j-1, i-1] = freq  # Mirror for symmetry
+    else:
+        # Pair counts as X.T @ X on the one-hot draw matrix
+        if draws is None:
+            numbers = [
+                draw['numbers'] if 'numbers' in draw else [draw[f'n{k}'] for k in range(1, 6)]
+                for draw in historical_data
+            ]
+            game = 'euromillions' if max_number == 50 else 'french_loto'
+            draws = DrawMatrix(numbers, np.zeros((len(numbers), GAME_CONFIG[game]['bonus_count'])), game=game)
+        counts = draws.cooccurrence().pair_matrix[:max_number, :max_number].astype(float)
+
+    # Convert frequencies to percentages of all pair occurrences
+    total_pairs = np.triu(counts, k=1).sum()
+    matrix = counts / total_pairs * 100 if total_pairs > 0 else counts
 
     # Create heatmap
     fig = go.Figure(data=go.Heatmap(
@@ -346,7 +345,11 @@ def create_all_visualizations(historical_data, statistics):
 
     try:
         # Number pairs heatmap
-        figures['pairs_heatmap'] = plot_number_pairs_heatmap(historical_data=historical_data)
+        draws = getattr(statistics, 'draws', None)
+        if draws is not None:
+            figures['pairs_heatmap'] = plot_number_pairs_heatmap(draws=draws, max_number=draws.max_number)
+        else:
+            figures['pairs_heatmap'] = plot_number_pairs_heatmap(historical_data=historical_data)
     except Exception as e:
         logger.error(f"Error creating pairs heatmap: {e}")
 
@@ -0,0 +1,108 @@
+"""
+Unit tests for batch scoring: every scorer against its per-ticket version.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def tickets():
+    """Random Euromillions tickets, numbers in draw order (unsorted)."""
+    rng = np.random.default_rng(5)
+    numbers = np.array([rng.choice(np.arange(1, 51), 5, replace=False) for _ in range(400)])
+    stars = np.array([rng.choice(np.arange(1, 13), 2, replace=False) for _ in range(400)])
+    return numbers, stars
+
+
+@pytest.mark.unit
+class TestScoreBatch:
+    """Test suite for score_batch."""
+
+    def test_utils_scores(self, tickets, euromillions_stats):
+        """Test the probability and Markov scorers against utils."""
+        import utils
+        from src.core.batch_scoring import score_batch
+
+        numbers, stars = tickets
+        freq = pd.Series(euromillions_stats.get_frequency())
+        star_freq = pd.Series(euromillions_stats.get_star_frequency())
+        scores = score_batch(numbers, {'name': 'probability', 'number_freq': freq, 'star_freq': star_freq}, bonus=stars)
+        assert scores.tolist() == [
+            utils.calculate_probability_score(n, s, freq, star_freq) for n, s in zip(numbers.tolist(), stars.tolist())
+        ]
+
+        rng = np.random.default_rng(1)
+        matrix = pd.DataFrame(rng.random((50, 50)), index=range(1, 51), columns=range(1, 51))
+        scores = score_batch(numbers, {'name': 'markov', 'transition_matrix': matrix})
+        assert scores.tolist() == [utils.calculate_markov_score(n, matrix) for n in numbers.tolist()]
+
+    def test_utils_scores_round_halves_like_numpy(self):
+        """Test frequencies whose scores land on .xx5, where NumPy and Python rounding differ."""
+        import utils
+        from src.core.batch_scoring import score_batch
+
+        rng = np.random.default_rng(3)
+        numbers = np.sort(rng.random((5000, 50)).argsort(axis=1)[:, :5] + 1, axis=1)
+        stars = np.sort(rng.random((5000, 12)).argsort(axis=1)[:, :2] + 1, axis=1)
+        freq = pd.Series(rng.integers(0, 1000, 50) / 1000, index=range(1, 51))
+        star_freq = pd.Series(rng.integers(0, 1000, 12) / 1000, index=range(1, 13))
+
+        expected = [utils.calculate_probability_score(n, s, freq, star_freq)
+                    for n, s in zip(numbers.tolist(), stars.tolist())]
+        spec = {'name': 'probability', 'number_freq': freq, 'star_freq': star_freq}
+        assert score_batch(numbers, spec, bonus=stars).tolist() == expected
+
+        matrix = pd.DataFrame(rng.integers(0, 1000, (50, 50)) / 1000, index=range(1, 51), columns=range(1, 51))
+        scores = score_batch(numbers, {'name': 'markov', 'transition_matrix': matrix})
+        assert scores.tolist() == [utils.calculate_markov_score(n, matrix) for n in numbers.tolist()]
+
+    def test_strategy_scores(self, tickets, euromillions_stats):
+        """Test the coverage and anti-bias scorers against the former inline formulas."""
+        from src.core.batch_scoring import score_batch
+
+        numbers, stars = tickets
+        number_freq = euromillions_stats.get_frequency()
+        star_freq = euromillions_stats.get_star_frequency()
+
+        expected, covered_numbers, covered_stars = [], set(), set()
+        for i, (n, s) in enumerate(zip(numbers[:20].tolist(), stars[:20].tolist())):
+            covered_numbers.update(n)
+            covered_stars.update(s)
+            freq_score = (sum(number_freq[x] for x in n) / 5 + sum(star_freq[x] for x in s) / 2) / 2
+            coverage_weight = min(0.2 + (i * 0.15), 0.8)
+            expected.append(round((coverage_weight * (len(covered_numbers) / 50 + len(covered_stars) / 12) / 2
+                                   + (1 - coverage_weight) * freq_score) * 100, 2))
+        spec = {'name': 'coverage', 'number_freq': number_freq, 'star_freq': star_freq}
+        assert score_batch(numbers[:20], spec, bonus=stars[:20]).tolist() == expected
+
+        expected = []
+        for n in numbers.tolist():
+            total, ordered = sum(n), sorted(n)
+            sum_score = 0.5 + (0.15 if total % 10 != 0 else 0)
+            sum_score += 0.1 if total % 5 != 0 else 0
+            pattern_score = 0.2 + (0.15 if all(b - a != 1 for a, b in zip(ordered, ordered[1:])) else 0)
+            distribution_score = 0.2 if sum(1 for x in n if x <= 25) in [2, 3] else 0.0
+            expected.append(round((sum_score + pattern_score + distribution_score) / 1.3 * 100, 2))
+        assert score_batch(numbers, {'name': 'cognitive_bias'}, bonus=stars).tolist() == expected
+
+    def test_fibonacci_and_errors(self, tickets):
+        """Test the Fibonacci hybrid scores on known tickets and the spec checks."""
+        from src.core.batch_scoring import score_batch, fibonacci_boosts
+        from src.core.ensemble import get_fibonacci_numbers
+
+        fib = get_fibonacci_numbers()
+        numbers = np.array([[1, 8, 13, 21, 40], [2, 4, 6, 7, 9], [10, 11, 12, 14, 15]])
+        stars = np.array([[5, 6], [8, 1], [2, 3]])
+        counts, boosts, star_boosts = fibonacci_boosts(numbers, stars, fib)
+        assert counts.tolist() == [4, 1, 0]
+        assert boosts.tolist() == [25 + 10 + 8 + 5, 8, 0]
+        assert star_boosts.tolist() == [10, 3, 0]
+
+        spec = {'name': 'fibonacci', 'fibonacci_numbers': fib, 'base_scores': [70, 50.5, 60]}
+        assert score_batch(numbers, spec, bonus=stars).tolist() == [100.0, 61.5, 60.0]
+
+        with pytest.raises(ValueError):
+            score_batch(numbers, {'name': 'unknown'})
+        assert score_batch(np.zeros((0, 5)), {'name': 'cognitive_bias'}).shape == (0,)
@@ -0,0 +1,61 @@
+"""
+Unit tests for the bitmask ticket encoding.
+
+Checks popcount matching against set intersection and its use by the backtester.
+"""
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+class TestBitmask:
+    """Test suite for bitmask encoding and match counting."""
+
+    def test_masks_and_scalar_matches(self):
+        """Test bit layout, dtypes and the scalar helpers."""
+        from src.core.bitmask import to_mask, count_matches, numbers_to_masks, bonus_to_masks
+
+        masks = numbers_to_masks([[1, 2, 3, 4, 50], [49, 10, 20, 30, 40]])
+        assert masks.dtype == np.uint64
+        assert int(masks[0]) == to_mask([1, 2, 3, 4, 50]) == 0b1111 | (1 << 49)
+        assert bonus_to_masks([3, 0, 20]).tolist() == [4, 0, 0]  # 0 and out-of-range set no bit
+        assert bonus_to_masks([[1, 12]]).dtype == np.uint16
+        assert count_matches(to_mask([1, 2, 3, 4, 5]), to_mask([4, 5, 6, 7, 8])) == 2
+
+    def test_match_counts_matches_sets(self, sample_euromillions_data):
+        """Test the (tickets x draws) matrix against set intersections."""
+        from src.core.bitmask import numbers_to_masks, match_counts
+
+        rng = np.random.default_rng(0)
+        tickets = np.array([rng.choice(50, 5, replace=False) + 1 for _ in range(300)])
+        draws = sample_euromillions_data[['n1', 'n2', 'n3', 'n4', 'n5']].to_numpy()
+
+        counts = match_counts(numbers_to_masks(tickets), numbers_to_masks(draws))
+
+        assert counts.shape == (300, 50)
+        for i in (0, 150, 299):
+            for j in (0, 25, 49):
+                assert counts[i, j] == len(set(tickets[i]) & set(draws[j]))
+
+    def test_backtest_scores_match_pairwise_scoring(self, sample_french_loto_data):
+        """Test that vectorized backtest metrics equal the per-pair scoring."""
+        from src.utils.backtesting import StrategyBacktester
+
+        data = sample_french_loto_data.rename(columns={'lucky_number': 'lucky'})
+        backtester = StrategyBacktester(data, 'french_loto')
+        predictions = [
+            {'numbers': [1, 2, 3, 4, 5], 'lucky': 1},
+            {'main_numbers': [10, 20, 30, 40, 49], 'lucky_number': 7},
+        ]
+
+        result = backtester.backtest_strategy(lambda strategies, num_combinations: predictions, 'fixed')
+
+        _, test_data = backtester.split_data()
+        expected = []
+        for _, row in test_data.iterrows():
+            actual = {'numbers': [row[f'n{i}'] for i in range(1, 6)], 'lucky': row['lucky']}
+            expected.extend(backtester.score_prediction_french_loto(pred, actual) for pred in predictions)
+        assert result['total_scores'] == len(expected)
+        assert result['avg_score'] == round(np.mean(expected), 2)
+        assert result['max_score'] == max(expected)
@@ -0,0 +1,71 @@
+"""
+Unit tests for the co-occurrence engine.
+
+Compares the matrix-product counts with direct enumeration of each draw.
+"""
+
+from collections import Counter
+from itertools import combinations
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+@pytest.mark.statistics
+class TestCoOccurrence:
+    """Test suite for CoOccurrence and its users."""
+
+    def test_counts_match_enumeration(self, sample_euromillions_data):
+        """Test pair, star pair, number x star and triplet counts."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data.iloc[::2])
+        engine = draws.cooccurrence()
+        assert draws.cooccurrence() is engine  # cached on the matrix
+
+        pairs, star_pairs, number_star, triplets = Counter(), Counter(), Counter(), Counter()
+        for numbers, stars in zip(draws.numbers.tolist(), draws.bonus.tolist()):
+            pairs.update(combinations(sorted(numbers), 2))
+            star_pairs.update(combinations(sorted(stars), 2))
+            number_star.update((n, s) for n in numbers for s in stars)
+            triplets.update(combinations(sorted(numbers), 3))
+
+        for (a, b), count in pairs.items():
+            assert engine.pair_matrix[a - 1, b - 1] == count
+        assert engine.pair_matrix.sum() == 2 * sum(pairs.values())
+        for (a, b), count in star_pairs.items():
+            assert engine.bonus_pair_matrix[a - 1, b - 1] == count
+        for (n, s), count in number_star.items():
+            assert engine.number_bonus_matrix[n - 1, s - 1] == count
+
+        subsets, counts = engine.triplet_counts()
+        assert dict(zip(map(tuple, subsets.tolist()), counts.tolist())) == dict(triplets)
+        assert np.all(np.diff(counts) <= 0)
+
+    def test_analysis_functions_use_engine(self, sample_euromillions_data, french_loto_stats):
+        """Test combination analysis and pair analysis results."""
+        from src.utils.combination_analysis import analyze_number_combinations, analyze_star_combinations
+
+        result = analyze_number_combinations(sample_euromillions_data, size=3)
+        top_combo, top_count = result['most_frequent_combinations'][0]
+        assert len(top_combo) == 3 and top_count >= 1
+        assert len(result['most_frequent_combinations']) == 20
+
+        stars = analyze_star_combinations(sample_euromillions_data)
+        assert sum(c for _, c in stars['most_frequent_star_combinations']) <= 50
+
+        pairs = french_loto_stats.analyze_number_pairs()
+        assert len(pairs) == 20
+        assert all(a < b for a, b in pairs)
+        assert pairs == french_loto_stats.aggregates.top_pairs(20)
+
+    def test_module_pairs_without_lucky_column(self, sample_french_loto_data, french_loto_stats):
+        """Test that the module-level pair analysis only needs the main number columns."""
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.french_loto_statistics import analyze_number_pairs
+
+        numbers_only = sample_french_loto_data.drop(columns=['lucky_number'])
+        assert analyze_number_pairs(numbers_only) == french_loto_stats.analyze_number_pairs()
+        with pytest.raises(ValueError):
+            DrawMatrix.from_dataframe(numbers_only, 'french_loto')
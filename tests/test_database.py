@@ -0,0 +1,403 @@
+"""
+Unit tests for database helpers.
+
+Each test runs against a temporary SQLite database patched into
+src.core.database, so the local lottery_predictions.db is never touched.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point src.core.database at a fresh SQLite file with all tables created."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker, scoped_session
+    from src.core import database
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    database.Base.metadata.create_all(engine)
+    session_factory = scoped_session(sessionmaker(bind=engine, autoflush=True, autocommit=False))
+
+    monkeypatch.setattr(database, 'engine', engine)
+    monkeypatch.setattr(database, 'Session', session_factory)
+    monkeypatch.setattr(database, 'DB_AVAILABLE', True)
+
+    yield database
+
+    session_factory.remove()
+    engine.dispose()
+
+
+@pytest.fixture
+def french_loto_rows(temp_db):
+    """Insert three French Loto drawings, two of them on the same date."""
+    session = temp_db.Session()
+    session.add_all([
+        temp_db.FrenchLotoDrawing(date=date(2024, 1, 1), draw_num=1, n1=1, n2=2, n3=3, n4=4, n5=5, lucky=1),
+        temp_db.FrenchLotoDrawing(date=date(2024, 1, 3), draw_num=1, n1=6, n2=7, n3=8, n4=9, n5=10, lucky=2),
+        temp_db.FrenchLotoDrawing(date=date(2024, 1, 3), draw_num=2, n1=11, n2=12, n3=13, n4=14, n5=15, lucky=3,
+                                  prize_rank1=1000.0),
+    ])
+    session.commit()
+    session.close()
+    return temp_db
+
+
+@pytest.mark.unit
+class TestLoadDrawings:
+    """Test suite for the Core select() drawing loader."""
+
+    def test_dataframe_matches_to_dict_layout(self, french_loto_rows):
+        """Test ordering, date format and the columns= argument."""
+        df = french_loto_rows.get_french_loto_drawings(columns=['date', 'draw_num', 'n1', 'lucky'])
+
+        assert list(df.columns) == ['date', 'draw_num', 'n1', 'lucky']
+        assert df['date'].tolist() == ['2024-01-03', '2024-01-03', '2024-01-01']
+        assert df['draw_num'].tolist() == [2, 1, 1]
+
+    def test_since_date_and_arrays(self, french_loto_rows):
+        """Test since_date filtering and typed NumPy output."""
+        arrays = french_loto_rows.load_drawings(
+            french_loto_rows.FrenchLotoDrawing,
+            columns=['date', 'n1', 'prize_rank1'],
+            since_date='2024-01-02',
+            as_arrays=True
+        )
+
+        assert arrays['date'].dtype == np.dtype('datetime64[D]')
+        assert arrays['n1'].dtype == np.int64
+        assert arrays['n1'].tolist() == [11, 6]
+        assert arrays['prize_rank1'][0] == 1000.0
+        assert np.isnan(arrays['prize_rank1'][1])
+
+    def test_empty_table(self, temp_db):
+        """Test that an empty table gives an empty DataFrame."""
+        assert temp_db.get_all_drawings().empty
+
+    def test_draw_matrix_from_database(self, french_loto_rows):
+        """Test building a DrawMatrix from the loader arrays."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_database('french_loto')
+
+        assert len(draws) == 3
+        assert draws.numbers[0].tolist() == [11, 12, 13, 14, 15]
+        assert draws.date_ordinals[-1] == date(2024, 1, 1).toordinal()
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test suite for session acquisition and the circuit breaker."""
+
+    def test_opens_after_threshold_and_recovers(self):
+        """Test the open/cool-down/close cycle."""
+        from src.core.database import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        breaker.record_failure()
+        assert not breaker.is_open()
+        breaker.record_failure()
+        assert breaker.is_open()
+
+        breaker.opened_at -= 61  # cool-down elapsed
+        assert not breaker.is_open()
+        breaker.record_success()
+        assert breaker.failures == 0 and breaker.opened_at is None
+
+    def test_open_circuit_fails_fast(self, tmp_path, monkeypatch):
+        """Test that new connections are refused while the circuit is open."""
+        from sqlalchemy import create_engine, exc
+        from src.core import database
+
+        breaker = database.CircuitBreaker(failure_threshold=1, cooldown=60)
+        monkeypatch.setattr(database, 'circuit_breaker', breaker)
+        engine = create_engine(f"sqlite:///{tmp_path / 'cb.db'}")
+        database._install_circuit_breaker(engine)
+
+        breaker.record_failure()
+        with pytest.raises(exc.OperationalError):
+            engine.connect()
+
+        breaker.record_success()
+        with engine.connect() as conn:
+            assert conn is not None
+        engine.dispose()
+
+    def test_refusals_do_not_extend_cooldown(self, tmp_path, monkeypatch):
+        """Test that the circuit half-opens after the cool-down despite refused attempts."""
+        from sqlalchemy import create_engine, exc
+        from src.core import database
+
+        breaker = database.CircuitBreaker(failure_threshold=1, cooldown=60)
+        monkeypatch.setattr(database, 'circuit_breaker', breaker)
+        engine = create_engine(f"sqlite:///{tmp_path / 'cb.db'}")
+        database._install_circuit_breaker(engine)
+
+        breaker.record_failure()
+        breaker.opened_at -= 30
+        for _ in range(3):
+            with pytest.raises(exc.OperationalError):
+                engine.connect()
+        assert breaker.failures == 1
+
+        breaker.opened_at -= 31  # cool-down elapsed since the real failure
+        with engine.connect() as conn:
+            assert conn is not None
+        assert breaker.failures == 0 and breaker.opened_at is None
+        engine.dispose()
+
+    def test_get_session_skips_validation_query(self, temp_db):
+        """Test that get_session hands out a session without touching the database."""
+        from sqlalchemy import event
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(temp_db.engine, "before_cursor_execute", listener)
+        try:
+            session = temp_db.get_session()
+            session.close()
+        finally:
+            event.remove(temp_db.engine, "before_cursor_execute", listener)
+
+        assert statements == []
+
+
+@pytest.mark.unit
+class TestBulkSaves:
+    """Test suite for the batched save functions."""
+
+    def test_generated_combinations_bulk(self, temp_db):
+        """Test that ids come back in input order and rows round-trip."""
+        combos = [
+            {'numbers': [1, 2, 3, 4, 5], 'stars': [1, 2], 'score': np.float64(80.5)},
+            {'numbers': [6, 7, 8, 9, 10], 'stars': [3, 4], 'score': 70.0, 'strategy': 'Mixed'},
+        ]
+
+        ids = temp_db.save_generated_combinations_bulk(combos, strategy='Frequency', target_draw_date='2024-02-02')
+
+        assert len(ids) == 2 and ids[0] < ids[1]
+        saved = {c['id']: c for c in temp_db.get_generated_combinations()}
+        assert saved[ids[0]]['numbers'] == [1, 2, 3, 4, 5]
+        assert saved[ids[0]]['strategy'] == 'Frequency'
+        assert saved[ids[1]]['strategy'] == 'Mixed'
+        assert saved[ids[1]]['target_draw_date'] == '2024-02-02'
+
+    def test_french_loto_bulk_saves(self, temp_db):
+        """Test predictions and played combinations with both key layouts."""
+        predictions = [
+            {'main_numbers': [5, 4, 3, 2, 1], 'lucky_number': 7, 'strategy': 'frequency', 'score': 60},
+            {'numbers': [10, 20, 30, 40, 49], 'lucky': 2},
+        ]
+
+        ids = temp_db.save_french_loto_predictions_bulk(predictions, strategy='mixed')
+        played_ids = temp_db.save_french_loto_played_combinations_bulk(predictions, draw_date='2024-03-04')
+
+        assert len(ids) == 2 and len(played_ids) == 2
+        stored = temp_db.get_french_loto_predictions()
+        assert sorted(stored['numbers'].tolist()) == ['1-2-3-4-5', '10-20-30-40-49']
+        assert sorted(stored['main_numbers'].tolist()) == [[1, 2, 3, 4, 5], [10, 20, 30, 40, 49]]
+        played = temp_db.get_french_loto_played_combinations()
+        assert set(played['draw_date']) == {'2024-03-04'}
+
+    def test_failed_batches_raise(self, temp_db):
+        """Test that every bulk save raises when the insert fails, instead of returning []."""
+        from sqlalchemy import exc
+
+        temp_db.Base.metadata.drop_all(temp_db.engine)
+        combo = {'numbers': [1, 2, 3, 4, 5], 'stars': [1, 2], 'lucky': 3}
+        for save in (temp_db.save_generated_combinations_bulk, temp_db.save_user_combinations_bulk,
+                     temp_db.save_french_loto_predictions_bulk, temp_db.save_french_loto_played_combinations_bulk):
+            with pytest.raises(exc.OperationalError):
+                save([combo])
+
+    def test_empty_batch(self, temp_db):
+        """Test that an empty batch does not touch the database."""
+        assert temp_db.save_user_combinations_bulk([]) == []
+
+
+@pytest.mark.unit
+class TestCombinationRanks:
+    """Test suite for rank-encoded combination storage."""
+
+    def test_rank_round_trip(self):
+        """Test colex rank bounds and unranking for both games."""
+        from src.core.combination_rank import rank_combination, unrank_combination, rank_ticket
+
+        assert rank_combination([1, 2, 3, 4, 5]) == 0
+        assert rank_combination([46, 47, 48, 49, 50]) == 2118759
+        assert rank_combination([45, 46, 47, 48, 49]) == 1906884 - 1
+        assert unrank_combination(rank_combination([50, 3, 17, 9, 21])) == [3, 9, 17, 21, 50]
+        assert rank_ticket([1, 2, 3, 4, 5], [11, 12]) == (0, 65)
+        assert rank_ticket([1, 2, 3, 4, 5], 7) == (0, 6)
+        with pytest.raises(ValueError):
+            rank_combination([1, 1, 2, 3, 4])
+
+    def test_array_ranks_and_ticket_codes(self):
+        """Test the batched ranks against the scalar ones and the ticket-code round trip."""
+        from itertools import combinations
+        from src.core.combination_rank import (
+            rank_combination, rank_combinations, unrank_combinations, ticket_codes, split_ticket_codes
+        )
+
+        tickets = np.array(list(combinations(range(1, 50), 5))[::9973])
+        ranks = rank_combinations(tickets[:, ::-1])
+        assert ranks.dtype == np.int32
+        assert ranks.tolist() == [rank_combination(t) for t in tickets]
+        np.testing.assert_array_equal(unrank_combinations(ranks, 5), tickets)
+
+        stars = np.array(list(combinations(range(1, 13), 2)))
+        codes = ticket_codes(np.repeat(tickets[:2], 66, axis=0), np.tile(stars, (2, 1)))
+        assert len(np.unique(codes)) == 132
+        numbers, bonus = split_ticket_codes(codes, 2)
+        np.testing.assert_array_equal(bonus, np.tile(stars, (2, 1)))
+        assert ticket_codes([[46, 47, 48, 49, 50]], [[11, 12]])[0] == 2118760 * 66 - 1
+        assert split_ticket_codes(ticket_codes([[1, 2, 3, 4, 5]], [7]), 1)[1].tolist() == [[7]]
+        with pytest.raises(ValueError):
+            rank_combinations([[1, 2, 3, 4, 4]])
+
+    def test_full_combination_repeats(self):
+        """Test that repeated tickets are found whatever the order of their numbers."""
+        import pandas as pd
+        from src.utils.combination_analysis import analyze_full_combinations
+
+        data = pd.DataFrame({
+            'date': ['2024-01-05', '2024-01-02', '2023-12-29', '2023-12-26'],
+            'n1': [5, 3, 1, 1], 'n2': [4, 9, 2, 2], 'n3': [3, 17, 3, 3], 'n4': [2, 21, 4, 4], 'n5': [1, 50, 5, 5],
+            's1': [2, 1, 1, 1], 's2': [1, 2, 3, 2],
+        })
+
+        result = analyze_full_combinations(data)
+        key = "Numbers: [1, 2, 3, 4, 5], Stars: [1, 2]"
+        assert result['total_draws'] == 4
+        assert result['unique_combinations'] == 3
+        assert result['repeated_combinations'] == {key: 2}
+        assert result['repeated_details'][key] == ['2024-01-05', '2023-12-26']
+
+    def test_saves_fill_ranks_and_lookup(self, temp_db):
+        """Test that saved tickets are found by the indexed lookups."""
+        temp_db.save_generated_combination([5, 4, 3, 2, 1], [2, 1], 'Frequency', 50.0, target_draw_date='2024-02-02')
+        temp_db.save_french_loto_predictions_bulk([{'numbers': [10, 20, 30, 40, 49], 'lucky': 2}], strategy='mixed')
+
+        assert temp_db.is_combination_generated([1, 2, 3, 4, 5], [1, 2])
+        assert temp_db.is_combination_generated([1, 2, 3, 4, 5], [1, 2], target_draw_date='2024-02-02')
+        assert not temp_db.is_combination_generated([1, 2, 3, 4, 5], [1, 2], target_draw_date='2024-02-09')
+        assert not temp_db.is_combination_generated([1, 2, 3, 4, 6], [1, 2])
+        assert temp_db.is_french_loto_prediction_generated([49, 40, 30, 20, 10], 2, strategy='mixed')
+        assert not temp_db.is_french_loto_prediction_generated([10, 20, 30, 40, 49], 3)
+        assert temp_db.get_generated_combinations()[0]['numbers'] == [1, 2, 3, 4, 5]
+
+    def test_orm_inserts_fill_ranks(self, temp_db):
+        """Test that rows added without ranks, as the app's save buttons do, are ranked on insert."""
+        import json
+
+        session = temp_db.get_session()
+        session.add_all([
+            temp_db.GeneratedCombination(numbers=json.dumps([9, 3, 17, 21, 50]), stars=json.dumps([4, 1]),
+                                         strategy='UI', score=1.0),
+            temp_db.FrenchLotoPrediction(numbers='10-20-30-40-49', lucky=2, strategy='UI', score=1.0),
+        ])
+        session.commit()
+        session.close()
+
+        assert temp_db.is_combination_generated([3, 9, 17, 21, 50], [1, 4], strategy='UI')
+        assert temp_db.is_french_loto_prediction_generated([10, 20, 30, 40, 49], 2, strategy='UI')
+
+    def test_migration_converts_existing_rows(self, tmp_path, monkeypatch):
+        """Test that a pre-rank table gains the columns and its rows are backfilled."""
+        import sqlite3
+        from sqlalchemy import create_engine, inspect
+        from sqlalchemy.orm import sessionmaker, scoped_session
+        from src.core import database
+
+        db_path = tmp_path / 'old.db'
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE generated_combinations (
+                id INTEGER PRIMARY KEY, created_at DATE, target_draw_date DATE,
+                numbers VARCHAR(50) NOT NULL, stars VARCHAR(20) NOT NULL, strategy VARCHAR(100), score FLOAT
+            )
+        """)
+        conn.execute("INSERT INTO generated_combinations (numbers, stars, strategy) VALUES ('[1, 2, 3, 4, 6]', '[3, 4]', 'Old')")
+        conn.execute("INSERT INTO generated_combinations (numbers, stars, strategy) VALUES ('[1, 2, 3, 4, 6]', '[3, 4, 5]', 'Old')")
+        conn.commit()
+        conn.close()
+
+        engine = create_engine(f"sqlite:///{db_path}")
+        monkeypatch.setattr(database, 'engine', engine)
+        monkeypatch.setattr(database, 'Session', scoped_session(sessionmaker(bind=engine)))
+        database.Base.metadata.create_all(engine)
+
+        assert database.migrate_combination_ranks() == {'generated_combinations': 2, 'french_loto_predictions': 0}
+        assert database.migrate_combination_ranks()['generated_combinations'] == 0
+
+        indexes = {index['name'] for index in inspect(engine).get_indexes('generated_combinations')}
+        assert 'ix_generated_combinations_ticket' in indexes
+        assert database.is_combination_generated([6, 4, 3, 2, 1], [4, 3])
+        combos = database.get_generated_combinations()
+        assert sorted(len(c['stars']) for c in combos) == [2, 3]
+        database.Session.remove()
+        engine.dispose()
+
+
+@pytest.mark.unit
+class TestDrawReplica:
+    """Test suite for the local read replica of the draw tables."""
+
+    def test_reads_sync_incrementally(self, french_loto_rows, tmp_path, monkeypatch):
+        """Test that reads go to the replica and only new rows are copied."""
+        replica = french_loto_rows.DrawReplica(str(tmp_path / 'replica.db'), sync_interval=3600)
+        monkeypatch.setattr(french_loto_rows, 'draw_replica', replica)
+        model = french_loto_rows.FrenchLotoDrawing
+
+        assert len(french_loto_rows.get_french_loto_drawings()) == 3
+        assert replica.sync(model) == 0  # within the sync interval
+
+        assert french_loto_rows.add_french_loto_drawing('2024-01-06', [20, 21, 22, 23, 24], 4, skip_future_dates=False)
+        assert replica.sync(model) == 1  # the write marked the table stale
+
+        df = french_loto_rows.load_drawings(model, columns=['date', 'n1'], limit=2)
+        assert df['date'].tolist() == ['2024-01-06', '2024-01-03']
+
+    def test_serves_local_copy_when_primary_fails(self, french_loto_rows, tmp_path, monkeypatch):
+        """Test that a failed sync falls back to the rows already replicated."""
+        replica = french_loto_rows.DrawReplica(str(tmp_path / 'replica.db'), sync_interval=0)
+        monkeypatch.setattr(french_loto_rows, 'draw_replica', replica)
+        replica.sync(french_loto_rows.FrenchLotoDrawing)
+
+        french_loto_rows.engine.dispose()
+        monkeypatch.setattr(french_loto_rows, 'engine', None)
+
+        assert len(french_loto_rows.get_french_loto_drawings()) == 3
+
+
+@pytest.mark.unit
+class TestStatisticsRegistry:
+    """Test suite for pushing inserted draws to registered statistics."""
+
+    def test_each_session_instance_receives_draws(self, french_loto_stats, sample_french_loto_data, monkeypatch):
+        """Test that every registered instance is updated and dropped ones are not."""
+        import gc
+        from src.core import database
+        from src.core.french_loto_statistics import FrenchLotoStatistics
+
+        monkeypatch.setattr(database, '_registered_statistics', {})
+        other = FrenchLotoStatistics(sample_french_loto_data)
+        database.register_statistics('french_loto', french_loto_stats)
+        database.register_statistics('french_loto', other)
+        database.register_statistics('french_loto', other)
+
+        draw = {'date': '2024-12-31', 'numbers': [1, 2, 3, 4, 5], 'lucky': 3}
+        database._push_draw_to_statistics('french_loto', draw)
+        assert len(french_loto_stats.draws) == 51 and len(other.draws) == 51
+
+        database.unregister_statistics('french_loto', french_loto_stats)
+        database._push_draw_to_statistics('french_loto', draw)
+        assert len(french_loto_stats.draws) == 51 and len(other.draws) == 52
+
+        del other
+        gc.collect()
+        assert len(database._registered_statistics['french_loto']) == 0
@@ -0,0 +1,90 @@
+"""
+Unit tests for the exponentially decayed frequency state.
+
+Compares the batch initialisation and the per-draw updates with explicit
+decay weights and checks its use by the statistics, strategies and models.
+"""
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+@pytest.mark.statistics
+class TestDecayedFrequency:
+    """Test suite for DecayedFrequency and its consumers."""
+
+    def test_batch_matches_weights(self, sample_euromillions_data):
+        """Test that draw i weighs 0.5 ** (i / half_life)."""
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.decayed_frequency import DecayedFrequency
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+        state = DecayedFrequency(draws, half_life=10)
+
+        expected = np.zeros(50)
+        expected_stars = np.zeros(12)
+        for i, (numbers, stars) in enumerate(zip(draws.numbers.tolist(), draws.bonus.tolist())):
+            weight = 0.5 ** (i / 10)
+            for n in numbers:
+                expected[n - 1] += weight
+            for s in stars:
+                expected_stars[s - 1] += weight
+
+        np.testing.assert_allclose(state.number_weights(), expected)
+        np.testing.assert_allclose(state.bonus_weights(), expected_stars)
+        assert state.total_weight == pytest.approx(sum(0.5 ** (i / 10) for i in range(50)))
+
+        with pytest.raises(ValueError):
+            DecayedFrequency(draws, half_life=0)
+
+    def test_update_matches_rebuild(self, sample_euromillions_data):
+        """Test that updates, including rescaling, agree with a batch rebuild."""
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.decayed_frequency import DecayedFrequency
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+        older = draws.take(slice(20, None))
+        # A short half-life forces several rescales over 20 updates
+        state = DecayedFrequency(older, half_life=0.03)
+        for row in range(19, -1, -1):
+            state.update(draws.numbers[row].tolist(), draws.bonus[row].tolist())
+
+        rebuilt = DecayedFrequency(draws, half_life=0.03)
+        assert state.n_draws == 50
+        np.testing.assert_allclose(state.number_weights(), rebuilt.number_weights())
+        np.testing.assert_allclose(state.bonus_weights(), rebuilt.bonus_weights())
+        assert state.total_weight == pytest.approx(rebuilt.total_weight)
+
+    def test_statistics_and_strategies(self, euromillions_stats, french_loto_stats, sample_euromillions_data):
+        """Test the statistics accessors, apply_draw and the weight consumers."""
+        from src.core.statistics import EuromillionsStatistics
+        from src.core.strategies import PredictionStrategies
+        from src.core.models import BayesianModel
+
+        state = euromillions_stats.get_decayed_frequency(8)
+        assert euromillions_stats.get_decayed_frequency(8) is state
+        loto_state = french_loto_stats.get_decayed_frequency(8)
+        assert len(loto_state.number_frequency()) == 49
+        assert len(loto_state.bonus_frequency()) == 10
+
+        draw = {'date': '2024-05-30', 'numbers': [1, 2, 3, 4, 5], 'stars': [1, 2]}
+        euromillions_stats.apply_draw(draw)
+        assert euromillions_stats.get_decayed_frequency(8) is state
+        rebuilt = EuromillionsStatistics(euromillions_stats.draws).get_decayed_frequency(8)
+        np.testing.assert_allclose(state.number_weights(), rebuilt.number_weights())
+
+        # Decayed weights rescaled to the overall counts
+        weighted = euromillions_stats.get_weighted_frequency(1.0, half_life=8)
+        assert sum(weighted.values()) == pytest.approx(sum(euromillions_stats.get_frequency().values()))
+
+        strategies = PredictionStrategies(euromillions_stats)
+        for combination in (strategies.frequency_strategy(3, half_life=8)
+                            + strategies.mixed_strategy(3, half_life=8)):
+            assert len(combination['numbers']) == 5
+
+        model = BayesianModel(sample_euromillions_data, update_method="adaptive", half_life=5)
+        assert sum(model.number_posteriors.values()) == pytest.approx(1.0)
+        # Without a half-life the adaptive update keeps its linear decay
+        linear = BayesianModel(sample_euromillions_data, update_method="adaptive")
+        assert linear.number_posteriors != model.number_posteriors
@@ -0,0 +1,124 @@
+"""
+Unit tests for the shared DrawMatrix store.
+
+Tests conversion from DataFrames and use of the matrix by statistics and models.
+"""
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+class TestDrawMatrix:
+    """Test suite for DrawMatrix class."""
+
+    def test_from_dataframe_euromillions(self, sample_euromillions_data):
+        """Test array shapes and dtypes for Euromillions data."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+
+        assert draws.game == 'euromillions'
+        assert len(draws) == 50
+        assert draws.numbers.shape == (50, 5) and draws.numbers.dtype == np.int8
+        assert draws.bonus.shape == (50, 2)
+        assert draws.occurrence.shape == (50, 50)
+        assert draws.bonus_occurrence.shape == (50, 12)
+        assert (draws.occurrence.sum(axis=1) == 5).all()
+        assert draws.date_ordinals[0] == sample_euromillions_data['date'][0].toordinal()
+
+    def test_from_dataframe_french_loto(self, sample_french_loto_data):
+        """Test that lucky_number columns are detected as French Loto."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_french_loto_data)
+
+        assert draws.game == 'french_loto'
+        assert draws.occurrence.shape == (50, 49)
+        assert draws.bonus.shape == (50, 1)
+        assert draws.bonus_counts().sum() == 50
+
+    def test_counts_match_dataframe(self, sample_euromillions_data):
+        """Test that column sums match value counts of the source data."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+        expected = sample_euromillions_data[['n1', 'n2', 'n3', 'n4', 'n5']].stack().value_counts()
+
+        counts = draws.number_counts()
+        for number, count in expected.items():
+            assert counts[number - 1] == count
+
+        positions = draws.position_counts()
+        assert positions.shape == (5, 50)
+        np.testing.assert_array_equal(positions.sum(axis=0), counts)
+        for p, col in enumerate(['n1', 'n2', 'n3', 'n4', 'n5']):
+            for number, count in sample_euromillions_data[col].value_counts().items():
+                assert positions[p, number - 1] == count
+
+    def test_round_trip_and_take(self, sample_euromillions_data):
+        """Test conversion back to a DataFrame and row selection."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+        frame = draws.to_dataframe()
+
+        assert list(frame.columns) == ['date', 'n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2']
+        assert (frame['n3'].values == sample_euromillions_data['n3'].values).all()
+
+        head = draws.take(slice(0, 10))
+        assert len(head) == 10
+        assert (head.numbers == draws.numbers[:10]).all()
+
+    def test_prepend_writes_in_place(self, sample_euromillions_data):
+        """Test that successive prepends share storage and match a rebuilt matrix."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+        first = draws.prepend([1, 2, 3, 4, 5], [1, 2], 740000)
+        second = first.prepend([6, 7, 8, 9, 10], [3, 4], 740003)
+        assert np.shares_memory(first.occurrence, second.occurrence)
+
+        # Prepending to an older matrix again must not overwrite the newer one
+        branch = first.prepend([11, 12, 13, 14, 15], [5, 6], 740003)
+        assert second.numbers[0].tolist() == [6, 7, 8, 9, 10]
+        assert branch.numbers[0].tolist() == [11, 12, 13, 14, 15]
+
+        rebuilt = DrawMatrix(
+            np.vstack([[[6, 7, 8, 9, 10], [1, 2, 3, 4, 5]], draws.numbers]),
+            np.vstack([[[3, 4], [1, 2]], draws.bonus]),
+            np.concatenate([[740003, 740000], draws.date_ordinals]),
+        )
+        for name in ('numbers', 'bonus', 'date_ordinals', 'occurrence', 'bonus_occurrence'):
+            np.testing.assert_array_equal(getattr(second, name), getattr(rebuilt, name))
+
+    def test_statistics_accept_draw_matrix(self, sample_euromillions_data, sample_french_loto_data):
+        """Test that statistics classes give the same frequencies from a DrawMatrix."""
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.statistics import EuromillionsStatistics
+        from src.core.french_loto_statistics import FrenchLotoStatistics
+
+        euro_df = EuromillionsStatistics(sample_euromillions_data)
+        euro_matrix = EuromillionsStatistics(DrawMatrix.from_dataframe(sample_euromillions_data))
+        assert euro_df.get_frequency() == euro_matrix.get_frequency()
+        assert euro_df.get_star_frequency() == euro_matrix.get_star_frequency()
+
+        loto_matrix = FrenchLotoStatistics(DrawMatrix.from_dataframe(sample_french_loto_data))
+        assert sum(loto_matrix.main_number_freq.values()) == 250
+
+    def test_models_accept_draw_matrix(self, sample_euromillions_data):
+        """Test that models and the backtester can be built from a DrawMatrix."""
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.models import BayesianModel, MarkovModel, TimeSeriesModel
+        from src.utils.backtesting import StrategyBacktester
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+
+        assert len(BayesianModel(draws).get_number_probabilities()) == 50
+        assert MarkovModel(draws).get_number_transition_matrix().shape == (50, 50)
+        assert len(TimeSeriesModel(draws).get_due_numbers(5)) == 5
+
+        backtester = StrategyBacktester(draws)
+        training, test = backtester.split_draws()
+        assert len(training) + len(test) == 50
+        assert training.date_ordinals.max() <= test.date_ordinals.min()
@@ -0,0 +1,54 @@
+"""
+Unit tests for the shared draw-shape features.
+
+Compares the feature columns and derived patterns with a per-row computation.
+"""
+
+from collections import Counter
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+@pytest.mark.statistics
+class TestDrawShape:
+    """Test suite for DrawShape and the statistics built on it."""
+
+    def test_features_match_rows(self, sample_euromillions_data):
+        """Test sums, spreads, even/low/consecutive counts, decades and patterns."""
+        from src.core.draw_matrix import DrawMatrix
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data.iloc[::3])
+        shape = draws.draw_shape()
+        assert draws.draw_shape() is shape  # cached on the matrix
+
+        even_patterns, low_patterns = [], []
+        for i, numbers in enumerate(sorted(row) for row in draws.numbers.tolist()):
+            assert shape.sums[i] == sum(numbers)
+            assert shape.spreads[i] == numbers[-1] - numbers[0]
+            assert shape.even_counts[i] == sum(n % 2 == 0 for n in numbers)
+            assert shape.low_counts[i] == sum(n <= 25 for n in numbers)
+            assert shape.consecutive_counts[i] == sum(b - a == 1 for a, b in zip(numbers, numbers[1:]))
+            assert shape.decades[i].tolist() == [sum(n // 10 == d for n in numbers) for d in range(6)]
+            even_patterns.append(f"{shape.even_counts[i]}e-{5 - shape.even_counts[i]}o")
+            low_patterns.append(f"{shape.low_counts[i]}l-{5 - shape.low_counts[i]}h")
+
+        assert shape.even_odd_pattern() == Counter(even_patterns).most_common(1)[0][0]
+        assert shape.low_high_pattern() == Counter(low_patterns).most_common(1)[0][0]
+        assert shape.histogram(shape.consecutive_counts).sum() == len(draws)
+
+    def test_statistics_use_features(self, euromillions_stats, french_loto_stats):
+        """Test the distribution methods of both games."""
+        consecutive = euromillions_stats.get_consecutive_analysis()
+        assert sum(consecutive['distribution'].values()) == 50
+        assert euromillions_stats.get_distribution_stats()['low_high_pattern'].endswith('h')
+
+        # French Loto splits low/high at 24 and reports decades 1-9 .. 40-49
+        ranges = french_loto_stats.calculate_range_distribution()
+        assert ranges['Count'].sum() == 250
+        even_odd = french_loto_stats.calculate_even_odd_distribution()
+        assert even_odd['Count'].sum() == 50
+        sums = french_loto_stats.calculate_sum_distribution()
+        assert sums['Count'].sum() == 50
+        assert 'sum' not in french_loto_stats.data.columns
@@ -0,0 +1,86 @@
+"""
+Benchmark of the vectorized French Loto frequency and position analysis.
+
+Runs the np.bincount implementations and the former per-number scans on
+db_dump/french_loto_drawings.csv, checks that they agree and reports the
+speedup. Run with ``pytest -m slow -s tests/test_french_loto_benchmark.py``.
+"""
+
+import os
+import time
+
+import pytest
+import pandas as pd
+
+DUMP_PATH = os.path.join(os.path.dirname(__file__), '..', 'db_dump', 'french_loto_drawings.csv')
+
+
+def _scan_number_frequency(df):
+    """Former analyze_number_frequency: list.count for every number."""
+    main_numbers = []
+    for col in ['number1', 'number2', 'number3', 'number4', 'number5']:
+        main_numbers.extend(df[col].tolist())
+    main_freq = {i: main_numbers.count(i) for i in range(1, 50)}
+    lucky_numbers = df['lucky_number'].tolist()
+    lucky_freq = {i: lucky_numbers.count(i) for i in range(1, 11)}
+    main_freq = dict(sorted(main_freq.items(), key=lambda x: x[1], reverse=True))
+    lucky_freq = dict(sorted(lucky_freq.items(), key=lambda x: x[1], reverse=True))
+    return main_freq, lucky_freq
+
+
+def _scan_number_positions(df):
+    """Former analyze_number_positions: one DataFrame filter per number and position."""
+    positions = {}
+    for num in range(1, 50):
+        positions[num] = {f'position{p}': len(df[df[f'number{p}'] == num]) for p in range(1, 6)}
+        positions[num]['total'] = sum(positions[num].values())
+        max_pos = max(positions[num].items(), key=lambda x: x[1] if x[0] != 'total' else 0)
+        positions[num]['favorite_position'] = max_pos[0]
+    return positions
+
+
+def _best_time(func, *args, repeat=3):
+    """Best wall-clock time of several calls, with the result of the last one."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@pytest.mark.slow
+@pytest.mark.statistics
+@pytest.mark.skipif(not os.path.exists(DUMP_PATH), reason="db_dump/french_loto_drawings.csv not available")
+class TestFrenchLotoBenchmark:
+    """Benchmark suite for the French Loto frequency analysis."""
+
+    @pytest.fixture
+    def dump_data(self):
+        """French Loto history from the database dump, with the script column names."""
+        df = pd.read_csv(DUMP_PATH)
+        return df.rename(columns={
+            'n1': 'number1', 'n2': 'number2', 'n3': 'number3',
+            'n4': 'number4', 'n5': 'number5', 'lucky': 'lucky_number'
+        })
+
+    def test_frequency_and_positions_speedup(self, dump_data):
+        """Test that the bincount versions match the scans and run faster."""
+        from src.core.french_loto_statistics import analyze_number_frequency, analyze_number_positions
+
+        scan_freq_time, expected_freq = _best_time(_scan_number_frequency, dump_data)
+        freq_time, freq = _best_time(analyze_number_frequency, dump_data)
+        assert freq == expected_freq
+        assert list(freq[0]) == list(expected_freq[0])  # same ordering
+
+        scan_pos_time, expected_positions = _best_time(_scan_number_positions, dump_data, repeat=1)
+        pos_time, positions = _best_time(analyze_number_positions, dump_data)
+        assert positions == expected_positions
+
+        print(f"\n{len(dump_data)} draws")
+        print(f"analyze_number_frequency: {scan_freq_time * 1000:.1f} ms -> {freq_time * 1000:.1f} ms "
+              f"({scan_freq_time / freq_time:.0f}x)")
+        print(f"analyze_number_positions: {scan_pos_time * 1000:.1f} ms -> {pos_time * 1000:.1f} ms "
+              f"({scan_pos_time / pos_time:.0f}x)")
+
+        assert pos_time < scan_pos_time
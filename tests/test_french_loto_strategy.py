@@ -0,0 +1,104 @@
+"""
+Unit tests for FrenchLotoStrategy combination scoring and mixing.
+"""
+
+import itertools
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def strategy(french_loto_stats):
+    """FrenchLotoStrategy on the sample French Loto history."""
+    from src.core.french_loto_strategy import FrenchLotoStrategy
+    return FrenchLotoStrategy(french_loto_stats)
+
+
+@pytest.fixture
+def source_combinations():
+    """Combinations selected for mixing."""
+    return [
+        {'main_numbers': [3, 12, 25, 38, 44], 'lucky_number': 2, 'score': 80},
+        {'main_numbers': [7, 12, 19, 33, 41], 'lucky_number': 7, 'score': 75},
+        {'numbers': [1, 2, 3, 4, 5], 'lucky': 2, 'score': 60},
+    ]
+
+
+@pytest.mark.unit
+class TestFrenchLotoMixing:
+    """Test suite for the vectorized scorer and mix_combinations."""
+
+    def test_vectorized_score_matches_rules(self, strategy):
+        """Test batch, grid and single scores against each other and hand-checked factors."""
+        hot, cold = {1, 2, 40}, {49}
+        tickets = np.array([[1, 2, 3, 4, 40], [10, 20, 30, 40, 49], [5, 17, 26, 34, 48]])
+        luckies = np.array([1, 5, 10])
+
+        grid = strategy._calculate_combination_scores(tickets, luckies[np.newaxis, :], hot, cold)
+        assert grid.shape == (3, 3)
+        for i, j in itertools.product(range(3), range(3)):
+            single = strategy._calculate_combination_score(tickets[i].tolist(), int(luckies[j]), hot, cold)
+            assert grid[i, j] == single
+        np.testing.assert_array_equal(
+            strategy._calculate_combination_scores(tickets, luckies, hot, cold), grid.diagonal()
+        )
+
+        # Same ticket and lucky number: only the hot-number factor differs
+        a = strategy._calculate_combination_score([1, 2, 3, 4, 40], 5, hot, cold)
+        b = strategy._calculate_combination_score([1, 2, 3, 4, 40], 5, set(), cold)
+        assert a - b == pytest.approx(3 * 8)
+
+    def test_exact_mix_is_optimal_and_deterministic(self, strategy, source_combinations):
+        """Test that the exact mode finds the best candidate and repeats it."""
+        best = strategy.mix_combinations(source_combinations, exact=True)
+        assert strategy.mix_combinations(source_combinations, exact=True) == best
+        assert best['main_numbers'] == sorted(best['main_numbers'])
+        assert best['score'] >= strategy.mix_combinations(source_combinations, max_iterations=50)['score']
+
+        top = strategy.mix_combinations(source_combinations, exact=True, top_k=4, max_shared=2)
+        assert top[0]['main_numbers'] == best['main_numbers']
+        assert [c['score'] for c in top] == sorted((c['score'] for c in top), reverse=True)
+        for a, b in itertools.combinations(top, 2):
+            assert len(set(a['main_numbers']) & set(b['main_numbers'])) <= 2
+
+    def test_random_mix_keeps_candidates(self, strategy, source_combinations):
+        """Test that sampled mixes are valid and scored like single combinations."""
+        hot_cold = strategy.statistics.get_hot_cold_numbers()
+        mixed = strategy.mix_combinations(source_combinations, max_iterations=30)
+
+        assert len(set(mixed['main_numbers'])) == 5
+        assert 1 <= mixed['lucky_number'] <= 10
+        assert mixed['score'] == strategy._calculate_combination_score(
+            mixed['main_numbers'], mixed['lucky_number'],
+            set(hot_cold['hot_numbers']), set(hot_cold['cold_numbers'])
+        )
+        with pytest.raises(ValueError):
+            strategy.mix_combinations(source_combinations[:1])
+
+
+@pytest.mark.unit
+class TestFrenchLotoGeneration:
+    """Test suite for batched frequency-based generation."""
+
+    def test_batched_frequency_generation(self, strategy):
+        """Test the shape and validity of a batch and the strategies built on it."""
+        mains, luckies = strategy.generate_frequency_based(strength=0.8, size=500)
+        assert mains.shape == (500, 5) and luckies.shape == (500,)
+        assert (np.diff(mains, axis=1) > 0).all()
+        assert mains.min() >= 1 and mains.max() <= 49
+        assert luckies.min() >= 1 and luckies.max() <= 10
+
+        main_numbers, lucky = strategy.generate_frequency_based()
+        assert main_numbers == sorted(main_numbers) and isinstance(lucky, int)
+
+        combos = strategy.frequency_strategy(num_combinations=20)
+        assert len(combos) == 20
+        assert all(type(n) is int for combo in combos for n in combo['main_numbers'])
+        assert type(combos[0]['lucky_number']) is int
+        assert {c['strategy'] for c in strategy.risk_reward_strategy(5, risk_level=1)} == {"Risk-Reward (Low Risk)"}
+        assert len(strategy.bayesian_strategy(7)) == 7
+
+        combos = strategy.generate_multiple_combinations(count=10, strategy="frequency")
+        assert len(combos) == 10
+        assert {c['strategy'] for c in combos} == {"Frequency-based"}
@@ -0,0 +1,119 @@
+"""
+Unit tests for the cumulative frequency index.
+
+Compares window and date queries with counts over the corresponding slices.
+"""
+
+from datetime import date
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+@pytest.mark.statistics
+class TestFrequencyIndex:
+    """Test suite for FrequencyIndex and the hot/cold APIs built on it."""
+
+    def test_windows_match_slices(self, sample_euromillions_data):
+        """Test row windows and date windows against direct slicing."""
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.frequency_index import FrequencyIndex
+
+        # Fixture rows are oldest first, so the date order differs from the row order
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data)
+        index = FrequencyIndex(draws)
+
+        for start, stop in [(0, 50), (0, 1), (7, 23), (30, 30), (45, 200)]:
+            numbers, bonus = index.counts(start, stop)
+            np.testing.assert_array_equal(numbers, draws.occurrence[start:stop].sum(axis=0))
+            np.testing.assert_array_equal(bonus, draws.bonus_occurrence[start:stop].sum(axis=0))
+
+        dates = sample_euromillions_data['date'].dt.date
+        start_date, end_date = date(2024, 1, 10), date(2024, 2, 15)
+        numbers, bonus, size = index.counts_between(start_date, end_date)
+        mask = ((dates >= start_date) & (dates <= end_date)).to_numpy()
+        assert size == mask.sum()
+        np.testing.assert_array_equal(numbers, draws.occurrence[mask].sum(axis=0))
+        np.testing.assert_array_equal(bonus, draws.bonus_occurrence[mask].sum(axis=0))
+
+        # The 30 days up to the latest draw: rows dated latest - 30 .. latest
+        numbers, _, size = index.counts_last_days(30)
+        assert size == 11
+        np.testing.assert_array_equal(numbers, draws.occurrence[-11:].sum(axis=0))
+
+    def test_hot_cold_apis(self, sample_french_loto_data, euromillions_stats):
+        """Test the recency APIs and the as-of upper bound of analyze_hot_cold_numbers."""
+        from src.core.french_loto_statistics import FrenchLotoStatistics, analyze_hot_cold_numbers
+
+        df = sample_french_loto_data.rename(columns={
+            'n1': 'number1', 'n2': 'number2', 'n3': 'number3', 'n4': 'number4', 'n5': 'number5'
+        })
+        before = df.copy()
+
+        # Only the 11 draws from 2024-01-01 to 2024-01-31 are in the window
+        result = analyze_hot_cold_numbers(df, period_days=30, as_of_date='2024-01-31')
+        assert result['recent_period'] == '2024-01-01 to 2024-01-31'
+        recent = df.iloc[:11]
+        counts = np.bincount(recent[['number1', 'number2', 'number3', 'number4', 'number5']].to_numpy().ravel(),
+                             minlength=50)[1:]
+        assert result['hot_numbers'] == [n for n in range(1, 50) if counts[n - 1] > counts.mean() * 1.25]
+        assert result['cold_numbers'] == [n for n in range(1, 50) if counts[n - 1] < counts.mean() * 0.75]
+        assert df.equals(before)
+
+        stats = FrenchLotoStatistics(sample_french_loto_data.copy())
+        hot_cold = stats.get_hot_cold_numbers()
+        assert hot_cold['recent_period'].endswith('2024-05-27')
+        assert len(hot_cold['cold_lucky']) == 3
+
+        # Euromillions windows follow the row order (most recent first from the database)
+        recent_stats = euromillions_stats.get_recency_stats(draws=20)
+        assert len(recent_stats['hot_numbers']) == 5 and len(recent_stats['hot_lucky']) == 3
+        weighted = euromillions_stats.get_weighted_frequency(recent_weight=0.0)
+        assert weighted == euromillions_stats.number_frequency
+        assert weighted is not euromillions_stats.number_frequency
+
+
+@pytest.mark.unit
+@pytest.mark.statistics
+class TestStatisticsView:
+    """Test suite for point-in-time statistics views."""
+
+    def test_view_matches_rebuilt_statistics(self, euromillions_stats, french_loto_stats):
+        """Test that a view answers like statistics rebuilt on the earlier draws."""
+        from src.core.statistics import EuromillionsStatistics
+        from src.core.french_loto_statistics import FrenchLotoStatistics
+
+        # Fixture rows are oldest first, so the 30 oldest draws are the first 30 rows
+        view = euromillions_stats.view(30)
+        rebuilt = EuromillionsStatistics(euromillions_stats.draws.take(slice(29, None, -1)))
+        assert len(view) == 30 and len(view.draws) == 30
+        assert view.get_frequency() == rebuilt.get_frequency()
+        assert view.get_weighted_frequency(0.7) == rebuilt.get_weighted_frequency(0.7)
+        assert view.get_weighted_star_frequency(0.3) == rebuilt.get_weighted_star_frequency(0.3)
+        assert view.get_recency_stats(10) == rebuilt.get_recency_stats(10)
+        assert view.get_number_statistics(1) == rebuilt.get_number_statistics(1)
+        assert view.view(10).get_hot_numbers() == euromillions_stats.view(10).get_hot_numbers()
+
+        view = french_loto_stats.view(25)
+        rebuilt = FrenchLotoStatistics(french_loto_stats.draws.take(slice(24, None, -1)))
+        assert view.main_number_freq == rebuilt.main_number_freq
+        view.analyze_frequencies()
+        assert view.lucky_number_freq == rebuilt.lucky_number_freq
+        assert view.hot_cold_numbers == rebuilt.hot_cold_numbers
+        assert view.get_recency_stats(5) == rebuilt.get_recency_stats(5)
+        assert view.data['date'].max() == rebuilt.data['date'].max()
+
+    def test_backtester_uses_views(self, sample_euromillions_data):
+        """Test that the backtester trains on a cached view of the oldest draws."""
+        from src.utils.backtesting import StrategyBacktester
+        from src.core.strategies import PredictionStrategies
+
+        backtester = StrategyBacktester(sample_euromillions_data, "euromillions")
+        result = backtester.backtest_strategy(
+            PredictionStrategies.frequency_strategy, "Frequency Analysis", num_predictions=3
+        )
+        assert result['total_tests'] == 15
+        assert result['total_scores'] == 45
+        assert list(backtester._views) == [35]
+        assert backtester.statistics_view(35) is backtester._views[35]
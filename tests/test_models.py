@@ -0,0 +1,173 @@
+"""
+Unit tests for the probabilistic models.
+
+Checks the Bayesian conjugate updates and the Markov transition tables
+against explicit counts.
+"""
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.unit
+class TestBayesianModel:
+    """Test suite for BayesianModel."""
+
+    def test_conjugate_update(self, sample_euromillions_data):
+        """Test that the posterior means are prior plus recent counts, normalized."""
+        from src.core.models import BayesianModel
+
+        model = BayesianModel(sample_euromillions_data, recent_draws_count=10, smoothing_factor=0.5)
+
+        recent = sample_euromillions_data.iloc[:10][['n1', 'n2', 'n3', 'n4', 'n5']].stack().value_counts()
+        older = sample_euromillions_data.iloc[10:][['n1', 'n2', 'n3', 'n4', 'n5']].stack().value_counts()
+        alpha = np.array([older.get(n, 0) + 0.5 + recent.get(n, 0) for n in range(1, 51)])
+        posteriors = model.get_number_probabilities()
+
+        np.testing.assert_allclose([posteriors[n] for n in range(1, 51)], alpha / alpha.sum())
+        assert sum(model.get_star_probabilities().values()) == pytest.approx(1.0)
+        assert model.probability_history.shape == (2, 62)
+        assert model.probability_history.dtype == np.float32
+
+        uniform = BayesianModel(sample_euromillions_data, recent_draws_count=10, prior_type="uniform")
+        assert uniform.number_alpha.sum() == pytest.approx(50)  # as strong as 10 draws
+        assert uniform.number_priors[1] == pytest.approx(1 / 50)
+
+    def test_sequential_history(self, sample_euromillions_data):
+        """Test the per-draw history over the full history, oldest draw first."""
+        from src.core.models import BayesianModel
+
+        model = BayesianModel(sample_euromillions_data, recent_draws_count=None,
+                              update_method="sequential", prior_type="uniform")
+        history = model.probability_history
+        assert history.shape == (51, 62)
+        np.testing.assert_allclose(history.sum(axis=1), 2.0, rtol=1e-5)
+
+        # After the oldest draw only its numbers have gained probability
+        oldest = sample_euromillions_data.iloc[-1]
+        gained = np.flatnonzero(history[1, :50] > history[0, :50]) + 1
+        assert sorted(gained) == sorted(oldest[['n1', 'n2', 'n3', 'n4', 'n5']])
+        np.testing.assert_allclose(history[-1, :50], model.number_probabilities, rtol=1e-6)
+
+    def test_batched_generation(self, sample_euromillions_data):
+        """Test that every generated ticket is valid and scored."""
+        from src.core.models import BayesianModel
+        from src.core.sampling import set_seed
+
+        set_seed(7)
+        combinations = BayesianModel(sample_euromillions_data).generate_combinations(50)
+        assert len(combinations) == 50
+        for combination in combinations:
+            assert len(set(combination.numbers)) == 5
+            assert len(set(combination.stars)) == 2
+            assert 0 < combination.score < 100
+
+
+@pytest.mark.unit
+class TestMarkovModel:
+    """Test suite for MarkovModel."""
+
+    def test_lagged_transitions_match_loops(self, sample_euromillions_data):
+        """Test the matrix-product counts against a loop over draw pairs."""
+        from src.core.models import MarkovModel
+
+        model = MarkovModel(sample_euromillions_data, lag=1, max_lag=3)
+        rows = sample_euromillions_data[['n1', 'n2', 'n3', 'n4', 'n5']].values.tolist()
+
+        for lag in (1, 2, 3):
+            expected = np.zeros((50, 50))
+            for i in range(lag, len(rows)):
+                for a in rows[i - lag]:
+                    for b in rows[i]:
+                        expected[a - 1, b - 1] += 1
+            np.testing.assert_array_equal(model.number_lag_transitions[lag - 1], expected)
+
+        np.testing.assert_array_equal(model.number_transitions[1:, 1:], model.number_lag_transitions[0])
+        matrix = model.get_number_transition_matrix(lag=2)
+        assert matrix.shape == (50, 50)
+        assert np.allclose(matrix.sum(axis=1)[matrix.sum(axis=1) > 0], 1.0)
+
+    def test_pair_transitions(self, sample_euromillions_data):
+        """Test the sparse pair -> number counts against the draws."""
+        from src.core.models import MarkovModel
+
+        model = MarkovModel(sample_euromillions_data)
+        pairs = model.pair_transitions
+        rows = [sorted(r) for r in sample_euromillions_data[['n1', 'n2', 'n3', 'n4', 'n5']].values.tolist()]
+
+        a, b = rows[0][:2]
+        expected = {}
+        for i in range(1, len(rows)):
+            if a in rows[i - 1] and b in rows[i - 1]:
+                for c in rows[i]:
+                    expected[c] = expected.get(c, 0) + 1
+        next_numbers, counts = pairs.transitions(b, a)
+        assert dict(zip(next_numbers.tolist(), counts.tolist())) == expected
+        assert pairs.counts.sum() == (len(rows) - 1) * 50
+        assert pairs.probabilities(a, b).sum() == pytest.approx(1.0)
+
+    def test_generation_keeps_model(self, sample_euromillions_data):
+        """Test that repeated generation leaves the transition tables untouched."""
+        from src.core.models import MarkovModel
+
+        model = MarkovModel(sample_euromillions_data)
+        probs = model.number_transition_probs.copy()
+        star_probs = model.star_transition_probs.copy()
+
+        for order in (1, 2):
+            for combination in model.generate_combinations(20, order=order):
+                assert len(set(combination.numbers)) == 5
+        np.testing.assert_array_equal(model.number_transition_probs, probs)
+        np.testing.assert_array_equal(model.star_transition_probs, star_probs)
+
+
+@pytest.mark.unit
+class TestEnhancedMarkovModel:
+    """Test suite for the array-based EnhancedMarkovModel."""
+
+    @pytest.fixture
+    def history(self, sample_euromillions_data):
+        """Draws in the list-of-dicts format of the model."""
+        columns = ['n1', 'n2', 'n3', 'n4', 'n5']
+        return [{'numbers': sorted(row)} for row in sample_euromillions_data[columns].values.tolist()]
+
+    def test_tables_and_scores(self, history):
+        """Test the dense and row-compressed tables against per-draw counting."""
+        from collections import Counter, defaultdict
+        from src.core.markov_models import EnhancedMarkovModel
+
+        model = EnhancedMarkovModel(history)
+        direct, position, combination = defaultdict(Counter), defaultdict(Counter), defaultdict(Counter)
+        for draw in history:
+            n = draw['numbers']
+            for i in range(4):
+                direct[n[i]][n[i + 1]] += 1
+            for i in range(3):
+                position[n[i]][n[i + 2]] += 1
+                combination[(n[i], n[i + 1])][n[i + 2]] += 1
+
+        for a in range(1, 51):
+            assert model.get_transition_probabilities(a)['direct'] == dict(direct[a])
+            assert model.get_transition_probabilities(a)['position'] == dict(position[a])
+
+        existing = history[0]['numbers'][:3]
+        for candidate in range(1, 51):
+            expected = sum(2.0 * direct[e][candidate] + 1.5 * position[e][candidate] for e in existing)
+            expected += sum(3.0 * combination[(a, b)][candidate] for a, b in zip(existing, existing[1:]))
+            assert model.score_number_with_transitions(candidate, existing) == expected
+
+    def test_lockstep_generation(self, history):
+        """Test that batched generation matches one-by-one prediction from the same seeds."""
+        import random
+        from src.core.markov_models import EnhancedMarkovModel
+
+        model = EnhancedMarkovModel(history)
+        seeds = model._seed_order()[:20]
+
+        random.seed(11)
+        combinations = model.generate_combinations(30)
+        random.seed(11)
+        expected = [model.predict_next_numbers(5, [int(seeds[i % len(seeds)])]) for i in range(30)]
+
+        assert combinations == expected
+        assert all(len(set(c)) == 5 for c in combinations)
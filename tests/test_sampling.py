@@ -0,0 +1,58 @@
+"""
+Unit tests for the shared weighted sampler.
+"""
+
+import pytest
+import numpy as np
+
+from src.core.sampling import weighted_sample, sample_items, set_seed
+
+
+@pytest.mark.unit
+class TestWeightedSample:
+    """Test suite for weighted sampling without replacement."""
+
+    def test_shapes_and_distinct_picks(self):
+        """Test output shapes and that every sample holds distinct indices."""
+        weights = np.arange(1, 51)
+        assert weighted_sample(weights, 5).shape == (5,)
+
+        picks = weighted_sample(weights, 5, size=1000)
+        assert picks.shape == (1000, 5)
+        assert (np.sort(picks, axis=1)[:, 1:] != np.sort(picks, axis=1)[:, :-1]).all()
+        assert picks.min() >= 0 and picks.max() < 50
+
+        per_row = np.tile(weights, (3, 1))
+        assert weighted_sample(per_row, 2).shape == (3, 2)
+
+    def test_matches_sequential_picking(self):
+        """Test the pick-order marginals of drawing one item at a time."""
+        rng = np.random.default_rng(0)
+        picks = weighted_sample([0.5, 0.3, 0.2], 2, size=200000, rng=rng)
+
+        first = np.bincount(picks[:, 0], minlength=3) / len(picks)
+        second = np.bincount(picks[:, 1], minlength=3) / len(picks)
+        # P(second = j) = sum over i != j of w_i * w_j / (1 - w_i)
+        expected_second = [0.3 * 0.5 / 0.7 + 0.2 * 0.5 / 0.8,
+                           0.5 * 0.3 / 0.5 + 0.2 * 0.3 / 0.8,
+                           0.5 * 0.2 / 0.5 + 0.3 * 0.2 / 0.7]
+        np.testing.assert_allclose(first, [0.5, 0.3, 0.2], atol=0.01)
+        np.testing.assert_allclose(second, expected_second, atol=0.01)
+
+    def test_unweighted_items_come_last(self):
+        """Test that zero and NaN weights are only picked after the weighted items."""
+        picks = weighted_sample([1.0, 0.0, 2.0, 0.0, np.nan], 4, size=5000)
+
+        assert set(np.sort(picks[:, :2], axis=1).ravel()) == {0, 2}
+        assert set(picks[:, 2:].ravel()) == {1, 3, 4}
+
+    def test_seed_and_items(self):
+        """Test reproducibility of the shared generator and key sampling."""
+        weights = {'a': 1.0, 'b': 2.0, 'c': 3.0, 'd': 4.0}
+
+        set_seed(42)
+        first = sample_items(weights, 3, size=10)
+        set_seed(42)
+        assert sample_items(weights, 3, size=10) == first
+        assert all(len(set(row)) == 3 and set(row) <= set(weights) for row in first)
+        assert sample_items({}, 2) == []
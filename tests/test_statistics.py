@@ -153,3 +153,163 @@ class TestEuromillionsStatistics:
         assert 'last_appearance' in gap
         assert isinstance(gap['gaps'], list)
         assert gap['avg_gap'] >= 0
+
+    def test_apply_draw_matches_rebuild(self, sample_euromillions_data):
+        """Test that apply_draw gives the same state as rebuilding from scratch."""
+        import numpy as np
+        import pandas as pd
+        from src.core.statistics import EuromillionsStatistics
+
+        data = sample_euromillions_data.sort_values('date', ascending=False).reset_index(drop=True)
+        history = data.iloc[1:].reset_index(drop=True)
+        newest = data.iloc[0]
+
+        stats = EuromillionsStatistics(history)
+        stats.apply_draw({
+            'date': newest['date'],
+            'numbers': [int(newest[f'n{i}']) for i in range(1, 6)],
+            'stars': [int(newest['s1']), int(newest['s2'])]
+        })
+        rebuilt = EuromillionsStatistics(pd.concat([newest.to_frame().T, history], ignore_index=True))
+
+        assert len(stats.data) == 50
+        assert stats.get_frequency() == rebuilt.get_frequency()
+        assert stats.get_star_frequency() == rebuilt.get_star_frequency()
+        for name in ['recent_number_counts', 'draws_since_last', 'pair_counts',
+                     'sum_histogram', 'even_histogram', 'gap_sums', 'gap_square_sums']:
+            assert np.array_equal(getattr(stats.aggregates, name), getattr(rebuilt.aggregates, name))
+
+        # Readers are served from the running state, no rescan needed
+        assert stats.get_recency_stats() == rebuilt.get_recency_stats()
+        assert stats.get_sum_distribution() == rebuilt.get_sum_distribution()
+        assert stats.get_even_odd_distribution() == rebuilt.get_even_odd_distribution()
+        for number in range(1, 51):
+            assert stats.get_number_statistics(number) == rebuilt.get_number_statistics(number)
+        avg_gap, gap_variance = stats.aggregates.gap_stats()
+        np.testing.assert_allclose(avg_gap, rebuilt.number_gaps.avg_gap)
+        np.testing.assert_allclose(gap_variance, rebuilt.number_gaps.gap_variance)
+        assert stats.data['date'].iloc[0] == pd.Timestamp(newest['date'])
+
+    def test_apply_older_draw_inserts_in_date_order(self, sample_euromillions_data):
+        """Test that a draw older than the latest is inserted by date, not prepended."""
+        import pandas as pd
+        from src.core.statistics import EuromillionsStatistics
+
+        data = sample_euromillions_data.sort_values('date', ascending=False).reset_index(drop=True)
+        history = data.drop(index=10).reset_index(drop=True)
+        late = data.iloc[10]
+
+        stats = EuromillionsStatistics(history)
+        stats.get_frequency()
+        stats.get_number_statistics(1)
+        stats.apply_draw({
+            'date': late['date'],
+            'numbers': [int(late[f'n{i}']) for i in range(1, 6)],
+            'stars': [int(late['s1']), int(late['s2'])]
+        })
+        rebuilt = EuromillionsStatistics(data)
+
+        assert stats.data['date'].tolist() == data['date'].tolist()
+        assert stats.draws.date_ordinals.tolist() == rebuilt.draws.date_ordinals.tolist()
+        assert stats.get_frequency() == rebuilt.get_frequency()
+        assert stats.get_recency_stats(10) == rebuilt.get_recency_stats(10)
+        assert stats.get_number_statistics(1) == rebuilt.get_number_statistics(1)
+
+    def test_gap_index_matches_row_scan(self, sample_euromillions_data):
+        """Test GapIndex appearances, gaps and summaries against a direct scan."""
+        import numpy as np
+        from src.core.draw_matrix import DrawMatrix
+        from src.core.gap_index import GapIndex
+
+        draws = DrawMatrix.from_dataframe(sample_euromillions_data.iloc[::3].reset_index(drop=True))
+        gaps = GapIndex(draws.occurrence)
+
+        for number in range(1, 51):
+            rows = [i for i, row in enumerate(draws.numbers) if number in row]
+            expected_gaps = np.diff(rows)
+            assert gaps.appearances(number).tolist() == rows
+            assert gaps.gaps(number).tolist() == expected_gaps.tolist()
+            assert gaps.draws_since_last[number - 1] == (rows[0] if rows else len(draws))
+            if len(expected_gaps):
+                assert gaps.avg_gap[number - 1] == pytest.approx(expected_gaps.mean())
+                assert gaps.gap_variance[number - 1] == pytest.approx(expected_gaps.var())
+
+    def test_number_statistics_and_cache_reset(self, euromillions_stats):
+        """Test recency from get_number_statistics and gap rebuild after apply_draw."""
+        stats = euromillions_stats.get_number_statistics(1)
+        assert stats['draws_since_last'] == 0  # drawn in the most recent row
+        assert stats['cyclic_pattern'] == 10.0  # drawn every 10 rows in the sample
+
+        euromillions_stats.apply_draw({'numbers': [2, 3, 4, 5, 6], 'stars': [1, 2]})
+        assert euromillions_stats.get_number_statistics(1)['draws_since_last'] == 1
+        assert euromillions_stats.get_gap_analysis(1)['last_appearance'] == 41
+
+    def test_memoized_statistics(self, euromillions_stats):
+        """Test that derived statistics are built lazily, reused, and dropped on new draws."""
+        assert 'sum_distribution' not in vars(euromillions_stats)
+        sum_dist = euromillions_stats.get_sum_distribution()
+        assert euromillions_stats.get_sum_distribution() is sum_dist
+        assert euromillions_stats.get_distribution_stats() is euromillions_stats.get_distribution_stats()
+
+        euromillions_stats.apply_draw({'numbers': [46, 47, 48, 49, 50], 'stars': [11, 12]})
+        assert 'sum_distribution' not in vars(euromillions_stats)
+        assert euromillions_stats.get_sum_distribution()['max_sum'] == 240
+
+
+@pytest.mark.unit
+@pytest.mark.statistics
+class TestFrenchLotoStatistics:
+    """Test suite for FrenchLotoStatistics class."""
+
+    def test_apply_draw_updates_frequencies(self, french_loto_stats):
+        """Test that apply_draw updates frequencies and the most recent row."""
+        before = dict(french_loto_stats.main_number_freq)
+        lucky_before = french_loto_stats.lucky_number_freq[3]
+
+        french_loto_stats.apply_draw({'date': '2024-12-31', 'numbers': [1, 2, 3, 4, 5], 'lucky': 3})
+
+        assert len(french_loto_stats.data) == 51
+        assert len(french_loto_stats.draws) == 51
+        assert french_loto_stats.main_number_freq[1] == before[1] + 1
+        assert french_loto_stats.lucky_number_freq[3] == lucky_before + 1
+        assert french_loto_stats.aggregates.draws_since_last[0] == 0
+        assert french_loto_stats.aggregates.pair_counts[0, 1] >= 1
+
+    def test_apply_older_draw_rebuilds(self, sample_french_loto_data):
+        """Test that a draw older than the latest is inserted by date and counted."""
+        import pandas as pd
+        from src.core.french_loto_statistics import FrenchLotoStatistics
+
+        data = sample_french_loto_data.sort_values('date', ascending=False).reset_index(drop=True)
+        stats = FrenchLotoStatistics(data)
+        before = dict(stats.main_number_freq)
+
+        stats.apply_draw({'date': '2023-12-31', 'numbers': [1, 2, 3, 4, 5], 'lucky': 3})
+
+        assert len(stats.data) == 51
+        assert stats.data['date'].iloc[-1] == pd.Timestamp('2023-12-31')
+        assert stats.draws.numbers[-1].tolist() == [1, 2, 3, 4, 5]
+        assert stats.main_number_freq[1] == before[1] + 1
+        assert stats.hot_cold_numbers == FrenchLotoStatistics(stats.data).hot_cold_numbers
+
+    def test_lazy_init_keeps_caller_data(self, sample_french_loto_data):
+        """Test that construction is lazy and leaves the caller's DataFrame untouched."""
+        from src.core.french_loto_statistics import FrenchLotoStatistics
+
+        source = sample_french_loto_data.copy()
+        source['date'] = source['date'].dt.strftime('%Y-%m-%d')
+        before = source.copy()
+
+        stats = FrenchLotoStatistics(source)
+        assert not {'main_number_freq', 'hot_cold_numbers', 'pair_analysis', 'aggregates'} & set(vars(stats))
+
+        assert sum(stats.lucky_number_freq.values()) == 50
+        assert 'hot_cold_numbers' not in vars(stats)
+        assert stats.hot_cold_numbers is stats.hot_cold_numbers
+        assert 'lucky' in stats.data.columns
+        assert str(stats.data['date'].dtype).startswith('datetime64')
+        assert source.equals(before)
+
+        stats.apply_draw({'date': '2024-12-31', 'numbers': [1, 2, 3, 4, 5], 'lucky': 3})
+        assert 'hot_cold_numbers' not in vars(stats)
+        assert stats.hot_cold_numbers['recent_period'].endswith('2024-12-31')
@@ -0,0 +1,72 @@
+"""
+Unit tests for the exhaustive ticket-space scorer.
+"""
+
+from itertools import combinations
+
+import pytest
+import numpy as np
+
+from src.core.ticket_space import AdditiveScorer, ticket_features, top_tickets
+
+
+@pytest.fixture
+def scorer():
+    """Scorer on a 20-number pool with feature tables, a cap and a sum bound."""
+    weights = np.random.default_rng(3).integers(0, 10, size=20)
+    return AdditiveScorer(
+        weights, base=10, number_cap=35,
+        feature_scores={'even': [0, 0, 5, 5], 'consecutive': [3, 3, 0, -5], 'zones': [0, 0, 0, 4, 0, 0, 4, 8]},
+        constraints={'sum': (40, 70)},
+    )
+
+
+@pytest.mark.unit
+class TestTicketSpace:
+    """Test suite for AdditiveScorer and top_tickets."""
+
+    def test_features_match_definitions(self):
+        """Test the vectorized features on hand-checked tickets."""
+        tickets = np.array([[1, 2, 3, 17, 49], [10, 20, 30, 40, 48]])
+        features = ticket_features(tickets, 49)
+
+        assert features['sum'].tolist() == [72, 148]
+        assert features['spread'].tolist() == [48, 38]
+        assert features['even'].tolist() == [1, 5]
+        assert features['low'].tolist() == [4, 2]
+        assert features['consecutive'].tolist() == [2, 0]
+        assert features['zones'].tolist() == [7, 7]
+        assert ticket_features(np.array([[1, 2, 3, 4, 40]]), 49)['zones'].tolist() == [5]
+
+        with pytest.raises(ValueError):
+            AdditiveScorer(np.ones(49), feature_scores={'parity': [1]})
+
+    def test_top_tickets_is_exact(self, scorer):
+        """Test the chunked top-K against scoring every ticket at once."""
+        tickets = np.array(list(combinations(range(1, 21), 5)))
+        scores = scorer(tickets)
+        assert np.isneginf(scores[tickets.sum(axis=1) > 70]).all()
+
+        numbers, best = top_tickets(scorer, k=25, pool=20, chunk_size=1000, processes=1)
+        np.testing.assert_array_equal(best, np.sort(scores)[::-1][:25])
+        assert all(scorer(numbers[i:i + 1])[0] == best[i] for i in range(25))
+        assert len({tuple(t) for t in numbers.tolist()}) == 25
+
+        # Chunking does not change the result, ties included
+        single, single_scores = top_tickets(scorer, k=25, pool=20, chunk_size=1 << 20, processes=1)
+        np.testing.assert_array_equal(single, numbers)
+        np.testing.assert_array_equal(single_scores, best)
+
+    def test_zero_k(self, scorer):
+        """Test that asking for no tickets returns empty arrays."""
+        numbers, scores = top_tickets(scorer, k=0, pool=20, chunk_size=1000, processes=1)
+        assert numbers.shape == (0, 5)
+        assert scores.shape == (0,)
+
+    def test_process_pool_matches_serial(self, scorer):
+        """Test that worker processes return the same tickets as the serial scan."""
+        serial = top_tickets(scorer, k=10, pool=20, chunk_size=2000, processes=1)
+        pooled = top_tickets(scorer, k=10, pool=20, chunk_size=2000, processes=2)
+
+        np.testing.assert_array_equal(pooled[0], serial[0])
+        np.testing.assert_array_equal(pooled[1], serial[1])
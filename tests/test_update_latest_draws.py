@@ -0,0 +1,112 @@
+"""
+Unit tests for the bulk import path of update_latest_draws.
+
+Uses a temporary SQLite database with the drawings tables.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def drawings_db(tmp_path):
+    """Create an empty SQLite database with both drawings tables."""
+    db_path = str(tmp_path / "draws.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE euromillions_drawings (
+            id INTEGER PRIMARY KEY, date DATE NOT NULL UNIQUE, day_of_week VARCHAR(20),
+            n1 INTEGER NOT NULL, n2 INTEGER NOT NULL, n3 INTEGER NOT NULL,
+            n4 INTEGER NOT NULL, n5 INTEGER NOT NULL, s1 INTEGER NOT NULL, s2 INTEGER NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE french_loto_drawings (
+            id INTEGER PRIMARY KEY, date DATE NOT NULL, draw_num INTEGER, day_of_week VARCHAR(20),
+            n1 INTEGER NOT NULL, n2 INTEGER NOT NULL, n3 INTEGER NOT NULL,
+            n4 INTEGER NOT NULL, n5 INTEGER NOT NULL, lucky INTEGER,
+            UNIQUE (date, draw_num)
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+class TestBulkImport:
+    """Test suite for bulk_import_drawings and the import_* wrappers."""
+
+    def test_euromillions_import_only_newer(self, drawings_db, sample_euromillions_data):
+        """Test that a second import only inserts rows newer than the stored ones."""
+        from update_latest_draws import import_euromillions_to_db
+
+        df = sample_euromillions_data.copy()
+        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+
+        assert import_euromillions_to_db(df.iloc[:30], db_path=drawings_db) == 30
+        assert import_euromillions_to_db(df, db_path=drawings_db) == 20
+        assert _count(drawings_db, 'euromillions_drawings') == 50
+
+    def test_counts_report_skipped_and_invalid(self, drawings_db, sample_euromillions_data):
+        """Test inserted/skipped/invalid counts, including duplicates in the file."""
+        from update_latest_draws import bulk_import_drawings, EUROMILLIONS_COLUMNS
+
+        df = sample_euromillions_data.copy()
+        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+        df = pd.concat([df, df.iloc[[0]]], ignore_index=True)
+        df.loc[1, 'n1'] = None
+
+        result = bulk_import_drawings(
+            df, 'euromillions_drawings', EUROMILLIONS_COLUMNS,
+            required_cols=['date', 'n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2'],
+            key_cols=['date'], db_path=drawings_db
+        )
+
+        assert result == {'inserted': 49, 'skipped': 1, 'invalid': 1}
+
+    def test_french_loto_draw_num_key(self, drawings_db, sample_french_loto_data):
+        """Test that a second draw on the latest stored date is still imported."""
+        from update_latest_draws import import_french_loto_to_db
+
+        df = sample_french_loto_data.rename(columns={'lucky_number': 'lucky'})
+        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+        df['draw_num'] = 1
+
+        assert import_french_loto_to_db(df, db_path=drawings_db) == 50
+
+        second = df.iloc[[-1]].copy()
+        second['draw_num'] = 2
+        assert import_french_loto_to_db(pd.concat([df, second]), db_path=drawings_db) == 1
+        assert _count(drawings_db, 'french_loto_drawings') == 51
+
+    def test_null_draw_num_counts_as_zero(self, drawings_db, sample_french_loto_data):
+        """Test that a stored drawing without a draw_num does not break the newer-rows filter."""
+        from update_latest_draws import import_french_loto_to_db
+
+        conn = sqlite3.connect(drawings_db)
+        conn.execute("""
+            INSERT INTO french_loto_drawings (date, draw_num, n1, n2, n3, n4, n5, lucky)
+            VALUES ('2024-05-27', NULL, 1, 2, 3, 4, 5, 6)
+        """)
+        conn.commit()
+        conn.close()
+
+        df = sample_french_loto_data.rename(columns={'lucky_number': 'lucky'})
+        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+        df['draw_num'] = 1
+
+        # Only the draw numbered 1 on the stored date is newer than (2024-05-27, 0)
+        assert df['date'].max() == '2024-05-27'
+        assert import_french_loto_to_db(df, db_path=drawings_db) == 1
+        assert _count(drawings_db, 'french_loto_drawings') == 2
@@ -218,74 +218,165 @@ def normalize_french_loto_data(df):
         return None
 
 
-def import_euromillions_to_db(df, db_path=DB_PATH):
-    """Import Euromillions DataFrame to SQLite database"""
+EUROMILLIONS_COLUMNS = ['date', 'day_of_week', 'n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2']
+FRENCH_LOTO_COLUMNS = ['date', 'draw_num', 'n1', 'n2', 'n3', 'n4', 'n5', 'lucky']
+
+
+def _is_postgres(db_url):
+    """Return True if the URL points to a PostgreSQL database"""
+    return bool(db_url) and db_url.startswith(('postgres://', 'postgresql'))
+
+
+def _latest_stored_key(fetch_one, table, key_cols):
+    """Return the (date[, draw_num]) key of the most recent stored drawing, or None (a NULL draw_num counts as 0)"""
+    order = ', '.join(f"{col} DESC" for col in key_cols)
+    row = fetch_one(f"SELECT {', '.join(key_cols)} FROM {table} ORDER BY {order} LIMIT 1")
+    if row is None:
+        return None
+    return (str(row[0])[:10],) + tuple(0 if v is None else int(v) for v in row[1:])
+
+
+def _newer_rows_mask(df, latest_key):
+    """Boolean mask of the rows strictly newer than the latest stored key"""
+    if latest_key is None:
+        return pd.Series(True, index=df.index)
+    newer = df['date'] > latest_key[0]
+    if len(latest_key) > 1:
+        draw_num = pd.to_numeric(df['draw_num'], errors='coerce').fillna(1)
+        newer |= (df['date'] == latest_key[0]) & (draw_num > latest_key[1])
+    return newer
+
+
+def bulk_import_drawings(df, table, columns, required_cols, key_cols, db_path=DB_PATH,
+                         db_url=None, only_newer=True):
+    """
+    Import drawings in one transaction with a single batched insert.
+
+    Reads the most recent stored key, keeps only newer rows (unless
+    only_newer is False) and inserts them with one executemany. SQLite uses
+    INSERT OR IGNORE, PostgreSQL uses INSERT ... ON CONFLICT DO NOTHING.
+    Inserted counts come from the table row count before and after the
+    insert, so duplicates inside the file are reported as skipped.
+
+    Args:
+        df: Normalized DataFrame of drawings
+        table: Target table name
+        columns: Columns to insert
+        required_cols: Columns that must be present for a row to be valid
+        key_cols: Columns identifying the most recent drawing ('date'[, 'draw_num'])
+        db_path: SQLite database path (used when db_url is not PostgreSQL)
+        db_url: Optional PostgreSQL URL
+        only_newer: Skip rows not newer than the latest stored drawing
+
+    Returns:
+        dict: {'inserted': int, 'skipped': int, 'invalid': int}
+    """
+    if df is None or df.empty:
+        return {'inserted': 0, 'skipped': 0, 'invalid': 0}
+
+    frame = df.copy()
+    for col in columns:
+        if col not in frame.columns:
+            frame[col] = None
+    frame['date'] = frame['date'].astype(str)
+
+    valid = frame[required_cols].notna().all(axis=1)
+    invalid_count = int((~valid).sum())
+    frame = frame[valid]
+
+    def to_rows(rows_df):
+        values = rows_df[columns].astype(object)
+        values = values.where(rows_df[columns].notna(), None)
+        return list(values.itertuples(index=False, name=None))
+
+    if _is_postgres(db_url):
+        from sqlalchemy import create_engine, text
+
+        engine = create_engine(db_url)
+        placeholders = ', '.join(f":{col}" for col in columns)
+        insert_sql = text(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
+        )
+        try:
+            with engine.begin() as conn:
+                latest_key = None
+                if only_newer:
+                    latest_key = _latest_stored_key(lambda q: conn.execute(text(q)).first(), table, key_cols)
+                candidates = frame[_newer_rows_mask(frame, latest_key)]
+                before = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                if len(candidates):
+                    conn.execute(insert_sql, [dict(zip(columns, row)) for row in to_rows(candidates)])
+                after = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+        finally:
+            engine.dispose()
+    else:
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:  # single transaction, rolled back on error
+                cursor = conn.cursor()
+                latest_key = None
+                if only_newer:
+                    latest_key = _latest_stored_key(lambda q: cursor.execute(q).fetchone(), table, key_cols)
+                candidates = frame[_newer_rows_mask(frame, latest_key)]
+                before = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                if len(candidates):
+                    placeholders = ', '.join('?' for _ in columns)
+                    cursor.executemany(
+                        f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                        to_rows(candidates)
+                    )
+                after = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    inserted = int(after - before)
+    return {
+        'inserted': inserted,
+        'skipped': len(frame) - inserted,
+        'invalid': invalid_count
+    }
+
+
+def import_euromillions_to_db(df, db_path=DB_PATH, db_url=None, only_newer=True):
+    """Import Euromillions DataFrame to the database in one batched transaction"""
     if df is None or df.empty:
         logger.warning("No Euromillions data to import")
         return 0
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    count = 0
-    for _, row in df.iterrows():
-        try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO euromillions_drawings 
-                (date, day_of_week, n1, n2, n3, n4, n5, s1, s2)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                str(row['date']),
-                row.get('day_of_week', None),
-                int(row['n1']), int(row['n2']), int(row['n3']), 
-                int(row['n4']), int(row['n5']),
-                int(row['s1']), int(row['s2'])
-            ))
-            if cursor.rowcount > 0:
-                count += 1
-        except Exception as e:
-            logger.error(f"Error inserting Euromillions row: {e}")
-            continue
+    try:
+        result = bulk_import_drawings(
+            df, 'euromillions_drawings', EUROMILLIONS_COLUMNS,
+            required_cols=['date', 'n1', 'n2', 'n3', 'n4', 'n5', 's1', 's2'],
+            key_cols=['date'], db_path=db_path, db_url=db_url, only_newer=only_newer
+        )
+    except Exception as e:
+        logger.error(f"Error importing Euromillions drawings: {e}")
+        return 0
     
-    conn.commit()
-    conn.close()
-    logger.info(f"✅ Imported {count} new Euromillions drawings")
-    return count
+    logger.info(f"✅ Imported {result['inserted']} new Euromillions drawings "
+                f"({result['skipped']} already stored, {result['invalid']} invalid)")
+    return result['inserted']
 
 
-def import_french_loto_to_db(df, db_path=DB_PATH):
-    """Import French Loto DataFrame to SQLite database"""
+def import_french_loto_to_db(df, db_path=DB_PATH, db_url=None, only_newer=True):
+    """Import French Loto DataFrame to the database in one batched transaction"""
     if df is None or df.empty:
         logger.warning("No French Loto data to import")
         return 0
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    count = 0
-    for _, row in df.iterrows():
-        try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO french_loto_drawings 
-                (date, draw_num, n1, n2, n3, n4, n5, lucky)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                str(row['date']),
-                int(row.get('draw_num', 1)),
-                int(row['n1']), int(row['n2']), int(row['n3']), 
-                int(row['n4']), int(row['n5']),
-                int(row['lucky']) if pd.notna(row.get('lucky')) else None
-            ))
-            if cursor.rowcount > 0:
-                count += 1
-        except Exception as e:
-            logger.error(f"Error inserting French Loto row: {e}")
-            continue
+    try:
+        result = bulk_import_drawings(
+            df, 'french_loto_drawings', FRENCH_LOTO_COLUMNS,
+            required_cols=['date', 'n1', 'n2', 'n3', 'n4', 'n5'],
+            key_cols=['date', 'draw_num'], db_path=db_path, db_url=db_url, only_newer=only_newer
+        )
+    except Exception as e:
+        logger.error(f"Error importing French Loto drawings: {e}")
+        return 0
     
-    conn.commit()
-    conn.close()
-    logger.info(f"✅ Imported {count} new French Loto drawings")
-    return count
+    logger.info(f"✅ Imported {result['inserted']} new French Loto drawings "
+                f"({result['skipped']} already stored, {result['invalid']} invalid)")
+    return result['inserted']
 
 
 def update_euromillions():